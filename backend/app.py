@@ -4,7 +4,7 @@ sseojum(써줌) 백엔드 메인 애플리케이션 (리팩토링 버전)
 """
 import os
 import logging
-from flask import Flask, request, jsonify
+from flask import Flask, Response, g, request, jsonify
 from dotenv import load_dotenv
 
 # .env 파일 로드를 가장 먼저 실행합니다.
@@ -28,16 +28,28 @@ import werkzeug
 import uuid
 import threading
 import time
+import hmac
+import random
 
 # 설정 및 유틸리티 모듈
 from config import get_cors_config, validate_settings
-from config.settings import get_database_config, get_vertex_ai_config
+from config.settings import (
+    get_database_config, get_vertex_ai_config, get_metrics_config, get_tracing_config, get_profiling_config
+)
 from utils import (
-    get_logger,
+    get_logger, lazy,
     validate_session_data, validate_question_data, validate_revision_request,
     validate_session_id, validate_question_index, ValidationError,
     FileProcessingError
 )
+from utils.metrics import (
+    registry as metrics_registry, HTTP_REQUEST_DURATION, HTTP_REQUESTS_IN_FLIGHT, TOKEN_ESTIMATOR_CORRECTION,
+    record_cache_stats
+)
+from utils.profiler import StackSampler, ProfileStore
+from utils.tracing import (
+    span, start_trace, finish_trace, normalize_trace_id, server_timing_header, configure_exporters
+)
 
 # 새로운 서비스 모듈들
 # 이 서비스 모듈들은 import 되는 시점에 내부적으로 로거를 생성하며,
@@ -45,6 +57,10 @@ from utils import (
 from services import AIService, OCRService, FileService
 from services.auth_service import AuthService
 from services.mail_service import MailService
+from services.bootstrap import BootstrapCoordinator
+from services.embedding_provider import get_embedding_provider
+from supabase_client import get_supabase
+from vertex_client import get_generation_model
 from supabase_models import get_session_model, get_question_model, get_user_model, get_feedback_model
 
 
@@ -96,18 +112,16 @@ def create_app():
         storage_uri="memory://"
     )
     
-    # 서비스 초기화 (Lazy Loading 방식)
+    # 외부 클라이언트 초기화는 부트스트랩 코디네이터가 관리합니다.
+    # (예열이 켜져 있으면 기동 직후 동시에 초기화하고, 꺼져 있으면 첫 사용 시 초기화)
+    bootstrap = create_bootstrap()
+    app.bootstrap = bootstrap
+
     def get_ai_service():
-        if not hasattr(app, '_ai_service'):
-            app._ai_service = AIService()
-        return app._ai_service
-    
+        return bootstrap.get('ai_service')
 
-    
     def get_ocr_service():
-        if not hasattr(app, '_ocr_service'):
-            app._ocr_service = OCRService()
-        return app._ocr_service
+        return bootstrap.get('vision')
     
     def get_file_service():
         if not hasattr(app, '_file_service'):
@@ -115,9 +129,7 @@ def create_app():
         return app._file_service
     
     def get_auth_service():
-        if not hasattr(app, '_auth_service'):
-            app._auth_service = AuthService()
-        return app._auth_service
+        return bootstrap.get('auth')
     
     def get_mail_service():
         if not hasattr(app, '_mail_service'):
@@ -138,32 +150,55 @@ def create_app():
     
     # API 라우트 등록
     register_routes(app)
+
+    # 요청 추적(trace id, Server-Timing) 및 메트릭 수집 등록
+    register_tracing(app)
+    register_metrics(app)
+    register_profiling(app)
     
     # 에러 핸들러 등록
     register_error_handlers(app)
 
-    # --- AI 서비스 사전 예열 (비동기, 환경변수로 제어) ---
-    def _prewarm_ai_service():
-        try:
-            start_ms = int(time.time() * 1000)
-            app.logger.info("AI 서비스 예열 시작...")
-            # 첫 접근 시 내부에서 AIService 인스턴스화 및 모델 로드 수행
-            _ = app.get_ai_service()
-            elapsed_ms = int(time.time() * 1000) - start_ms
-            app.logger.info(f"AI 서비스 예열 완료 ({elapsed_ms}ms)")
-        except Exception as e:
-            app.logger.error(f"AI 서비스 예열 실패: {str(e)}")
-
+    # --- 외부 클라이언트 동시 예열 (비동기, 환경변수로 제어) ---
     prewarm_env = os.getenv("PREWARM_AI", "true").strip().lower()
     if prewarm_env in ("1", "true", "yes", "on"): 
-        threading.Thread(target=_prewarm_ai_service, name="ai-prewarm", daemon=True).start()
+        bootstrap.start()
     else:
-        app.logger.info("환경변수 PREWARM_AI=false 감지: AI 서비스 예열을 비활성화합니다.")
+        app.logger.info("환경변수 PREWARM_AI=false 감지: 예열을 비활성화합니다. (첫 사용 또는 첫 준비 상태 확인 시 초기화)")
     # -----------------------------------
     
     return app
 
 
+def _create_embedding_provider():
+    provider = get_embedding_provider()
+    provider.warmup()
+    return provider
+
+
+def _create_ocr_service():
+    ocr_service = OCRService()
+    if ocr_service.client is None:
+        raise RuntimeError("GCP Vision AI 클라이언트를 초기화하지 못했습니다.")
+    return ocr_service
+
+
+def create_bootstrap() -> BootstrapCoordinator:
+    """외부 의존성 등록 (선행 의존성이 없는 항목은 서로 동시에 초기화됩니다)"""
+    bootstrap = BootstrapCoordinator()
+    bootstrap.register('supabase', get_supabase)
+    bootstrap.register('vertex_generation', get_generation_model)
+    bootstrap.register('embedding', _create_embedding_provider)
+    bootstrap.register(
+        'ai_service', lambda _model, provider: AIService(embedding_provider=provider),
+        depends_on=['vertex_generation', 'embedding']
+    )
+    bootstrap.register('auth', AuthService)
+    # 이미지 OCR은 일부 요청에서만 사용하므로 준비 상태 판단에서 제외합니다.
+    bootstrap.register('vision', _create_ocr_service, required=False)
+    return bootstrap
+
+
 def register_error_handlers(app):
     """에러 핸들러 등록"""
     
@@ -209,6 +244,203 @@ def register_error_handlers(app):
         return response
 
 
+def register_tracing(app):
+    """요청마다 trace를 시작하고 응답에 X-Trace-Id / Server-Timing 헤더를 붙입니다."""
+    config = get_tracing_config()
+    if not config['enabled']:
+        return
+    configure_exporters(config)
+
+    @app.before_request
+    def start_request_trace():
+        # 프론트엔드/프록시가 넘긴 요청 ID가 있으면 이어서 사용합니다.
+        trace_id = normalize_trace_id(
+            request.headers.get('X-Request-ID') or request.headers.get('traceparent')
+        )
+        g.trace = start_trace(f"{request.method} {request.path}", trace_id)
+
+    @app.after_request
+    def add_trace_headers(response):
+        trace = g.get('trace')
+        if trace is not None:
+            trace.attributes['status'] = response.status_code
+            trace.attributes['route'] = request.url_rule.rule if request.url_rule else 'unmatched'
+            response.headers['X-Trace-Id'] = trace.trace_id
+            if config['server_timing']:
+                response.headers['Server-Timing'] = server_timing_header(trace)
+        return response
+
+    @app.teardown_request
+    def finish_request_trace(exc):
+        trace = g.pop('trace', None)
+        if trace is not None:
+            finish_trace(trace)
+
+
+def register_profiling(app):
+    """
+    요청 단위 온디맨드 프로파일러와 관리자 조회 API 등록
+
+    X-Admin-Token(ADMIN_TOKEN)과 X-Profile: 1 헤더를 함께 보낸 요청, 또는 PROFILE_SAMPLE_RATE 비율로
+    뽑힌 요청의 호출 스택을 샘플링하여 디스크 링 저장소에 남기고, 응답에 X-Profile-Id 헤더를 붙입니다.
+    """
+    config = get_profiling_config()
+    if not config['admin_token'] and config['sample_rate'] <= 0:
+        return
+    # 동시에 프로파일링하는 요청 수를 제한합니다. (샘플링 스레드 부하 상한)
+    slots = threading.BoundedSemaphore(max(config['max_concurrent'], 1))
+
+    def get_profile_store():
+        if not hasattr(app, '_profile_store'):
+            app._profile_store = ProfileStore(config['directory'], config['max_entries'])
+        return app._profile_store
+
+    def is_admin_request():
+        token = config['admin_token']
+        return bool(token) and hmac.compare_digest(request.headers.get('X-Admin-Token', ''), token)
+
+    def require_admin():
+        if not config['admin_token']:
+            raise APIError("관리자 API가 비활성화되어 있습니다.", status_code=404)
+        if not is_admin_request():
+            raise APIError("관리자 토큰이 필요합니다.", status_code=403)
+
+    @app.before_request
+    def start_request_profile():
+        if request.path.startswith('/api/v1/admin/'):
+            return
+        requested = bool(request.headers.get('X-Profile')) and is_admin_request()
+        sampled = not requested and config['sample_rate'] > 0 and random.random() < config['sample_rate']
+        if not (requested or sampled) or not slots.acquire(blocking=False):
+            return
+        g.profile_reason = 'requested' if requested else 'sampled'
+        g.profiler = StackSampler(threading.get_ident(), config['interval_ms']).start()
+
+    @app.after_request
+    def save_request_profile(response):
+        sampler = g.pop('profiler', None)
+        if sampler is None:
+            return response
+        try:
+            sampler.stop()
+            trace = g.get('trace')
+            profile_id = get_profile_store().save(sampler, {
+                'method': request.method,
+                'path': request.path,
+                'route': request.url_rule.rule if request.url_rule else 'unmatched',
+                'status': response.status_code,
+                'reason': g.pop('profile_reason', 'sampled'),
+                'trace_id': trace.trace_id if trace is not None else None
+            })
+            response.headers['X-Profile-Id'] = profile_id
+            app.logger.info(f"요청 프로파일 저장: {profile_id} ({request.method} {request.path}, 샘플 {sampler.samples}개)")
+        except Exception as e:
+            app.logger.error(f"요청 프로파일 저장 실패: {e}")
+        finally:
+            slots.release()
+        return response
+
+    @app.teardown_request
+    def discard_request_profile(exc):
+        # 처리되지 않은 예외로 after_request가 호출되지 않은 경우 샘플러만 정리합니다.
+        sampler = g.pop('profiler', None)
+        if sampler is not None:
+            sampler.stop()
+            slots.release()
+
+    @app.route('/api/v1/admin/profiles', methods=['GET'])
+    def list_profiles():
+        """저장된 요청 프로파일 목록 (최신순)"""
+        require_admin()
+        return jsonify({'success': True, 'profiles': get_profile_store().list_profiles()})
+
+    @app.route('/api/v1/admin/profiles/<string:profile_id>', methods=['GET'])
+    def get_profile(profile_id):
+        """
+        프로파일 조회. 기본은 flamegraph.pl / speedscope에 바로 넣을 수 있는 folded 형식,
+        ?format=json이면 메타데이터를 포함한 원본 JSON을 반환합니다.
+        """
+        require_admin()
+        store = get_profile_store()
+        if request.args.get('format') == 'json':
+            record = store.load(profile_id)
+            if record is None:
+                raise APIError("프로파일을 찾을 수 없습니다.", status_code=404)
+            return jsonify(record)
+        folded = store.folded(profile_id)
+        if folded is None:
+            raise APIError("프로파일을 찾을 수 없습니다.", status_code=404)
+        return Response(folded, mimetype='text/plain; charset=utf-8')
+
+
+def register_metrics(app):
+    """라우트별 요청 지연 시간/동시 처리 수 기록, 캐시 적중률 수집, /metrics 엔드포인트 등록"""
+    config = get_metrics_config()
+    if not config['enabled']:
+        return
+
+    @app.before_request
+    def start_request_metrics():
+        g.metrics_started = time.perf_counter()
+        HTTP_REQUESTS_IN_FLIGHT.inc()
+
+    @app.after_request
+    def record_response_status(response):
+        g.metrics_status = response.status_code
+        return response
+
+    @app.teardown_request
+    def finish_request_metrics(exc):
+        started = g.pop('metrics_started', None)
+        if started is None:
+            return
+        HTTP_REQUESTS_IN_FLIGHT.dec()
+        # 경로 변수(세션 ID 등)가 라벨 값으로 퍼지지 않도록 URL 규칙 문자열을 사용합니다.
+        route = request.url_rule.rule if request.url_rule else 'unmatched'
+        status = g.pop('metrics_status', 500)
+        HTTP_REQUEST_DURATION.observe(
+            time.perf_counter() - started, route=route, method=request.method, status=status
+        )
+
+    def collect_cache_stats():
+        if hasattr(app, '_file_service'):
+            extraction_stats = app._file_service.extraction_cache.get_stats()
+            record_cache_stats('extraction', extraction_stats['hits'], extraction_stats['misses'])
+
+        ai_service = app.bootstrap.get_if_ready('ai_service')
+        if ai_service is None:
+            return
+        response_stats = ai_service.get_response_cache_stats()
+        record_cache_stats('response', response_stats['hits'], response_stats['misses'])
+
+        context_stats = ai_service.get_context_cache_stats()
+        record_cache_stats('context', context_stats['session_hits'], context_stats['requests'] - context_stats['session_hits'])
+
+        classification_stats = ai_service.get_classification_stats()
+        embedding_stats = classification_stats['embedding_cache']
+        record_cache_stats(
+            'embedding', embedding_stats['memory_hits'] + embedding_stats['disk_hits'], embedding_stats['misses']
+        )
+        # 로컬 분류(Chip 매칭 + 어휘 분류)로 임베딩 호출을 생략한 비율
+        record_cache_stats(
+            'classification_local', classification_stats['remote_calls_saved'],
+            classification_stats.get('fallthroughs', 0)
+        )
+        TOKEN_ESTIMATOR_CORRECTION.set(ai_service.get_prompt_budget_stats()['estimator']['correction'])
+
+    metrics_registry.register_collector('ai_service_caches', collect_cache_stats)
+
+    @app.route('/metrics')
+    @app.get_limiter().exempt
+    def metrics():
+        """Prometheus 스크레이프 엔드포인트 (워커 프로세스별 값)"""
+        if config['token'] and not hmac.compare_digest(
+            request.headers.get('Authorization', ''), f"Bearer {config['token']}"
+        ):
+            raise APIError("메트릭 조회 토큰이 필요합니다.", status_code=401)
+        return Response(metrics_registry.render(), mimetype='text/plain; version=0.0.4; charset=utf-8')
+
+
 def register_routes(app):
     """라우트 등록"""
     
@@ -229,6 +461,15 @@ def register_routes(app):
             'message': 'API server is healthy'
         })
 
+    @app.route('/api/v1/ready')
+    @app.get_limiter().exempt
+    def readiness_check():
+        """준비 상태 확인 엔드포인트 (필수 의존성이 모두 예열된 워커만 200, 아니면 503)"""
+        # 시작 전이거나 실패한 필수 의존성은 백그라운드에서 다시 초기화합니다. (응답은 기다리지 않음)
+        app.bootstrap.retry_pending()
+        status = app.bootstrap.status()
+        return jsonify(status), (200 if status['ready'] else 503)
+
     @app.route('/api/v1/upload', methods=['POST'])
     def upload():
         """파일 업로드 및 세션 생성"""
@@ -302,24 +543,14 @@ def register_routes(app):
                     app.logger.error(f"전체 요청이 50MB를 초과합니다: {content_length / 1024 / 1024:.2f} MB")
                     return jsonify({'message': '첨부파일의 용량이 50mb를 초과했습니다.'}), 413
             
-            # FormData 개별 필드 크기 확인
-            app.logger.info("=== FormData 필드별 크기 분석 ===")
+            # FormData 개별 필드 크기 확인 (DEBUG 레벨에서만 계산, 몇 MB짜리 필드를 매번 인코딩하지 않도록 지연 계산)
             for field_name in request.form:
                 field_data = request.form[field_name]
-                if isinstance(field_data, str):
-                    field_size = len(field_data.encode('utf-8'))
-                    app.logger.info(f"필드 '{field_name}': {field_size} bytes ({field_size / 1024 / 1024:.2f} MB)")
-                else:
-                    app.logger.info(f"필드 '{field_name}': 파일 또는 바이너리 데이터")
-            
-            # 파일 크기 확인
-            if 'files' in request.files:
-                for i, file in enumerate(request.files.getlist('files')):
-                    file.seek(0, 2)  # 파일 끝으로 이동
-                    file_size = file.tell()
-                    file.seek(0)  # 파일 시작으로 복원
-                    app.logger.info(f"파일 {i+1} '{file.filename}': {file_size} bytes ({file_size / 1024 / 1024:.2f} MB)")
-            app.logger.info("==================================")
+                app.logger.debug(
+                    "필드 '%s': %s bytes", field_name,
+                    lazy(lambda value=field_data: len(value.encode('utf-8'))),
+                    extra={'sample': True}
+                )
             
             # JSON 파싱 및 검증
             data = json.loads(data_str)
@@ -337,7 +568,8 @@ def register_routes(app):
 
             # 파일 텍스트 추출 (파일이 있으면 파일에서 추출, 없으면 사용자 입력 사용)
             if files:
-                file_result = app.get_file_service().process_uploaded_files(files)
+                with span('upload.process_files', file_count=len(files)):
+                    file_result = app.get_file_service().process_uploaded_files(files, user_id=user['id'])
                 if not file_result['success']:
                     raise APIError(file_result['message'], status_code=400)
                 
@@ -394,8 +626,25 @@ def register_routes(app):
                 'preferred_qualifications': preferred_qualifications,
                 'resume_text': resume_text
             }
+
+            # 경험/역할/기술/정량 성과를 구조화 프로필로 한 번 추출해 두고 이후 생성/수정 프롬프트에 원문 대신 사용합니다.
+            try:
+                with span('upload.extract_profile'):
+                    session_data['resume_profile'] = app.get_ai_service().build_resume_profile(resume_text)
+            except Exception as e:
+                app.logger.warning(f"이력서 프로필 추출 실패, 원문을 사용합니다: {e}")
+
+            # 프로필이 없을 때만 이력서를 청크로 나눠 한 번에 임베딩해 두고, 문항마다 관련 청크만 프롬프트에 넣습니다.
+            # (프로필이 있으면 항상 프로필을 사용하므로 인덱스는 만들지 않음, 짧은 이력서는 생략)
+            if not session_data.get('resume_profile'):
+                try:
+                    with span('upload.index_resume'):
+                        session_data['resume_chunks'] = app.get_ai_service().build_resume_index(resume_text)
+                except Exception as e:
+                    app.logger.warning(f"이력서 청크 인덱스 생성 실패, 전체 이력서를 사용합니다: {e}")
             
-            new_session = session_model.create_session(user['id'], session_data)
+            with span('upload.create_session'):
+                new_session = session_model.create_session(user['id'], session_data)
             
             app.logger.info(f"세션 생성 성공: {new_session['id']}")
             
@@ -405,6 +654,12 @@ def register_routes(app):
                 try:
                     # AI 서비스를 사용하여 자기소개서 생성
                     ai_service = app.get_ai_service()
+
+                    # 생성 시작 전에 모든 질문을 한 번에 분류 (임베딩 요청 1회로 묶음)
+                    question_types = ai_service.classify_questions_batch(
+                        [q for q in questions if q and q.strip()]
+                    )
+                    question_type_iter = iter(question_types)
                     
                     for i, question_text in enumerate(questions):
                         if question_text and question_text.strip():
@@ -416,7 +671,12 @@ def register_routes(app):
                                 jd_text=job_description,
                                 resume_text=resume_text,
                                 company_name=company_name,
-                                job_title=job_title
+                                job_title=job_title,
+                                session_id=new_session['id'],
+                                bypass_cache=bool(data.get('regenerate')),
+                                question_type=next(question_type_iter),
+                                resume_chunks=session_data.get('resume_chunks'),
+                                resume_profile=session_data.get('resume_profile')
                             )
                             
                             # 튜플에서 답변과 회사 정보 추출
@@ -631,7 +891,11 @@ def register_routes(app):
 {session.get('preferred_qualifications', '')}
                 """.strip()
                 
-                revised_text = app.get_ai_service().revise_cover_letter(
+                # 오래된 버전의 변경 요약은 질문에 저장해 두고 다음 수정 때 재사용합니다.
+                ai_service = app.get_ai_service()
+                history_context = ai_service.compact_revision_history(history, question.get('history_digest'))
+
+                revised_text = ai_service.revise_cover_letter(
                     question=question['question'],
                     jd_text=jd_text,
                     resume_text=session.get('resume_text', ''),
@@ -640,7 +904,12 @@ def register_routes(app):
                     company_info="",  # 회사 정보 사용 비활성화
                     company_name=session.get('company_name', ''),
                     job_title=session.get('job_title', ''),
-                    answer_history=history
+                    answer_history=history,
+                    session_id=session_id,
+                    bypass_cache=bool(data.get('regenerate')),
+                    resume_chunks=session.get('resume_chunks'),
+                    history_context=history_context,
+                    resume_profile=session.get('resume_profile')
                 )
                 
                 # 수정 프롬프트를 revision_prompts 배열에 추가
@@ -655,6 +924,8 @@ def register_routes(app):
                 history.append(revised_text)
                 question['answer_history'] = history
                 question['current_version_index'] = len(history) - 1
+                if history_context.stored is not None:
+                    question['history_digest'] = history_context.stored
             
             else:
                 raise APIError(f"알 수 없는 액션입니다: {action}", status_code=400)
@@ -708,6 +979,21 @@ def register_routes(app):
                 app.logger.info(f"파일 정리 결과: {cleanup_result}")
             except Exception as file_error:
                 app.logger.warning(f"파일 정리 중 오류 (무시됨): {file_error}")
+
+            # 추출 텍스트 캐시에 남은 이력서 원문도 삭제합니다. (캐시는 세션이 아닌 사용자+파일 단위라 사용자 항목 전체)
+            # 파일 정리가 실패해도 원문 삭제는 건너뛰지 않도록 따로 처리합니다.
+            try:
+                app.get_file_service().purge_user_cache(user['id'])
+            except Exception as purge_error:
+                app.logger.warning(f"추출 텍스트 캐시 삭제 중 오류 (무시됨): {purge_error}")
+
+            # 세션 단위 컨텍스트 캐시 정리 (AI 서비스가 이미 로드된 경우에만)
+            ai_service = app.bootstrap.get_if_ready('ai_service')
+            if ai_service:
+                try:
+                    ai_service.invalidate_session_cache(session_id)
+                except Exception as cache_error:
+                    app.logger.warning(f"컨텍스트 캐시 정리 중 오류 (무시됨): {cache_error}")
             
             app.logger.info(f"세션 삭제 및 데이터 정리 완료: {session_id}")
             return jsonify({
@@ -882,7 +1168,11 @@ def register_routes(app):
                 jd_text=jd_text,
                 resume_text=session['resume_text'],
                 company_name=session['company_name'] or "",
-                job_title=session['job_title'] or ""
+                job_title=session['job_title'] or "",
+                session_id=session_id,
+                bypass_cache=bool(data.get('regenerate')),
+                resume_chunks=session.get('resume_chunks'),
+                resume_profile=session.get('resume_profile')
             )
             
             # 튜플에서 답변과 회사 정보 추출
@@ -988,7 +1278,11 @@ def register_routes(app):
                 jd_text=jd_text,
                 resume_text=session.get('resume_text', ''), # 빈 문자열이 전달될 수 있음
                 company_name=session.get('company_name') or "",
-                job_title=session.get('job_title') or ""
+                job_title=session.get('job_title') or "",
+                session_id=session_id,
+                bypass_cache=bool(data.get('regenerate')),
+                resume_chunks=session.get('resume_chunks'),
+                resume_profile=session.get('resume_profile')
             )
             
             if not generated_answer:
@@ -1027,18 +1321,13 @@ def register_routes(app):
     def get_google_auth_url():
         """Google OAuth URL 생성"""
         try:
-            print("Google OAuth URL 요청 받음")
+            app.logger.debug("Google OAuth URL 요청 받음")
             auth_service = app.get_auth_service()
-            print(f"AuthService 객체 생성됨: {type(auth_service)}")
-            print(f"AuthService 메서드들: {dir(auth_service)}")
             auth_url = auth_service.get_google_auth_url()
-            print(f"생성된 auth_url: {auth_url}")
+            app.logger.debug("생성된 auth_url: %s", auth_url)
             return jsonify({"success": True, "auth_url": auth_url})
         except Exception as e:
-            print(f"Google OAuth URL 생성 오류: {str(e)}")
-            print(f"오류 타입: {type(e)}")
-            import traceback
-            traceback.print_exc()
+            app.logger.error("Google OAuth URL 생성 오류 (%s): %s", type(e).__name__, e, exc_info=True)
             return jsonify({"success": False, "message": f"Google OAuth URL 생성 오류: {str(e)}"}), 500
 
     @app.route('/api/v1/auth/google/callback', methods=['POST'])
@@ -1173,113 +1462,6 @@ def register_routes(app):
         except Exception as e:
             return jsonify({"success": False, "message": f"비밀번호 재설정 오류: {str(e)}"}), 500
 
-    @app.route('/api/v1/sessions/<string:session_id>/questions/<int:question_index>/revise', methods=['POST'])
-    def revise_answer(session_id, question_index):
-        """특정 질문의 답변 수정 (세션 내 인덱스 기반)"""
-        # Supabase 모델 가져오기
-        session_model = get_session_model()
-        question_model = get_question_model()
-        
-        try:
-            app.logger.info(f"답변 수정 요청 시작 - 세션: {session_id}, 질문 인덱스: {question_index}")
-            # 인증 확인
-            auth_header = request.headers.get('Authorization')
-            if not auth_header or not auth_header.startswith('Bearer '):
-                raise APIError("인증 토큰이 필요합니다.", status_code=401)
-            access_token = auth_header.split(' ')[1]
-            auth_service = app.get_auth_service()
-            user = auth_service.get_user(access_token)
-            if not user:
-                raise APIError("유효하지 않은 토큰입니다.", status_code=401)
-            
-            data = request.get_json()
-            if not data or 'revision' not in data:
-                raise APIError("revision이 필요합니다.", status_code=400)
-            
-            revision_text = data['revision']
-            
-            # 세션 조회
-            session = session_model.get_session(session_id, user['id'])
-            if not session:
-                raise APIError("세션을 찾을 수 없습니다.", status_code=404)
-            
-            # 세션 내 질문 인덱스 검증
-            if not session.questions or question_index < 0 or question_index >= len(session.questions):
-                raise APIError("질문을 찾을 수 없습니다.", status_code=404)
-            
-            # 세션 내 해당 인덱스의 질문 가져오기 (안전한 접근)
-            question = session.questions[question_index]
-            
-            
-            # 현재 답변을 히스토리에 추가
-            current_answer = question.answer_history
-            if current_answer:
-                try:
-                    history_list = json.loads(current_answer) if isinstance(current_answer, str) else current_answer
-                except (json.JSONDecodeError, TypeError):
-                    history_list = []
-            else:
-                history_list = []
-            
-            # 현재 답변을 히스토리에 추가
-            if question.current_version_index < len(history_list):
-                current_answer_text = history_list[question.current_version_index]
-                history_list.append(current_answer_text)
-            else:
-                history_list.append("")
-            
-            # 개별 필드들을 조합하여 JD 텍스트 생성
-            jd_text = f"""
-회사명: {session.company_name or ''}
-직무: {session.job_title or ''}
-
-주요업무:
-{session.main_responsibilities or ''}
-
-자격요건:
-{session.requirements or ''}
-
-우대사항:
-{session.preferred_qualifications or ''}
-            """.strip()
-            
-            # 답변 수정
-            revised_answer = app.get_ai_service().revise_cover_letter(
-                question=question.question,
-                jd_text=jd_text,
-                resume_text=session.resume_text or "",
-                original_answer=current_answer_text if 'current_answer_text' in locals() else "",
-                user_edit_prompt=revision_text,
-                company_info="",  # 회사 정보 사용 비활성화
-                company_name=session.company_name or "",
-                job_title=session.job_title or "",
-                answer_history=history_list
-            )
-            
-            # 새로운 답변을 히스토리에 추가
-            history_list.append(revised_answer)
-            
-            # 데이터베이스 업데이트
-            question.answer_history = json.dumps(history_list)
-            question.current_version_index = len(history_list) - 1
-            
-            session_model.update_session(session_id, user['id'], session.to_dict())
-            
-            app.logger.info(f"답변 수정 완료 - 세션: {session_id}, 질문 인덱스: {question_index}")
-            
-            return jsonify({
-                'success': True,
-                'revised_answer': revised_answer,
-                'message': '답변이 수정되었습니다.'
-            }), 200
-            
-        except (APIError, ValidationError):
-            raise
-        except Exception as e:
-            app.logger.error(f"답변 수정 중 오류: {str(e)}")
-            app.logger.error(traceback.format_exc())
-            raise APIError(f"답변 수정에 실패했습니다: {str(e)}", status_code=500)
-
     @app.route('/api/v1/feedback', methods=['POST'])
     @app.get_limiter().limit("5 per minute, 20 per hour")  # Rate Limiting 적용
     def submit_feedback():
@@ -0,0 +1 @@
+"""성능 벤치마크 및 합성 이력서 코퍼스"""
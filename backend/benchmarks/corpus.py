@@ -0,0 +1,205 @@
+"""
+합성 한국어 이력서 코퍼스 생성기 (벤치마크/부하 테스트용)
+
+시드가 같으면 항상 같은 내용을 만들므로 커밋 간 벤치마크 결과를 비교할 수 있습니다.
+외부 라이브러리 없이 PDF/DOCX를 직접 작성합니다.
+
+- PDF: 문자 코드를 UCS-2 그대로 쓰는 Identity-H 인코딩과 항등 ToUnicode CMap을 사용하여
+  텍스트 추출기가 한글을 그대로 복원할 수 있게 합니다. 폰트를 임베딩하지 않으므로 화면 렌더링은 정확하지 않으며,
+  텍스트 추출 비용 측정용입니다. (PyPDF2는 UniKS-UCS2-H 같은 기본 CJK CMap을 해석하지 못합니다)
+- DOCX: 최소 구성의 OOXML(document.xml)로, 쪽마다 페이지 나누기를 넣습니다.
+
+사용법:
+    python -m benchmarks.corpus --out-dir /tmp/resume_corpus --pages 1 10 50 200
+"""
+
+import argparse
+import io
+import os
+import random
+import zipfile
+from typing import List
+from xml.sax.saxutils import escape
+
+LINES_PER_PAGE = 48
+_PAGE_WIDTH, _PAGE_HEIGHT = 595, 842  # A4 (pt)
+
+_SECTIONS = ["인적사항", "학력", "경력", "프로젝트", "보유 기술", "자격증", "수상 경력", "대외 활동", "자기소개"]
+_COMPANIES = ["한빛소프트", "누리데이터", "가온커머스", "다온로보틱스", "미르헬스케어", "바른핀테크", "새봄에듀", "하람모빌리티"]
+_ROLES = ["백엔드 개발자", "데이터 엔지니어", "서비스 기획자", "마케팅 매니저", "프론트엔드 개발자", "품질 관리 담당", "영업 관리"]
+_SKILLS = ["Python", "Java", "SQL", "Spring", "React", "AWS", "Docker", "Kubernetes", "Tableau", "Excel", "Figma", "GA4"]
+_VERBS = ["설계하고 구축했습니다", "개선하여 성과를 냈습니다", "주도적으로 운영했습니다", "자동화했습니다", "분석하여 전략을 수립했습니다"]
+_OBJECTS = ["주문 처리 시스템", "고객 데이터 파이프라인", "사내 협업 도구", "추천 알고리즘", "정산 배치", "온보딩 프로세스", "마케팅 캠페인"]
+_RESULTS = ["처리 시간을 {n}% 단축", "매출을 {n}% 향상", "오류율을 {n}% 감소", "사용자 만족도를 {n}점 개선", "운영 비용을 {n}% 절감"]
+
+
+def _sentence(rng: random.Random) -> str:
+    result = rng.choice(_RESULTS).format(n=rng.randint(5, 60))
+    return (
+        f"{rng.choice(_COMPANIES)}에서 {rng.choice(_ROLES)}로 근무하며 {rng.choice(_OBJECTS)}을(를) "
+        f"{rng.choice(_VERBS)}. 그 결과 {result}하였고, {', '.join(rng.sample(_SKILLS, 3))}을(를) 활용했습니다."
+    )
+
+
+def generate_resume_lines(pages: int, seed: int = 42, line_width: int = 38) -> List[str]:
+    """쪽당 LINES_PER_PAGE줄인 한국어 이력서 본문 줄 목록을 만듭니다."""
+    rng = random.Random(seed * 1000 + pages)
+    lines: List[str] = ["이 력 서", f"성명: 홍길동{rng.randint(1, 99)}  |  연락처: 010-{rng.randint(1000, 9999)}-{rng.randint(1000, 9999)}"]
+    target = pages * LINES_PER_PAGE
+    section_index = 0
+    while len(lines) < target:
+        lines.append(f"■ {_SECTIONS[section_index % len(_SECTIONS)]}")
+        section_index += 1
+        for _ in range(rng.randint(3, 8)):
+            sentence = f"- {_sentence(rng)}"
+            lines.extend(sentence[i:i + line_width] for i in range(0, len(sentence), line_width))
+    return lines[:target]
+
+
+def _ucs2_hex(text: str) -> str:
+    # 기본 다국어 평면 밖의 문자는 UCS-2로 표현할 수 없으므로 제외합니다.
+    return "".join(f"{ord(ch):04X}" for ch in text if ord(ch) <= 0xFFFF)
+
+
+def _to_unicode_cmap() -> bytes:
+    # bfrange는 마지막 바이트만 달라질 수 있으므로 상위 바이트별로 256개 범위를 만듭니다.
+    ranges = "\n".join(f"<{hi:02X}00> <{hi:02X}FF> <{hi:02X}00>" for hi in range(256) if not 0xD8 <= hi <= 0xDF)
+    count = 256 - 8
+    body = (
+        "/CIDInit /ProcSet findresource begin\n12 dict begin\nbegincmap\n"
+        "/CIDSystemInfo << /Registry (Adobe) /Ordering (UCS) /Supplement 0 >> def\n"
+        "/CMapName /Adobe-Identity-UCS def\n/CMapType 2 def\n"
+        "1 begincodespacerange\n<0000> <FFFF>\nendcodespacerange\n"
+        f"{count} beginbfrange\n{ranges}\nendbfrange\n"
+        "endcmap\nCMapName currentdict /CMap defineresource pop\nend\nend\n"
+    )
+    return body.encode("ascii")
+
+
+def build_pdf(lines: List[str], font_size: int = 10) -> bytes:
+    """줄 목록을 A4 PDF로 작성합니다. (쪽당 LINES_PER_PAGE줄)"""
+    pages = [lines[i:i + LINES_PER_PAGE] for i in range(0, len(lines), LINES_PER_PAGE)] or [[]]
+    objects: List[bytes] = []
+
+    def add(obj: bytes) -> int:
+        objects.append(obj)
+        return len(objects)
+
+    catalog_id = add(b"")  # 페이지 트리 번호가 정해진 뒤 채웁니다.
+    pages_id = add(b"")
+    to_unicode = _to_unicode_cmap()
+    to_unicode_id = add(b"<< /Length %d >>\nstream\n" % len(to_unicode) + to_unicode + b"\nendstream")
+    descriptor_id = add(
+        b"<< /Type /FontDescriptor /FontName /HYSMyeongJo-Medium /Flags 6 /FontBBox [-12 -148 1001 880] "
+        b"/ItalicAngle 0 /Ascent 880 /Descent -148 /CapHeight 880 /StemV 60 >>"
+    )
+    cid_font_id = add(
+        b"<< /Type /Font /Subtype /CIDFontType0 /BaseFont /HYSMyeongJo-Medium "
+        b"/CIDSystemInfo << /Registry (Adobe) /Ordering (Korea1) /Supplement 1 >> "
+        b"/FontDescriptor %d 0 R /DW 1000 >>" % descriptor_id
+    )
+    font_id = add(
+        b"<< /Type /Font /Subtype /Type0 /BaseFont /HYSMyeongJo-Medium /Encoding /Identity-H "
+        b"/DescendantFonts [%d 0 R] /ToUnicode %d 0 R >>" % (cid_font_id, to_unicode_id)
+    )
+
+    page_ids = []
+    leading = font_size + 5
+    for page_lines in pages:
+        content = [f"BT /F1 {font_size} Tf {leading} TL 50 {_PAGE_HEIGHT - 50} Td"]
+        content.extend(f"<{_ucs2_hex(line)}> Tj T*" for line in page_lines)
+        content.append("ET")
+        stream = "\n".join(content).encode("ascii")
+        content_id = add(b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream")
+        page_ids.append(add(
+            b"<< /Type /Page /Parent %d 0 R /MediaBox [0 0 %d %d] /Contents %d 0 R "
+            b"/Resources << /Font << /F1 %d 0 R >> >> >>" % (pages_id, _PAGE_WIDTH, _PAGE_HEIGHT, content_id, font_id)
+        ))
+
+    objects[catalog_id - 1] = b"<< /Type /Catalog /Pages %d 0 R >>" % pages_id
+    kids = b" ".join(b"%d 0 R" % page_id for page_id in page_ids)
+    objects[pages_id - 1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (kids, len(page_ids))
+
+    out = io.BytesIO()
+    out.write(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+    offsets = []
+    for number, obj in enumerate(objects, 1):
+        offsets.append(out.tell())
+        out.write(b"%d 0 obj\n" % number + obj + b"\nendobj\n")
+    xref_offset = out.tell()
+    out.write(b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1))
+    for offset in offsets:
+        out.write(b"%010d 00000 n \n" % offset)
+    out.write(b"trailer\n<< /Size %d /Root %d 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, catalog_id, xref_offset))
+    return out.getvalue()
+
+
+_CONTENT_TYPES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/word/document.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/>'
+    '</Types>'
+)
+_ROOT_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+    'Target="word/document.xml"/>'
+    '</Relationships>'
+)
+
+
+def build_docx(lines: List[str]) -> bytes:
+    """줄 목록을 문단 하나씩으로 하는 DOCX를 작성합니다. (LINES_PER_PAGE줄마다 페이지 나누기)"""
+    paragraphs = []
+    for i, line in enumerate(lines):
+        paragraphs.append(f'<w:p><w:r><w:t xml:space="preserve">{escape(line)}</w:t></w:r></w:p>')
+        if (i + 1) % LINES_PER_PAGE == 0 and i + 1 < len(lines):
+            paragraphs.append('<w:p><w:r><w:br w:type="page"/></w:r></w:p>')
+    document = (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"><w:body>'
+        + "".join(paragraphs) +
+        '</w:body></w:document>'
+    )
+    out = io.BytesIO()
+    with zipfile.ZipFile(out, "w", zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr("[Content_Types].xml", _CONTENT_TYPES)
+        archive.writestr("_rels/.rels", _ROOT_RELS)
+        archive.writestr("word/document.xml", document)
+    return out.getvalue()
+
+
+def generate_resume(pages: int, fmt: str, seed: int = 42) -> bytes:
+    """pages쪽짜리 합성 이력서를 'pdf' 또는 'docx' 바이트로 반환합니다."""
+    lines = generate_resume_lines(pages, seed)
+    if fmt == "pdf":
+        return build_pdf(lines)
+    if fmt == "docx":
+        return build_docx(lines)
+    raise ValueError(f"지원하지 않는 형식입니다: {fmt}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="합성 한국어 이력서(PDF/DOCX) 생성")
+    parser.add_argument("--out-dir", required=True)
+    parser.add_argument("--pages", type=int, nargs="+", default=[1, 10, 50, 200])
+    parser.add_argument("--formats", nargs="+", default=["pdf", "docx"], choices=["pdf", "docx"])
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args(argv)
+
+    os.makedirs(args.out_dir, exist_ok=True)
+    for pages in args.pages:
+        for fmt in args.formats:
+            path = os.path.join(args.out_dir, f"resume_{pages}p.{fmt}")
+            with open(path, "wb") as f:
+                f.write(generate_resume(pages, fmt, args.seed))
+            print(f"{path} ({os.path.getsize(path):,} bytes)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,71 @@
+"""
+텍스트 정규화 머리글/바닥글 검출 점검
+
+쪽 경계의 본문 줄(기간, 회사명 등)이 머리글/바닥글로 잘못 지워지지 않는지, 반복 머리글/바닥글과 쪽 번호는
+지워지는지 고정 입력으로 확인합니다. 하나라도 어긋나면 종료 코드 1을 반환합니다.
+
+사용법:
+    python -m benchmarks.normalizer_check
+"""
+
+import os
+import sys
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BASE_DIR not in sys.path:
+    sys.path.insert(0, BASE_DIR)
+
+from utils.text_normalizer import PAGE_BREAK, normalize_resume_text
+
+# (이름, 쪽 목록, 남아야 하는 줄, 지워져야 하는 줄)
+CASES = [
+    (
+        "date_ranges_at_page_edges_2p",
+        [
+            "■ 경력\n누리데이터 백엔드 개발자\n결제 API 설계 및 운영\n2019.03 ~ 2020.02",
+            "2021.03 ~ 2023.02\n한빛소프트 데이터 엔지니어\n정산 배치 자동화\n2023.03 ~ 재직 중",
+        ],
+        ["2019.03 ~ 2020.02", "2021.03 ~ 2023.02", "2023.03 ~ 재직 중"],
+        [],
+    ),
+    (
+        "date_ranges_with_headers_3p",
+        [
+            f"홍길동 이력서\n{period}\n{company} 근무\n- {page} -"
+            for page, (period, company) in enumerate(
+                [("2015.03 ~ 2017.02", "가온커머스"), ("2017.03 ~ 2019.02", "바른핀테크"),
+                 ("2019.03 ~ 2021.02", "새봄에듀")], 1)
+        ],
+        ["2015.03 ~ 2017.02", "2017.03 ~ 2019.02", "2019.03 ~ 2021.02"],
+        ["홍길동 이력서", "- 1 -", "- 2 -", "- 3 -"],
+    ),
+    (
+        "page_numbered_footer_4p",
+        [f"■ 항목 {page}\n본문 내용 {page * 11}\n이력서 {page} / 4" for page in range(1, 5)],
+        ["본문 내용 11", "본문 내용 44"],
+        ["이력서 1 / 4", "이력서 4 / 4"],
+    ),
+]
+
+
+def check_case(name, pages, kept, removed):
+    text, _ = normalize_resume_text(PAGE_BREAK.join(pages))
+    lines = set(text.split("\n"))
+    errors = [f"지워짐: {line}" for line in kept if line not in lines]
+    errors += [f"남음: {line}" for line in removed if line in lines]
+    return errors
+
+
+def main():
+    failures = 0
+    for name, pages, kept, removed in CASES:
+        errors = check_case(name, pages, kept, removed)
+        print(f"{name:<36} {'FAIL' if errors else 'ok'}")
+        for error in errors:
+            print(f"    - {error}")
+        failures += bool(errors)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
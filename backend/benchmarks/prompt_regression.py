@@ -0,0 +1,495 @@
+"""
+프롬프트 토큰/지연 시간 회귀 검사
+
+고정된 문항·이력서·채용공고 조합(benchmarks/fixtures/prompt_cases.json)으로 생성/수정 프롬프트를 실제 요청 경로와
+같은 빌더(_build_cover_letter_prompt/_build_revision_prompt)로 조립해 토큰 수를 세고,
+카세트(benchmarks/cassettes/<case_id>.json)에 녹화된 모델 응답을 재생해 generate_cover_letter/revise_cover_letter를
+끝까지 실행합니다. 가이드라인(_precompute_guidelines)이나 프롬프트 f-string이 바뀌어 예산
+(benchmarks/prompt_budgets.json)을 넘으면 종료 코드 1을 반환합니다.
+
+  - 프롬프트 토큰 : 카운터로 센 전체 프롬프트 토큰 수 <= max_prompt_tokens
+  - 재생 E2E 시간 : 프로세스 내 실행 시간(중앙값) + 녹화 당시 모델 응답 시간 <= max_e2e_ms
+
+토큰 카운터는 교체할 수 있습니다.
+  bytes4              UTF-8 바이트 수 / 4 (기본값)
+  estimate            utils.token_budget의 한국어 보정 추정기 (프롬프트 예산/컨텍스트 캐시가 쓰는 값)
+  vertex              Vertex AI count_tokens (네트워크 필요)
+  package.module:name 인자 없이 호출하면 count(text) 메서드를 가진 객체를 돌려주는 클래스/함수
+
+카세트는 --record로 실제 Vertex 모델을 호출해 녹화합니다. 녹화 이후 프롬프트가 바뀌면 재생은 하되 경고를 출력하고,
+--strict에서는 실패로 처리합니다. 카세트가 없는 항목은 E2E 예산(max_e2e_ms)이 있으면 항상 실패입니다. (없으면 --strict에서만)
+Vertex 자격 증명이 없는 환경에서는 --sanitize로 고정 답변과 가정한 응답 시간(--latency-ms)을 담은 대체 카세트를 만듭니다.
+대체 카세트는 'sanitized': true로 표시되며, --record로 녹화하면 덮어씁니다. (실제 녹화 카세트는 --sanitize가 덮어쓰지 않음)
+
+사용법 (backend 디렉터리에서):
+    python -m benchmarks.prompt_regression                              # 토큰 예산 + 카세트 재생
+    python -m benchmarks.prompt_regression --counter vertex --strict
+    python -m benchmarks.prompt_regression --record                     # 카세트 녹화 (Vertex 자격 증명 필요)
+    python -m benchmarks.prompt_regression --sanitize                   # 대체 카세트 생성 (모델 호출 없음)
+    python -m benchmarks.prompt_regression --write-budgets --headroom 0.1
+"""
+
+import os
+import sys
+
+# 설정 모듈은 임포트 시점에 환경 변수를 읽으므로 서비스 모듈보다 먼저 지정합니다.
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BASE_DIR not in sys.path:
+    sys.path.insert(0, BASE_DIR)
+os.environ.setdefault("PROJECT_ID", "benchmark")
+os.environ.setdefault("LOCATION", "asia-northeast3")
+os.environ.setdefault("PREWARM_AI", "false")
+os.environ.setdefault("LOG_LEVEL", "ERROR")
+os.environ.setdefault("EMBEDDING_CACHE_ENABLED", "false")
+# 컨텍스트 캐시를 끄면 전체 프롬프트가 한 번에 모델로 전달되므로 카세트의 프롬프트 해시가 세션 상태와 무관해집니다.
+os.environ.setdefault("CONTEXT_CACHE_ENABLED", "false")
+os.environ.setdefault("RESPONSE_CACHE_ENABLED", "false")
+
+import argparse
+import datetime
+import hashlib
+import importlib
+import json
+import re
+import statistics
+import tempfile
+import time
+from types import SimpleNamespace
+from typing import Any, Dict, List, Optional
+
+from benchmarks.corpus import generate_resume_lines
+from benchmarks.run_benchmarks import RESULTS_DIR, environment_info
+
+BENCHMARKS_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_FIXTURES = os.path.join(BENCHMARKS_DIR, "fixtures", "prompt_cases.json")
+DEFAULT_BUDGETS = os.path.join(BENCHMARKS_DIR, "prompt_budgets.json")
+DEFAULT_CASSETTES = os.path.join(BENCHMARKS_DIR, "cassettes")
+CASSETTE_FORMAT_VERSION = 1
+# 대체 카세트의 응답 시간 기본값 (녹화한 생성/수정 응답 시간보다 넉넉하게 잡은 가정값)
+DEFAULT_SANITIZED_LATENCY_MS = 12000.0
+# 대체 카세트의 생성 답변 (수정 항목은 고정 입력의 현재 답변을 그대로 사용)
+SANITIZED_ANSWER = (
+    "대용량 데이터를 안정적으로 처리하는 서비스를 만들고 싶어 지원했습니다. "
+    "이전 프로젝트에서 결제 API의 병목을 분석해 쿼리와 캐시 구조를 개선했고, 응답 지연을 절반 가까이 줄였습니다. "
+    "입사 후에는 이 경험을 바탕으로 데이터 파이프라인의 안정성과 처리 효율을 높이는 데 기여하겠습니다."
+)
+
+
+# ---------------------------------------------------------------------- #
+# 토큰 카운터
+# ---------------------------------------------------------------------- #
+class Utf8BytesTokenCounter:
+    """UTF-8 바이트 수 / 4 (모델과 무관한 단순 추정식)"""
+
+    name = "bytes4"
+
+    def count(self, text: str) -> int:
+        return len(text.encode('utf-8')) // 4
+
+
+class VertexTokenCounter:
+    """생성 모델의 count_tokens API로 실제 토큰 수를 셉니다."""
+
+    def __init__(self, model=None):
+        from config.settings import get_vertex_ai_config
+        from vertex_client import get_generation_model
+
+        self.model = model if model is not None else get_generation_model()
+        self.name = f"vertex:{get_vertex_ai_config()['model_name']}"
+
+    def count(self, text: str) -> int:
+        return int(self.model.count_tokens(text).total_tokens)
+
+
+def load_token_counter(spec: str):
+    """'bytes4', 'estimate', 'vertex' 또는 'package.module:name' 형식의 지정으로 카운터를 만듭니다."""
+    if spec == "bytes4":
+        return Utf8BytesTokenCounter()
+    if spec == "estimate":
+        from utils.token_budget import TokenEstimator
+        return TokenEstimator()
+    if spec == "vertex":
+        return VertexTokenCounter()
+    if ":" not in spec:
+        raise ValueError(f"알 수 없는 토큰 카운터: {spec} (bytes4, estimate, vertex 또는 module:name)")
+    module_name, attr = spec.split(":", 1)
+    counter = getattr(importlib.import_module(module_name), attr)()
+    if not callable(getattr(counter, 'count', None)):
+        raise ValueError(f"토큰 카운터에 count(text) 메서드가 없습니다: {spec}")
+    if not getattr(counter, 'name', None):
+        counter.name = spec
+    return counter
+
+
+# ---------------------------------------------------------------------- #
+# 카세트
+# ---------------------------------------------------------------------- #
+def prompt_sha256(prompt: str) -> str:
+    return hashlib.sha256(prompt.encode('utf-8')).hexdigest()
+
+
+class CassetteStore:
+    """항목별 녹화 응답 JSON 파일 디렉터리"""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+
+    def path(self, case_id: str) -> str:
+        return os.path.join(self.directory, f"{case_id}.json")
+
+    def load(self, case_id: str) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self.path(case_id), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+    def save(self, case_id: str, cassette: Dict[str, Any]):
+        os.makedirs(self.directory, exist_ok=True)
+        with open(self.path(case_id), 'w', encoding='utf-8') as f:
+            json.dump(cassette, f, ensure_ascii=False, indent=2)
+            f.write("\n")
+
+
+def _make_response(text: str, usage: Optional[Dict[str, int]]):
+    """_handle_response/_log_token_usage가 읽는 속성만 갖춘 응답 객체"""
+    usage_metadata = SimpleNamespace(**usage) if usage else None
+    return SimpleNamespace(text=text, usage_metadata=usage_metadata)
+
+
+class CassetteModel:
+    """generate_content 호출에 현재 항목의 카세트 응답을 즉시 돌려주는 생성 모델 대역"""
+
+    def __init__(self):
+        self.cassette: Optional[Dict[str, Any]] = None
+        self.last_prompt: Optional[str] = None
+
+    def generate_content(self, contents, **kwargs):
+        self.last_prompt = contents
+        return _make_response(self.cassette['response_text'], self.cassette.get('usage'))
+
+
+class RecordingModel:
+    """실제 생성 모델을 호출하면서 프롬프트, 응답, 응답 시간을 기록합니다."""
+
+    def __init__(self, model):
+        self.model = model
+        self.last_prompt: Optional[str] = None
+        self.last_response = None
+        self.last_latency_ms: Optional[float] = None
+
+    def generate_content(self, contents, **kwargs):
+        self.last_prompt = contents
+        start = time.perf_counter()
+        self.last_response = self.model.generate_content(contents, **kwargs)
+        self.last_latency_ms = (time.perf_counter() - start) * 1000
+        return self.last_response
+
+
+def _usage_dict(response) -> Optional[Dict[str, int]]:
+    usage_metadata = getattr(response, 'usage_metadata', None)
+    if not usage_metadata:
+        return None
+    return {
+        'prompt_token_count': usage_metadata.prompt_token_count,
+        'candidates_token_count': usage_metadata.candidates_token_count,
+        'total_token_count': usage_metadata.total_token_count,
+        'cached_content_token_count': getattr(usage_metadata, 'cached_content_token_count', 0) or 0,
+    }
+
+
+# ---------------------------------------------------------------------- #
+# 고정 입력
+# ---------------------------------------------------------------------- #
+def load_cases(path: str) -> List[Dict[str, Any]]:
+    """고정 입력 파일을 읽어 defaults를 채우고 이력서/답변 히스토리를 펼친 항목 목록을 반환합니다."""
+    with open(path, 'r', encoding='utf-8') as f:
+        fixtures = json.load(f)
+    defaults = fixtures.get('defaults', {})
+    cases = []
+    for raw in fixtures['cases']:
+        case = dict(defaults, **raw)
+        resume = case.get('resume') or {}
+        if 'corpus_pages' in resume:
+            case['resume_text'] = "\n".join(generate_resume_lines(resume['corpus_pages'], seed=resume.get('seed', 42)))
+        else:
+            case['resume_text'] = resume.get('text', "")
+        if case['operation'] == 'revise':
+            case['answer_history'] = _synthesize_history(case['original_answer'], case.get('history_versions', 1))
+        cases.append(case)
+    return cases
+
+
+def _synthesize_history(original_answer: str, versions: int) -> List[str]:
+    """현재 답변의 문장 순서를 바꿔 이전 버전들을 만듭니다. (마지막 항목이 현재 답변)"""
+    sentences = [s for s in re.split(r"(?<=[.다])\s+", original_answer) if s]
+    history = []
+    for i in range(1, versions):
+        shift = i % len(sentences)
+        history.append(" ".join(sentences[shift:] + sentences[:shift]))
+    history.append(original_answer)
+    return history
+
+
+def render_prompt(service, case: Dict[str, Any]) -> Dict[str, str]:
+    """요청 경로와 같은 빌더로 프롬프트 블록을 조립합니다. (full은 컨텍스트 캐시 미사용 시 모델에 전달되는 문자열)"""
+    if case['operation'] == 'generate':
+        global_block, session_block, request_block, _ = service._build_cover_letter_prompt(
+            case['question'], case.get('question_type'), case['jd'], case['resume_text'],
+            case['company_name'], case['job_title']
+        )
+    else:
+        global_block, session_block, request_block = service._build_revision_prompt(
+            case['question'], case['jd'], case['resume_text'], case['original_answer'], case['edit_prompt'],
+            company_name=case['company_name'], job_title=case['job_title'], answer_history=case['answer_history']
+        )
+    return {
+        'global': global_block,
+        'session': session_block,
+        'request': request_block,
+        'full': f"{global_block}\n{session_block}\n{request_block}",
+    }
+
+
+def run_operation(service, case: Dict[str, Any]) -> Optional[str]:
+    """generate_cover_letter/revise_cover_letter를 응답 캐시 없이 한 번 실행하고 답변을 반환합니다."""
+    if case['operation'] == 'generate':
+        answer, _ = service.generate_cover_letter(
+            case['question'], case['jd'], case['resume_text'], case['company_name'], case['job_title'],
+            session_id=f"prompt-regression-{case['id']}", bypass_cache=True,
+            question_type=case.get('question_type')
+        )
+        return answer
+    return service.revise_cover_letter(
+        case['question'], case['jd'], case['resume_text'], case['original_answer'], case['edit_prompt'],
+        company_name=case['company_name'], job_title=case['job_title'],
+        answer_history=case['answer_history'], session_id=f"prompt-regression-{case['id']}", bypass_cache=True
+    )
+
+
+def _build_service(generation_model):
+    from services.ai_service import AIService
+    from services.embedding_provider import HashingEmbeddingProvider
+
+    # 모든 항목이 question_type을 지정하므로 분류(임베딩) 경로는 타지 않습니다.
+    # 대역 임베딩 제공자와 기준 임베딩의 모델이 달라 불일치 오류 로그가 한 번 출력되는 것이 정상입니다.
+    return AIService(embedding_provider=HashingEmbeddingProvider(), generation_model=generation_model)
+
+
+# ---------------------------------------------------------------------- #
+# 예산
+# ---------------------------------------------------------------------- #
+def load_budgets(path: str) -> Dict[str, Any]:
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {'counter': None, 'defaults': {}, 'cases': {}}
+
+
+def case_budget(budgets: Dict[str, Any], case_id: str) -> Dict[str, Any]:
+    return dict(budgets.get('defaults', {}), **budgets.get('cases', {}).get(case_id, {}))
+
+
+def write_budgets(path: str, budgets: Dict[str, Any], results: List[Dict[str, Any]], counter_name: str,
+                  headroom: float):
+    """현재 토큰 수에 headroom 비율을 더해 항목별 max_prompt_tokens를 갱신합니다. (E2E 예산은 유지)"""
+    budgets = dict(budgets, counter=counter_name)
+    cases = {k: dict(v) for k, v in budgets.get('cases', {}).items()}
+    for result in results:
+        limit = int(result['tokens']['full'] * (1 + headroom))
+        cases.setdefault(result['id'], {})['max_prompt_tokens'] = -(-limit // 100) * 100  # 100 단위 올림
+    budgets['cases'] = cases
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(budgets, f, ensure_ascii=False, indent=2)
+        f.write("\n")
+
+
+# ---------------------------------------------------------------------- #
+# 실행
+# ---------------------------------------------------------------------- #
+def record_cassettes(cases: List[Dict[str, Any]], store: CassetteStore) -> int:
+    """실제 Vertex 모델로 각 항목을 한 번씩 실행해 카세트를 저장합니다."""
+    from vertex_client import get_generation_model
+
+    recorder = RecordingModel(get_generation_model())
+    service = _build_service(recorder)
+    failures = 0
+    for case in cases:
+        answer = run_operation(service, case)
+        if not answer:
+            print(f"  {case['id']:<36} 녹화 실패 (응답 없음)")
+            failures += 1
+            continue
+        store.save(case['id'], {
+            'format_version': CASSETTE_FORMAT_VERSION,
+            'case_id': case['id'],
+            'model': service.model_name,
+            'prompt_sha256': prompt_sha256(recorder.last_prompt),
+            'response_text': recorder.last_response.text,
+            'usage': _usage_dict(recorder.last_response),
+            'latency_ms': round(recorder.last_latency_ms, 1),
+            'recorded_at': datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        })
+        print(f"  {case['id']:<36} 녹화 {recorder.last_latency_ms:>9.1f} ms -> {store.path(case['id'])}")
+    return 1 if failures else 0
+
+
+def sanitize_cassettes(cases: List[Dict[str, Any]], store: CassetteStore, counter, latency_ms: float) -> int:
+    """모델을 호출하지 않고 현재 프롬프트 해시, 고정 답변, 가정한 응답 시간으로 대체 카세트를 저장합니다."""
+    service = _build_service(CassetteModel())
+    for case in cases:
+        existing = store.load(case['id'])
+        if existing is not None and not existing.get('sanitized'):
+            print(f"  {case['id']:<36} 녹화된 카세트가 있어 건너뜀")
+            continue
+        prompt = render_prompt(service, case)['full']
+        answer = case['original_answer'] if case['operation'] == 'revise' else SANITIZED_ANSWER
+        prompt_tokens, answer_tokens = counter.count(prompt), counter.count(answer)
+        store.save(case['id'], {
+            'format_version': CASSETTE_FORMAT_VERSION,
+            'case_id': case['id'],
+            'model': service.model_name,
+            'sanitized': True,
+            'prompt_sha256': prompt_sha256(prompt),
+            'response_text': answer,
+            'usage': {
+                'prompt_token_count': prompt_tokens,
+                'candidates_token_count': answer_tokens,
+                'total_token_count': prompt_tokens + answer_tokens,
+                'cached_content_token_count': 0,
+            },
+            'latency_ms': latency_ms,
+            'recorded_at': datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        })
+        print(f"  {case['id']:<36} 대체 카세트 -> {store.path(case['id'])}")
+    return 0
+
+
+def check_case(service, model: CassetteModel, counter, case: Dict[str, Any], budget: Dict[str, Any],
+               cassette: Optional[Dict[str, Any]], repeat: int, check_tokens: bool, strict: bool) -> Dict[str, Any]:
+    """항목 하나의 토큰 수를 세고 카세트를 재생해 예산 위반/경고 목록과 함께 결과를 반환합니다."""
+    blocks = render_prompt(service, case)
+    tokens = {name: counter.count(text) for name, text in blocks.items()}
+    result = {'id': case['id'], 'operation': case['operation'], 'tokens': tokens,
+              'chars': len(blocks['full']), 'violations': [], 'warnings': []}
+
+    max_tokens = budget.get('max_prompt_tokens')
+    if check_tokens and max_tokens is not None and tokens['full'] > max_tokens:
+        result['violations'].append(f"프롬프트 토큰 {tokens['full']:,} > 예산 {max_tokens:,}")
+
+    if cassette is None:
+        # E2E 예산이 있는 항목은 재생하지 않으면 예산을 검사할 수 없으므로 실패로 처리합니다.
+        message = "카세트 없음: E2E 재생 불가 (--record로 녹화하거나 --sanitize로 대체 카세트 생성)"
+        (result['violations'] if strict or budget.get('max_e2e_ms') is not None else result['warnings']).append(message)
+        return result
+
+    model.cassette = cassette
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        answer = run_operation(service, case)
+        timings.append((time.perf_counter() - start) * 1000)
+        if not answer:
+            result['violations'].append("카세트 재생 실패 (답변 없음)")
+            return result
+
+    local_ms = statistics.median(timings)
+    result['local_ms'] = round(local_ms, 3)
+    result['recorded_latency_ms'] = cassette.get('latency_ms', 0.0)
+    result['sanitized'] = bool(cassette.get('sanitized'))
+    result['replayed_e2e_ms'] = round(local_ms + result['recorded_latency_ms'], 1)
+
+    if prompt_sha256(model.last_prompt) != cassette.get('prompt_sha256'):
+        message = "녹화 이후 프롬프트가 바뀌었습니다 (녹화된 응답 시간은 이전 프롬프트 기준, --record로 갱신)"
+        (result['violations'] if strict else result['warnings']).append(message)
+    if model.last_prompt != blocks['full']:
+        result['warnings'].append("요청 경로가 모델에 전달한 프롬프트가 빌더 조립 결과와 다릅니다")
+
+    max_e2e_ms = budget.get('max_e2e_ms')
+    if max_e2e_ms is not None and result['replayed_e2e_ms'] > max_e2e_ms:
+        result['violations'].append(f"재생 E2E {result['replayed_e2e_ms']:,.1f} ms > 예산 {max_e2e_ms:,} ms")
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="프롬프트 토큰/지연 시간 회귀 검사")
+    parser.add_argument("--fixtures", default=DEFAULT_FIXTURES, help="고정 입력 JSON")
+    parser.add_argument("--budgets", default=DEFAULT_BUDGETS, help="예산 JSON")
+    parser.add_argument("--cassettes", default=DEFAULT_CASSETTES, help="카세트 디렉터리")
+    parser.add_argument("--counter", default="bytes4", help="토큰 카운터 (bytes4, estimate, vertex, module:name)")
+    parser.add_argument("--filter", default=None, help="항목 id 정규식")
+    parser.add_argument("--repeat", type=int, default=5, help="재생 반복 횟수 (프로세스 내 시간은 중앙값 사용)")
+    parser.add_argument("--strict", action="store_true", help="카세트 누락/프롬프트 변경도 실패로 처리")
+    parser.add_argument("--record", action="store_true", help="실제 Vertex 모델로 카세트를 녹화")
+    parser.add_argument("--sanitize", action="store_true", help="모델 호출 없이 대체 카세트를 생성")
+    parser.add_argument("--latency-ms", type=float, default=DEFAULT_SANITIZED_LATENCY_MS,
+                        help="--sanitize 카세트에 기록할 가정 응답 시간(ms)")
+    parser.add_argument("--write-budgets", action="store_true", help="현재 토큰 수로 항목별 토큰 예산을 갱신")
+    parser.add_argument("--headroom", type=float, default=0.1, help="--write-budgets 여유 비율")
+    parser.add_argument("--output", default=None, help="결과 JSON 경로 (기본: benchmarks/results/prompt-<시각>-<커밋>.json)")
+    args = parser.parse_args(argv)
+
+    cases = load_cases(args.fixtures)
+    if args.filter:
+        pattern = re.compile(args.filter)
+        cases = [case for case in cases if pattern.search(case['id'])]
+    store = CassetteStore(args.cassettes)
+
+    # 서비스가 만드는 캐시 디렉터리가 작업 트리에 남지 않도록 임시 디렉터리를 사용합니다.
+    with tempfile.TemporaryDirectory(prefix="sseojum-prompt-") as cache_dir:
+        os.environ.setdefault("CACHE_DIR", cache_dir)
+        if args.record:
+            return record_cassettes(cases, store)
+
+        counter = load_token_counter(args.counter)
+        if args.sanitize:
+            return sanitize_cassettes(cases, store, counter, args.latency_ms)
+        budgets = load_budgets(args.budgets)
+        check_tokens = budgets.get('counter') in (None, counter.name)
+        if not check_tokens:
+            print(f"토큰 예산은 '{budgets['counter']}' 카운터 기준이므로 '{counter.name}' 결과에는 적용하지 않습니다.")
+
+        model = CassetteModel()
+        service = _build_service(model)
+        results = []
+        for case in cases:
+            result = check_case(service, model, counter, case, case_budget(budgets, case['id']),
+                                store.load(case['id']), args.repeat, check_tokens, args.strict)
+            results.append(result)
+            e2e = f"{result['replayed_e2e_ms']:>9.1f} ms" if 'replayed_e2e_ms' in result else f"{'-':>12}"
+            status = "FAIL" if result['violations'] else ("WARN" if result['warnings'] else "ok")
+            print(f"{case['id']:<36} tokens {result['tokens']['full']:>7,} "
+                  f"(global {result['tokens']['global']:,} / session {result['tokens']['session']:,} / "
+                  f"request {result['tokens']['request']:,})  e2e {e2e}  {status}")
+            for message in result['violations'] + result['warnings']:
+                print(f"    - {message}")
+
+    if args.write_budgets:
+        write_budgets(args.budgets, budgets, results, counter.name, args.headroom)
+        print(f"\n토큰 예산 갱신: {args.budgets}")
+
+    report = {
+        'created_at': datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        'environment': environment_info(),
+        'counter': counter.name,
+        'results': results,
+    }
+    output = args.output
+    if not output:
+        sha = (report['environment']['git']['sha'] or 'nogit')[:10]
+        output = os.path.join(RESULTS_DIR, f"prompt-{datetime.datetime.now():%Y%m%d-%H%M%S}-{sha}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"\n결과 저장: {output}")
+
+    failed = [result['id'] for result in results if result['violations']]
+    if failed and not args.write_budgets:
+        print(f"\n예산 위반 {len(failed)}건: {', '.join(failed)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
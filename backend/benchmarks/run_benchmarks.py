@@ -0,0 +1,343 @@
+"""
+마이크로 벤치마크 실행기
+
+합성 이력서 코퍼스(benchmarks/corpus.py)와 대역 임베딩 제공자로 요청 처리 경로의 CPU 구간을 측정합니다.
+네트워크(Vertex AI, Supabase)는 사용하지 않습니다.
+
+측정 항목:
+  - parse_pdf / parse_docx        : 1~200쪽 합성 이력서 텍스트 추출
+  - normalize_resume_text         : utils.text_normalizer.normalize_resume_text (추출 텍스트 정규화)
+  - clean_resume_text             : AIService._clean_resume_text
+  - classify_question_hybrid      : chip/로컬 어휘/임베딩(HashingEmbeddingProvider) 분류
+  - build_cover_letter_prompt     : 생성 프롬프트 조립
+  - build_revision_prompt         : 수정 프롬프트 조립 (답변 히스토리 포함)
+  - parse_answer_history          : supabase_models._parse_answer_history
+  - question_to_dict              : SupabaseQuestion.to_dict
+
+결과는 환경 정보(git 커밋, 파이썬/라이브러리 버전)와 함께 JSON으로 저장하며,
+--compare로 이전 결과와 중앙값을 비교해 허용치를 넘는 회귀가 있으면 종료 코드 1을 반환합니다.
+
+사용법 (backend 디렉터리에서):
+    python -m benchmarks.run_benchmarks                                  # 전체 실행, benchmarks/results/ 에 저장
+    python -m benchmarks.run_benchmarks --quick                          # 1/10쪽만, 반복 횟수 축소
+    python -m benchmarks.run_benchmarks --filter parse_ --pages 1 50
+    python -m benchmarks.run_benchmarks --compare benchmarks/results/baseline.json --max-regression 0.2
+"""
+
+import os
+import sys
+
+# 설정 모듈은 임포트 시점에 환경 변수를 읽으므로 서비스 모듈보다 먼저 지정합니다.
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BASE_DIR not in sys.path:
+    sys.path.insert(0, BASE_DIR)
+os.environ.setdefault("PROJECT_ID", "benchmark")
+os.environ.setdefault("LOCATION", "asia-northeast3")
+os.environ.setdefault("PREWARM_AI", "false")
+os.environ.setdefault("LOG_LEVEL", "ERROR")  # 분류 경고 등 로그 출력 비용이 측정값에 섞이지 않도록 합니다.
+os.environ.setdefault("EMBEDDING_CACHE_ENABLED", "false")
+os.environ.setdefault("CONTEXT_CACHE_ENABLED", "false")
+
+import argparse
+import datetime
+import io
+import json
+import platform
+import re
+import statistics
+import subprocess
+import tempfile
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from benchmarks.corpus import generate_resume, generate_resume_lines
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+RESULT_FORMAT_VERSION = 1
+DEFAULT_PAGES = [1, 10, 50, 200]
+
+CLASSIFICATION_QUESTIONS = [
+    "지원동기",                                                   # chip 매칭
+    "성격의 장단점은 무엇인가요?",                                  # 로컬 어휘 분류
+    "우리 회사에 지원한 이유와 입사 후 이루고 싶은 목표를 작성해 주세요.",
+    "팀 프로젝트에서 갈등을 해결했던 경험을 구체적으로 서술하시오.",
+    "본인이 생각하는 이 직무의 핵심 역량과 이를 갖추기 위한 노력은?",
+    "최근 관심 있게 본 산업 이슈와 그에 대한 본인의 견해를 작성해 주세요.",
+]
+
+
+class Case:
+    """벤치마크 항목 하나 (func는 인자 없이 한 번 실행되는 함수)"""
+
+    def __init__(self, name: str, func: Callable[[], Any], params: Optional[Dict[str, Any]] = None):
+        self.name = name
+        self.func = func
+        self.params = params or {}
+
+
+def _calibrate(func: Callable[[], Any], min_round_seconds: float) -> int:
+    """한 라운드가 min_round_seconds 이상 걸리도록 라운드당 반복 횟수를 정합니다. (timeit.autorange 방식)"""
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        if time.perf_counter() - start >= min_round_seconds or number >= 1_000_000:
+            return number
+        number *= 10
+
+
+def run_case(case: Case, rounds: int, min_round_seconds: float, max_case_seconds: float) -> Dict[str, Any]:
+    """
+    case를 rounds번(라운드마다 number회) 실행하고 호출 1회당 소요 시간(ms) 통계를 반환합니다.
+    200쪽 PDF처럼 느린 항목은 max_case_seconds를 넘으면 최소 1라운드 후 중단합니다.
+    """
+    number = _calibrate(case.func, min_round_seconds)  # 보정 실행이 예열도 겸합니다.
+    timings: List[float] = []
+    started = time.perf_counter()
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for _ in range(number):
+            case.func()
+        timings.append((time.perf_counter() - start) * 1000 / number)
+        if time.perf_counter() - started >= max_case_seconds:
+            break
+    return {
+        'name': case.name,
+        'params': case.params,
+        'number': number,
+        'rounds': len(timings),
+        'min_ms': round(min(timings), 4),
+        'median_ms': round(statistics.median(timings), 4),
+        'mean_ms': round(statistics.mean(timings), 4),
+        'stdev_ms': round(statistics.stdev(timings), 4) if len(timings) > 1 else 0.0,
+    }
+
+
+# ---------------------------------------------------------------------- #
+# 벤치마크 항목
+# ---------------------------------------------------------------------- #
+def _file_cases(pages_list: List[int]) -> List[Case]:
+    from utils.file_processor import parse_docx, parse_pdf
+    from utils.text_normalizer import normalize_resume_text
+
+    cases = []
+    for pages in pages_list:
+        for fmt, parser in (("pdf", parse_pdf), ("docx", parse_docx)):
+            data = generate_resume(pages, fmt)
+            cases.append(Case(
+                f"parse_{fmt}",
+                lambda parser=parser, data=data: parser(io.BytesIO(data)),
+                {'pages': pages, 'bytes': len(data)}
+            ))
+        pdf_text = parse_pdf(io.BytesIO(generate_resume(pages, "pdf")))
+        cases.append(Case(
+            "normalize_resume_text",
+            lambda text=pdf_text: normalize_resume_text(text),
+            {'pages': pages, 'chars': len(pdf_text)}
+        ))
+    return cases
+
+
+def _build_ai_service():
+    """대역 임베딩 제공자로 AIService를 만들고, 같은 제공자로 임베딩한 기준 질문 분류기를 붙입니다."""
+    from services.ai_service import AIService
+    from services.embedding_provider import HashingEmbeddingProvider, TASK_DOCUMENT
+    from services.question_classifier import QuestionClassifier
+
+    provider = HashingEmbeddingProvider()
+    # 생성 모델은 호출하지 않으므로 Vertex AI 초기화를 피하기 위해 빈 객체를 주입합니다.
+    # 저장소의 기준 임베딩은 Vertex 모델로 만든 것이므로 모델 불일치 오류 로그가 한 번 출력되는 것이 정상입니다.
+    service = AIService(embedding_provider=provider, generation_model=object())
+
+    with open(os.path.join(BASE_DIR, "services", "canonical_questions.json"), 'r', encoding='utf-8') as f:
+        categories = json.load(f)
+    keys, texts = [], []
+    for category in categories:
+        for question in category['questions']:
+            keys.append(category['key'])
+            texts.append(question)
+    service.classifier = QuestionClassifier(keys, provider.embed(texts, TASK_DOCUMENT))
+    return service
+
+
+def _ai_cases(pages_list: List[int]) -> List[Case]:
+    service = _build_ai_service()
+    jd_text = "\n".join(generate_resume_lines(1, seed=7)[:20])
+    cases = [Case(
+        "classify_question_hybrid",
+        lambda: [service.classify_question_hybrid(q) for q in CLASSIFICATION_QUESTIONS],
+        {'questions': len(CLASSIFICATION_QUESTIONS)}
+    )]
+    history = [f"버전 {i} 답변입니다. " + "저는 문제를 끝까지 해결하는 사람입니다. " * 20 for i in range(5)]
+    for pages in pages_list:
+        resume_text = "\n".join(generate_resume_lines(pages))
+        params = {'pages': pages, 'chars': len(resume_text)}
+        cases.append(Case(
+            "clean_resume_text",
+            lambda text=resume_text: service._clean_resume_text(text),
+            params
+        ))
+        cases.append(Case(
+            "build_cover_letter_prompt",
+            lambda text=resume_text: service._build_cover_letter_prompt(
+                CLASSIFICATION_QUESTIONS[2], "motivation", jd_text, text, "누리데이터", "백엔드 개발자"
+            ),
+            params
+        ))
+        cases.append(Case(
+            "build_revision_prompt",
+            lambda text=resume_text: service._build_revision_prompt(
+                CLASSIFICATION_QUESTIONS[2], jd_text, text, history[-1], "조금 더 간결하게 다듬어 주세요.",
+                company_name="누리데이터", job_title="백엔드 개발자", answer_history=history
+            ),
+            dict(params, history_versions=len(history))
+        ))
+    return cases
+
+
+def _model_cases() -> List[Case]:
+    from supabase_models import SupabaseQuestion, _parse_answer_history
+
+    cases = []
+    question_model = SupabaseQuestion(None)
+    for versions in (1, 10, 50):
+        history = [f"{i}번째 답변\n줄바꿈이 포함된 \"자기소개서\" 본문입니다. " * 10 for i in range(versions)]
+        history_json = json.dumps(history, ensure_ascii=False)
+        # 제어 문자가 그대로 저장된 과거 데이터 (복구 경로)
+        raw_history = json.dumps(history, ensure_ascii=False).replace("\\n", "\n")
+        row = {
+            'id': 1, 'question_number': 1, 'question': CLASSIFICATION_QUESTIONS[2],
+            'answer_history': history_json, 'current_version_index': versions - 1
+        }
+        cases.append(Case("parse_answer_history", lambda s=history_json: _parse_answer_history(s),
+                          {'versions': versions, 'variant': 'valid'}))
+        cases.append(Case("parse_answer_history", lambda s=raw_history: _parse_answer_history(s),
+                          {'versions': versions, 'variant': 'control_chars'}))
+        cases.append(Case("question_to_dict", lambda row=row: question_model.to_dict(row),
+                          {'versions': versions}))
+    return cases
+
+
+# ---------------------------------------------------------------------- #
+# 결과 저장/비교
+# ---------------------------------------------------------------------- #
+def _case_key(result: Dict[str, Any]) -> str:
+    params = ",".join(f"{k}={v}" for k, v in sorted(result['params'].items()) if k not in ('bytes', 'chars'))
+    return f"{result['name']}[{params}]"
+
+
+def _git_revision() -> Dict[str, Any]:
+    def git(*args):
+        completed = subprocess.run(["git", *args], cwd=BASE_DIR, capture_output=True, text=True)
+        return completed.stdout.strip() if completed.returncode == 0 else None
+
+    return {'sha': git("rev-parse", "HEAD"), 'dirty': bool(git("status", "--porcelain", "--untracked-files=no"))}
+
+
+def _library_versions() -> Dict[str, Optional[str]]:
+    from importlib import metadata
+
+    versions = {}
+    for name in ("PyPDF2", "python-docx", "numpy"):
+        try:
+            versions[name] = metadata.version(name)
+        except metadata.PackageNotFoundError:
+            versions[name] = None
+    return versions
+
+
+def environment_info() -> Dict[str, Any]:
+    return {
+        'git': _git_revision(),
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+        'cpu_count': os.cpu_count(),
+        'libraries': _library_versions(),
+    }
+
+
+def compare_results(current: Dict[str, Any], baseline: Dict[str, Any], max_regression: float) -> List[str]:
+    """
+    중앙값 기준으로 비교 결과를 출력하고, max_regression(비율)을 넘게 느려진 항목 목록을 반환합니다.
+    한쪽에만 있는 항목은 비교하지 않습니다.
+    """
+    baseline_by_key = {_case_key(r): r for r in baseline.get('results', [])}
+    regressions = []
+    print(f"\n기준 결과와 비교 (기준 커밋: {(baseline.get('environment', {}).get('git') or {}).get('sha') or '-'})")
+    for result in current['results']:
+        key = _case_key(result)
+        previous = baseline_by_key.get(key)
+        if not previous or not previous['median_ms']:
+            continue
+        change = result['median_ms'] / previous['median_ms'] - 1
+        marker = ""
+        if change > max_regression:
+            marker = "  << 회귀"
+            regressions.append(key)
+        print(f"  {key:<70} {previous['median_ms']:>11.3f} -> {result['median_ms']:>11.3f} ms ({change:+.1%}){marker}")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="마이크로 벤치마크 실행")
+    parser.add_argument("--pages", type=int, nargs="+", default=None, help=f"코퍼스 쪽수 (기본 {DEFAULT_PAGES})")
+    parser.add_argument("--filter", default=None, help="항목 이름 정규식")
+    parser.add_argument("--rounds", type=int, default=7, help="항목별 측정 라운드 수")
+    parser.add_argument("--min-round-seconds", type=float, default=0.2, help="라운드당 최소 측정 시간")
+    parser.add_argument("--max-case-seconds", type=float, default=20.0, help="항목별 측정 시간 상한 (최소 1라운드)")
+    parser.add_argument("--quick", action="store_true", help="1/10쪽만, 3라운드로 빠르게 실행")
+    parser.add_argument("--output", default=None, help="결과 JSON 경로 (기본: benchmarks/results/<시각>-<커밋>.json)")
+    parser.add_argument("--compare", default=None, help="비교할 기준 결과 JSON")
+    parser.add_argument("--max-regression", type=float, default=0.2, help="허용 회귀 비율 (0.2 = 중앙값 20%% 증가)")
+    args = parser.parse_args(argv)
+
+    pages_list = args.pages or ([1, 10] if args.quick else DEFAULT_PAGES)
+    rounds = 3 if args.quick else args.rounds
+    pattern = re.compile(args.filter) if args.filter else None
+
+    # 서비스가 만드는 캐시/프로파일 디렉터리가 작업 트리에 남지 않도록 임시 디렉터리를 사용합니다.
+    with tempfile.TemporaryDirectory(prefix="sseojum-bench-") as cache_dir:
+        os.environ.setdefault("CACHE_DIR", cache_dir)
+        cases = _file_cases(pages_list) + _ai_cases(pages_list) + _model_cases()
+        if pattern:
+            cases = [case for case in cases if pattern.search(case.name)]
+
+        results = []
+        for case in cases:
+            result = run_case(case, rounds, args.min_round_seconds, args.max_case_seconds)
+            results.append(result)
+            print(f"{_case_key(result):<70} median {result['median_ms']:>11.3f} ms "
+                  f"(min {result['min_ms']:.3f}, {result['rounds']}x{result['number']})")
+
+    report = {
+        'format_version': RESULT_FORMAT_VERSION,
+        'created_at': datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        'environment': environment_info(),
+        'settings': {'pages': pages_list, 'rounds': rounds, 'min_round_seconds': args.min_round_seconds},
+        'results': results,
+    }
+
+    output = args.output
+    if not output:
+        sha = (report['environment']['git']['sha'] or 'nogit')[:10]
+        output = os.path.join(RESULTS_DIR, f"{datetime.datetime.now():%Y%m%d-%H%M%S}-{sha}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"\n결과 저장: {output}")
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare_results(report, baseline, args.max_regression)
+        if regressions:
+            print(f"\n허용치({args.max_regression:.0%})를 넘는 회귀 {len(regressions)}건: {', '.join(regressions)}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
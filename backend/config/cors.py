@@ -10,6 +10,7 @@ def get_cors_config():
         r"/api/*": {
             "origins": CORS_ORIGINS,
             "methods": ["GET", "POST", "DELETE"],
-            "allow_headers": ["Content-Type", "Authorization"]
+            "allow_headers": ["Content-Type", "Authorization", "X-Request-ID"],
+            "expose_headers": ["X-Trace-Id", "Server-Timing"]
         }
     } 
\ No newline at end of file
@@ -24,23 +24,151 @@ CORS_ORIGINS = os.getenv("CORS_ORIGINS", "http://localhost:3000").split(",")
 
 # 로깅 설정
 LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
-LOG_FILE_MAX_BYTES = int(os.getenv("LOG_FILE_MAX_BYTES", "1048576"))  # 1MB
+LOG_FILE_MAX_BYTES = int(os.getenv("LOG_FILE_MAX_BYTES", "10485760"))  # 10MB
 LOG_BACKUP_COUNT = int(os.getenv("LOG_BACKUP_COUNT", "10"))
+# 로그 출력 형식: text(기본) | json(한 줄 JSON, 로그 수집기 적재용)
+LOG_FORMAT = os.getenv("LOG_FORMAT", "text").strip().lower()
+# 요청 스레드와 파일 쓰기 스레드 사이의 큐 크기 (가득 차면 요청을 막지 않고 버림, 0이면 무제한)
+LOG_QUEUE_SIZE = int(os.getenv("LOG_QUEUE_SIZE", "10000"))
+# 상세 로그 샘플링: LOG_SAMPLING_LEVEL 이하 레벨은 호출 위치별로 WINDOW초 동안 BURST건까지만 기록
+LOG_SAMPLING_ENABLED = os.getenv("LOG_SAMPLING_ENABLED", "true").strip().lower() in ("1", "true", "yes", "on")
+LOG_SAMPLING_LEVEL = os.getenv("LOG_SAMPLING_LEVEL", "DEBUG").strip().upper()
+LOG_SAMPLING_BURST = int(os.getenv("LOG_SAMPLING_BURST", "20"))
+LOG_SAMPLING_WINDOW_SECONDS = float(os.getenv("LOG_SAMPLING_WINDOW_SECONDS", "10"))
 
 # 파일 업로드 설정
 ALLOWED_EXTENSIONS = {'.pdf', '.docx'}
 # 단일 파일 최대 크기: 50MB로 통일
 MAX_FILE_SIZE = int(os.getenv("MAX_FILE_SIZE", str(50 * 1024 * 1024)))  # 50MB
+# 추출한 텍스트 정규화 (머리글/바닥글, 중복 줄, 연속 공백 제거). 이 길이 이상인 줄은 떨어져 있어도 중복으로 제거
+TEXT_NORMALIZATION_ENABLED = os.getenv("TEXT_NORMALIZATION_ENABLED", "true").strip().lower() in ("1", "true", "yes", "on")
+TEXT_DEDUP_MIN_CHARS = int(os.getenv("TEXT_DEDUP_MIN_CHARS", "15"))
+# 추출 텍스트 캐시 (사용자별로 파일 내용 해시 + 추출기 버전을 키로 저장해, 같은 파일을 다시 올리면 파싱을 생략)
+EXTRACTION_CACHE_ENABLED = os.getenv("EXTRACTION_CACHE_ENABLED", "true").strip().lower() in ("1", "true", "yes", "on")
+EXTRACTION_CACHE_MAX_ENTRIES = int(os.getenv("EXTRACTION_CACHE_MAX_ENTRIES", "5000"))
+EXTRACTION_CACHE_TTL_SECONDS = int(os.getenv("EXTRACTION_CACHE_TTL_SECONDS", str(30 * 24 * 3600)))  # 30일
 
 # AI 모델 설정
 GEMINI_MODEL_NAME = os.getenv("GEMINI_MODEL_NAME", "gemini-2.0-flash-001")
 
+# 컨텍스트 캐시 설정 (Vertex AI cached content)
+# 정적 프롬프트 접두부(가이드라인, 이력서, 채용공고)를 Vertex에 캐시하여 재전송 비용을 줄입니다.
+CONTEXT_CACHE_ENABLED = os.getenv("CONTEXT_CACHE_ENABLED", "true").strip().lower() in ("1", "true", "yes", "on")
+CONTEXT_CACHE_SESSION_TTL_SECONDS = int(os.getenv("CONTEXT_CACHE_SESSION_TTL_SECONDS", "1800"))  # 30분
+# Vertex가 허용하는 캐시 최소 토큰 수 (모델별로 다르므로 환경 변수로 조정)
+CONTEXT_CACHE_MIN_TOKENS = int(os.getenv("CONTEXT_CACHE_MIN_TOKENS", "4096"))
+CONTEXT_CACHE_MAX_SESSIONS = int(os.getenv("CONTEXT_CACHE_MAX_SESSIONS", "200"))
+
+# 응답 캐시 설정 (동일 입력에 대한 생성/수정 결과 재사용)
+RESPONSE_CACHE_ENABLED = os.getenv("RESPONSE_CACHE_ENABLED", "true").strip().lower() in ("1", "true", "yes", "on")
+RESPONSE_CACHE_TTL_SECONDS = int(os.getenv("RESPONSE_CACHE_TTL_SECONDS", "3600"))  # 1시간
+RESPONSE_CACHE_MAX_ENTRIES = int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", "512"))
+# 생성 결과도 캐시할지 여부. 프론트엔드에 '다시 생성'(regenerate) 요청이 없어 같은 문항을 다시 요청하면
+# 새 답변을 원하는 경우이므로 기본값은 false (수정 결과만 캐시)
+RESPONSE_CACHE_GENERATE = os.getenv("RESPONSE_CACHE_GENERATE", "false").strip().lower() in ("1", "true", "yes", "on")
+
+# 프롬프트 토큰 예산 설정
+# 이력서+채용공고는 세션 예산에 맞춰 (이력서를 최소량까지 먼저, 그다음 채용공고) 줄여 컨텍스트 캐시 접두부를 요청마다 같게 유지하고,
+# 전체 추정 입력 토큰이 작업별 예산을 넘으면 요청 구간(히스토리 → 부록 순)을 줄입니다.
+PROMPT_BUDGET_ENABLED = os.getenv("PROMPT_BUDGET_ENABLED", "true").strip().lower() in ("1", "true", "yes", "on")
+PROMPT_BUDGET_GENERATE_TOKENS = int(os.getenv("PROMPT_BUDGET_GENERATE_TOKENS", "24000"))
+PROMPT_BUDGET_REVISE_TOKENS = int(os.getenv("PROMPT_BUDGET_REVISE_TOKENS", "24000"))
+# 이력서+채용공고에 쓸 수 있는 토큰 수 (작업별 예산에서 가이드와 요청 구간 몫을 뺀 값보다 작게 설정)
+PROMPT_BUDGET_SESSION_TOKENS = int(os.getenv("PROMPT_BUDGET_SESSION_TOKENS", "16000"))
+# 줄이더라도 남겨 둘 최소 토큰 수
+PROMPT_BUDGET_RESUME_MIN_TOKENS = int(os.getenv("PROMPT_BUDGET_RESUME_MIN_TOKENS", "2000"))
+PROMPT_BUDGET_JD_MIN_TOKENS = int(os.getenv("PROMPT_BUDGET_JD_MIN_TOKENS", "600"))
+# 이 비율의 프롬프트는 원격 count_tokens로 추정치를 검증하고 보정 배율을 갱신합니다. (0이면 비활성화)
+TOKEN_VERIFY_SAMPLE_RATE = float(os.getenv("TOKEN_VERIFY_SAMPLE_RATE", "0"))
+
+# 문항별 이력서 검색 설정 (세션 생성 시 이력서를 청크로 나눠 임베딩하고, 문항마다 관련 청크 top_k개만 프롬프트에 사용)
+RESUME_RETRIEVAL_ENABLED = os.getenv("RESUME_RETRIEVAL_ENABLED", "true").strip().lower() in ("1", "true", "yes", "on")
+RESUME_CHUNK_CHARS = int(os.getenv("RESUME_CHUNK_CHARS", "800"))
+RESUME_RETRIEVAL_TOP_K = int(os.getenv("RESUME_RETRIEVAL_TOP_K", "6"))
+# 이보다 짧은(추정 토큰 수) 이력서는 청크로 나누지 않고 전체를 보냅니다.
+RESUME_RETRIEVAL_MIN_TOKENS = int(os.getenv("RESUME_RETRIEVAL_MIN_TOKENS", "3000"))
+# 검색 쿼리에 문항과 함께 넣을 채용공고 앞부분 글자 수
+RESUME_RETRIEVAL_QUERY_JD_CHARS = int(os.getenv("RESUME_RETRIEVAL_QUERY_JD_CHARS", "1000"))
+# 청크 임베딩 요청 한 번에 넣을 최대 추정 토큰 수 (Vertex 임베딩 요청당 토큰 한도보다 작게)
+RESUME_EMBED_BATCH_TOKENS = int(os.getenv("RESUME_EMBED_BATCH_TOKENS", "12000"))
+
+# 이력서 구조화 프로필 설정 (세션 생성 시 경험/역할/기술/정량 성과를 한 번 추출해 저장하고, 생성/수정 프롬프트에는 프로필을 우선 사용)
+RESUME_PROFILE_ENABLED = os.getenv("RESUME_PROFILE_ENABLED", "true").strip().lower() in ("1", "true", "yes", "on")
+# 이보다 짧은(추정 토큰 수) 이력서는 프로필을 만들지 않고 원문을 그대로 보냅니다.
+RESUME_PROFILE_MIN_TOKENS = int(os.getenv("RESUME_PROFILE_MIN_TOKENS", "1000"))
+# 추출 응답의 최대 출력 토큰 수
+RESUME_PROFILE_MAX_OUTPUT_TOKENS = int(os.getenv("RESUME_PROFILE_MAX_OUTPUT_TOKENS", "4096"))
+# 추출 입력으로 보낼 이력서 최대 토큰 수 (넘으면 잘린 부분의 내용을 잃지 않도록 프로필을 만들지 않고 검색 발췌를 사용)
+RESUME_PROFILE_MAX_INPUT_TOKENS = int(os.getenv("RESUME_PROFILE_MAX_INPUT_TOKENS", "60000"))
+
+# 수정 프롬프트의 이전 버전 히스토리 압축 설정 (최근 N개 버전만 원문으로, 그보다 오래된 버전은 변경 요약으로 보냄)
+REVISION_HISTORY_VERBATIM_VERSIONS = int(os.getenv("REVISION_HISTORY_VERBATIM_VERSIONS", "2"))
+# 요약 한 줄(버전 하나)의 최대 글자 수
+REVISION_HISTORY_DIGEST_LINE_CHARS = int(os.getenv("REVISION_HISTORY_DIGEST_LINE_CHARS", "240"))
+# 히스토리 구간 전체의 상한(추정 토큰 수). 원문 버전이 길어도 이 값을 넘지 않습니다.
+REVISION_HISTORY_MAX_TOKENS = int(os.getenv("REVISION_HISTORY_MAX_TOKENS", "2500"))
+
+# 임베딩 설정
+EMBEDDING_MODEL_NAME = os.getenv("EMBEDDING_MODEL_NAME", "text-multilingual-embedding-002")
+# 임베딩 제공자: vertex(기본), local(transformers CPU 모델), hashing(테스트용 결정적 임베딩)
+EMBEDDING_PROVIDER = os.getenv("EMBEDDING_PROVIDER", "vertex").strip().lower()
+EMBEDDING_BATCH_SIZE = int(os.getenv("EMBEDDING_BATCH_SIZE", "32"))
+LOCAL_EMBEDDING_MODEL = os.getenv("LOCAL_EMBEDDING_MODEL", "intfloat/multilingual-e5-small")
+LOCAL_EMBEDDING_WORKERS = int(os.getenv("LOCAL_EMBEDDING_WORKERS", "2"))
+LOCAL_EMBEDDING_MAX_LENGTH = int(os.getenv("LOCAL_EMBEDDING_MAX_LENGTH", "256"))
+HASHING_EMBEDDING_DIMENSION = int(os.getenv("HASHING_EMBEDDING_DIMENSION", "256"))
+# 요청 간 마이크로 배치: 동시에 들어온 임베딩 요청을 최대 대기 시간 동안 모아 EMBEDDING_BATCH_SIZE개까지 한 번에 호출
+EMBEDDING_MICROBATCH_ENABLED = os.getenv("EMBEDDING_MICROBATCH_ENABLED", "true").strip().lower() in ("1", "true", "yes", "on")
+EMBEDDING_MICROBATCH_MAX_WAIT_MS = float(os.getenv("EMBEDDING_MICROBATCH_MAX_WAIT_MS", "5"))
+EMBEDDING_MICROBATCH_MAX_CONCURRENT = int(os.getenv("EMBEDDING_MICROBATCH_MAX_CONCURRENT", "4"))
+# 질문 임베딩 캐시 (인메모리 LRU + 재시작 후에도 유지되는 SQLite 저장소)
+EMBEDDING_CACHE_ENABLED = os.getenv("EMBEDDING_CACHE_ENABLED", "true").strip().lower() in ("1", "true", "yes", "on")
+EMBEDDING_CACHE_MEMORY_ENTRIES = int(os.getenv("EMBEDDING_CACHE_MEMORY_ENTRIES", "2048"))
+EMBEDDING_CACHE_MAX_ENTRIES = int(os.getenv("EMBEDDING_CACHE_MAX_ENTRIES", "100000"))
+
+# 로컬 어휘 분류기 설정 (임베딩 API 호출 전 단계)
+# 유사도와 1·2위 차이가 모두 임계값 이상일 때만 로컬에서 확정하고, 아니면 임베딩 분류로 넘깁니다.
+LEXICAL_CLASSIFIER_ENABLED = os.getenv("LEXICAL_CLASSIFIER_ENABLED", "true").strip().lower() in ("1", "true", "yes", "on")
+LEXICAL_CLASSIFIER_MIN_SCORE = float(os.getenv("LEXICAL_CLASSIFIER_MIN_SCORE", "0.4"))
+LEXICAL_CLASSIFIER_MIN_MARGIN = float(os.getenv("LEXICAL_CLASSIFIER_MIN_MARGIN", "0.2"))
+# 별칭 뒤에 허용하는 꼬리 글자 수 ("지원동기" + "를작성하시오", 꼬리는 조사/지시어만 허용)
+LEXICAL_CLASSIFIER_MAX_ALIAS_TAIL = int(os.getenv("LEXICAL_CLASSIFIER_MAX_ALIAS_TAIL", "12"))
+
+# 메트릭 설정 (/metrics 엔드포인트, Prometheus 텍스트 형식)
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "true").strip().lower() in ("1", "true", "yes", "on")
+# 설정하면 Authorization: Bearer <토큰> 헤더가 있는 스크레이프만 허용합니다.
+METRICS_TOKEN = os.getenv("METRICS_TOKEN", "")
+
+# 요청 추적 설정 (trace id, 구간별 소요 시간, Server-Timing 응답 헤더)
+TRACING_ENABLED = os.getenv("TRACING_ENABLED", "true").strip().lower() in ("1", "true", "yes", "on")
+SERVER_TIMING_ENABLED = os.getenv("SERVER_TIMING_ENABLED", "true").strip().lower() in ("1", "true", "yes", "on")
+# 종료된 trace 내보내기 (쉼표로 구분: none | log | jsonl)
+TRACE_EXPORTERS = [name.strip().lower() for name in os.getenv("TRACE_EXPORTERS", "log").split(",") if name.strip()]
+# log 내보내기는 이 시간 이상 걸린 요청만 기록합니다.
+TRACE_LOG_MIN_DURATION_MS = float(os.getenv("TRACE_LOG_MIN_DURATION_MS", "1000"))
+
+# 관리자 API 토큰 (X-Admin-Token 헤더, 설정하지 않으면 관리자 API 비활성화)
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN", "")
+
+# 요청 프로파일러 설정
+# 관리자 토큰과 함께 X-Profile 헤더를 보낸 요청, 또는 PROFILE_SAMPLE_RATE 비율의 요청을 샘플링 프로파일링합니다.
+PROFILE_SAMPLE_RATE = float(os.getenv("PROFILE_SAMPLE_RATE", "0"))
+PROFILE_INTERVAL_MS = float(os.getenv("PROFILE_INTERVAL_MS", "5"))
+PROFILE_MAX_ENTRIES = int(os.getenv("PROFILE_MAX_ENTRIES", "50"))
+PROFILE_MAX_CONCURRENT = int(os.getenv("PROFILE_MAX_CONCURRENT", "2"))
+
 # OCR 설정 (파일 업로드용)
 OCR_TEXT_MIN_LENGTH = int(os.getenv("OCR_TEXT_MIN_LENGTH", "200"))
 
 # 디렉토리 설정
 LOGS_DIR = "logs"
 UPLOADS_DIR = "uploads"
+CACHE_DIR = os.getenv("CACHE_DIR", "cache")
+
+EMBEDDING_CACHE_PATH = os.getenv("EMBEDDING_CACHE_PATH", os.path.join(CACHE_DIR, "embeddings.sqlite3"))
+EXTRACTION_CACHE_PATH = os.getenv("EXTRACTION_CACHE_PATH", os.path.join(CACHE_DIR, "extractions.sqlite3"))
+TRACE_EXPORT_PATH = os.getenv("TRACE_EXPORT_PATH", os.path.join(LOGS_DIR, "traces.jsonl"))
+PROFILE_DIR = os.getenv("PROFILE_DIR", os.path.join(CACHE_DIR, "profiles"))
 
 def validate_settings():
     """설정값 유효성 검증"""
@@ -68,12 +196,157 @@ def get_vertex_ai_config():
         'model_name': GEMINI_MODEL_NAME
     }
 
+def get_context_cache_config():
+    """컨텍스트 캐시 설정 반환"""
+    return {
+        'enabled': CONTEXT_CACHE_ENABLED,
+        'session_ttl_seconds': CONTEXT_CACHE_SESSION_TTL_SECONDS,
+        'min_tokens': CONTEXT_CACHE_MIN_TOKENS,
+        'max_sessions': CONTEXT_CACHE_MAX_SESSIONS
+    }
+
+def get_response_cache_config():
+    """응답 캐시 설정 반환"""
+    return {
+        'enabled': RESPONSE_CACHE_ENABLED,
+        'ttl_seconds': RESPONSE_CACHE_TTL_SECONDS,
+        'max_entries': RESPONSE_CACHE_MAX_ENTRIES,
+        'cache_generate': RESPONSE_CACHE_GENERATE
+    }
+
+def get_prompt_budget_config():
+    """프롬프트 토큰 예산 설정 반환"""
+    return {
+        'enabled': PROMPT_BUDGET_ENABLED,
+        'budgets': {
+            'generate': PROMPT_BUDGET_GENERATE_TOKENS,
+            'revise': PROMPT_BUDGET_REVISE_TOKENS
+        },
+        'session_tokens': PROMPT_BUDGET_SESSION_TOKENS,
+        'min_tokens': {
+            'resume': PROMPT_BUDGET_RESUME_MIN_TOKENS,
+            'jd': PROMPT_BUDGET_JD_MIN_TOKENS
+        },
+        'verify_sample_rate': TOKEN_VERIFY_SAMPLE_RATE
+    }
+
+def get_resume_retrieval_config():
+    """문항별 이력서 검색 설정 반환"""
+    return {
+        'enabled': RESUME_RETRIEVAL_ENABLED,
+        'chunk_chars': RESUME_CHUNK_CHARS,
+        'top_k': RESUME_RETRIEVAL_TOP_K,
+        'min_tokens': RESUME_RETRIEVAL_MIN_TOKENS,
+        'query_jd_chars': RESUME_RETRIEVAL_QUERY_JD_CHARS,
+        'embed_batch_tokens': RESUME_EMBED_BATCH_TOKENS
+    }
+
+def get_resume_profile_config():
+    """이력서 구조화 프로필 설정 반환"""
+    return {
+        'enabled': RESUME_PROFILE_ENABLED,
+        'min_tokens': RESUME_PROFILE_MIN_TOKENS,
+        'max_output_tokens': RESUME_PROFILE_MAX_OUTPUT_TOKENS,
+        'max_input_tokens': RESUME_PROFILE_MAX_INPUT_TOKENS
+    }
+
+def get_revision_history_config():
+    """수정 히스토리 압축 설정 반환"""
+    return {
+        'verbatim_versions': REVISION_HISTORY_VERBATIM_VERSIONS,
+        'digest_line_chars': REVISION_HISTORY_DIGEST_LINE_CHARS,
+        'max_tokens': REVISION_HISTORY_MAX_TOKENS
+    }
+
+def get_embedding_cache_config():
+    """임베딩 캐시 설정 반환"""
+    return {
+        'enabled': EMBEDDING_CACHE_ENABLED,
+        'path': EMBEDDING_CACHE_PATH,
+        'memory_entries': EMBEDDING_CACHE_MEMORY_ENTRIES,
+        'max_entries': EMBEDDING_CACHE_MAX_ENTRIES
+    }
+
+def get_embedding_provider_config():
+    """임베딩 제공자 설정 반환"""
+    return {
+        'provider': EMBEDDING_PROVIDER,
+        'batch_size': EMBEDDING_BATCH_SIZE,
+        'vertex_model': EMBEDDING_MODEL_NAME,
+        'local_model': LOCAL_EMBEDDING_MODEL,
+        'local_workers': LOCAL_EMBEDDING_WORKERS,
+        'local_max_length': LOCAL_EMBEDDING_MAX_LENGTH,
+        'hashing_dimension': HASHING_EMBEDDING_DIMENSION,
+        'microbatch_enabled': EMBEDDING_MICROBATCH_ENABLED,
+        'microbatch_max_wait_ms': EMBEDDING_MICROBATCH_MAX_WAIT_MS,
+        'microbatch_max_concurrent': EMBEDDING_MICROBATCH_MAX_CONCURRENT
+    }
+
+def get_lexical_classifier_config():
+    """로컬 어휘 분류기 설정 반환"""
+    return {
+        'enabled': LEXICAL_CLASSIFIER_ENABLED,
+        'min_score': LEXICAL_CLASSIFIER_MIN_SCORE,
+        'min_margin': LEXICAL_CLASSIFIER_MIN_MARGIN,
+        'max_alias_tail': LEXICAL_CLASSIFIER_MAX_ALIAS_TAIL
+    }
+
+def get_logging_config():
+    """로깅 출력 형식/큐/샘플링 설정 반환"""
+    return {
+        'format': LOG_FORMAT,
+        'queue_size': LOG_QUEUE_SIZE,
+        'sampling_enabled': LOG_SAMPLING_ENABLED,
+        'sampling_level': LOG_SAMPLING_LEVEL,
+        'sampling_burst': LOG_SAMPLING_BURST,
+        'sampling_window_seconds': LOG_SAMPLING_WINDOW_SECONDS
+    }
+
+def get_metrics_config():
+    """메트릭 엔드포인트 설정 반환"""
+    return {
+        'enabled': METRICS_ENABLED,
+        'token': METRICS_TOKEN
+    }
+
+def get_tracing_config():
+    """요청 추적 설정 반환"""
+    return {
+        'enabled': TRACING_ENABLED,
+        'server_timing': SERVER_TIMING_ENABLED,
+        'exporters': TRACE_EXPORTERS,
+        'log_min_duration_ms': TRACE_LOG_MIN_DURATION_MS,
+        'export_path': TRACE_EXPORT_PATH
+    }
+
+def get_profiling_config():
+    """요청 프로파일러 설정 반환"""
+    return {
+        'admin_token': ADMIN_TOKEN,
+        'sample_rate': PROFILE_SAMPLE_RATE,
+        'interval_ms': PROFILE_INTERVAL_MS,
+        'max_entries': PROFILE_MAX_ENTRIES,
+        'max_concurrent': PROFILE_MAX_CONCURRENT,
+        'directory': PROFILE_DIR
+    }
+
 def get_file_config():
     """파일 처리 설정 반환"""
     return {
         'allowed_extensions': ALLOWED_EXTENSIONS,
         'max_file_size': MAX_FILE_SIZE,
-        'uploads_dir': UPLOADS_DIR
+        'uploads_dir': UPLOADS_DIR,
+        'normalize_text': TEXT_NORMALIZATION_ENABLED,
+        'dedup_min_chars': TEXT_DEDUP_MIN_CHARS
+    }
+
+def get_extraction_cache_config():
+    """추출 텍스트 캐시 설정 반환"""
+    return {
+        'enabled': EXTRACTION_CACHE_ENABLED,
+        'path': EXTRACTION_CACHE_PATH,
+        'max_entries': EXTRACTION_CACHE_MAX_ENTRIES,
+        'ttl_seconds': EXTRACTION_CACHE_TTL_SECONDS
     }
 
 def get_ocr_config():
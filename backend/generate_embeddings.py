@@ -1,140 +1,354 @@
+"""
+기준 임베딩 빌드 명령
+
+카테고리별 기준 질문(services/canonical_questions.json)을 임베딩하여 다음 파일을 만듭니다.
+  - canonical_embeddings.json      : 카테고리별 중심 벡터 + 내용 해시 (JSON 대체 로드 및 증분 빌드 캐시)
+  - canonical_embeddings.npy       : 행 단위로 정규화된 float16/float32 행렬 (메모리 맵 로드용)
+  - canonical_embeddings.meta.json : 행별 카테고리 키, 차원, dtype, 모델, 버전 정보
+
+카테고리마다 (모델, 질문 목록)의 내용 해시를 기록해 두고, 해시가 바뀐 카테고리만 다시 임베딩합니다.
+다시 임베딩할 문장은 모두 모아 batch_size 단위로 나누어 병렬로 요청합니다.
+결과는 임시 파일에 쓴 뒤 AIService와 같은 로더로 검증하고, 통과하면 원자적으로 교체합니다.
+
+사용법:
+    python generate_embeddings.py                      # 변경된 카테고리만 다시 임베딩 (services/ 에 저장)
+    python generate_embeddings.py --force              # 전체 다시 임베딩
+    python generate_embeddings.py --provider local     # 로컬 모델로 빌드 (서비스의 EMBEDDING_PROVIDER와 일치해야 함)
+    python generate_embeddings.py --check              # 기존 아티팩트 검증만 수행
+    python generate_embeddings.py --from-json services/canonical_embeddings.json  # API 호출 없이 변환만
+"""
+
+import argparse
+import datetime
+import hashlib
 import json
 import os
-import vertexai
-from vertexai.language_models import TextEmbeddingModel, TextEmbeddingInput
+import sys
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+
 import numpy as np # 벡터 평균 계산을 위해 NumPy 라이브러리를 임포트합니다.
 
-# --------------------------------------------------------------------------
-# Vertex AI 초기화
-# --------------------------------------------------------------------------
-# gcloud auth application-default login 명령어로 인증이 필요할 수 있습니다.
-try:
-    vertexai.init(project="gen-lang-client-0050370482") # 실제 프로젝트 ID를 입력하세요.
-except Exception as e:
-    print(f"Vertex AI 초기화 중 오류 발생: {e}")
-    print("gcloud CLI 인증을 확인하세요. (gcloud auth application-default login)")
-    exit()
+ARTIFACT_FORMAT_VERSION = 1  # services/question_classifier.py 의 ARTIFACT_FORMAT_VERSION 과 일치해야 합니다.
+DEFAULT_MODEL_NAME = "text-multilingual-embedding-002"
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+SERVICES_DIR = os.path.join(BASE_DIR, "services")
+CANONICAL_QUESTIONS_PATH = os.path.join(SERVICES_DIR, "canonical_questions.json")
+ARTIFACT_NAME = "canonical_embeddings"
+TASK_TYPE = "RETRIEVAL_DOCUMENT"
+
 
 # --------------------------------------------------------------------------
 # Step 1: 카테고리별 기준 질문 정의 (다중 문장 방식)
 # --------------------------------------------------------------------------
 # 각 카테고리의 의미적 '영역'을 정의하기 위해 여러 개의 대표 질문을 리스트로 정의합니다.
 # 이렇게 하면 분류기의 안정성과 정확도가 크게 향상됩니다.
-print("Step 1: 명확하게 구분된 기준 질문 정의 (다중 문장 방식)")
-canonical_questions = [
-    {
-        "key": "strength_weakness", 
-        "questions": [
-            "당신의 성격의 장점과 단점은 무엇이라고 생각하나요?",
-            "자신의 강점과 약점에 대해 설명해주세요.",
-            "지원자님의 강점 한 가지와 보완점에 대해 말씀해주세요.",
-            "본인의 가장 큰 장점은 무엇이며, 직무 수행에 어떻게 기여할 수 있나요?"
-        ]
-    },
-    {
-        "key": "aspiration", 
-        "questions": [
-            "우리 회사에 입사한 후의 포부나 이루고 싶은 목표에 대해 말씀해주세요.",
-            "입사 후 5년, 10년 뒤의 커리어 계획은 무엇인가요?",
-            "회사 생활을 통해 어떻게 성장하고 기여하고 싶으신가요?",
-            "우리 회사에서 최종적으로 이루고 싶은 꿈은 무엇입니까?"
-        ]
-    },
-    {
-        "key": "job_experience", 
-        "questions": [
-            "지원하신 직무와 관련하여 가장 의미 있었던 경험은 무엇인가요?",
-            "프로젝트를 수행하면서 본인의 역량을 발휘했던 사례를 소개해주세요.",
-            "직무 수행 경험 중 가장 성공적이었던 것은 무엇입니까?",
-            "가장 기억에 남는 직무 관련 경험에 대해 구체적으로 설명해주세요."
-        ]
-    },
-    {
-        "key": "failure_experience", 
-        "questions": [
-            "지금까지 겪었던 가장 큰 어려움이나 실패는 무엇이며, 어떻게 극복했나요?",
-            "도전적인 목표를 세우고 실행했지만 실패했던 경험이 있나요?",
-            "팀원과의 갈등이나 문제를 해결했던 경험에 대해 말씀해주세요.",
-            "예상치 못한 문제에 부딪혔을 때 어떻게 해결했는지 구체적인 사례를 들어주세요."
-        ]
-    },
-    {
-        "key": "motivation", 
-        "questions": [
-            "우리 회사와 지원하신 직무에 관심을 가지게 된 계기는 무엇인가요?",
-            "왜 다른 회사가 아닌 우리 회사에 지원하셨나요?",
-            "지원 동기를 구체적인 경험과 연결하여 설명해주세요.",
-            "수많은 기업 중에서 특별히 우리 회사에 지원한 이유가 궁금합니다."
-        ]
-    },
-    {
-        "key": "growth_process", 
-        "questions": [
-            "자신의 성장 과정에 대해 설명하고, 가치관에 가장 큰 영향을 미친 경험이 있다면 알려주세요.",
-            "본인의 인생관이나 좌우명은 무엇이며, 그렇게 생각하게 된 계기가 있나요?",
-            "살아오면서 가장 중요하게 생각하는 가치는 무엇입니까?",
-            "자신이 어떤 사람인지 성장 과정을 바탕으로 설명해주세요."
-        ]
-    }
-]
+# 질문 목록은 임베딩 전 단계의 로컬 어휘 분류기(services/lexical_classifier.py)도 함께 사용하므로 JSON 파일로 관리합니다.
+def load_canonical_questions(path=CANONICAL_QUESTIONS_PATH):
+    """services/canonical_questions.json 에서 카테고리별 기준 질문을 읽습니다. (로컬 어휘 분류기와 공유)"""
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def category_hash(model_name, questions):
+    """(모델, 태스크 유형, 질문 목록)의 내용 해시 - 하나라도 바뀌면 해당 카테고리를 다시 임베딩합니다."""
+    payload = json.dumps([model_name, TASK_TYPE, questions], ensure_ascii=False)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:16]
+
+
+def load_previous_records(output_dir):
+    """이전 빌드 결과(canonical_embeddings.json)를 카테고리 키 기준으로 읽습니다."""
+    path = os.path.join(output_dir, f"{ARTIFACT_NAME}.json")
+    if not os.path.exists(path):
+        return {}
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return {record['key']: record for record in json.load(f)}
+    except (OSError, ValueError, KeyError) as e:
+        print(f"이전 빌드 결과를 읽을 수 없어 전체를 다시 임베딩합니다: {e}")
+        return {}
+
 
 # --------------------------------------------------------------------------
-# Step 2: Vertex AI 임베딩 모델 로드
+# Step 2: 변경된 카테고리만 '중심 벡터(Centroid)' 생성
 # --------------------------------------------------------------------------
-print("\nStep 2: Vertex AI 임베딩 모델 로드 (text-multilingual-embedding-002)")
-try:
-    model = TextEmbeddingModel.from_pretrained("text-multilingual-embedding-002")
-except Exception as e:
-    print(f"임베딩 모델 로딩 실패: {e}")
-    exit()
+def embed_texts(provider, texts, batch_size, workers):
+    """문장들을 batch_size 단위로 나누어 병렬로 임베딩합니다. (입력 순서 유지)"""
+    batches = [texts[i:i + batch_size] for i in range(0, len(texts), batch_size)]
+    if not batches:
+        return []
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, len(batches)))) as executor:
+        results = list(executor.map(lambda batch: provider.embed(batch, task_type=TASK_TYPE), batches))
+    return [vector for result in results for vector in result]
+
+
+def build_records(canonical_questions, previous, provider, model_name, batch_size, workers, exemplars, force=False):
+    """
+    카테고리별 레코드를 만듭니다. 해시가 같은 카테고리는 이전 벡터를 재사용합니다.
+
+    Returns:
+        Tuple[List[Dict], List[str]]: (canonical_questions 순서의 레코드, 다시 임베딩한 카테고리 키)
+    """
+    hashes = {item['key']: category_hash(model_name, item['questions']) for item in canonical_questions}
+    changed = [
+        item for item in canonical_questions
+        if force
+        or previous.get(item['key'], {}).get('content_hash') != hashes[item['key']]
+        or (exemplars and not previous[item['key']].get('question_vectors'))
+    ]
+
+    embedded = {}
+    if changed:
+        if provider is None:
+            raise RuntimeError("다시 임베딩할 카테고리가 있지만 임베딩 제공자가 없습니다.")
+        # 바뀐 카테고리의 문장을 모두 모아 최소한의 요청으로 임베딩합니다.
+        texts = [q for item in changed for q in item['questions']]
+        print(f"{len(changed)}개 카테고리, {len(texts)}개 문장 임베딩 중 (배치 {batch_size}, 병렬 {workers})...")
+        vectors = embed_texts(provider, texts, batch_size, workers)
+        offset = 0
+        for item in changed:
+            embedded[item['key']] = vectors[offset:offset + len(item['questions'])]
+            offset += len(item['questions'])
+
+    records = []
+    for item in canonical_questions:
+        key, questions = item['key'], item['questions']
+        if key in embedded:
+            # [핵심 로직]
+            # NumPy를 사용하여 해당 카테고리의 모든 벡터들의 평균 벡터(중심점)를 계산합니다.
+            # 이 중심 벡터가 해당 카테고리를 대표하는 가장 안정적인 값이 됩니다.
+            question_vectors = embedded[key]
+            record = {
+                "key": key,
+                # 대표 질문은 JSON 파일에서 사람이 읽기 쉽도록 리스트의 첫 번째 질문으로 저장합니다.
+                "question": questions[0],
+                "content_hash": hashes[key],
+                "vector": np.array(question_vectors).mean(axis=0).tolist()
+            }
+            if exemplars:
+                record["question_vectors"] = question_vectors
+            print(f" -> 임베딩: '{key}' 유형의 중심 벡터 생성 완료. ({len(questions)}개 문장 사용)")
+        else:
+            record = dict(previous[key])
+            if not exemplars:
+                record.pop("question_vectors", None)
+            print(f" -> 재사용: '{key}' (변경 없음)")
+        records.append(record)
+    return records, [item['key'] for item in changed]
+
 
 # --------------------------------------------------------------------------
-# Step 3: 각 카테고리의 '중심 벡터(Centroid)' 생성
+# Step 3: 바이너리 아티팩트 구성
 # --------------------------------------------------------------------------
-print("\nStep 3: 각 카테고리에 대한 임베딩 벡터 생성 및 평균(중심점) 계산")
-embeddings_data = []
-for item in canonical_questions:
-    key = item['key']
-    questions = item['questions']
-    
-    try:
-        # 각 카테고리에 속한 모든 질문들의 벡터를 저장할 리스트
-        vectors = []
-        
-        # '검색 대상 문서' 모드로 각 질문의 임베딩을 생성합니다.
-        # 한 번에 여러 문장을 API에 보내는 것이 더 효율적입니다.
-        inputs = [TextEmbeddingInput(text=q, task_type="RETRIEVAL_DOCUMENT") for q in questions]
-        response = model.get_embeddings(inputs)
-        
-        for emb in response:
-            vectors.append(emb.values)
-        
-        # [핵심 로직]
-        # NumPy를 사용하여 해당 카테고리의 모든 벡터들의 평균 벡터(중심점)를 계산합니다.
-        # 이 중심 벡터가 해당 카테고리를 대표하는 가장 안정적인 값이 됩니다.
-        centroid_vector = np.array(vectors).mean(axis=0).tolist()
-        
-        # 대표 질문은 JSON 파일에서 사람이 읽기 쉽도록 리스트의 첫 번째 질문으로 저장합니다.
-        representative_question = questions[0]
-        embeddings_data.append({
-            "key": key,
-            "question": representative_question, 
-            "vector": centroid_vector
-        })
-        
-        print(f" -> 성공: '{key}' 유형의 중심 벡터 생성 완료. ({len(questions)}개 문장 사용)")
-        
-    except Exception as e:
-        print(f" -> 실패: '{key}' 유형 처리 중 오류 발생: {e}")
-        exit()
+def build_artifact(records, dtype, dimension=None, exemplars=False, model_name=DEFAULT_MODEL_NAME):
+    """
+    정규화된 행렬과 사이드카 메타데이터를 만듭니다.
+
+    Args:
+        dtype: 'float16' 또는 'float32'
+        dimension: 지정하면 앞쪽 차원만 남긴 뒤 다시 정규화합니다 (차원 축소)
+        exemplars: True면 중심 벡터 대신 카테고리별 개별 질문 벡터를 행으로 저장합니다
+    """
+    keys, rows = [], []
+    for record in records:
+        vectors = record['question_vectors'] if exemplars and record.get('question_vectors') else [record['vector']]
+        for vector in vectors:
+            keys.append(record['key'])
+            rows.append(vector)
+
+    matrix = np.asarray(rows, dtype=np.float32)
+    source_dimension = matrix.shape[1]
+    if dimension and dimension < source_dimension:
+        matrix = matrix[:, :dimension]
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    matrix = np.ascontiguousarray(matrix / norms, dtype=dtype)
+
+    category_hashes = {record['key']: record.get('content_hash') for record in records}
+    # 버전 스탬프: 입력(카테고리 해시)과 빌드 옵션이 같으면 같은 값이 나오도록 결정적으로 계산합니다.
+    version_payload = json.dumps([model_name, dtype, int(matrix.shape[1]), bool(exemplars), category_hashes], sort_keys=True)
+    meta = {
+        "format_version": ARTIFACT_FORMAT_VERSION,
+        "artifact_version": hashlib.sha256(version_payload.encode('utf-8')).hexdigest()[:12],
+        "created_at": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        "model": model_name,
+        "dtype": dtype,
+        "dimension": int(matrix.shape[1]),
+        "source_dimension": int(source_dimension),
+        "normalized": True,
+        "exemplars": bool(exemplars),
+        "keys": keys,
+        "category_hashes": category_hashes,
+        "questions": {record['key']: record.get('question', '') for record in records}
+    }
+    return matrix, meta
+
 
 # --------------------------------------------------------------------------
-# Step 4: 결과 파일 저장
+# Step 4: 검증 및 원자적 저장
 # --------------------------------------------------------------------------
-output_filename = "canonical_embeddings.json"
-try:
-    with open(output_filename, 'w', encoding='utf-8') as f:
-        json.dump(embeddings_data, f, ensure_ascii=False, indent=2)
-    print(f"\n성공! '{output_filename}' 파일을 backend/services/ 폴더로 이동해주세요.")
-except Exception as e:
-    print(f"\n파일 저장 실패: {e}")
\ No newline at end of file
+def validate_artifact(base_path, expected_keys, model_name=None):
+    """
+    AIService와 같은 로더(load_canonical_classifier)로 아티팩트를 열어 검증합니다.
+    각 카테고리의 기준 벡터가 자기 카테고리로 분류되는지도 확인합니다.
+
+    Raises:
+        ValueError: 검증 실패
+    """
+    from services.question_classifier import load_canonical_classifier
+
+    classifier, meta = load_canonical_classifier(base_path)
+    if meta.get('source') != 'artifact':
+        raise ValueError("바이너리 아티팩트가 아닌 JSON으로 로드되었습니다.")
+    if model_name and meta.get('model') != model_name:
+        raise ValueError(f"아티팩트 모델({meta.get('model')})이 제공자 모델({model_name})과 다릅니다.")
+    if classifier.categories != list(expected_keys):
+        raise ValueError(f"카테고리 구성이 다릅니다: {classifier.categories}")
+    for key, result in zip(meta['keys'], classifier.classify_batch(np.asarray(classifier.matrix, dtype=np.float32))):
+        if result['best_category'] != key:
+            raise ValueError(f"'{key}' 기준 벡터가 '{result['best_category']}'(으)로 분류됩니다.")
+    return meta
+
+
+def _write_temp(directory, suffix, write):
+    fd, path = tempfile.mkstemp(prefix=f".{ARTIFACT_NAME}.", suffix=suffix, dir=directory)
+    with os.fdopen(fd, 'wb') as f:
+        write(f)
+        f.flush()
+        os.fsync(f.fileno())
+    return path
+
+
+def _dump_json(data):
+    return lambda f: f.write(json.dumps(data, ensure_ascii=False, indent=2).encode('utf-8'))
+
+
+def write_outputs(output_dir, records, matrix, meta, write_json=True, model_name=None):
+    """임시 파일에 기록하고 검증한 뒤 os.replace로 교체합니다. (중간 상태의 파일이 로드되지 않도록)"""
+    os.makedirs(output_dir, exist_ok=True)
+    base_path = os.path.join(output_dir, ARTIFACT_NAME)
+
+    staged = {}
+    try:
+        staged['.npy'] = _write_temp(output_dir, '.npy', lambda f: np.save(f, matrix))
+        staged['.meta.json'] = _write_temp(output_dir, '.meta.json', _dump_json(meta))
+        if write_json:
+            staged['.json'] = _write_temp(output_dir, '.json', _dump_json(records))
+
+        # 임시 파일들을 같은 기준 경로로 모아 로더로 검증합니다.
+        staging_base = staged['.npy'][:-len('.npy')]
+        os.replace(staged['.meta.json'], f"{staging_base}.meta.json")
+        staged['.meta.json'] = f"{staging_base}.meta.json"
+        validate_artifact(staging_base, list(dict.fromkeys(meta['keys'])), model_name)
+
+        # 로더는 .meta.json을 먼저 읽으므로 행렬을 먼저 교체하고 메타데이터를 마지막에 교체합니다.
+        for suffix in ('.json', '.npy', '.meta.json'):
+            if suffix in staged:
+                os.replace(staged.pop(suffix), f"{base_path}{suffix}")
+    finally:
+        for path in staged.values():
+            if os.path.exists(path):
+                os.remove(path)
+
+    print(f"\n성공! '{base_path}.npy' ({matrix.shape[0]}x{matrix.shape[1]}, {meta['dtype']}, "
+          f"{os.path.getsize(base_path + '.npy'):,} bytes, 버전 {meta['artifact_version']}) 저장 및 검증 완료")
+
+
+def create_provider(args):
+    """명령행 옵션을 반영하여 서비스와 같은 방식으로 임베딩 제공자를 생성합니다."""
+    from config.settings import get_embedding_provider_config
+    from services.embedding_provider import get_embedding_provider
+
+    config = get_embedding_provider_config()
+    # 빌드는 한 프로세스에서 직접 배치를 구성하므로 요청 간 마이크로 배치가 필요 없습니다.
+    config['microbatch_enabled'] = False
+    if args.provider:
+        config['provider'] = args.provider
+    if args.model:
+        config['vertex_model'] = config['local_model'] = args.model
+    if config['provider'] == 'vertex':
+        import vertexai
+        if not args.project_id:
+            raise ValueError("Vertex 제공자를 사용하려면 PROJECT_ID 환경 변수 또는 --project-id 옵션이 필요합니다.")
+        # gcloud auth application-default login 명령어로 인증이 필요할 수 있습니다.
+        vertexai.init(project=args.project_id, location=args.location)
+    return get_embedding_provider(config)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="기준 질문 임베딩 및 바이너리 아티팩트 빌드")
+    parser.add_argument("--project-id", default=os.getenv("PROJECT_ID"), help="GCP 프로젝트 (기본: PROJECT_ID 환경 변수)")
+    parser.add_argument("--location", default=os.getenv("LOCATION"), help="Vertex 리전 (기본: LOCATION 환경 변수)")
+    parser.add_argument("--provider", choices=["vertex", "local", "hashing"], default=None,
+                        help="임베딩 제공자 (기본: EMBEDDING_PROVIDER 설정, 서비스와 같은 값을 사용해야 함)")
+    parser.add_argument("--model", default=None, help="임베딩 모델 이름 (기본: 제공자 설정값)")
+    parser.add_argument("--output-dir", default=SERVICES_DIR, help="출력 디렉토리 (기본: backend/services)")
+    parser.add_argument("--dtype", choices=["float16", "float32"], default="float16",
+                        help="행렬 저장 dtype (기본: float16, 분류 정확도에는 영향이 거의 없음)")
+    parser.add_argument("--dim", type=int, default=None, help="앞쪽 N차원만 남겨 저장 (차원 축소)")
+    parser.add_argument("--exemplars", action="store_true",
+                        help="중심 벡터 대신 카테고리별 개별 질문 벡터를 저장 (카테고리 점수 = 최댓값)")
+    parser.add_argument("--batch-size", type=int, default=32, help="임베딩 요청 한 번에 보낼 문장 수")
+    parser.add_argument("--workers", type=int, default=4, help="동시에 보낼 임베딩 요청 수")
+    parser.add_argument("--force", action="store_true", help="내용 해시와 관계없이 전체 다시 임베딩")
+    parser.add_argument("--check", action="store_true", help="기존 아티팩트 검증만 수행")
+    parser.add_argument("--from-json", default=None,
+                        help="API 호출 없이 기존 canonical_embeddings.json 으로부터 아티팩트만 생성")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    canonical_questions = load_canonical_questions()
+    base_path = os.path.join(args.output_dir, ARTIFACT_NAME)
+
+    if args.check:
+        try:
+            meta = validate_artifact(base_path, [item['key'] for item in canonical_questions])
+        except (OSError, ValueError) as e:
+            print(f"검증 실패: {e}")
+            return 1
+        print(f"검증 통과: 버전 {meta['artifact_version']}, 모델 {meta['model']}, {len(meta['keys'])}행 x {meta['dimension']}차원")
+        return 0
+
+    if args.from_json:
+        with open(args.from_json, 'r', encoding='utf-8') as f:
+            records = json.load(f)
+        print(f"'{args.from_json}' 에서 {len(records)}개 카테고리를 읽었습니다.")
+        model_name = args.model or DEFAULT_MODEL_NAME
+        changed, write_json = [], False
+    else:
+        try:
+            provider = create_provider(args)
+            model_name = provider.model_name
+            previous = {} if args.force else load_previous_records(args.output_dir)
+            records, changed = build_records(
+                canonical_questions, previous, provider, model_name,
+                args.batch_size, args.workers, args.exemplars, force=args.force
+            )
+        except Exception as e:
+            print(f"임베딩 생성 실패: {e}")
+            print("gcloud CLI 인증을 확인하세요. (gcloud auth application-default login)")
+            return 1
+        write_json = True
+
+    matrix, meta = build_artifact(records, args.dtype, args.dim, args.exemplars, model_name)
+
+    # 입력과 옵션이 같으면 버전 스탬프도 같으므로 다시 쓰지 않습니다.
+    meta_path = f"{base_path}.meta.json"
+    if not changed and not args.from_json and os.path.exists(meta_path):
+        with open(meta_path, 'r', encoding='utf-8') as f:
+            if json.load(f).get('artifact_version') == meta['artifact_version']:
+                print(f"\n변경 사항 없음: 기존 아티팩트(버전 {meta['artifact_version']})가 최신입니다.")
+                return 0
+
+    try:
+        write_outputs(args.output_dir, records, matrix, meta, write_json=write_json, model_name=model_name)
+    except Exception as e:
+        print(f"\n아티팩트 저장/검증 실패 (기존 파일은 유지됩니다): {e}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1 @@
+"""부하 테스트 하네스 (외부 의존성 지연 주입 대역 + 워커/스레드 조합별 부하 드라이버)"""
@@ -0,0 +1,491 @@
+"""
+외부 의존성 대역(fake) - 부하 테스트용
+
+실제 Vertex AI(생성/임베딩), Vision, Supabase(DB/인증), SMTP 대신 같은 인터페이스를 가진 프로세스 내 대역을 사용합니다.
+각 대역은 프로필(loadtest/profiles/*.json)에 정의된 지연 시간 분포만큼 대기하고,
+설정된 비율로 일반 오류 또는 429(요청 한도 초과) 오류를 발생시킵니다.
+
+Supabase 대역은 SQLite 파일에 데이터를 저장하므로 gunicorn 워커 프로세스들이 같은 세션/질문을 공유합니다.
+
+프로필 형식 (의존성 이름별):
+    {
+      "vertex_generation": {
+        "latency_ms": {"distribution": "lognormal", "median": 6000, "p95": 14000},
+        "error_rate": 0.005,        # 일반 오류 비율
+        "rate_limit_rate": 0.02,    # 429 오류 비율
+        "output_chars": 900         # (생성 전용) 응답 길이
+      },
+      ...
+    }
+지연 분포: fixed(value), uniform(min, max), normal(mean, stdev), lognormal(median, p95)
+"""
+
+import json
+import math
+import os
+import random
+import sqlite3
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+from services.embedding_provider import EmbeddingProvider, HashingEmbeddingProvider, TASK_QUERY
+from services.ocr_service import OCRService
+from utils.logger import LoggerMixin
+
+DEPENDENCIES = ('vertex_generation', 'vertex_embedding', 'vision', 'supabase', 'supabase_auth', 'smtp')
+DEFAULT_PROFILE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "profiles", "default.json")
+
+# 정규 분포의 95 백분위 z 값 (lognormal의 median/p95로 sigma를 구할 때 사용)
+_Z_95 = 1.6449
+
+
+class InjectedDependencyError(Exception):
+    """대역이 주입한 오류 (status_code 429는 요청 한도 초과)"""
+
+    def __init__(self, dependency: str, status_code: int = 500):
+        self.dependency = dependency
+        self.status_code = status_code
+        reason = "Too Many Requests" if status_code == 429 else "Internal Error"
+        super().__init__(f"[loadtest] {dependency}: {status_code} {reason}")
+
+
+def _rate_limit_error(dependency: str) -> Exception:
+    """실제 SDK와 같은 예외 형식으로 429를 만듭니다. (google-api-core가 없으면 InjectedDependencyError)"""
+    if dependency.startswith('vertex') or dependency == 'vision':
+        try:
+            from google.api_core.exceptions import ResourceExhausted
+            return ResourceExhausted(f"[loadtest] {dependency}: 429 Resource exhausted")
+        except ImportError:
+            pass
+    return InjectedDependencyError(dependency, 429)
+
+
+class LatencyModel:
+    """지연 시간 분포 (ms)"""
+
+    def __init__(self, spec: Dict[str, Any]):
+        self.distribution = spec.get('distribution', 'fixed')
+        self.spec = spec
+        if self.distribution == 'lognormal':
+            median = float(spec['median'])
+            p95 = float(spec.get('p95', median))
+            self._mu = math.log(max(median, 1e-3))
+            self._sigma = max(math.log(max(p95, median) / max(median, 1e-3)) / _Z_95, 0.0)
+        elif self.distribution not in ('fixed', 'uniform', 'normal'):
+            raise ValueError(f"알 수 없는 지연 분포입니다: {self.distribution} (fixed, uniform, normal, lognormal 중 하나)")
+
+    def sample(self, rng: random.Random) -> float:
+        spec = self.spec
+        if self.distribution == 'fixed':
+            value = float(spec.get('value', 0))
+        elif self.distribution == 'uniform':
+            value = rng.uniform(float(spec['min']), float(spec['max']))
+        elif self.distribution == 'normal':
+            value = rng.gauss(float(spec['mean']), float(spec.get('stdev', 0)))
+        else:
+            value = rng.lognormvariate(self._mu, self._sigma)
+        return max(value, 0.0)
+
+
+class DependencyBehavior:
+    """의존성 하나의 지연/오류 주입 동작"""
+
+    def __init__(self, name: str, spec: Dict[str, Any], latency_scale: float = 1.0, seed: Optional[int] = None):
+        self.name = name
+        self.spec = spec
+        self.latency = LatencyModel(spec.get('latency_ms', {'distribution': 'fixed', 'value': 0}))
+        self.error_rate = float(spec.get('error_rate', 0))
+        self.rate_limit_rate = float(spec.get('rate_limit_rate', 0))
+        self.latency_scale = latency_scale
+        # 워커 프로세스마다 다른 난수열을 쓰도록 pid를 섞습니다.
+        self._rng = random.Random(None if seed is None else seed * 100003 + os.getpid())
+        self._lock = threading.Lock()
+        self._stats = {'calls': 0, 'errors': 0, 'rate_limited': 0}
+
+    def call(self) -> None:
+        """지연 시간만큼 대기한 뒤, 설정된 비율로 오류를 발생시킵니다."""
+        with self._lock:
+            delay_ms = self.latency.sample(self._rng) * self.latency_scale
+            roll = self._rng.random()
+            self._stats['calls'] += 1
+            if roll < self.rate_limit_rate:
+                self._stats['rate_limited'] += 1
+            elif roll < self.rate_limit_rate + self.error_rate:
+                self._stats['errors'] += 1
+        time.sleep(delay_ms / 1000)
+        if roll < self.rate_limit_rate:
+            raise _rate_limit_error(self.name)
+        if roll < self.rate_limit_rate + self.error_rate:
+            raise InjectedDependencyError(self.name)
+
+    def get_stats(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._stats)
+
+
+def load_profile(path: Optional[str] = None, latency_scale: float = 1.0,
+                 seed: Optional[int] = None) -> Dict[str, DependencyBehavior]:
+    """프로필 JSON을 읽어 의존성별 동작을 만듭니다. (프로필에 없는 의존성은 지연/오류 없음)"""
+    with open(path or DEFAULT_PROFILE_PATH, 'r', encoding='utf-8') as f:
+        specs = json.load(f)
+    unknown = set(specs) - set(DEPENDENCIES)
+    if unknown:
+        raise ValueError(f"알 수 없는 의존성 이름: {', '.join(sorted(unknown))} ({', '.join(DEPENDENCIES)} 중 하나)")
+    return {name: DependencyBehavior(name, specs.get(name, {}), latency_scale, seed) for name in DEPENDENCIES}
+
+
+# ---------------------------------------------------------------------- #
+# Vertex AI (생성 / 임베딩)
+# ---------------------------------------------------------------------- #
+class _UsageMetadata:
+    def __init__(self, prompt_tokens: int, output_tokens: int):
+        self.prompt_token_count = prompt_tokens
+        self.candidates_token_count = output_tokens
+        self.total_token_count = prompt_tokens + output_tokens
+        self.cached_content_token_count = 0
+
+
+class _GenerationResponse:
+    def __init__(self, text: str, prompt_tokens: int, output_tokens: int):
+        self.text = text
+        self.usage_metadata = _UsageMetadata(prompt_tokens, output_tokens)
+
+
+class FakeGenerativeModel:
+    """GenerativeModel.generate_content 대역 (한국어 기준 약 2자당 1토큰으로 사용량 추정)"""
+
+    _SENTENCE = "저는 주어진 문제를 끝까지 분석하고 동료와 협업하여 성과로 연결해 온 경험이 있습니다. "
+
+    def __init__(self, behavior: DependencyBehavior):
+        self.behavior = behavior
+        self.output_chars = int(behavior.spec.get('output_chars', 900))
+
+    def generate_content(self, contents, **kwargs) -> _GenerationResponse:
+        self.behavior.call()
+        prompt = contents if isinstance(contents, str) else json.dumps(contents, ensure_ascii=False, default=str)
+        repeat = self.output_chars // len(self._SENTENCE) + 1
+        text = (self._SENTENCE * repeat)[:self.output_chars]
+        return _GenerationResponse(text, len(prompt) // 2, len(text) // 2)
+
+
+class FakeEmbeddingProvider(EmbeddingProvider):
+    """
+    Vertex 임베딩 대역 (벡터는 HashingEmbeddingProvider로 계산)
+
+    기준 임베딩 아티팩트와 모델 이름/차원을 맞춰 AIService의 임베딩 분류 경로가 그대로 실행되게 합니다.
+    (유사도 값 자체는 의미가 없으므로 분류 결과는 대부분 '분류 실패'가 됩니다)
+    """
+
+    def __init__(self, behavior: DependencyBehavior, model_name: str, dimension: int):
+        self.behavior = behavior
+        self.model_name = model_name
+        self._hashing = HashingEmbeddingProvider(dimension)
+
+    def embed(self, texts: List[str], task_type: str = TASK_QUERY) -> List[List[float]]:
+        self.behavior.call()
+        return self._hashing.embed(texts, task_type)
+
+
+# ---------------------------------------------------------------------- #
+# Vision
+# ---------------------------------------------------------------------- #
+class FakeOCRService(OCRService):
+    """Vision API 대역 (이미지 전처리는 실제 코드를 그대로 실행)"""
+
+    def __init__(self, behavior: DependencyBehavior):
+        self.behavior = behavior
+        self.client = self  # 클라이언트 초기화 여부 검사를 통과시키기 위한 표식
+
+    def _detect_text(self, content: bytes) -> str:
+        self.behavior.call()
+        return "부하 테스트용 OCR 결과 텍스트입니다."
+
+
+# ---------------------------------------------------------------------- #
+# SMTP
+# ---------------------------------------------------------------------- #
+class FakeMailer:
+    """flask_mail.Mail 대역 (send만 지원)"""
+
+    def __init__(self, behavior: DependencyBehavior):
+        self.behavior = behavior
+
+    def send(self, message) -> None:
+        self.behavior.call()
+
+
+# ---------------------------------------------------------------------- #
+# Supabase (DB / 인증)
+# ---------------------------------------------------------------------- #
+class _Result:
+    def __init__(self, data: List[Dict[str, Any]]):
+        self.data = data
+
+
+class _Query:
+    """supabase-py 쿼리 빌더 중 SupabaseService가 사용하는 부분 (select/insert/update/delete, eq/order/limit)"""
+
+    def __init__(self, store: "SQLiteTableStore", behavior: DependencyBehavior, table: str):
+        self._store = store
+        self._behavior = behavior
+        self._table = table
+        self._operation = 'select'
+        self._payload: Optional[Dict[str, Any]] = None
+        self._columns = '*'
+        self._filters: List[Tuple[str, Any]] = []
+        self._order: Optional[Tuple[str, bool]] = None
+        self._limit: Optional[int] = None
+
+    def select(self, columns: str = '*', **kwargs) -> "_Query":
+        self._operation, self._columns = 'select', columns
+        return self
+
+    def insert(self, data: Dict[str, Any], **kwargs) -> "_Query":
+        self._operation, self._payload = 'insert', data
+        return self
+
+    def update(self, data: Dict[str, Any], **kwargs) -> "_Query":
+        self._operation, self._payload = 'update', data
+        return self
+
+    def delete(self, **kwargs) -> "_Query":
+        self._operation = 'delete'
+        return self
+
+    def eq(self, column: str, value: Any) -> "_Query":
+        self._filters.append((column, value))
+        return self
+
+    def order(self, column: str, desc: bool = False, **kwargs) -> "_Query":
+        self._order = (column, desc)
+        return self
+
+    def limit(self, count: int, **kwargs) -> "_Query":
+        self._limit = count
+        return self
+
+    def execute(self) -> _Result:
+        self._behavior.call()
+        store = self._store
+        if self._operation == 'insert':
+            return _Result([store.insert(self._table, self._payload)])
+        if self._operation == 'update':
+            return _Result(store.update(self._table, self._filters, self._payload))
+        if self._operation == 'delete':
+            return _Result(store.delete(self._table, self._filters))
+
+        rows = store.select(self._table, self._filters)
+        if self._order:
+            column, desc = self._order
+            rows.sort(key=lambda row: (row.get(column) is None, row.get(column)), reverse=desc)
+        if self._limit is not None:
+            rows = rows[:self._limit]
+        if self._columns.strip() != '*':
+            columns = [c.strip() for c in self._columns.split(',')]
+            rows = [{c: row.get(c) for c in columns} for row in rows]
+        return _Result(rows)
+
+
+class SQLiteTableStore:
+    """
+    테이블별 행을 JSON으로 저장하는 SQLite 저장소 (여러 워커 프로세스가 같은 파일을 공유)
+
+    id/session_id/user_id 조건은 인덱스로 찾고, 나머지 조건은 읽은 뒤 걸러냅니다.
+    sessions/feedbacks의 id는 UUID 문자열, 그 밖의 테이블(questions)은 정수 id를 부여합니다.
+    """
+
+    _INDEXED = ('id', 'session_id', 'user_id')
+    _UUID_TABLES = ('sessions', 'feedbacks')
+
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS rows ("
+                " seq INTEGER PRIMARY KEY AUTOINCREMENT, tbl TEXT NOT NULL, id TEXT,"
+                " session_id TEXT, user_id TEXT, data TEXT NOT NULL)"
+            )
+            for column in self._INDEXED:
+                conn.execute(f"CREATE INDEX IF NOT EXISTS idx_rows_{column} ON rows(tbl, {column})")
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = self._local.conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def _where(self, table: str, filters: List[Tuple[str, Any]]) -> Tuple[str, List[Any], List[Tuple[str, Any]]]:
+        clauses, params, remaining = ["tbl = ?"], [table], []
+        for column, value in filters:
+            if column in self._INDEXED:
+                clauses.append(f"{column} = ?")
+                params.append(str(value))
+            else:
+                remaining.append((column, value))
+        return " AND ".join(clauses), params, remaining
+
+    @staticmethod
+    def _matches(row: Dict[str, Any], filters: List[Tuple[str, Any]]) -> bool:
+        return all(str(row.get(column)) == str(value) for column, value in filters)
+
+    def _load(self, conn: sqlite3.Connection, table: str, filters: List[Tuple[str, Any]]) -> List[Tuple[int, Dict[str, Any]]]:
+        where, params, remaining = self._where(table, filters)
+        rows = [(seq, json.loads(data)) for seq, data in
+                conn.execute(f"SELECT seq, data FROM rows WHERE {where} ORDER BY seq", params)]
+        return [(seq, row) for seq, row in rows if self._matches(row, remaining)]
+
+    def select(self, table: str, filters: List[Tuple[str, Any]]) -> List[Dict[str, Any]]:
+        return [row for _, row in self._load(self._connect(), table, filters)]
+
+    def insert(self, table: str, data: Dict[str, Any]) -> Dict[str, Any]:
+        conn = self._connect()
+        row = dict(data)
+        row.setdefault('created_at', datetime.now(timezone.utc).isoformat())
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            if table in self._UUID_TABLES:
+                row.setdefault('id', str(uuid.uuid4()))
+                cursor = conn.execute(
+                    "INSERT INTO rows (tbl, id, session_id, user_id, data) VALUES (?, ?, ?, ?, ?)",
+                    (table, str(row['id']), row.get('session_id'), row.get('user_id'), "{}")
+                )
+            else:
+                cursor = conn.execute(
+                    "INSERT INTO rows (tbl, session_id, user_id, data) VALUES (?, ?, ?, ?)",
+                    (table, row.get('session_id'), row.get('user_id'), "{}")
+                )
+                row.setdefault('id', cursor.lastrowid)
+            conn.execute("UPDATE rows SET id = ?, data = ? WHERE seq = ?",
+                         (str(row['id']), json.dumps(row, ensure_ascii=False), cursor.lastrowid))
+        return row
+
+    def update(self, table: str, filters: List[Tuple[str, Any]], data: Dict[str, Any]) -> List[Dict[str, Any]]:
+        conn = self._connect()
+        updated = []
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            for seq, row in self._load(conn, table, filters):
+                row.update(data)
+                conn.execute("UPDATE rows SET session_id = ?, user_id = ?, data = ? WHERE seq = ?",
+                             (row.get('session_id'), row.get('user_id'), json.dumps(row, ensure_ascii=False), seq))
+                updated.append(row)
+        return updated
+
+    def delete(self, table: str, filters: List[Tuple[str, Any]]) -> List[Dict[str, Any]]:
+        conn = self._connect()
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            rows = self._load(conn, table, filters)
+            conn.executemany("DELETE FROM rows WHERE seq = ?", [(seq,) for seq, _ in rows])
+        return [row for _, row in rows]
+
+
+class _FakeUser:
+    def __init__(self, user_id: str, email: str):
+        self.id = user_id
+        self.email = email
+        self.user_metadata = {'name': email.split('@')[0]}
+
+
+class _UserResponse:
+    def __init__(self, user: Optional[_FakeUser]):
+        self.user = user
+
+
+class FakeSupabaseAuth:
+    """supabase auth 대역 - 'loadtest-'로 시작하는 토큰을 모두 유효한 사용자로 인정합니다."""
+
+    TOKEN_PREFIX = "loadtest-"
+
+    def __init__(self, behavior: DependencyBehavior):
+        self.behavior = behavior
+
+    def get_user(self, access_token: str) -> _UserResponse:
+        self.behavior.call()
+        if not access_token or not access_token.startswith(self.TOKEN_PREFIX):
+            return _UserResponse(None)
+        name = access_token[len(self.TOKEN_PREFIX):]
+        # 토큰마다 고정된 사용자 id (같은 가상 사용자는 항상 같은 id)
+        user_id = str(uuid.uuid5(uuid.NAMESPACE_URL, f"loadtest:{name}"))
+        return _UserResponse(_FakeUser(user_id, f"{name}@loadtest.local"))
+
+
+class FakeSupabaseClient:
+    """supabase.Client 대역 (table 쿼리 + auth.get_user)"""
+
+    def __init__(self, store: SQLiteTableStore, db_behavior: DependencyBehavior, auth_behavior: DependencyBehavior):
+        self.store = store
+        self.db_behavior = db_behavior
+        self.auth = FakeSupabaseAuth(auth_behavior)
+
+    def table(self, name: str) -> _Query:
+        return _Query(self.store, self.db_behavior, name)
+
+
+# ---------------------------------------------------------------------- #
+# 설치
+# ---------------------------------------------------------------------- #
+class FakeEnvironment(LoggerMixin):
+    """앱의 외부 의존성을 대역으로 교체합니다. (create_app() 직후, 부트스트랩 시작 전에 호출)"""
+
+    def __init__(self, behaviors: Dict[str, DependencyBehavior], store_path: str):
+        self.behaviors = behaviors
+        self.store = SQLiteTableStore(store_path)
+        self.supabase_client = FakeSupabaseClient(self.store, behaviors['supabase'], behaviors['supabase_auth'])
+
+    def install(self, app) -> None:
+        import supabase_client
+        from config.settings import get_embedding_provider_config
+        from services import ai_service as ai_service_module
+        from services.ai_service import AIService
+        from services.embedding_provider import MicroBatchingEmbeddingProvider
+        from services.mail_service import MailService
+        from services.question_classifier import load_canonical_classifier
+
+        # SupabaseService(get_supabase)와 supabase_models 싱글턴이 대역 클라이언트를 사용하도록 합니다.
+        supabase_client._supabase = self.supabase_client
+
+        config = get_embedding_provider_config()
+        classifier, meta = load_canonical_classifier(
+            os.path.join(os.path.dirname(ai_service_module.__file__), "canonical_embeddings")
+        )
+        embedding = FakeEmbeddingProvider(
+            self.behaviors['vertex_embedding'], meta.get('model') or config['vertex_model'], classifier.dimension
+        )
+        if config.get('microbatch_enabled'):
+            # 운영과 같은 마이크로 배치 경로를 거치도록 감쌉니다.
+            embedding = MicroBatchingEmbeddingProvider(
+                embedding, max_batch_size=config['batch_size'], max_wait_ms=config['microbatch_max_wait_ms'],
+                max_concurrent_batches=config['microbatch_max_concurrent']
+            )
+        generation = FakeGenerativeModel(self.behaviors['vertex_generation'])
+
+        bootstrap = app.bootstrap
+        bootstrap.register('supabase', lambda: self.supabase_client)
+        bootstrap.register('vertex_generation', lambda: generation)
+        bootstrap.register('embedding', lambda: embedding)
+        bootstrap.register(
+            'ai_service',
+            lambda model, provider: AIService(embedding_provider=provider, generation_model=model),
+            depends_on=['vertex_generation', 'embedding']
+        )
+        bootstrap.register('auth', lambda: self._create_auth_service())
+        bootstrap.register('vision', lambda: FakeOCRService(self.behaviors['vision']), required=False)
+
+        mail_service = MailService(app)
+        mail_service.mail = FakeMailer(self.behaviors['smtp'])
+        app._mail_service = mail_service
+        self.logger.warning(f"[loadtest] 외부 의존성을 대역으로 교체했습니다. (저장소: {self.store.path})")
+
+    def _create_auth_service(self):
+        from services.auth_service import AuthService
+        return AuthService(client=self.supabase_client)
+
+    def get_stats(self) -> Dict[str, Dict[str, int]]:
+        return {name: behavior.get_stats() for name, behavior in self.behaviors.items()}
@@ -0,0 +1,377 @@
+"""
+부하 드라이버 - gunicorn 워커/스레드 조합별 처리량과 지연 시간 백분위 측정
+
+조합(예: 2x8 = 워커 2개, 워커당 스레드 8개)마다 대역 앱(loadtest.wsgi)으로 gunicorn을 새로 띄우고,
+가상 사용자 N명이 업로드 → 세션 조회/수정 요청을 가중치 비율로 반복합니다.
+엔드포인트별 처리량(req/s)과 p50/p95/p99, 오류(5xx/연결 실패)와 429 건수를 출력하고 JSON으로 저장합니다.
+
+사용법 (backend 디렉터리에서):
+    python -m loadtest.run_loadtest --matrix 1x4 2x4 2x8 4x8 --concurrency 32 --duration 120
+    python -m loadtest.run_loadtest --latency-scale 0.1 --duration 20            # 지연을 1/10로 줄여 빠르게 점검
+    python -m loadtest.run_loadtest --profile loadtest/profiles/slow_vertex.json
+    python -m loadtest.run_loadtest --target http://127.0.0.1:8080 --duration 30  # 이미 떠 있는 서버에 부하만 생성
+
+gunicorn의 --preload는 사용하지 마세요. (부트스트랩 스레드가 fork 이전에 시작됩니다)
+"""
+
+import argparse
+import datetime
+import http.client
+import json
+import os
+import random
+import shutil
+import signal
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.parse
+import uuid
+from typing import Any, Dict, List, Optional, Tuple
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BASE_DIR not in sys.path:
+    sys.path.insert(0, BASE_DIR)
+
+from benchmarks.corpus import generate_resume
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+DEFAULT_MATRIX = ["1x1", "1x4", "2x4", "2x8", "4x8"]
+ENDPOINTS = ("upload", "session", "revise")
+
+_JOB_DESCRIPTION = "누리데이터 백엔드 개발자 채용 - Python 기반 API 개발 및 데이터 파이프라인 운영"
+_QUESTIONS = [
+    "지원동기",
+    "팀 프로젝트에서 갈등을 해결했던 경험을 구체적으로 서술하시오.",
+    "입사 후 이루고 싶은 목표를 작성해 주세요.",
+    "본인의 성격의 장단점은 무엇인가요?",
+]
+
+
+def _parse_matrix(values: List[str]) -> List[Tuple[int, int]]:
+    matrix = []
+    for value in values:
+        workers, _, threads = value.lower().partition('x')
+        if not workers.isdigit() or not threads.isdigit():
+            raise argparse.ArgumentTypeError(f"조합은 '워커x스레드' 형식이어야 합니다: {value}")
+        matrix.append((int(workers), int(threads)))
+    return matrix
+
+
+def _parse_mix(value: str) -> Dict[str, float]:
+    mix = {}
+    for part in value.split(','):
+        name, _, weight = part.partition('=')
+        if name not in ENDPOINTS:
+            raise argparse.ArgumentTypeError(f"알 수 없는 엔드포인트: {name} ({', '.join(ENDPOINTS)} 중 하나)")
+        mix[name] = float(weight)
+    return mix
+
+
+def _percentile(sorted_values: List[float], percent: float) -> float:
+    """최근접 순위(nearest-rank) 백분위"""
+    if not sorted_values:
+        return 0.0
+    rank = max(int(-(-percent * len(sorted_values) // 100)), 1)
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def _multipart(fields: Dict[str, str], files: List[Tuple[str, str, bytes, str]]) -> Tuple[bytes, str]:
+    boundary = f"----loadtest{uuid.uuid4().hex}"
+    parts = []
+    for name, value in fields.items():
+        parts.append(
+            f'--{boundary}\r\nContent-Disposition: form-data; name="{name}"\r\n\r\n{value}\r\n'.encode('utf-8')
+        )
+    for name, filename, content, content_type in files:
+        parts.append(
+            f'--{boundary}\r\nContent-Disposition: form-data; name="{name}"; filename="{filename}"\r\n'
+            f'Content-Type: {content_type}\r\n\r\n'.encode('utf-8') + content + b"\r\n"
+        )
+    parts.append(f"--{boundary}--\r\n".encode('ascii'))
+    return b"".join(parts), f"multipart/form-data; boundary={boundary}"
+
+
+class Recorder:
+    """요청 결과 기록 (측정 구간 밖의 요청은 버립니다)"""
+
+    def __init__(self):
+        self.samples: List[Tuple[str, int, float]] = []
+        self.measure_from = 0.0
+        self.measure_until = float('inf')
+        self._lock = threading.Lock()
+
+    def record(self, endpoint: str, status: int, started: float, finished: float) -> None:
+        if not (self.measure_from <= finished <= self.measure_until):
+            return
+        with self._lock:
+            self.samples.append((endpoint, status, (finished - started) * 1000))
+
+    def summarize(self, elapsed: float) -> Dict[str, Any]:
+        with self._lock:
+            samples = list(self.samples)
+        summary = {}
+        for endpoint in ENDPOINTS + ('total',):
+            selected = [s for s in samples if endpoint == 'total' or s[0] == endpoint]
+            latencies = sorted(s[2] for s in selected)
+            errors = sum(1 for s in selected if s[1] == 0 or s[1] >= 500)
+            summary[endpoint] = {
+                'requests': len(selected),
+                'throughput_rps': round(len(selected) / elapsed, 3) if elapsed else 0.0,
+                'p50_ms': round(_percentile(latencies, 50), 1),
+                'p95_ms': round(_percentile(latencies, 95), 1),
+                'p99_ms': round(_percentile(latencies, 99), 1),
+                'max_ms': round(latencies[-1], 1) if latencies else 0.0,
+                'errors': errors,
+                'rate_limited': sum(1 for s in selected if s[1] == 429),
+                'error_rate': round(errors / len(selected), 4) if selected else 0.0,
+            }
+        return summary
+
+
+class VirtualUser(threading.Thread):
+    """가상 사용자 한 명 - 자기 세션이 없으면 업로드부터, 이후 가중치에 따라 요청을 고릅니다."""
+
+    def __init__(self, index: int, base_url: str, args, resume: Optional[Tuple[str, bytes, str]],
+                 recorder: Recorder, stop_event: threading.Event):
+        super().__init__(name=f"vu-{index}", daemon=True)
+        parsed = urllib.parse.urlparse(base_url)
+        self.host, self.port = parsed.hostname, parsed.port or 80
+        self.headers = {'Authorization': f"Bearer loadtest-vu{index}"}
+        self.args = args
+        self.resume = resume
+        self.recorder = recorder
+        self.stop_event = stop_event
+        self.rng = random.Random(index)
+        self.sessions: List[Tuple[str, int]] = []
+        self._conn: Optional[http.client.HTTPConnection] = None
+
+    def _request(self, endpoint: str, method: str, path: str, body: Optional[bytes] = None,
+                 content_type: Optional[str] = None) -> Tuple[int, Any]:
+        headers = dict(self.headers)
+        if content_type:
+            headers['Content-Type'] = content_type
+        started = time.perf_counter()
+        status, payload = 0, None
+        try:
+            if self._conn is None:
+                self._conn = http.client.HTTPConnection(self.host, self.port, timeout=self.args.request_timeout)
+            self._conn.request(method, path, body=body, headers=headers)
+            response = self._conn.getresponse()
+            raw = response.read()
+            status = response.status
+            if response.getheader('Content-Type', '').startswith('application/json'):
+                payload = json.loads(raw)
+        except (OSError, http.client.HTTPException, ValueError):
+            # 연결 실패/시간 초과는 status 0(오류)으로 기록하고 다음 요청에서 다시 연결합니다.
+            if self._conn is not None:
+                self._conn.close()
+            self._conn = None
+        self.recorder.record(endpoint, status, started, time.perf_counter())
+        return status, payload
+
+    def _upload(self) -> None:
+        questions = _QUESTIONS[:self.args.questions]
+        data = {
+            'jobDescription': _JOB_DESCRIPTION, 'resumeText': '', 'questions': questions,
+            'companyName': '누리데이터', 'jobTitle': '백엔드 개발자', 'mainResponsibilities': 'API 개발',
+            'requirements': 'Python', 'preferredQualifications': ''
+        }
+        files = [('files',) + self.resume] if self.resume else []
+        body, content_type = _multipart({'data': json.dumps(data, ensure_ascii=False)}, files)
+        status, payload = self._request('upload', 'POST', '/api/v1/upload', body, content_type)
+        if status == 201 and payload:
+            self.sessions.append((payload['sessionId'], len(questions)))
+
+    def _get_session(self, session_id: str) -> None:
+        self._request('session', 'GET', f'/api/v1/session/{session_id}')
+
+    def _revise(self, session_id: str, question_count: int) -> None:
+        body = json.dumps({
+            'sessionId': session_id, 'questionIndex': self.rng.randint(1, max(question_count, 1)),
+            'revisionRequest': '조금 더 간결하고 구체적으로 다듬어 주세요.'
+        }, ensure_ascii=False).encode('utf-8')
+        self._request('revise', 'POST', '/api/v1/revise', body, 'application/json')
+
+    def run(self) -> None:
+        names = list(self.args.mix)
+        weights = [self.args.mix[name] for name in names]
+        while not self.stop_event.is_set():
+            action = self.rng.choices(names, weights)[0] if self.sessions else 'upload'
+            if action == 'upload':
+                self._upload()
+            else:
+                session_id, question_count = self.rng.choice(self.sessions)
+                if action == 'session':
+                    self._get_session(session_id)
+                else:
+                    self._revise(session_id, question_count)
+            if self.args.think_time_ms:
+                self.stop_event.wait(self.rng.expovariate(1000 / self.args.think_time_ms))
+        if self._conn is not None:
+            self._conn.close()
+
+
+def run_load(base_url: str, args, resume) -> Dict[str, Any]:
+    """warmup 이후 duration초 동안의 요청만 집계합니다."""
+    recorder = Recorder()
+    stop_event = threading.Event()
+    start = time.perf_counter()
+    recorder.measure_from = start + args.warmup
+    recorder.measure_until = recorder.measure_from + args.duration
+    users = [VirtualUser(i, base_url, args, resume, recorder, stop_event) for i in range(args.concurrency)]
+    for user in users:
+        user.start()
+    time.sleep(args.warmup + args.duration)
+    stop_event.set()
+    for user in users:
+        user.join(timeout=args.request_timeout)
+    return recorder.summarize(args.duration)
+
+
+def _wait_until_ready(base_url: str, process: subprocess.Popen, timeout: float) -> None:
+    parsed = urllib.parse.urlparse(base_url)
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"gunicorn이 종료되었습니다. (종료 코드 {process.returncode})")
+        try:
+            conn = http.client.HTTPConnection(parsed.hostname, parsed.port, timeout=2)
+            conn.request('GET', '/api/v1/ready')
+            if conn.getresponse().status == 200:
+                return
+        except OSError:
+            pass
+        time.sleep(0.5)
+    raise RuntimeError(f"{timeout:.0f}초 안에 준비 상태가 되지 않았습니다.")
+
+
+def run_cell(workers: int, threads: int, port: int, args, resume, work_dir: str) -> Dict[str, Any]:
+    """gunicorn을 조합대로 띄워 부하를 주고 종료합니다. (조합마다 저장소를 새로 만듭니다)"""
+    cell = f"{workers}x{threads}"
+    env = dict(os.environ)
+    env.update({
+        'CACHE_DIR': os.path.join(work_dir, cell, 'cache'),
+        'LOADTEST_STORE': os.path.join(work_dir, cell, 'store.sqlite3'),
+        'LOADTEST_LATENCY_SCALE': str(args.latency_scale),
+        'LOG_LEVEL': env.get('LOG_LEVEL', 'WARNING'),
+    })
+    if args.profile:
+        env['LOADTEST_PROFILE'] = os.path.abspath(args.profile)
+    if args.seed is not None:
+        env['LOADTEST_SEED'] = str(args.seed)
+    os.makedirs(env['CACHE_DIR'], exist_ok=True)
+
+    command = [
+        args.gunicorn, '--bind', f'127.0.0.1:{port}', '--workers', str(workers), '--threads', str(threads),
+        '--timeout', str(args.worker_timeout), 'loadtest.wsgi:app'
+    ]
+    log_path = os.path.join(work_dir, cell, 'gunicorn.log')
+    base_url = f"http://127.0.0.1:{port}"
+    with open(log_path, 'wb') as log_file:
+        # 앱의 파일 로그(logs/)가 작업 디렉터리에 쌓이지 않도록 조합별 디렉터리에서 실행합니다.
+        env['PYTHONPATH'] = os.pathsep.join(filter(None, [BASE_DIR, env.get('PYTHONPATH')]))
+        process = subprocess.Popen(command, cwd=os.path.join(work_dir, cell), env=env,
+                                   stdout=log_file, stderr=subprocess.STDOUT)
+        try:
+            _wait_until_ready(base_url, process, args.startup_timeout)
+            print(f"[{cell}] 부하 시작: 가상 사용자 {args.concurrency}명, 예열 {args.warmup}초 + 측정 {args.duration}초")
+            summary = run_load(base_url, args, resume)
+        except RuntimeError as e:
+            raise RuntimeError(f"[{cell}] {e} (로그: {log_path})") from e
+        finally:
+            process.send_signal(signal.SIGTERM)
+            try:
+                process.wait(timeout=30)
+            except subprocess.TimeoutExpired:
+                process.kill()
+    return {'workers': workers, 'threads': threads, 'endpoints': summary}
+
+
+def print_summary(label: str, summary: Dict[str, Any]) -> None:
+    print(f"\n[{label}]")
+    print(f"  {'endpoint':<9} {'req':>6} {'req/s':>8} {'p50':>9} {'p95':>9} {'p99':>9} {'err':>5} {'429':>5}")
+    for endpoint, row in summary.items():
+        print(f"  {endpoint:<9} {row['requests']:>6} {row['throughput_rps']:>8.2f} {row['p50_ms']:>8.0f}ms "
+              f"{row['p95_ms']:>7.0f}ms {row['p99_ms']:>7.0f}ms {row['errors']:>5} {row['rate_limited']:>5}")
+
+
+def _build_resume(args) -> Optional[Tuple[str, bytes, str]]:
+    if args.resume_format == 'none':
+        return None
+    content_type = {
+        'pdf': 'application/pdf',
+        'docx': 'application/vnd.openxmlformats-officedocument.wordprocessingml.document',
+    }[args.resume_format]
+    return (f"resume.{args.resume_format}", generate_resume(args.resume_pages, args.resume_format), content_type)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="gunicorn 워커/스레드 조합별 부하 테스트")
+    parser.add_argument("--matrix", nargs="+", default=DEFAULT_MATRIX, help="워커x스레드 조합 목록 (예: 2x8)")
+    parser.add_argument("--target", default=None, help="이미 실행 중인 서버 주소 (지정하면 gunicorn을 띄우지 않음)")
+    parser.add_argument("--concurrency", type=int, default=16, help="가상 사용자 수")
+    parser.add_argument("--duration", type=float, default=60, help="측정 시간(초)")
+    parser.add_argument("--warmup", type=float, default=5, help="측정 전 예열 시간(초)")
+    parser.add_argument("--mix", type=_parse_mix, default=_parse_mix("upload=1,session=4,revise=2"),
+                        help="요청 가중치 (기본 upload=1,session=4,revise=2)")
+    parser.add_argument("--think-time-ms", type=float, default=0, help="요청 사이 평균 대기 시간 (지수 분포)")
+    parser.add_argument("--questions", type=int, default=2, choices=range(1, len(_QUESTIONS) + 1),
+                        help="업로드당 문항 수")
+    parser.add_argument("--resume-format", choices=["pdf", "docx", "none"], default="pdf")
+    parser.add_argument("--resume-pages", type=int, default=2)
+    parser.add_argument("--profile", default=None, help="의존성 지연 프로필 JSON (기본 loadtest/profiles/default.json)")
+    parser.add_argument("--latency-scale", type=float, default=1.0, help="프로필 지연 시간 배율")
+    parser.add_argument("--seed", type=int, default=None, help="대역 지연/오류 난수 시드")
+    parser.add_argument("--base-port", type=int, default=18080)
+    parser.add_argument("--gunicorn", default="gunicorn", help="gunicorn 실행 파일")
+    parser.add_argument("--worker-timeout", type=int, default=120, help="gunicorn --timeout (Dockerfile과 동일)")
+    parser.add_argument("--startup-timeout", type=float, default=60)
+    parser.add_argument("--request-timeout", type=float, default=180)
+    parser.add_argument("--output", default=None, help="결과 JSON 경로 (기본: loadtest/results/<시각>.json)")
+    args = parser.parse_args(argv)
+
+    resume = _build_resume(args)
+    report: Dict[str, Any] = {
+        'created_at': datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        'settings': {
+            'concurrency': args.concurrency, 'duration': args.duration, 'warmup': args.warmup, 'mix': args.mix,
+            'questions': args.questions, 'resume': f"{args.resume_pages}p {args.resume_format}",
+            'profile': args.profile or 'default', 'latency_scale': args.latency_scale, 'target': args.target,
+        },
+        'results': [],
+    }
+
+    if args.target:
+        summary = run_load(args.target.rstrip('/'), args, resume)
+        print_summary(args.target, summary)
+        report['results'].append({'target': args.target, 'endpoints': summary})
+    else:
+        if shutil.which(args.gunicorn) is None:
+            print(f"gunicorn 실행 파일을 찾을 수 없습니다: {args.gunicorn} (pip install gunicorn)")
+            return 2
+        matrix = _parse_matrix(args.matrix)
+        with tempfile.TemporaryDirectory(prefix="sseojum-loadtest-") as work_dir:
+            for i, (workers, threads) in enumerate(matrix):
+                os.makedirs(os.path.join(work_dir, f"{workers}x{threads}"), exist_ok=True)
+                try:
+                    result = run_cell(workers, threads, args.base_port + i, args, resume, work_dir)
+                except RuntimeError as e:
+                    print(e)
+                    report['results'].append({'workers': workers, 'threads': threads, 'error': str(e)})
+                    continue
+                print_summary(f"workers={workers} threads={threads}", result['endpoints'])
+                report['results'].append(result)
+
+    output = args.output or os.path.join(RESULTS_DIR, f"{datetime.datetime.now():%Y%m%d-%H%M%S}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"\n결과 저장: {output}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,46 @@
+"""
+부하 테스트용 WSGI 진입점 - 외부 의존성을 지연 주입 대역으로 교체한 앱
+
+    gunicorn --workers 2 --threads 8 'loadtest.wsgi:app'
+
+환경 변수:
+    LOADTEST_PROFILE         의존성 지연/오류 프로필 JSON (기본 loadtest/profiles/default.json)
+    LOADTEST_STORE           Supabase 대역 SQLite 파일 (워커 간 공유, 기본 CACHE_DIR/loadtest_store.sqlite3)
+    LOADTEST_LATENCY_SCALE   모든 지연 시간에 곱할 배율 (기본 1.0, 빠른 점검 시 0.1 등)
+    LOADTEST_SEED            지연/오류 난수 시드 (미지정 시 매번 다름)
+    LOADTEST_RATE_LIMIT      true면 앱의 요청 한도(Flask-Limiter)를 유지 (기본 false: 부하 생성기가 한 IP라 끕니다)
+    PREWARM_AI               true면 대역 설치 후 부트스트랩을 예열합니다. (기본 true)
+"""
+
+import os
+
+os.environ.setdefault("PROJECT_ID", "loadtest")
+os.environ.setdefault("LOCATION", "asia-northeast3")
+os.environ.setdefault("CONTEXT_CACHE_ENABLED", "false")  # Vertex 컨텍스트 캐시 API는 대역이 없습니다.
+
+# 실제 클라이언트로 예열되지 않도록 create_app() 동안에는 예열을 끄고, 대역 설치 후 직접 시작합니다.
+_prewarm = os.getenv("PREWARM_AI", "true").strip().lower() in ("1", "true", "yes", "on")
+os.environ["PREWARM_AI"] = "false"
+
+from app import create_app
+from config.settings import CACHE_DIR
+from loadtest.fakes import FakeEnvironment, load_profile
+
+_seed = os.getenv("LOADTEST_SEED")
+behaviors = load_profile(
+    os.getenv("LOADTEST_PROFILE"),
+    latency_scale=float(os.getenv("LOADTEST_LATENCY_SCALE", "1.0")),
+    seed=int(_seed) if _seed else None
+)
+store_path = os.getenv("LOADTEST_STORE", os.path.join(CACHE_DIR, "loadtest_store.sqlite3"))
+os.makedirs(os.path.dirname(os.path.abspath(store_path)), exist_ok=True)
+
+app = create_app()
+fake_environment = FakeEnvironment(behaviors, store_path)
+fake_environment.install(app)
+
+if os.getenv("LOADTEST_RATE_LIMIT", "false").strip().lower() not in ("1", "true", "yes", "on"):
+    app.get_limiter().enabled = False
+
+if _prewarm:
+    app.bootstrap.start()
@@ -0,0 +1,177 @@
+"""
+기동 시간 프로파일러
+
+새 인터프리터에서 `python -X importtime`으로 app 모듈을 임포트하여 모듈별 임포트 시간을 수집하고,
+기동 시간 예산과 '기동 시 임포트 금지' 모듈 목록을 검사합니다. (콜드 스타트 회귀 추적용)
+
+AI 서비스 예열 스레드(PREWARM_AI)는 요청 처리 경로가 아니므로 측정 시에는 끄고 실행합니다.
+
+사용법:
+    python profile_startup.py                           # 상위 20개 모듈/패키지 출력 + 예산 검사
+    python profile_startup.py --budget-ms 800 --top 30
+    python profile_startup.py --module-budget numpy=150 --json startup_profile.json
+    python profile_startup.py --target "services.ai_service"   # 다른 모듈의 임포트 시간 측정
+
+예산 초과 또는 금지 모듈이 임포트되면 종료 코드 1을 반환합니다.
+"""
+
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+from collections import defaultdict
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# 첫 사용 시점에 임포트해야 하는 무거운 모듈 (app 임포트만으로 로드되면 회귀로 판단)
+DEFAULT_FORBIDDEN_MODULES = [
+    "vertexai", "google.cloud.vision", "google.cloud.aiplatform", "PIL", "PyPDF2", "docx",
+    "flask_mail", "supabase", "scipy", "torch", "transformers",
+]
+
+_IMPORTTIME_RE = re.compile(r'^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s+)(\S+)')
+
+
+def run_import_profile(target: str, env_overrides=None):
+    """
+    새 프로세스에서 target 모듈을 임포트하고 (모듈별 기록, 전체 벽시계 시간[ms])을 반환합니다.
+
+    Raises:
+        RuntimeError: 임포트 실패
+    """
+    code = (
+        "import time; _t = time.perf_counter(); "
+        f"import {target}; "
+        "print('__WALL_MS__', (time.perf_counter() - _t) * 1000)"
+    )
+    env = dict(os.environ)
+    env.setdefault("PREWARM_AI", "false")
+    env.update(env_overrides or {})
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=BASE_DIR, env=env, capture_output=True, text=True
+    )
+    if completed.returncode != 0:
+        tail = "\n".join(line for line in completed.stderr.splitlines() if not line.startswith("import time:"))
+        raise RuntimeError(f"'{target}' 임포트 실패:\n{tail[-2000:]}")
+
+    records = []
+    for line in completed.stderr.splitlines():
+        match = _IMPORTTIME_RE.match(line)
+        if match:
+            self_us, cumulative_us, indent, module = match.groups()
+            records.append({
+                "module": module,
+                "self_ms": int(self_us) / 1000,
+                "cumulative_ms": int(cumulative_us) / 1000,
+                "depth": (len(indent) - 1) // 2
+            })
+
+    wall_ms = None
+    for line in completed.stdout.splitlines():
+        if line.startswith("__WALL_MS__"):
+            wall_ms = float(line.split()[1])
+    return records, wall_ms
+
+
+def summarize(records, top: int):
+    """모듈별 누적 시간 상위 목록과 최상위 패키지별 자체 시간 합계를 만듭니다."""
+    slowest_modules = sorted(records, key=lambda r: r["cumulative_ms"], reverse=True)[:top]
+    packages = defaultdict(float)
+    for record in records:
+        packages[record["module"].split(".")[0]] += record["self_ms"]
+    slowest_packages = sorted(packages.items(), key=lambda item: item[1], reverse=True)[:top]
+    return slowest_modules, slowest_packages
+
+
+def check_budgets(records, wall_ms, budget_ms, module_budgets, forbidden):
+    """예산/금지 모듈 위반 목록을 반환합니다."""
+    violations = []
+    if budget_ms and wall_ms is not None and wall_ms > budget_ms:
+        violations.append(f"전체 임포트 시간 {wall_ms:.0f}ms > 예산 {budget_ms:.0f}ms")
+
+    cumulative = {}
+    for record in records:
+        cumulative[record["module"]] = max(cumulative.get(record["module"], 0.0), record["cumulative_ms"])
+    for module, limit in module_budgets.items():
+        if cumulative.get(module, 0.0) > limit:
+            violations.append(f"'{module}' 임포트 {cumulative[module]:.0f}ms > 예산 {limit:.0f}ms")
+
+    loaded = set(cumulative)
+    for module in forbidden:
+        if module in loaded:
+            violations.append(f"기동 시 임포트 금지 모듈이 로드됨: {module}")
+    return violations
+
+
+def _parse_module_budgets(values):
+    budgets = {}
+    for value in values or []:
+        name, _, limit = value.partition("=")
+        if not name or not limit:
+            raise argparse.ArgumentTypeError(f"--module-budget 형식은 모듈=ms 입니다: {value}")
+        budgets[name] = float(limit)
+    return budgets
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="앱 기동(임포트) 시간 프로파일 및 예산 검사")
+    parser.add_argument("--target", default="app", help="임포트할 모듈 (기본: app)")
+    parser.add_argument("--top", type=int, default=20, help="출력할 상위 항목 수")
+    parser.add_argument("--budget-ms", type=float, default=float(os.getenv("STARTUP_IMPORT_BUDGET_MS", "1500")),
+                        help="전체 임포트 시간 예산 (기본: STARTUP_IMPORT_BUDGET_MS 또는 1500ms, 0이면 검사 안 함)")
+    parser.add_argument("--module-budget", action="append", metavar="MODULE=MS",
+                        help="모듈별 누적 임포트 시간 예산 (여러 번 지정 가능)")
+    parser.add_argument("--forbid", action="append", default=None,
+                        help="기동 시 임포트되면 안 되는 모듈 (지정 시 기본 목록을 대체)")
+    parser.add_argument("--allow-eager", action="store_true", help="금지 모듈 검사를 하지 않음")
+    parser.add_argument("--json", default=None, help="결과를 JSON 파일로 저장 (회귀 추적용)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    module_budgets = _parse_module_budgets(args.module_budget)
+    forbidden = [] if args.allow_eager else (args.forbid or DEFAULT_FORBIDDEN_MODULES)
+
+    try:
+        records, wall_ms = run_import_profile(args.target)
+    except RuntimeError as e:
+        print(e)
+        return 1
+
+    slowest_modules, slowest_packages = summarize(records, args.top)
+    print(f"'{args.target}' 임포트: {wall_ms:.1f}ms (모듈 {len(records)}개)\n")
+    print(f"{'누적(ms)':>10} {'자체(ms)':>10}  모듈")
+    for record in slowest_modules:
+        print(f"{record['cumulative_ms']:>10.1f} {record['self_ms']:>10.1f}  {'  ' * record['depth']}{record['module']}")
+    print(f"\n{'자체 합계(ms)':>14}  최상위 패키지")
+    for package, self_ms in slowest_packages:
+        print(f"{self_ms:>14.1f}  {package}")
+
+    violations = check_budgets(records, wall_ms, args.budget_ms, module_budgets, forbidden)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({
+                "target": args.target,
+                "wall_ms": wall_ms,
+                "budget_ms": args.budget_ms,
+                "module_budgets": module_budgets,
+                "violations": violations,
+                "modules": slowest_modules,
+                "packages": [{"package": p, "self_ms": ms} for p, ms in slowest_packages]
+            }, f, ensure_ascii=False, indent=2)
+
+    if violations:
+        print("\n예산 검사 실패:")
+        for violation in violations:
+            print(f" - {violation}")
+        return 1
+    print("\n예산 검사 통과")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,38 +1,79 @@
 import logging
 import os
-import json
-from typing import Dict, Any, Optional, Tuple
-from scipy.spatial.distance import cosine
-from vertexai.language_models import TextEmbeddingModel, TextEmbeddingInput
+from typing import Dict, Any, List, Optional, Tuple
 
 # 프로젝트 유틸리티 및 모델 임포트
 from utils.logger import LoggerMixin
-from vertex_client import model as generation_model 
+from utils.cache import LRUCache, make_cache_key
+from utils.metrics import track_stage, record_token_usage
+from utils.token_budget import PromptBudgeter
+from utils.text_normalizer import strip_boilerplate
+from config.settings import get_vertex_ai_config, get_response_cache_config
+from vertex_client import get_generation_model
+from services.context_cache import ContextCacheManager
+from services.embedding_cache import EmbeddingCache
+from services.embedding_provider import EmbeddingProvider, get_embedding_provider, TASK_QUERY
+from services.question_classifier import QuestionClassifier, load_canonical_classifier, SIMILARITY_THRESHOLD
+from services.lexical_classifier import LexicalClassifier
+from services.resume_retriever import ResumeRetriever, ResumeIndex
+from services.resume_profile import ResumeProfileExtractor
+from services.revision_history import RevisionHistoryCompactor, RevisionHistoryContext
 
 logger = logging.getLogger(__name__)
 
+# generate_cover_letter에 분류 결과를 넘기지 않았음을 나타내는 표식 (None은 '분류 실패'라는 유효한 결과)
+NOT_CLASSIFIED = object()
+
 class AIService(LoggerMixin):
     """ AI 기반 자기소개서 생성 및 수정 서비스 (지능형 분류기 및 모듈형 가이드라인 사용) """
 
-    def __init__(self):
+    def __init__(self, embedding_provider: Optional[EmbeddingProvider] = None, generation_model=None):
+        """
+        Args:
+            embedding_provider: 질문 임베딩 제공자 (미지정 시 EMBEDDING_PROVIDER 설정에 따라 생성)
+            generation_model: 생성 모델 (미지정 시 Vertex AI 모델, 벤치마크/부하 테스트에서는 대역 모델 주입)
+        """
         self.logger.info("AI 서비스 초기화 시작...")
-        self.generation_model = generation_model
-        self.embedding_model = TextEmbeddingModel.from_pretrained("text-multilingual-embedding-002")
+        self.generation_model = generation_model if generation_model is not None else get_generation_model()
+        self.embedding_provider = embedding_provider or get_embedding_provider()
+        # 반복되는 질문의 임베딩 API 호출을 생략하기 위한 영속 캐시 (제공자 모델별로 키 분리)
+        self.embedding_cache = EmbeddingCache(self.embedding_provider.model_name)
         
+        # 기준 임베딩은 바이너리 아티팩트(.npy)를 메모리 맵으로 열어 워커 간에 공유합니다.
+        # 아티팩트가 없으면 canonical_embeddings.json을 정규화된 float32 행렬로 변환하여 사용합니다.
+        self.classifier: Optional[QuestionClassifier] = None
+        self.embedding_artifact_meta: Dict[str, Any] = {}
         try:
             base_dir = os.path.dirname(__file__)
-            embeddings_path = os.path.join(base_dir, "canonical_embeddings.json")
-            with open(embeddings_path, 'r', encoding='utf-8') as f:
-                self.canonical_embeddings = json.load(f)
-            self.logger.info("기준 임베딩 데이터를 성공적으로 로드했습니다.")
+            self.classifier, self.embedding_artifact_meta = load_canonical_classifier(
+                os.path.join(base_dir, "canonical_embeddings")
+            )
+            self.logger.info(f"기준 임베딩 데이터를 성공적으로 로드했습니다. (형식: {self.embedding_artifact_meta['source']})")
+            artifact_model = self.embedding_artifact_meta.get('model')
+            if artifact_model and artifact_model != self.embedding_provider.model_name:
+                # 다른 모델로 만든 기준 벡터와는 벡터 공간이 달라 유사도가 의미 없으므로 임베딩 분류를 끕니다.
+                self.logger.error(
+                    f"치명적 오류: 기준 임베딩 모델({artifact_model})과 임베딩 제공자 모델({self.embedding_provider.model_name})이 다릅니다! "
+                    f"generate_embeddings.py --provider 옵션으로 기준 임베딩을 다시 생성하세요."
+                )
+                self.classifier = None
         except FileNotFoundError:
             self.logger.error("치명적 오류: canonical_embeddings.json 파일을 찾을 수 없습니다! generate_embeddings.py를 먼저 실행하세요.")
-            self.canonical_embeddings = []
+        except ValueError as e:
+            self.logger.error(f"치명적 오류: 기준 임베딩 아티팩트가 올바르지 않습니다! generate_embeddings.py를 다시 실행하세요. ({e})")
+
+        # 확신할 수 있는 질문은 임베딩 API 없이 로컬에서 분류하는 1차 단계
+        self.lexical_classifier: Optional[LexicalClassifier] = None
+        try:
+            self.lexical_classifier = LexicalClassifier.from_file()
+        except Exception as e:
+            self.logger.warning(f"로컬 어휘 분류기 로드 실패, 임베딩 분류만 사용합니다: {e}")
+        self.chip_hits = 0
 
         # ================== [웜업 코드] ================== #
         try:
             self.logger.info("임베딩 모델 웜업을 시작합니다...")
-            self.embedding_model.get_embeddings(["웜업용 테스트 문장"])
+            self.embedding_provider.warmup()
             self.logger.info("임베딩 모델 웜업이 성공적으로 완료되었습니다.")
         except Exception as e:
             self.logger.error(f"임베딩 모델 웜업 중 오류가 발생했습니다: {e}")
@@ -40,6 +81,29 @@ class AIService(LoggerMixin):
 
         self.MAIN_GUIDE, self.APPENDICES = self._precompute_guidelines()
         self.logger.info("모듈형 가이드라인 계산 완료.")
+
+        # 정적 프롬프트 접두부(가이드라인, 이력서/채용공고)를 위한 Vertex 컨텍스트 캐시
+        self.context_cache = ContextCacheManager()
+
+        # 세션 이력서 청크 인덱스 (문항마다 관련 청크만 프롬프트에 사용). 요청마다 JSON을 다시 풀지 않도록 세션별로 보관합니다.
+        self.resume_retriever = ResumeRetriever(self.embedding_provider)
+        self._resume_indexes = LRUCache(max_entries=64, ttl_seconds=1800)
+
+        # 세션 생성 시 한 번 추출하는 이력서 구조화 프로필 (있으면 원문/발췌 대신 사용). 렌더링 결과를 세션별로 보관합니다.
+        self.resume_profiler = ResumeProfileExtractor()
+        self._resume_profiles = LRUCache(max_entries=64, ttl_seconds=1800)
+
+        # 작업별 입력 토큰 예산 (넘으면 히스토리/채용공고/이력서/부록을 줄여서 전송)
+        self.prompt_budgeter = PromptBudgeter(remote_counter=self._count_tokens_remote)
+        self.history_compactor = RevisionHistoryCompactor()
+
+        # 동일 입력(문항, 이력서, 채용공고, 모델)에 대한 생성/수정 결과 캐시
+        self.model_name = get_vertex_ai_config()['model_name']
+        self.response_cache_config = get_response_cache_config()
+        self.response_cache = LRUCache(
+            max_entries=self.response_cache_config['max_entries'],
+            ttl_seconds=self.response_cache_config['ttl_seconds']
+        )
         self.logger.info("AI 서비스 초기화 완료.")
 
     def _precompute_guidelines(self) -> Tuple[str, Dict[str, str]]:
@@ -180,48 +244,116 @@ class AIService(LoggerMixin):
             return matched_category
         return None
 
+    def _embed_queries(self, questions: List[str]) -> List[List[float]]:
+        """ 질문 임베딩 벡터 목록을 반환합니다. (캐시 우선, 캐시에 없는 질문은 제공자를 한 번만 호출) """
+        vectors: List[Optional[List[float]]] = [self.embedding_cache.get(q, TASK_QUERY) for q in questions]
+        # 같은 질문이 여러 번 들어와도 한 번만 임베딩합니다.
+        missing = list(dict.fromkeys(q for q, v in zip(questions, vectors) if v is None))
+        if len(missing) < len(questions):
+            self.logger.info(f"임베딩 캐시 적중: {len(questions) - len(missing)}/{len(questions)}개 질문의 임베딩 API 호출을 생략합니다.")
+        if missing:
+            embedded = dict(zip(missing, self.embedding_provider.embed(missing, TASK_QUERY)))
+            for question, vector in embedded.items():
+                self.embedding_cache.set(question, TASK_QUERY, vector)
+            vectors = [v if v is not None else embedded[q] for q, v in zip(questions, vectors)]
+        return vectors
+
+    def _embed_query(self, question: str) -> List[float]:
+        """ 질문 임베딩 벡터를 반환합니다. (캐시 우선, 없으면 임베딩 제공자 호출) """
+        return self._embed_queries([question])[0]
+
+    def classify_question_detail(self, question: str, top_k: int = 3) -> Optional[Dict[str, Any]]:
+        """
+        임베딩 분류의 상세 결과(상위 k개 유사도, 1·2위 차이)를 반환합니다.
+        기준 임베딩이 없으면 None을 반환합니다.
+        """
+        if not self.classifier:
+            return None
+        return self.classifier.classify(self._embed_query(question), top_k=top_k)
+
+    def _classify_locally(self, question: str) -> Tuple[bool, Optional[str]]:
+        """
+        임베딩 없이 분류를 시도합니다. (Chip 매칭 -> 로컬 어휘 분류)
+        Returns: (확정 여부, 카테고리)
+        """
+        # 1단계: Chip 매칭 시도
+        if (chip_category := self._match_question_to_chip(question)):
+            self.chip_hits += 1
+            return True, chip_category
+
+        # 2단계: 로컬 어휘 분류 시도
+        if self.lexical_classifier and (lexical := self.lexical_classifier.classify(question)):
+            self.logger.info(f"로컬 분류 성공 ({lexical['method']}): '{question[:20]}...' -> {lexical['category']} (점수: {lexical['score']:.3f}, 차이: {lexical['margin']:.3f})")
+            return True, lexical['category']
+        return False, None
+
+    @track_stage('classification')
     def classify_question_hybrid(self, question: str) -> Optional[str]:
         """
         하이브리드 방식으로 질문을 분류합니다.
         1. Chip 매칭 (정확히 일치)
-        2. 임베딩 분류 (유사도 기반)
+        2. 로컬 어휘 분류 (별칭 매칭 + 문자 n-gram TF-IDF, 확신할 때만)
+        3. 임베딩 분류 (유사도 기반)
         분류 성공 시 카테고리(str) 반환, 실패 시 None 반환.
         """
-        # 1단계: Chip 매칭 시도
-        if (chip_category := self._match_question_to_chip(question)):
-            return chip_category
-        
-        # 2단계: 임베딩 분류 시도
-        if not self.canonical_embeddings:
+        resolved, category = self._classify_locally(question)
+        if resolved:
+            return category
+
+        # 3단계: 임베딩 분류 시도
+        if not self.classifier:
             self.logger.warning("기준 임베딩이 없어 분류를 건너뛰고 None을 반환합니다.")
             return None
 
-        SIMILARITY_THRESHOLD = 0.7  # 신뢰도 임계점 (필요시 조정)
-
         try:
-            inputs = [TextEmbeddingInput(text=question, task_type="RETRIEVAL_QUERY")]
-            response = self.embedding_model.get_embeddings(inputs)
-            question_vector = response[0].values
-            
-            similarities = [(1 - cosine(question_vector, item['vector']), item['key']) for item in self.canonical_embeddings]
-            
-            if not similarities:
-                return None
-            
-            best_match = max(similarities, key=lambda x: x[0])
-            similarity_score, category = best_match[0], best_match[1]
-            
-            if similarity_score >= SIMILARITY_THRESHOLD:
-                self.logger.info(f"임베딩 분류 성공: '{question[:20]}...' -> {category} (유사도: {similarity_score:.3f})")
-                return category
-            else:
-                self.logger.warning(f"임계점 미달: '{question[:20]}...' -> 가장 유사한 항목 '{category}' (유사도: {similarity_score:.3f} < {SIMILARITY_THRESHOLD}). 분류되지 않은 질문으로 처리합니다.")
-                return None
+            result = self.classify_question_detail(question)
+            return self._log_classification(question, result)
 
         except Exception as e:
             self.logger.error(f"임베딩 분류 중 오류 발생: {e}", exc_info=True)
             return None
 
+    @track_stage('classification')
+    def classify_questions_batch(self, questions: List[str]) -> List[Optional[str]]:
+        """
+        여러 질문을 한 번에 분류합니다. (업로드 시 생성 시작 전에 호출)
+        로컬에서 확정되지 않고 캐시에도 없는 질문들은 임베딩 요청 한 번으로 묶어 처리합니다.
+
+        Returns:
+            List[Optional[str]]: 입력 순서와 같은 순서의 카테고리 (분류 실패 시 None)
+        """
+        results: List[Optional[str]] = [None] * len(questions)
+        pending: List[int] = []
+        for i, question in enumerate(questions):
+            resolved, category = self._classify_locally(question)
+            if resolved:
+                results[i] = category
+            else:
+                pending.append(i)
+
+        if not pending:
+            return results
+        if not self.classifier:
+            self.logger.warning("기준 임베딩이 없어 분류를 건너뛰고 None을 반환합니다.")
+            return results
+
+        try:
+            vectors = self._embed_queries([questions[i] for i in pending])
+            for i, result in zip(pending, self.classifier.classify_batch(vectors)):
+                results[i] = self._log_classification(questions[i], result)
+        except Exception as e:
+            self.logger.error(f"일괄 임베딩 분류 중 오류 발생: {e}", exc_info=True)
+        return results
+
+    def _log_classification(self, question: str, result: Dict[str, Any]) -> Optional[str]:
+        """ 임베딩 분류 결과를 로깅하고 카테고리(임계점 미달 시 None)를 반환합니다. """
+        category, similarity_score = result['best_category'], result['score']
+        if result['category']:
+            self.logger.info(f"임베딩 분류 성공: '{question[:20]}...' -> {category} (유사도: {similarity_score:.3f}, 차이: {result['margin']:.3f})")
+            return category
+        self.logger.warning(f"임계점 미달: '{question[:20]}...' -> 가장 유사한 항목 '{category}' (유사도: {similarity_score:.3f} < {SIMILARITY_THRESHOLD}). 분류되지 않은 질문으로 처리합니다.")
+        return None
+
     def _handle_response(self, response) -> str:
         """ generate_content 응답 처리 헬퍼 """
         try:
@@ -233,28 +365,25 @@ class AIService(LoggerMixin):
     def _clean_resume_text(self, text: str) -> str:
         """ 입력 텍스트에서 AI 챗봇이 생성했을 법한 상용구(boilerplate) 문장을 제거합니다. """
         if not text: return ""
-        patterns_to_remove = [
-            "좋습니다. 요청하신 대로", "요청하신 대로", "자소서를 수정해 드리겠습니다.",
-            "AI가 생성한 답변입니다.", "다음은 ...에 대한 답변입니다.", "생성된 자기소개서입니다.",
-            "도움이 되셨기를 바랍니다.", "...에 대한 답변입니다.", "답변:", "답변 :"
-        ]
-        cleaned_text = text
-        for pattern in patterns_to_remove:
-            cleaned_text = cleaned_text.replace(pattern, "")
-        return cleaned_text.strip()
-
-    def _log_token_usage(self, response, operation_type: str, question_preview: str = "", prompt_data: dict = None):
-        """ AI 모델 응답에서 토큰 사용량을 추출하고 로깅합니다. """
+        # 파일 텍스트는 추출 시 normalize_resume_text로 이미 정리되므로 여기서는 상용구만 한 번에 제거합니다.
+        return strip_boilerplate(text).strip()
+
+    def _log_token_usage(self, response, operation_type: str, question_preview: str = "", prompt_data: dict = None,
+                         operation: str = ""):
+        """ AI 모델 응답에서 토큰 사용량을 추출하고 로깅합니다. (operation을 주면 토큰 메트릭에도 누적) """
         try:
             usage_metadata = getattr(response, 'usage_metadata', None)
             if usage_metadata:
                 prompt_token_count = usage_metadata.prompt_token_count
                 candidates_token_count = usage_metadata.candidates_token_count
                 total_token_count = usage_metadata.total_token_count
+                cached_token_count = getattr(usage_metadata, 'cached_content_token_count', 0) or 0
+                if operation:
+                    record_token_usage(operation, prompt_token_count, candidates_token_count, cached_token_count)
                 
                 self.logger.info(f"╭─ AI 토큰 사용량 ({operation_type}) ─╮\n"
                                  f"│ 질문: {question_preview[:30]}...\n"
-                                 f"│ 입력 토큰: {prompt_token_count:,}\n"
+                                 f"│ 입력 토큰: {prompt_token_count:,} (캐시 적중: {cached_token_count:,})\n"
                                  f"│ 출력 토큰: {candidates_token_count:,}\n"
                                  f"│ 총 토큰: {total_token_count:,}\n"
                                  f"╰─────────────────────────────────╯")
@@ -263,72 +392,91 @@ class AIService(LoggerMixin):
         except Exception as e:
             self.logger.error(f"토큰 사용량 로깅 중 오류 발생: {e}")
 
-    def generate_cover_letter(
-        self, question: str, jd_text: str, resume_text: str,
-        company_name: str = "", job_title: str = ""
-    ) -> Tuple[Optional[str], str]:
-        """ 단일 자기소개서 문항 답변을 생성합니다. """
-        try:
-            self.logger.info(f"단일 자기소개서 생성 시작: {question[:50]}...")
-            
-            # 하이브리드 분류기 호출 (결과는 '카테고리 문자열' 또는 None)
-            question_type = self.classify_question_hybrid(question)
-            
-           # 프롬프트에 동적으로 추가될 구성요소를 미리 정의합니다.
-            custom_guideline = ""
-            length_instruction = "" # [수정 1] 글자 수 제한 지시사항을 저장할 변수를 만듭니다 (기본값: 없음).
-
-            # "건너뛰기 모드"인지 판별 (이력서와 JD 텍스트가 모두 비어있는 경우)
-            is_skip_mode = not resume_text.strip() and not (
-                (company_name.strip() and job_title.strip()) or jd_text.strip()
-            )
 
-            # 분류 결과에 따라 가이드라인을 동적으로 구성
-            length_instruction = ""
-            if question_type:
-                # 분류 성공: 핵심 가이드 + 특정 부록
-                specific_appendix = self.APPENDICES.get(question_type, "")
-                custom_guideline = f"{self.MAIN_GUIDE}\n\n{specific_appendix}"
-                self.logger.info(f"'{question_type}' 유형으로 분류되어 해당 부록을 사용합니다.")
-            else:
-                # 분류 실패: 핵심 가이드만 사용 + 글자 수 제한 추가
-                custom_guideline = self.MAIN_GUIDE
-                self.logger.info("질문이 특정 유형으로 분류되지 않아, 핵심 가이드라인만 사용하며 분량 제한을 적용합니다.")
-                length_instruction = "- **분량**: 최종 결과물은 한글 공백 포함 500자 내외로 간결하게 작성하세요.\n"
+    @staticmethod
+    def _submitted_data_section(resume: str, excerpt: str = "") -> str:
+        """ '정보 2: 지원자 제출 자료' 구간 (발췌가 있으면 발췌를 사용) """
+        if excerpt:
+            return f"### 정보 2: 지원자 제출 자료 (이 문항과 관련된 이력서 발췌)\n--- 자료 시작 ---\n{excerpt}\n--- 자료 끝 ---"
+        if resume:
+            return f"### 정보 2: 지원자 제출 자료\n--- 자료 시작 ---\n{resume}\n--- 자료 끝 ---"
+        return "### 정보 2: 지원자 제출 자료\n자료가 제공되지 않았습니다."
+
+    @staticmethod
+    def _place_data_section(section: str, excerpt: str = "") -> Tuple[str, str]:
+        """ 제출 자료 구간을 (세션 블록 앞부분, 요청 블록 앞부분)으로 나눕니다. 발췌는 요청마다 달라 요청 블록에 둡니다. """
+        return ("", section + "\n") if excerpt else (section + "\n", "")
+
+    def _build_cover_letter_prompt(
+        self, question: str, question_type: Optional[str], jd_text: str, resume_text: str,
+        company_name: str = "", job_title: str = "", resume_excerpt: str = ""
+    ) -> Tuple[str, str, str, str]:
+        """
+        자기소개서 생성 프롬프트를 (전역 블록, 세션 블록, 요청 블록, 회사 정보)로 구성합니다.
+        전역/세션 블록은 같은 세션 안에서 변하지 않으므로 컨텍스트 캐시 접두부로 사용됩니다.
+        resume_excerpt(문항별 이력서 발췌)는 문항마다 달라지므로 세션 블록이 아닌 요청 블록에 넣습니다.
+        """
+        # "건너뛰기 모드"인지 판별 (이력서와 JD 텍스트가 모두 비어있는 경우)
+        is_skip_mode = not resume_text.strip() and not resume_excerpt.strip() and not (
+            (company_name.strip() and job_title.strip()) or jd_text.strip()
+        )
+
+        # 분류 결과에 따라 부록과 분량 지시사항을 동적으로 구성
+        specific_appendix = ""
+        length_instruction = ""
+        if question_type:
+            # 분류 성공: 핵심 가이드 + 특정 부록
+            specific_appendix = self.APPENDICES.get(question_type, "")
+            self.logger.info(f"'{question_type}' 유형으로 분류되어 해당 부록을 사용합니다.")
+        else:
+            # 분류 실패: 핵심 가이드만 사용 + 글자 수 제한 추가
+            self.logger.info("질문이 특정 유형으로 분류되지 않아, 핵심 가이드라인만 사용하며 분량 제한을 적용합니다.")
+            length_instruction = "- **분량**: 최종 결과물은 한글 공백 포함 500자 내외로 간결하게 작성하세요.\n"
+
+        company_info = f"{company_name} 회사 정보는 현재 검색 기능이 비활성화되어 있습니다."
+
+        # "건너뛰기 모드"일 때와 아닐 때의 시스템 메시지와 제출 자료 섹션을 다르게 구성합니다.
+        if is_skip_mode:
+            self.logger.info("건너뛰기 모드 감지: 일반적인 답변을 생성합니다.")
+            system_message = "당신은 대한민국 최고의 자기소개서 작성 전문가입니다. 현재 지원자에 대한 구체적인 정보(이력서, 경력)가 제공되지 않았습니다. 당신의 임무는 주어진 질문에 대해, 특정 경험을 꾸며내지 않고 가장 이상적이고 보편적인 내용으로 답변을 작성하는 것입니다."
+            cleaned_resume_text = ""
+            cleaned_excerpt = ""
+        else:
+            system_message = "당신은 대한민국 최고의 자기소개서 작성 전문가입니다. 당신의 임무는 주어진 가이드라인을 **내부적으로, 그리고 엄격하게** 따라서, 지원자의 자료를 전략적으로 분석하고 최고의 답변을 생성하는 것입니다."
+            cleaned_resume_text = self._clean_resume_text(resume_text)
+            cleaned_excerpt = self._clean_resume_text(resume_excerpt)
 
-            company_info = f"{company_name} 회사 정보는 현재 검색 기능이 비활성화되어 있습니다."
-            
-            # [수정] "건너뛰기 모드"일 때와 아닐 때의 시스템 메시지와 제출 자료 섹션을 다르게 구성합니다.
+        # 토큰 예산을 넘으면 prompt_budgeter가 이력서/채용공고/부록을 줄인 값으로 다시 조립합니다.
+        def render(resume: str, jd: str, appendix: str) -> Tuple[str, str, str]:
             if is_skip_mode:
-                self.logger.info("건너뛰기 모드 감지: 일반적인 답변을 생성합니다.")
-                system_message = "당신은 대한민국 최고의 자기소개서 작성 전문가입니다. 현재 지원자에 대한 구체적인 정보(이력서, 경력)가 제공되지 않았습니다. 당신의 임무는 주어진 질문에 대해, 특정 경험을 꾸며내지 않고 가장 이상적이고 보편적인 내용으로 답변을 작성하는 것입니다."
                 submitted_data_section = "### 정보 2: 지원자 제출 자료\n자료가 제공되지 않았습니다. 일반적인 내용으로 작성해야 합니다."
             else:
-                system_message = "당신은 대한민국 최고의 자기소개서 작성 전문가입니다. 당신의 임무는 주어진 가이드라인을 **내부적으로, 그리고 엄격하게** 따라서, 지원자의 자료를 전략적으로 분석하고 최고의 답변을 생성하는 것입니다."
-                cleaned_resume_text = self._clean_resume_text(resume_text)
-                submitted_data_section = f"### 정보 2: 지원자 제출 자료\n--- 자료 시작 ---\n{cleaned_resume_text}\n--- 자료 끝 ---" if cleaned_resume_text else "### 정보 2: 지원자 제출 자료\n자료가 제공되지 않았습니다."
+                submitted_data_section = self._submitted_data_section(resume, cleaned_excerpt)
+            session_data_section, request_data_section = self._place_data_section(submitted_data_section, cleaned_excerpt)
+            appendix_section = f"### 문항 유형별 작성 가이드 (부록)\n아래 부록은 위 '맞춤형 작성 가이드'와 함께 반드시 따라야 하는 이 문항 전용 지침입니다.\n---\n{appendix}\n---\n" if appendix else ""
 
-            prompt = f"""<|system|>
+            global_block = f"""<|system|>
 {system_message}
 |>
 <|user|>
-### 정보 1: 자기소개서 문항
-"{question}"
-{submitted_data_section}
-### 정보 3: 채용공고
+### 맞춤형 작성 가이드
+아래 가이드는 당신이 답변을 생성하기 위해 **머릿속으로 따라야 할 생각의 흐름**입니다. 이 가이드라인을 완벽하게 준수하여 답변의 품질을 극대화하세요.
+---
+{self.MAIN_GUIDE}
+---"""
+
+            session_block = f"""{session_data_section}### 정보 3: 채용공고
 --- 채용공고 시작 ---
-{jd_text}
+{jd}
 --- 채용공고 끝 ---
 ### 정보 4: 회사 추가 정보
 --- 회사 정보 시작 ---
 {company_info}
---- 회사 정보 끝 ---
-### 맞춤형 작성 가이드
-아래 가이드는 당신이 답변을 생성하기 위해 **머릿속으로 따라야 할 생각의 흐름**입니다. 이 가이드라인을 완벽하게 준수하여 답변의 품질을 극대화하세요.
----
-{custom_guideline}
----
-### 🚨 중요 경고: 지원 회사 정보 교차 검증
+--- 회사 정보 끝 ---"""
+
+            request_block = f"""{request_data_section}### 정보 1: 자기소개서 문항
+"{question}"
+{appendix_section}### 🚨 중요 경고: 지원 회사 정보 교차 검증
 - **임무**: 지금 **'{company_name}'** 회사, **'{job_title}'** 직무에 지원하는 글을 작성하고 있다.
 - **오류 확인**: 제출 자료에 다른 회사 이름이 있어도, 절대 최종 결과물에 언급해서는 안 된다.
 - **최종 검증**: 생성할 답변에 '{company_name}' 이외의 회사 이름이 없는지 반드시 확인하라.
@@ -338,63 +486,38 @@ class AIService(LoggerMixin):
 - **형식**: 제목, 헤더, 불릿 없이 오직 완성된 한국어 본문만 작성.
 - **완성도**: 자료 유무와 관계없이 바로 본론으로 시작하는 완성형 글을 작성.
 
-이제, 위 모든 지침을 준수하여 최고의 답변을 작성하세요.
+이제, 위 모든 지침을 준수하여 '정보 1'의 문항에 대한 최고의 답변을 작성하세요.
 |>"""
-            
-            response = self.generation_model.generate_content(prompt)
-            answer = self._handle_response(response)
-            
-            self._log_token_usage(response, "자기소개서 생성", question[:50])
-            self.logger.info("단일 자기소개서 생성 완료")
-            return answer, company_info
+            return global_block, session_block, request_block
 
-        except Exception as e:
-            self.logger.error(f"단일 자기소개서 생성 실패: {e}", exc_info=True)
-            return None, ""
-    
-    def revise_cover_letter(
+        (global_block, session_block, request_block), _ = self.prompt_budgeter.fit(
+            'generate', {'resume': cleaned_resume_text, 'jd': jd_text, 'appendix': specific_appendix}, render
+        )
+        return global_block, session_block, request_block, company_info
+
+    def _build_revision_prompt(
         self, question: str, jd_text: str, resume_text: str, original_answer: str,
         user_edit_prompt: str, company_info: str = "", company_name: str = "",
-        job_title: str = "", answer_history: list = None
-    ) -> Optional[str]:
-        try:
-            self.logger.info(f"자기소개서 수정 시작: {user_edit_prompt[:50]}...")
-
-            if not company_info and company_name:
-                company_info = f"{company_name} 회사 정보는 현재 검색 기능이 비활성화되어 있습니다."
-            
-            cleaned_resume_text = self._clean_resume_text(resume_text)
-            submitted_data_section = f"### 정보 2: 지원자 제출 자료\n--- 자료 시작 ---\n{cleaned_resume_text}\n--- 자료 끝 ---" if cleaned_resume_text else "### 정보 2: 지원자 제출 자료\n자료가 제공되지 않았습니다."
+        job_title: str = "", answer_history: list = None,
+        history_context: Optional[RevisionHistoryContext] = None, resume_excerpt: str = ""
+    ) -> Tuple[str, str, str]:
+        """
+        자기소개서 수정 프롬프트를 (전역 블록, 세션 블록, 요청 블록)으로 구성합니다.
+        resume_excerpt(문항별 이력서 발췌)는 요청마다 달라지므로 세션 블록이 아닌 요청 블록에 넣습니다.
+        """
+        if not company_info and company_name:
+            company_info = f"{company_name} 회사 정보는 현재 검색 기능이 비활성화되어 있습니다."
 
-            answer_history_section = ""
-            if answer_history and len(answer_history) > 1:
-                history_texts = [f"버전 {i}: {v}" for i, v in enumerate(answer_history[:-1], 1)]
-                answer_history_section = f"### 정보 6: 이전 버전 답변 히스토리\n--- 이전 버전들 시작 ---\n{chr(10).join(history_texts)}\n--- 이전 버전들 끝 ---"
+        cleaned_resume_text = self._clean_resume_text(resume_text)
+        cleaned_excerpt = self._clean_resume_text(resume_excerpt)
+        # 이전 버전은 최근 몇 개만 원문으로, 나머지는 변경 요약으로 넣습니다. (히스토리 구간 토큰 상한 적용)
+        if history_context is None:
+            history_context = self.history_compactor.compact(answer_history or [])
 
-            prompt = f"""<|system|>
+        global_block = """<|system|>
 당신은 대한민국 최고의 자기소개서 교정 전문가입니다. 당신의 임무는 주어진 수정 지침을 엄격하게 따라서, 사용자의 의도를 완벽하게 반영한 결과물을 만들어내는 것입니다.
 |>
 <|user|>
-### 정보 1: 자기소개서 문항 (가장 중요한 원본)
-"{question}"
-{submitted_data_section}
-### 정보 3: 채용공고
---- 채용공고 시작 ---
-{jd_text}
---- 채용공고 끝 ---
-### 정보 4: 회사 추가 정보
---- 회사 정보 시작 ---
-{company_info}
---- 회사 정보 끝 ---
-### 정보 5: 수정 대상인 현재 버전 자기소개서
---- 현재 답변 시작 ---
-{original_answer}
---- 현재 답변 끝 ---
-{answer_history_section}
-### 정보 6: 사용자의 수정 요청 사항
-"{user_edit_prompt}"
-
----
 ### 수정 지침 (Thinking Process)
 
 **1. 원본 문항의 요구사항 재확인 (가장 중요):**
@@ -416,7 +539,35 @@ class AIService(LoggerMixin):
 
 **5. 최종 결과물:**
    - 수정 과정이나 당신의 내부 규칙에 대한 언급(예: '[특정 모델명 언급 금지]') 없이, 오직 [1단계]의 모든 요구사항을 충족하는 완성된 최종 본문만 출력하세요.
----
+---"""
+
+        # 토큰 예산을 넘으면 prompt_budgeter가 오래된 히스토리부터 줄인 값으로 다시 조립합니다.
+        def render(resume: str, jd: str, history: List[str]) -> Tuple[str, str, str]:
+            submitted_data_section = self._submitted_data_section(resume, cleaned_excerpt)
+            session_data_section, request_data_section = self._place_data_section(submitted_data_section, cleaned_excerpt)
+
+            answer_history_section = ""
+            if history:
+                answer_history_section = f"### 정보 6: 이전 버전 답변 히스토리\n--- 이전 버전들 시작 ---\n{chr(10).join(history)}\n--- 이전 버전들 끝 ---"
+
+            session_block = f"""{session_data_section}### 정보 3: 채용공고
+--- 채용공고 시작 ---
+{jd}
+--- 채용공고 끝 ---
+### 정보 4: 회사 추가 정보
+--- 회사 정보 시작 ---
+{company_info}
+--- 회사 정보 끝 ---"""
+
+            request_block = f"""{request_data_section}### 정보 1: 자기소개서 문항 (가장 중요한 원본)
+"{question}"
+### 정보 5: 수정 대상인 현재 버전 자기소개서
+--- 현재 답변 시작 ---
+{original_answer}
+--- 현재 답변 끝 ---
+{answer_history_section}
+### 정보 6: 사용자의 수정 요청 사항
+"{user_edit_prompt}"
 
 ### 🚨 중요 경고: 지원 회사 정보 교차 검증
 - **임무**: 지금 **'{company_name}'** 회사, **'{job_title}'** 직무의 글을 수정하고 있다.
@@ -424,13 +575,237 @@ class AIService(LoggerMixin):
 
 이제, 위 '수정 지침'을 반드시 따라서 최종 결과물을 작성하세요.
 |>"""
-            response = self.generation_model.generate_content(prompt)
+            return global_block, session_block, request_block
+
+        blocks, _ = self.prompt_budgeter.fit(
+            'revise', {'resume': cleaned_resume_text, 'jd': jd_text, 'history': history_context.entries}, render
+        )
+        return blocks
+
+    def build_resume_index(self, resume_text: str) -> Optional[str]:
+        """
+        세션 생성 시 이력서를 청크로 나눠 한 번에 임베딩합니다.
+
+        Returns:
+            str: sessions.resume_chunks에 저장할 값 (짧은 이력서이거나 실패하면 None)
+        """
+        index = self.resume_retriever.build_index(resume_text)
+        return index.to_json() if index else None
+
+    def build_resume_profile(self, resume_text: str) -> Optional[str]:
+        """
+        세션 생성 시 이력서에서 경험/역할/기술/정량 성과를 구조화 프로필로 한 번 추출합니다.
+
+        Returns:
+            str: sessions.resume_profile에 저장할 값 (짧은 이력서, 비활성화, 추출/검증 실패 시 None)
+        """
+        if not self.resume_profiler.should_extract(resume_text):
+            return None
+        try:
+            with track_stage('profile_extraction', dependency='vertex'):
+                response = self.generation_model.generate_content(
+                    self.resume_profiler.build_prompt(resume_text),
+                    generation_config=self.resume_profiler.generation_config()
+                )
+        except Exception as e:
+            self.logger.warning(f"이력서 프로필 추출 실패, 원문을 사용합니다: {e}")
+            return None
+        self._log_token_usage(response, "이력서 프로필 추출", operation='profile')
+        profile = self.resume_profiler.parse(self._handle_response(response), resume_text)
+        return profile.to_json() if profile else None
+
+    def _load_resume_profile(self, resume_profile: Optional[str], session_id: str) -> Optional[str]:
+        if not resume_profile:
+            return None
+        cache_key = (session_id, len(resume_profile)) if session_id else None
+        rendered = self._resume_profiles.get(cache_key) if cache_key else None
+        if rendered is None:
+            profile = self.resume_profiler.load(resume_profile)
+            if profile is None:
+                return None
+            rendered = profile.render()
+            if cache_key:
+                self._resume_profiles.set(cache_key, rendered)
+        return rendered
+
+    def _load_resume_index(self, resume_chunks: Optional[str], session_id: str) -> Optional[ResumeIndex]:
+        if not resume_chunks:
+            return None
+        cache_key = (session_id, len(resume_chunks)) if session_id else None
+        index = self._resume_indexes.get(cache_key) if cache_key else None
+        if index is None:
+            index = self.resume_retriever.load_index(resume_chunks)
+            if index is not None and cache_key:
+                self._resume_indexes.set(cache_key, index)
+        return index
+
+    def _resume_context(
+        self, resume_text: str, resume_chunks: Optional[str], question: str, jd_text: str,
+        session_id: str = "", extra_query: str = "", resume_profile: Optional[str] = None
+    ) -> Tuple[str, str]:
+        """
+        프롬프트에 넣을 지원자 자료를 고릅니다.
+        구조화 프로필 → (인덱스가 있으면) 문항(+수정 요청, 채용공고)과 관련된 이력서 청크 → 전체 이력서 순으로 사용합니다.
+
+        Returns:
+            Tuple[str, str]: (세션 블록에 넣을 자료, 요청 블록에 넣을 발췌). 둘 중 하나만 값이 있습니다.
+        """
+        profile_text = self._load_resume_profile(resume_profile, session_id)
+        if profile_text:
+            return profile_text, ""
+        index = self._load_resume_index(resume_chunks, session_id)
+        if index is None:
+            return resume_text, ""
+        try:
+            # 검색 쿼리는 문항/수정 요청마다 달라 재사용되지 않으므로, 질문 임베딩 캐시를 거치지 않고 제공자를 바로 호출합니다.
+            query_vector = self.embedding_provider.embed_one(
+                self.resume_retriever.make_query(question, jd_text, extra_query), TASK_QUERY
+            )
+        except Exception as e:
+            self.logger.warning(f"이력서 검색 쿼리 임베딩 실패, 전체 이력서를 사용합니다: {e}")
+            return resume_text, ""
+        excerpt = self.resume_retriever.select(index, query_vector)
+        self.logger.info(f"이력서 발췌 사용: {len(resume_text):,}자 -> {len(excerpt):,}자 ({len(index.chunks)}개 청크 중 선택)")
+        return "", excerpt
+
+    def _count_tokens_remote(self, text: str) -> int:
+        """ 생성 모델의 count_tokens로 실제 토큰 수를 셉니다. (토큰 추정기 보정용) """
+        return self.generation_model.count_tokens(text).total_tokens
+
+    def compact_revision_history(self, answer_history: list, stored_digest: Optional[str] = None) -> RevisionHistoryContext:
+        """
+        수정 프롬프트용 히스토리를 압축합니다. 반환값의 stored가 있으면 questions.history_digest에 저장하세요.
+
+        Args:
+            answer_history: 현재 버전까지의 답변 히스토리
+            stored_digest: questions.history_digest에 저장된 이전 요약
+        """
+        return self.history_compactor.compact(answer_history or [], stored_digest)
+
+    def get_prompt_budget_stats(self) -> Dict[str, Any]:
+        """ 프롬프트 토큰 예산 적용 횟수와 토큰 추정기 보정 상태 반환 """
+        return self.prompt_budgeter.get_stats()
+
+    def get_response_cache_stats(self) -> Dict[str, Any]:
+        """ 응답 캐시 적중/미스 통계 반환 """
+        return self.response_cache.get_stats()
+
+    def get_classification_stats(self) -> Dict[str, Any]:
+        """ 질문 분류 단계별 통계 반환 (remote_calls_saved = chip 매칭 + 로컬 분류로 생략한 임베딩 API 호출 수) """
+        stats = self.lexical_classifier.get_stats() if self.lexical_classifier else {'remote_calls_saved': 0}
+        stats['chip_hits'] = self.chip_hits
+        stats['remote_calls_saved'] += self.chip_hits
+        stats['embedding_cache'] = self.embedding_cache.get_stats()
+        if hasattr(self.embedding_provider, 'get_stats'):
+            stats['embedding_batches'] = self.embedding_provider.get_stats()
+        return stats
+
+    def get_context_cache_stats(self) -> Dict[str, Any]:
+        """ 컨텍스트 캐시 적중 지표 반환 """
+        return self.context_cache.get_stats()
+
+    def invalidate_session_cache(self, session_id: str) -> int:
+        """ 세션 삭제 시 해당 세션의 컨텍스트 캐시를 정리합니다. """
+        return self.context_cache.invalidate_session(session_id)
+
+    def generate_cover_letter(
+        self, question: str, jd_text: str, resume_text: str,
+        company_name: str = "", job_title: str = "", session_id: str = "",
+        bypass_cache: bool = False, question_type: Any = NOT_CLASSIFIED, resume_chunks: Optional[str] = None,
+        resume_profile: Optional[str] = None
+    ) -> Tuple[Optional[str], str]:
+        """
+        단일 자기소개서 문항 답변을 생성합니다.
+        응답 캐시는 RESPONSE_CACHE_GENERATE=true일 때만 사용하며,
+        bypass_cache=True ("다시 생성")이면 캐시를 조회하지 않고 새로 생성한 결과로 캐시를 갱신합니다.
+        question_type에 classify_questions_batch()의 결과(카테고리 또는 None)를 넘기면 분류를 다시 하지 않습니다.
+        resume_chunks(세션에 저장된 build_resume_index() 결과)를 넘기면 문항과 관련된 이력서 청크만 사용합니다.
+        resume_profile(세션에 저장된 build_resume_profile() 결과)이 있으면 원문/청크보다 우선 사용합니다.
+        """
+        try:
+            self.logger.info(f"단일 자기소개서 생성 시작: {question[:50]}...")
+
+            cache_key = make_cache_key(
+                'generate', self.model_name, question, jd_text, resume_text, company_name, job_title
+            )
+            use_cache = self.response_cache_config['enabled'] and self.response_cache_config['cache_generate']
+            if use_cache and not bypass_cache:
+                cached = self.response_cache.get(cache_key)
+                if cached is not None:
+                    self.logger.info("응답 캐시 적중: 이전에 생성된 답변을 반환합니다.")
+                    return cached
+            
+            # 하이브리드 분류기 호출 (결과는 '카테고리 문자열' 또는 None)
+            if question_type is NOT_CLASSIFIED:
+                question_type = self.classify_question_hybrid(question)
+
+            prompt_resume, resume_excerpt = self._resume_context(
+                resume_text, resume_chunks, question, jd_text, session_id, resume_profile=resume_profile
+            )
+            global_block, session_block, request_block, company_info = self._build_cover_letter_prompt(
+                question, question_type, jd_text, prompt_resume, company_name, job_title, resume_excerpt
+            )
+
+            # 정적 접두부(가이드라인 + 이력서/채용공고)는 컨텍스트 캐시를 통해 재사용합니다.
+            with track_stage('generation', dependency='vertex'):
+                response = self.context_cache.generate_content(
+                    self.generation_model, global_block, session_block, request_block,
+                    session_key=session_id
+                )
+            answer = self._handle_response(response)
+            
+            self._log_token_usage(response, "자기소개서 생성", question[:50], operation='generate')
+            self.logger.info("단일 자기소개서 생성 완료")
+            if answer and use_cache:
+                self.response_cache.set(cache_key, (answer, company_info))
+            return answer, company_info
+
+        except Exception as e:
+            self.logger.error(f"단일 자기소개서 생성 실패: {e}", exc_info=True)
+            return None, ""
+    
+    def revise_cover_letter(
+        self, question: str, jd_text: str, resume_text: str, original_answer: str,
+        user_edit_prompt: str, company_info: str = "", company_name: str = "",
+        job_title: str = "", answer_history: list = None, session_id: str = "",
+        bypass_cache: bool = False, resume_chunks: Optional[str] = None,
+        history_context: Optional[RevisionHistoryContext] = None, resume_profile: Optional[str] = None
+    ) -> Optional[str]:
+        try:
+            self.logger.info(f"자기소개서 수정 시작: {user_edit_prompt[:50]}...")
+
+            cache_key = make_cache_key(
+                'revise', self.model_name, question, jd_text, resume_text, original_answer,
+                user_edit_prompt, company_info, company_name, job_title, list(answer_history or [])
+            )
+            if self.response_cache_config['enabled'] and not bypass_cache:
+                cached = self.response_cache.get(cache_key)
+                if cached is not None:
+                    self.logger.info("응답 캐시 적중: 동일한 수정 요청의 이전 결과를 반환합니다.")
+                    return cached
+
+            prompt_resume, resume_excerpt = self._resume_context(
+                resume_text, resume_chunks, question, jd_text, session_id, extra_query=user_edit_prompt,
+                resume_profile=resume_profile
+            )
+            global_block, session_block, request_block = self._build_revision_prompt(
+                question, jd_text, prompt_resume, original_answer, user_edit_prompt,
+                company_info, company_name, job_title, answer_history, history_context, resume_excerpt
+            )
+
+            with track_stage('generation', dependency='vertex'):
+                response = self.context_cache.generate_content(
+                    self.generation_model, global_block, session_block, request_block,
+                    session_key=session_id
+                )
             revised_answer = self._handle_response(response)
             
-            self._log_token_usage(response, "자기소개서 수정", user_edit_prompt[:50])
+            self._log_token_usage(response, "자기소개서 수정", user_edit_prompt[:50], operation='revise')
             self.logger.info("자기소개서 수정 완료")
+            if revised_answer and self.response_cache_config['enabled']:
+                self.response_cache.set(cache_key, revised_answer)
             return revised_answer
             
         except Exception as e:
             self.logger.error(f"자기소개서 수정 실패: {e}", exc_info=True)
-            return None
\ No newline at end of file
+            return None
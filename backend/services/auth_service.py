@@ -3,22 +3,35 @@ Supabase 인증 서비스
 """
 
 import os
-from supabase import create_client, Client
 from typing import Optional, Dict, Any
 
+from utils.logger import get_logger
+from utils.metrics import track_stage
+
+logger = get_logger(__name__)
+
 class AuthService:
     """Supabase 인증 서비스"""
     
-    def __init__(self):
+    def __init__(self, client=None):
+        """
+        Args:
+            client: Supabase 클라이언트 (미지정 시 환경 변수로 생성, 부하 테스트에서는 대역 클라이언트 주입)
+        """
         # 프로젝트 URL은 환경 변수로 관리
         self.supabase_url = os.getenv("SUPABASE_URL")
         self.supabase_key = os.getenv("SUPABASE_ANON_KEY")
+        if client is not None:
+            self.client = client
+            return
         
         if not self.supabase_url:
             raise ValueError("SUPABASE_URL 환경 변수가 설정되지 않았습니다.")
         if not self.supabase_key:
             raise ValueError("SUPABASE_ANON_KEY 환경 변수가 설정되지 않았습니다.")
         
+        # supabase 패키지는 인증 서비스가 처음 필요할 때 임포트합니다. (앱 기동 시간 단축)
+        from supabase import create_client
         self.client = create_client(self.supabase_url, self.supabase_key)
     
     def get_google_auth_url(self) -> str:
@@ -78,6 +91,7 @@ class AuthService:
                 "message": f"로그아웃 오류: {str(e)}"
             }
     
+    @track_stage('auth', dependency='supabase')
     def get_user(self, access_token: str) -> Optional[Dict[str, Any]]:
         """토큰으로 사용자 정보 조회"""
         try:
@@ -102,7 +116,7 @@ class AuthService:
             return None
             
         except Exception as e:
-            print(f"사용자 정보 조회 오류: {str(e)}")
+            logger.warning(f"사용자 정보 조회 오류: {str(e)}")
             return None
     
     def refresh_token(self, refresh_token: str) -> Dict[str, Any]:
@@ -0,0 +1,222 @@
+"""
+부트스트랩 코디네이터 - 외부 클라이언트(Supabase, Vertex, 임베딩, Vision, 인증)의 동시 초기화와 준비 상태 관리
+
+각 의존성은 이름, 초기화 함수, 선행 의존성으로 등록합니다.
+start()는 선행 의존성이 없는 항목부터 스레드 풀에서 동시에 초기화하고,
+get()은 초기화가 끝날 때까지 기다리거나(진행 중인 경우) 그 자리에서 초기화합니다(아직 시작 전이거나, 실패 후 재시도 간격이 지난 경우).
+재시도 간격 안에 있는 실패한 의존성은 초기화를 다시 시도하지 않고 마지막 오류를 바로 던집니다. (장애 중 모든 요청이 초기화를 기다리지 않도록)
+준비 상태(readiness)는 status()로 조회하여 로드밸런서가 예열된 워커에만 트래픽을 보내도록 합니다.
+retry_pending()은 아직 시작하지 않았거나(예열 비활성화) 실패한 필수 의존성을 백그라운드에서 다시 초기화합니다.
+실패한 항목은 실패 횟수에 따라 재시도 간격을 늘립니다.
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+from utils.logger import LoggerMixin
+
+PENDING = 'pending'
+WARMING = 'warming'
+READY = 'ready'
+FAILED = 'failed'
+
+
+class _Dependency:
+    """등록된 의존성 한 건의 초기화 상태"""
+
+    def __init__(self, name: str, factory: Callable[..., Any], depends_on: List[str], required: bool):
+        self.name = name
+        self.factory = factory
+        self.depends_on = depends_on
+        self.required = required
+        self.state = PENDING
+        self.value: Any = None
+        self.error: Optional[str] = None
+        self.exception: Optional[BaseException] = None
+        self.elapsed_ms: Optional[int] = None
+        self.failures = 0
+        self.retry_at = 0.0
+        # 백그라운드 초기화가 예약되어 실행을 기다리는 중인지 여부 (중복 예약 방지)
+        self.scheduled = False
+        self.lock = threading.Lock()
+        self.done = threading.Event()
+
+
+class BootstrapCoordinator(LoggerMixin):
+    """외부 클라이언트 동시 초기화 및 준비 상태 관리"""
+
+    def __init__(self, max_workers: int = 6, retry_backoff: float = 2.0, max_retry_backoff: float = 60.0):
+        """
+        Args:
+            max_workers: 동시에 초기화할 최대 의존성 수
+            retry_backoff: 첫 실패 후 재시도까지 기다리는 시간(초). 실패할 때마다 두 배로 늘어납니다.
+            max_retry_backoff: 재시도 간격 상한(초)
+        """
+        self._dependencies: Dict[str, _Dependency] = {}
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._max_workers = max_workers
+        self._retry_backoff = retry_backoff
+        self._max_retry_backoff = max_retry_backoff
+        self._started_at: Optional[float] = None
+        self._schedule_lock = threading.Lock()
+
+    def register(
+        self, name: str, factory: Callable[..., Any], depends_on: Optional[List[str]] = None,
+        required: bool = True
+    ) -> None:
+        """
+        의존성을 등록합니다.
+
+        Args:
+            name: 의존성 이름 (준비 상태 응답의 키)
+            factory: 초기화 함수. 선행 의존성의 값이 depends_on 순서대로 인자로 전달됩니다.
+            depends_on: 먼저 초기화되어야 하는 의존성 이름 목록
+            required: False면 초기화에 실패해도 준비 상태(ready)에 영향을 주지 않습니다.
+        """
+        self._dependencies[name] = _Dependency(name, factory, list(depends_on or []), required)
+
+    def start(self) -> None:
+        """모든 의존성의 초기화를 백그라운드에서 동시에 시작합니다."""
+        with self._schedule_lock:
+            if self._executor is not None:
+                return
+            self._started_at = time.time()
+            self._executor = ThreadPoolExecutor(max_workers=self._max_workers, thread_name_prefix="bootstrap")
+            self.logger.info(f"부트스트랩 시작: {', '.join(self._dependencies)}")
+            for name in self._dependencies:
+                self._schedule(name)
+
+    def retry_pending(self) -> List[str]:
+        """
+        시작 전(PENDING)이거나 실패한(FAILED) 필수 의존성의 초기화를 백그라운드에서 다시 시작합니다.
+
+        실패한 항목은 재시도 간격(실패할 때마다 두 배, 상한 max_retry_backoff)이 지난 경우에만 다시 시도합니다.
+        readiness 엔드포인트에서 호출하여, 예열을 끈 경우나 일시적인 실패 후에도 준비 상태로 돌아올 수 있게 합니다.
+
+        Returns:
+            List[str]: 이번 호출에서 초기화를 예약한 의존성 이름
+        """
+        now = time.time()
+        scheduled = []
+        with self._schedule_lock:
+            if self._executor is None:
+                self._started_at = now
+                self._executor = ThreadPoolExecutor(max_workers=self._max_workers, thread_name_prefix="bootstrap")
+            for name, dependency in self._dependencies.items():
+                if not dependency.required or dependency.scheduled:
+                    continue
+                if dependency.state == PENDING or (dependency.state == FAILED and now >= dependency.retry_at):
+                    self._schedule(name)
+                    scheduled.append(name)
+        if scheduled:
+            self.logger.info(f"부트스트랩 재시도: {', '.join(scheduled)}")
+        return scheduled
+
+    def get(self, name: str, timeout: Optional[float] = None) -> Any:
+        """
+        초기화된 의존성 값을 반환합니다.
+
+        백그라운드 초기화가 진행 중이면 끝날 때까지 기다리고,
+        아직 시작하지 않았거나 실패 후 재시도 간격이 지났다면 현재 스레드에서 초기화합니다.
+
+        Raises:
+            Exception: 초기화 실패 시 초기화 함수가 던진 예외 (재시도 간격 안이면 마지막 실패 예외)
+            TimeoutError: timeout 안에 초기화가 끝나지 않은 경우
+        """
+        dependency = self._dependencies[name]
+        if dependency.state == READY:
+            return dependency.value
+        if dependency.state == WARMING:
+            if not dependency.done.wait(timeout):
+                raise TimeoutError(f"'{name}' 초기화 대기 시간 초과")
+            if dependency.state == READY:
+                return dependency.value
+        self._raise_if_backing_off(dependency)
+        return self._initialize(name)
+
+    def get_if_ready(self, name: str) -> Any:
+        """초기화가 끝난 경우에만 값을 반환하고, 아니면 None을 반환합니다. (초기화를 유발하지 않음)"""
+        dependency = self._dependencies.get(name)
+        return dependency.value if dependency and dependency.state == READY else None
+
+    def is_ready(self) -> bool:
+        """필수 의존성이 모두 초기화되었는지 여부"""
+        return all(d.state == READY for d in self._dependencies.values() if d.required)
+
+    def status(self) -> Dict[str, Any]:
+        """의존성별 준비 상태 (readiness 엔드포인트 응답)"""
+        return {
+            'ready': self.is_ready(),
+            'started': self._started_at is not None,
+            'uptime_seconds': round(time.time() - self._started_at, 1) if self._started_at else None,
+            'dependencies': {
+                name: {
+                    'state': d.state,
+                    'required': d.required,
+                    'elapsed_ms': d.elapsed_ms,
+                    'failures': d.failures,
+                    'error': d.error
+                }
+                for name, d in self._dependencies.items()
+            }
+        }
+
+    # ------------------------------------------------------------------ #
+    # 내부 구현
+    # ------------------------------------------------------------------ #
+    @staticmethod
+    def _raise_if_backing_off(dependency: _Dependency) -> None:
+        """실패 후 재시도 간격 안이면 마지막 실패 예외를 다시 던집니다. (재시도는 retry_pending()이 담당)"""
+        if dependency.state == FAILED and time.time() < dependency.retry_at and dependency.exception is not None:
+            raise dependency.exception
+
+    def _schedule(self, name: str) -> None:
+        """백그라운드 초기화 예약 (self._schedule_lock 보유 상태에서 호출)"""
+        self._dependencies[name].scheduled = True
+        self._executor.submit(self._safe_initialize, name)
+
+    def _safe_initialize(self, name: str) -> None:
+        try:
+            self._initialize(name)
+        except Exception:
+            # 실패 내용은 상태에 기록되었고, 이후 get() 또는 retry_pending() 호출 시 다시 시도합니다.
+            pass
+        finally:
+            self._dependencies[name].scheduled = False
+
+    def _initialize(self, name: str) -> Any:
+        dependency = self._dependencies[name]
+        # 선행 의존성은 락 밖에서 준비합니다. (같은 선행 의존성을 여러 항목이 기다릴 수 있음)
+        inputs = [self.get(parent) for parent in dependency.depends_on]
+
+        with dependency.lock:
+            if dependency.state == READY:
+                return dependency.value
+            dependency.state = WARMING
+            dependency.error = None
+            dependency.done.clear()
+            started = time.time()
+            try:
+                value = dependency.factory(*inputs)
+            except Exception as e:
+                dependency.state = FAILED
+                dependency.error = str(e)
+                dependency.exception = e
+                dependency.elapsed_ms = int((time.time() - started) * 1000)
+                dependency.failures += 1
+                backoff = min(self._retry_backoff * (2 ** (dependency.failures - 1)), self._max_retry_backoff)
+                dependency.retry_at = time.time() + backoff
+                self.logger.error(f"'{name}' 초기화 실패 ({dependency.elapsed_ms}ms, {backoff:.0f}초 후 재시도 가능): {e}")
+                raise
+            else:
+                dependency.value = value
+                dependency.state = READY
+                dependency.failures = 0
+                dependency.exception = None
+                dependency.elapsed_ms = int((time.time() - started) * 1000)
+                self.logger.info(f"'{name}' 초기화 완료 ({dependency.elapsed_ms}ms)")
+                return value
+            finally:
+                dependency.done.set()
@@ -0,0 +1,291 @@
+"""
+컨텍스트 캐시 서비스 - Vertex AI cached content 기반 프롬프트 접두부 캐싱
+
+프롬프트를 '전역 블록(시스템 메시지 + 가이드라인)' → '세션 블록(이력서 + 채용공고)'
+→ '요청 블록(문항 또는 수정 요청)' 순서로 구성하면, 앞의 두 블록은 같은 세션 안에서
+변하지 않으므로 Vertex에 한 번만 올려두고 재사용할 수 있습니다.
+
+전역 블록만 따로 캐시하지는 않습니다. 가이드라인은 추정 1.0~1.2k 토큰으로 Vertex 캐시 최소 토큰 수(4096)에
+한참 못 미치고, 문항 유형별 부록은 요청마다 달라 접두부에 넣을 수 없기 때문입니다.
+"""
+
+import hashlib
+import threading
+import time
+import datetime
+from typing import Dict, Any, Optional
+
+from utils.logger import LoggerMixin
+from utils.token_budget import estimate_tokens
+from config.settings import get_context_cache_config, GEMINI_MODEL_NAME
+
+
+def _same_session(key: str, other: str) -> bool:
+    """'session:{세션 ID}:{해시}' 형식의 두 키가 같은 세션의 것인지 (세션 ID가 없는 키는 묶지 않음)"""
+    prefix = key.rsplit(':', 1)[0]
+    return prefix != 'session:' and prefix == other.rsplit(':', 1)[0]
+
+
+class _CacheEntry:
+    """Vertex cached content 한 건과 그 로컬 메타데이터"""
+
+    def __init__(self, scope: str, cached_content, model, ttl_seconds: int):
+        self.scope = scope
+        self.cached_content = cached_content
+        self.model = model
+        self.ttl_seconds = ttl_seconds
+        self.created_at = time.time()
+        self.expires_at = self.created_at + ttl_seconds
+        self.last_used_at = self.created_at
+        self.uses = 0
+
+
+class ContextCacheManager(LoggerMixin):
+    """세션 범위의 Vertex 컨텍스트 캐시 관리자 (TTL 연장, 개수 제한, 적중 지표 포함)"""
+
+    def __init__(self, model_name: str = GEMINI_MODEL_NAME, config: Optional[Dict[str, Any]] = None):
+        self.model_name = model_name
+        self.config = config or get_context_cache_config()
+        self.enabled = self.config['enabled']
+
+        self._entries: Dict[str, _CacheEntry] = {}
+        # 생성 실패(최소 토큰 미달 등)한 키는 재시도하지 않도록 만료 시각까지 기억합니다.
+        # 실패 기록은 항목이 만료/제거되거나 실패 기록이 만료되면 함께 정리합니다.
+        self._failed_keys: Dict[str, float] = {}
+        # 키별 생성 락과 사용 중인 스레드 수. 락을 잡고 있거나 기다리는 스레드가 없어질 때만 제거합니다.
+        # (생성 중인 키의 락을 지우면 다른 스레드가 새 락으로 같은 캐시를 중복 생성할 수 있음)
+        self._key_locks: Dict[str, threading.Lock] = {}
+        self._key_lock_users: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+        self._stats = {
+            'requests': 0,
+            'session_hits': 0,
+            'creates': 0,
+            'create_failures': 0,
+            'uncached_requests': 0,
+            'evictions': 0,
+            'prompt_tokens': 0,
+            'cached_tokens': 0
+        }
+
+    # ------------------------------------------------------------------ #
+    # 공개 API
+    # ------------------------------------------------------------------ #
+    def generate_content(
+        self, base_model, global_block: str, session_block: str, request_block: str,
+        session_key: str = ""
+    ):
+        """
+        캐시 가능한 접두부를 활용하여 generate_content를 호출합니다.
+
+        1. 전역 블록 + 세션 블록이 최소 토큰 수를 넘으면 세션 캐시 사용
+        2. 아니면 전체 프롬프트를 그대로 전송
+
+        Returns:
+            Vertex 응답 객체
+        """
+        self._increment('requests')
+        full_prompt = f"{global_block}\n{session_block}\n{request_block}"
+
+        if not self.enabled:
+            self._increment('uncached_requests')
+            return self._record_usage(base_model.generate_content(full_prompt))
+
+        session_prefix = f"{global_block}\n{session_block}"
+        entry = None
+        contents = request_block
+
+        if self._estimate_tokens(session_prefix) >= self.config['min_tokens']:
+            key = self._make_key('session', session_key, session_prefix)
+            entry = self._get_or_create(key, 'session', session_prefix, self.config['session_ttl_seconds'])
+
+        if entry is None:
+            self._increment('uncached_requests')
+            return self._record_usage(base_model.generate_content(full_prompt))
+
+        try:
+            response = entry.model.generate_content(contents)
+        except Exception as e:
+            # 원격 캐시가 이미 만료/삭제된 경우 등: 로컬 항목을 버리고 캐시 없이 한 번 더 시도합니다.
+            self.logger.warning(f"캐시된 컨텍스트로 생성 실패, 캐시 없이 재시도합니다: {e}")
+            self._drop_entry(entry)
+            self._increment('uncached_requests')
+            return self._record_usage(base_model.generate_content(full_prompt))
+
+        self._increment('session_hits')
+        return self._record_usage(response)
+
+    def invalidate_session(self, session_key: str) -> int:
+        """특정 세션의 캐시 항목을 모두 삭제합니다. 삭제된 항목 수를 반환합니다."""
+        if not session_key:
+            return 0
+        prefix = f"session:{session_key}:"
+        with self._lock:
+            targets = [self._forget_key(key) for key in list(self._entries) if key.startswith(prefix)]
+            for key in [k for k in list(self._failed_keys) if k.startswith(prefix)]:
+                self._forget_key(key)
+        for entry in targets:
+            self._delete_remote(entry)
+        return len(targets)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """캐시 적중 지표 반환 (cached_token_ratio = 캐시에서 제공된 입력 토큰 비율)"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats['active_entries'] = len(self._entries)
+        prompt_tokens = stats['prompt_tokens']
+        stats['cached_token_ratio'] = round(stats['cached_tokens'] / prompt_tokens, 4) if prompt_tokens else 0.0
+        stats['hit_rate'] = round(stats['session_hits'] / stats['requests'], 4) if stats['requests'] else 0.0
+        return stats
+
+    # ------------------------------------------------------------------ #
+    # 내부 구현
+    # ------------------------------------------------------------------ #
+    def _make_key(self, scope: str, session_key: str, text: str) -> str:
+        digest = hashlib.sha256(f"{self.model_name}\n{text}".encode('utf-8')).hexdigest()[:32]
+        return f"{scope}:{session_key}:{digest}"
+
+    @staticmethod
+    def _estimate_tokens(text: str) -> int:
+        """캐시 최소 토큰 수 판단용 추정 (프롬프트 예산과 같은 한국어 보정 추정기 사용)"""
+        return estimate_tokens(text)
+
+    def _get_or_create(self, key: str, scope: str, text: str, ttl_seconds: int) -> Optional[_CacheEntry]:
+        now = time.time()
+        with self._lock:
+            failed_until = self._failed_keys.get(key)
+            if failed_until and failed_until > now:
+                return None
+            if failed_until:
+                self._failed_keys.pop(key, None)
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+            self._key_lock_users[key] = self._key_lock_users.get(key, 0) + 1
+
+        # 같은 키에 대한 동시 생성을 막되, 다른 키의 조회는 막지 않도록 키별 락을 사용합니다.
+        try:
+            return self._get_or_create_locked(key, key_lock, scope, text, ttl_seconds, now)
+        finally:
+            self._release_key_lock(key)
+
+    def _get_or_create_locked(self, key: str, key_lock: threading.Lock, scope: str, text: str,
+                              ttl_seconds: int, now: float) -> Optional[_CacheEntry]:
+        with key_lock:
+            with self._lock:
+                # 락을 기다리는 동안 앞선 스레드가 생성에 실패했으면 다시 시도하지 않습니다.
+                if self._failed_keys.get(key, 0) > now:
+                    return None
+                entry = self._entries.get(key)
+                if entry and entry.expires_at <= now:
+                    self._entries.pop(key, None)
+                    entry = None
+
+            if entry:
+                self._touch(entry)
+                return entry
+
+            entry = self._create(scope, text, ttl_seconds)
+            with self._lock:
+                self._prune_stale(now)
+                if entry is None:
+                    self._failed_keys[key] = now + ttl_seconds
+                    return None
+                self._entries[key] = entry
+                # 같은 세션의 접두부가 바뀌면(이력서/채용공고 수정 등) 이전 접두부 캐시는 다시 쓰이지 않으므로 바로 정리합니다.
+                stale = [self._forget_key(k) for k in list(self._entries) if k != key and _same_session(k, key)]
+                self._evict_if_needed()
+            for old in stale:
+                threading.Thread(target=self._delete_remote, args=(old,), daemon=True).start()
+            return entry
+
+    def _create(self, scope: str, text: str, ttl_seconds: int) -> Optional[_CacheEntry]:
+        try:
+            from vertexai.preview import caching
+            from vertexai.preview.generative_models import GenerativeModel, Content, Part
+
+            cached_content = caching.CachedContent.create(
+                model_name=self.model_name,
+                contents=[Content(role="user", parts=[Part.from_text(text)])],
+                ttl=datetime.timedelta(seconds=ttl_seconds),
+                display_name=f"sseojum-{scope}"
+            )
+            model = GenerativeModel.from_cached_content(cached_content=cached_content)
+            self._increment('creates')
+            self.logger.info(f"컨텍스트 캐시 생성 완료 ({scope}, TTL {ttl_seconds}s)")
+            return _CacheEntry(scope, cached_content, model, ttl_seconds)
+        except Exception as e:
+            self._increment('create_failures')
+            self.logger.warning(f"컨텍스트 캐시 생성 실패 ({scope}), 캐시 없이 진행합니다: {e}")
+            return None
+
+    def _touch(self, entry: _CacheEntry) -> None:
+        """사용 기록을 갱신하고, 만료가 임박한 캐시는 TTL을 연장합니다."""
+        entry.uses += 1
+        entry.last_used_at = time.time()
+        remaining = entry.expires_at - entry.last_used_at
+        if remaining < entry.ttl_seconds / 4:
+            try:
+                entry.cached_content.update(ttl=datetime.timedelta(seconds=entry.ttl_seconds))
+                entry.expires_at = time.time() + entry.ttl_seconds
+            except Exception as e:
+                self.logger.warning(f"컨텍스트 캐시 TTL 연장 실패: {e}")
+
+    def _evict_if_needed(self) -> None:
+        """세션 캐시 개수가 상한을 넘으면 가장 오래 사용되지 않은 항목부터 제거합니다. (self._lock 보유 상태에서 호출)"""
+        session_keys = [key for key, entry in self._entries.items() if entry.scope == 'session']
+        overflow = len(session_keys) - self.config['max_sessions']
+        if overflow <= 0:
+            return
+        session_keys.sort(key=lambda k: self._entries[k].last_used_at)
+        for key in session_keys[:overflow]:
+            entry = self._forget_key(key)
+            self._stats['evictions'] += 1
+            threading.Thread(target=self._delete_remote, args=(entry,), daemon=True).start()
+
+    def _release_key_lock(self, key: str) -> None:
+        """키별 락 사용을 마치고, 더 이상 사용하는 스레드가 없으면 락을 제거합니다."""
+        with self._lock:
+            users = self._key_lock_users.get(key, 0) - 1
+            if users > 0:
+                self._key_lock_users[key] = users
+            else:
+                self._key_lock_users.pop(key, None)
+                self._key_locks.pop(key, None)
+
+    def _forget_key(self, key: str) -> Optional[_CacheEntry]:
+        """항목과 실패 기록을 함께 제거합니다. (self._lock 보유 상태에서 호출, 키별 락은 _release_key_lock이 정리)"""
+        self._failed_keys.pop(key, None)
+        return self._entries.pop(key, None)
+
+    def _prune_stale(self, now: float) -> None:
+        """만료된 항목과 만료된 실패 기록을 정리합니다. (self._lock 보유 상태에서 호출)"""
+        for key in [k for k, e in self._entries.items() if e.expires_at <= now]:
+            self._forget_key(key)
+        for key in [k for k, until in self._failed_keys.items() if until <= now]:
+            self._forget_key(key)
+
+    def _drop_entry(self, entry: _CacheEntry, delete_remote: bool = False) -> None:
+        with self._lock:
+            for key, value in list(self._entries.items()):
+                if value is entry:
+                    self._forget_key(key)
+        if delete_remote:
+            self._delete_remote(entry)
+
+    def _delete_remote(self, entry: _CacheEntry) -> None:
+        try:
+            entry.cached_content.delete()
+        except Exception as e:
+            self.logger.warning(f"원격 컨텍스트 캐시 삭제 실패 (TTL 만료 시 자동 삭제됨): {e}")
+
+    def _record_usage(self, response):
+        usage_metadata = getattr(response, 'usage_metadata', None)
+        if usage_metadata:
+            with self._lock:
+                self._stats['prompt_tokens'] += getattr(usage_metadata, 'prompt_token_count', 0) or 0
+                self._stats['cached_tokens'] += getattr(usage_metadata, 'cached_content_token_count', 0) or 0
+        return response
+
+    def _increment(self, name: str, amount: int = 1) -> None:
+        with self._lock:
+            self._stats[name] += amount
@@ -0,0 +1,83 @@
+"""
+임베딩 캐시 서비스 - 정규화된 텍스트 기준으로 임베딩 벡터를 재사용
+
+"지원동기를 작성해주세요"처럼 사용자 간에 반복되는 질문은 임베딩 API를 다시 호출할 필요가 없습니다.
+인메모리 LRU를 1차 캐시로, SQLite 파일을 2차 저장소로 사용하여 재시작 후에도 캐시가 유지됩니다.
+"""
+
+from array import array
+from typing import Dict, Any, List, Optional
+
+from utils.cache import LRUCache, SQLiteStore, make_cache_key, normalize_text
+from utils.logger import LoggerMixin
+from config.settings import get_embedding_cache_config, EMBEDDING_MODEL_NAME
+
+
+class EmbeddingCache(LoggerMixin):
+    """인메모리 LRU + SQLite 2단계 임베딩 캐시"""
+
+    def __init__(self, model_name: str = EMBEDDING_MODEL_NAME, config: Optional[Dict[str, Any]] = None):
+        self.model_name = model_name
+        self.config = config or get_embedding_cache_config()
+        self.enabled = self.config['enabled']
+        self.memory = LRUCache(max_entries=self.config['memory_entries'])
+        self.store = None
+        self.disk_hits = 0
+
+        if self.enabled:
+            try:
+                self.store = SQLiteStore(self.config['path'], table='embeddings', max_entries=self.config['max_entries'])
+                self.logger.info(f"임베딩 영속 캐시 연결 완료: {self.config['path']}")
+            except Exception as e:
+                # 디스크 저장소를 쓸 수 없어도 인메모리 캐시로는 동작합니다.
+                self.logger.warning(f"임베딩 영속 캐시를 열 수 없어 인메모리 캐시만 사용합니다: {e}")
+
+    def _key(self, text: str, task_type: str) -> str:
+        return make_cache_key(self.model_name, task_type, normalize_text(text))
+
+    def get(self, text: str, task_type: str) -> Optional[List[float]]:
+        """캐시된 임베딩 벡터 조회 (없으면 None)"""
+        if not self.enabled:
+            return None
+        key = self._key(text, task_type)
+        vector = self.memory.get(key)
+        if vector is not None:
+            return vector
+
+        if self.store is not None:
+            try:
+                blob = self.store.get(key)
+            except Exception as e:
+                self.logger.warning(f"임베딩 영속 캐시 조회 실패: {e}")
+                blob = None
+            if blob is not None:
+                vector = array('f', blob).tolist()
+                self.memory.set(key, vector)
+                self.disk_hits += 1
+                return vector
+        return None
+
+    def set(self, text: str, task_type: str, vector: List[float]) -> None:
+        """임베딩 벡터 저장 (float32로 직렬화)"""
+        if not self.enabled or vector is None:
+            return
+        key = self._key(text, task_type)
+        vector = list(vector)
+        self.memory.set(key, vector)
+        if self.store is not None:
+            try:
+                self.store.set(key, array('f', vector).tobytes())
+            except Exception as e:
+                self.logger.warning(f"임베딩 영속 캐시 저장 실패: {e}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """캐시 통계 반환 (memory_hits는 1차 캐시, disk_hits는 2차 저장소 적중 수)"""
+        stats = self.memory.get_stats()
+        return {
+            'enabled': self.enabled,
+            'persistent': self.store is not None,
+            'memory_hits': stats['hits'],
+            'disk_hits': self.disk_hits,
+            'misses': stats['misses'] - self.disk_hits,
+            'memory_entries': stats['entries']
+        }
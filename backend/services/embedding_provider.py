@@ -0,0 +1,372 @@
+"""
+임베딩 제공자 - 질문/기준 문장 임베딩을 생성하는 구현체를 교체 가능하게 분리
+
+- VertexEmbeddingProvider : Vertex AI 텍스트 임베딩 API (기본값)
+- LocalEmbeddingProvider  : transformers 기반 로컬 CPU 모델 (배치 + 스레드 풀 추론, 네트워크 불필요)
+- HashingEmbeddingProvider: 문자 n-gram 해싱 기반 결정적 임베딩 (테스트/오프라인 개발용)
+- MicroBatchingEmbeddingProvider: 동시에 들어온 요청들을 몇 ms 동안 모아 한 번의 배치 호출로 처리하는 래퍼
+
+기준 임베딩 생성(generate_embeddings.py)과 질문 분류(AIService)가 같은 제공자를 사용해야
+두 벡터 공간이 일치합니다. 기준 임베딩 아티팩트의 'model' 값이 제공자의 model_name과 같은지 확인하세요.
+"""
+
+import bisect
+import hashlib
+import math
+import re
+import threading
+import time
+import unicodedata
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Optional
+
+from utils.logger import LoggerMixin
+from utils.metrics import track_stage
+from config.settings import get_embedding_provider_config
+
+# Vertex 임베딩 태스크 유형 (로컬 모델은 e5 계열 접두어로 대응)
+TASK_QUERY = "RETRIEVAL_QUERY"
+TASK_DOCUMENT = "RETRIEVAL_DOCUMENT"
+
+
+def _chunks(items: List[Any], size: int) -> List[List[Any]]:
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+
+class EmbeddingProvider(LoggerMixin):
+    """임베딩 제공자 인터페이스"""
+
+    model_name: str = ""
+    # warmup()이 한 번 성공하면 True (부트스트랩과 AIService가 중복으로 예열하지 않도록)
+    is_warm: bool = False
+
+    def embed(self, texts: List[str], task_type: str = TASK_QUERY) -> List[List[float]]:
+        """
+        텍스트 목록을 한 번에 임베딩합니다.
+
+        Args:
+            texts: 임베딩할 텍스트 목록
+            task_type: RETRIEVAL_QUERY(질문) 또는 RETRIEVAL_DOCUMENT(기준 문장)
+
+        Returns:
+            List[List[float]]: 입력 순서와 같은 순서의 벡터 목록
+        """
+        raise NotImplementedError
+
+    def embed_one(self, text: str, task_type: str = TASK_QUERY) -> List[float]:
+        return self.embed([text], task_type)[0]
+
+    def warmup(self) -> None:
+        """첫 요청의 지연을 줄이기 위해 모델 로드/연결을 미리 수행합니다. (이미 예열되었으면 생략)"""
+        if self.is_warm:
+            return
+        self.embed(["웜업용 테스트 문장"], TASK_QUERY)
+        self.is_warm = True
+
+
+class VertexEmbeddingProvider(EmbeddingProvider):
+    """Vertex AI 텍스트 임베딩 API 제공자"""
+
+    def __init__(self, model_name: str, batch_size: int = 64):
+        self.model_name = model_name
+        # Vertex는 요청당 입력 개수 제한이 있으므로 batch_size 단위로 나누어 호출합니다.
+        self.batch_size = batch_size
+        self._model = None
+        self._lock = threading.Lock()
+
+    def _get_model(self):
+        if self._model is None:
+            with self._lock:
+                if self._model is None:
+                    from vertexai.language_models import TextEmbeddingModel
+                    self._model = TextEmbeddingModel.from_pretrained(self.model_name)
+        return self._model
+
+    def embed(self, texts: List[str], task_type: str = TASK_QUERY) -> List[List[float]]:
+        from vertexai.language_models import TextEmbeddingInput
+
+        model = self._get_model()
+        vectors: List[List[float]] = []
+        for batch in _chunks(list(texts), self.batch_size):
+            inputs = [TextEmbeddingInput(text=text, task_type=task_type) for text in batch]
+            with track_stage('embedding', dependency='vertex'):
+                vectors.extend(embedding.values for embedding in model.get_embeddings(inputs))
+        return vectors
+
+
+class LocalEmbeddingProvider(EmbeddingProvider):
+    """
+    transformers 기반 로컬 CPU 임베딩 제공자
+
+    입력을 batch_size 단위로 나누어 스레드 풀에서 병렬로 추론합니다. (torch 연산은 GIL을 해제합니다)
+    e5 계열 모델을 기준으로 질문에는 'query: ', 기준 문장에는 'passage: ' 접두어를 붙이고,
+    마스크 평균 풀링 후 L2 정규화한 벡터를 반환합니다.
+    """
+
+    _PREFIXES = {TASK_QUERY: "query: ", TASK_DOCUMENT: "passage: "}
+
+    def __init__(self, model_name: str, batch_size: int = 32, max_workers: int = 2, max_length: int = 256):
+        self.model_name = model_name
+        self.batch_size = batch_size
+        self.max_length = max_length
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="local-embedding")
+        self._tokenizer = None
+        self._model = None
+        self._lock = threading.Lock()
+
+    def _load(self):
+        if self._model is None:
+            with self._lock:
+                if self._model is None:
+                    from transformers import AutoModel, AutoTokenizer
+
+                    self.logger.info(f"로컬 임베딩 모델 로드 중: {self.model_name}")
+                    self._tokenizer = AutoTokenizer.from_pretrained(self.model_name)
+                    model = AutoModel.from_pretrained(self.model_name)
+                    model.eval()
+                    self._model = model
+        return self._tokenizer, self._model
+
+    def _embed_batch(self, batch: List[str]) -> List[List[float]]:
+        import torch
+
+        tokenizer, model = self._load()
+        encoded = tokenizer(batch, padding=True, truncation=True, max_length=self.max_length, return_tensors="pt")
+        with torch.inference_mode():
+            hidden = model(**encoded).last_hidden_state
+            mask = encoded["attention_mask"].unsqueeze(-1).to(hidden.dtype)
+            pooled = (hidden * mask).sum(dim=1) / mask.sum(dim=1).clamp(min=1e-9)
+            pooled = torch.nn.functional.normalize(pooled, p=2, dim=1)
+        return pooled.tolist()
+
+    def embed(self, texts: List[str], task_type: str = TASK_QUERY) -> List[List[float]]:
+        prefix = self._PREFIXES.get(task_type, "")
+        batches = _chunks([f"{prefix}{text}" for text in texts], self.batch_size)
+        if len(batches) <= 1:
+            return self._embed_batch(batches[0]) if batches else []
+        vectors: List[List[float]] = []
+        for result in self._executor.map(self._embed_batch, batches):
+            vectors.extend(result)
+        return vectors
+
+
+class HashingEmbeddingProvider(EmbeddingProvider):
+    """
+    문자 n-gram 해싱 기반 결정적 임베딩 제공자 (네트워크/모델 불필요)
+
+    같은 입력에는 항상 같은 벡터를 반환하므로 테스트와 오프라인 개발에 사용합니다.
+    의미 유사도는 표면 문자열 겹침 수준으로만 반영됩니다.
+    """
+
+    _NON_WORD_RE = re.compile(r'[\W_]+', re.UNICODE)
+
+    def __init__(self, dimension: int = 256):
+        self.dimension = dimension
+        self.model_name = f"hashing-char-ngram-{dimension}"
+
+    def _vector(self, text: str) -> List[float]:
+        normalized = self._NON_WORD_RE.sub('', unicodedata.normalize('NFKC', text or '').lower())
+        padded = f"^{normalized}$"
+        vector = [0.0] * self.dimension
+        for n in (2, 3):
+            for i in range(len(padded) - n + 1):
+                digest = hashlib.blake2b(padded[i:i + n].encode('utf-8'), digest_size=8).digest()
+                bucket = int.from_bytes(digest[:4], 'little') % self.dimension
+                vector[bucket] += 1.0 if digest[4] & 1 else -1.0
+        norm = math.sqrt(sum(v * v for v in vector))
+        return [v / norm for v in vector] if norm else vector
+
+    def embed(self, texts: List[str], task_type: str = TASK_QUERY) -> List[List[float]]:
+        return [self._vector(text) for text in texts]
+
+    def warmup(self) -> None:
+        self.is_warm = True
+
+
+class _PendingRequest:
+    """배치 대기열의 요청 한 건 (호출 스레드는 done 이벤트를 기다립니다)"""
+
+    __slots__ = ('texts', 'task_type', 'enqueued_at', 'done', 'vectors', 'error')
+
+    def __init__(self, texts: List[str], task_type: str):
+        self.texts = texts
+        self.task_type = task_type
+        self.enqueued_at = time.monotonic()
+        self.done = threading.Event()
+        self.vectors: Optional[List[List[float]]] = None
+        self.error: Optional[BaseException] = None
+
+
+class MicroBatchingEmbeddingProvider(EmbeddingProvider):
+    """
+    요청 간 마이크로 배치 래퍼
+
+    여러 요청 스레드가 각각 한두 개의 텍스트를 임베딩할 때, 첫 요청 이후 최대 max_wait_ms 동안
+    (또는 max_batch_size개가 찰 때까지) 요청을 모아 내부 제공자를 한 번만 호출하고 결과를 나누어 돌려줍니다.
+    max_batch_size 이상을 한 번에 요청하면 대기 없이 바로 내부 제공자를 호출합니다.
+    """
+
+    def __init__(
+        self, inner: EmbeddingProvider, max_batch_size: int = 32, max_wait_ms: float = 5.0,
+        max_concurrent_batches: int = 4, request_timeout: float = 30.0
+    ):
+        self.inner = inner
+        self.model_name = inner.model_name
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self.request_timeout = request_timeout
+
+        self._queue: "deque[_PendingRequest]" = deque()
+        self._condition = threading.Condition()
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrent_batches, thread_name_prefix="embedding-batch")
+        self._dispatcher: Optional[threading.Thread] = None
+
+        # 배치 크기 히스토그램 (버킷 상한: 1, 2, 4, ..., max_batch_size)
+        self._bucket_bounds: List[int] = []
+        bound = 1
+        while bound < max_batch_size:
+            self._bucket_bounds.append(bound)
+            bound *= 2
+        self._bucket_bounds.append(max_batch_size)
+        self._stats_lock = threading.Lock()
+        self._bucket_counts = [0] * len(self._bucket_bounds)
+        self._stats = {'requests': 0, 'batches': 0, 'texts': 0, 'direct_calls': 0, 'wait_seconds_total': 0.0}
+
+    def embed(self, texts: List[str], task_type: str = TASK_QUERY) -> List[List[float]]:
+        texts = list(texts)
+        if not texts:
+            return []
+        if len(texts) >= self.max_batch_size:
+            self._increment('direct_calls')
+            return self.inner.embed(texts, task_type)
+
+        request = _PendingRequest(texts, task_type)
+        with self._condition:
+            self._ensure_dispatcher()
+            self._queue.append(request)
+            self._condition.notify()
+
+        if not request.done.wait(self.request_timeout):
+            raise TimeoutError(f"임베딩 배치 응답 대기 시간 초과 ({self.request_timeout}s)")
+        if request.error is not None:
+            raise request.error
+        return request.vectors
+
+    def warmup(self) -> None:
+        self.inner.warmup()
+        self.is_warm = self.inner.is_warm
+
+    def get_stats(self) -> Dict[str, Any]:
+        """배치 통계 반환 (batch_size_histogram: 버킷 상한별 배치 수)"""
+        with self._stats_lock:
+            stats = dict(self._stats)
+            counts = list(self._bucket_counts)
+        stats['avg_batch_size'] = round(stats['texts'] / stats['batches'], 2) if stats['batches'] else 0.0
+        stats['avg_wait_ms'] = round(stats['wait_seconds_total'] * 1000 / stats['requests'], 2) if stats['requests'] else 0.0
+        stats['batch_size_histogram'] = {str(bound): count for bound, count in zip(self._bucket_bounds, counts)}
+        stats['max_batch_size'] = self.max_batch_size
+        stats['max_wait_ms'] = self.max_wait * 1000
+        return stats
+
+    # ------------------------------------------------------------------ #
+    # 내부 구현
+    # ------------------------------------------------------------------ #
+    def _ensure_dispatcher(self) -> None:
+        """(self._condition 보유 상태에서 호출)"""
+        if self._dispatcher is None or not self._dispatcher.is_alive():
+            self._dispatcher = threading.Thread(target=self._dispatch_loop, name="embedding-dispatcher", daemon=True)
+            self._dispatcher.start()
+
+    def _dispatch_loop(self) -> None:
+        while True:
+            with self._condition:
+                while not self._queue:
+                    self._condition.wait()
+                # 가장 오래 기다린 요청 기준으로 max_wait가 지나거나 배치가 찰 때까지 더 모읍니다.
+                deadline = self._queue[0].enqueued_at + self.max_wait
+                while self._queued_texts() < self.max_batch_size:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._condition.wait(remaining)
+                batch = self._take_batch()
+            self._executor.submit(self._run_batch, batch)
+
+    def _queued_texts(self) -> int:
+        return sum(len(request.texts) for request in self._queue)
+
+    def _take_batch(self) -> List[_PendingRequest]:
+        """첫 요청과 같은 task_type의 요청들을 max_batch_size 한도 안에서 꺼냅니다. (self._condition 보유 상태에서 호출)"""
+        task_type = self._queue[0].task_type
+        batch, size, remaining = [], 0, deque()
+        while self._queue:
+            request = self._queue.popleft()
+            if request.task_type == task_type and (not batch or size + len(request.texts) <= self.max_batch_size):
+                batch.append(request)
+                size += len(request.texts)
+            else:
+                remaining.append(request)
+        self._queue.extendleft(reversed(remaining))
+        return batch
+
+    def _run_batch(self, batch: List[_PendingRequest]) -> None:
+        texts = [text for request in batch for text in request.texts]
+        started_at = time.monotonic()
+        try:
+            vectors = self.inner.embed(texts, batch[0].task_type)
+            offset = 0
+            for request in batch:
+                request.vectors = vectors[offset:offset + len(request.texts)]
+                offset += len(request.texts)
+        except BaseException as e:
+            self.logger.warning(f"임베딩 배치 호출 실패 ({len(texts)}개): {e}")
+            for request in batch:
+                request.error = e
+        finally:
+            self._record_batch(batch, len(texts), started_at)
+            for request in batch:
+                request.done.set()
+
+    def _record_batch(self, batch: List[_PendingRequest], size: int, started_at: float) -> None:
+        with self._stats_lock:
+            self._stats['batches'] += 1
+            self._stats['requests'] += len(batch)
+            self._stats['texts'] += size
+            self._stats['wait_seconds_total'] += sum(started_at - request.enqueued_at for request in batch)
+            index = min(bisect.bisect_left(self._bucket_bounds, size), len(self._bucket_bounds) - 1)
+            self._bucket_counts[index] += 1
+
+    def _increment(self, name: str) -> None:
+        with self._stats_lock:
+            self._stats[name] += 1
+
+
+def get_embedding_provider(config: Optional[Dict[str, Any]] = None) -> EmbeddingProvider:
+    """
+    설정(EMBEDDING_PROVIDER)에 맞는 임베딩 제공자를 생성합니다.
+
+    Raises:
+        ValueError: 알 수 없는 제공자 이름인 경우
+    """
+    config = config or get_embedding_provider_config()
+    provider = config['provider']
+    if provider == 'vertex':
+        inner = VertexEmbeddingProvider(config['vertex_model'], batch_size=config['batch_size'])
+    elif provider == 'local':
+        inner = LocalEmbeddingProvider(
+            config['local_model'], batch_size=config['batch_size'],
+            max_workers=config['local_workers'], max_length=config['local_max_length']
+        )
+    elif provider == 'hashing':
+        # 프로세스 내 계산만 하므로 마이크로 배치가 필요 없습니다.
+        return HashingEmbeddingProvider(config['hashing_dimension'])
+    else:
+        raise ValueError(f"알 수 없는 임베딩 제공자입니다: {provider} (vertex, local, hashing 중 하나)")
+
+    if not config.get('microbatch_enabled'):
+        return inner
+    return MicroBatchingEmbeddingProvider(
+        inner, max_batch_size=config['batch_size'], max_wait_ms=config['microbatch_max_wait_ms'],
+        max_concurrent_batches=config['microbatch_max_concurrent']
+    )
@@ -0,0 +1,137 @@
+"""
+추출 텍스트 캐시 서비스 - 같은 이력서 파일을 다시 올리면 PDF/DOCX 파싱을 생략
+
+지원할 회사마다 같은 이력서 PDF를 다시 올리는 경우가 많습니다.
+파일 바이트의 SHA-256과 추출기 버전(파서/정규화 버전, 라이브러리 버전, 정규화 설정)을 키로
+정규화까지 끝난 텍스트를 zlib으로 압축해 SQLite에 저장합니다. (워커 간 공유, 최대 항목 수와 TTL로 크기 제한)
+키에 사용자 ID를 넣어 다른 사용자의 업로드 결과는 절대 재사용하지 않습니다.
+키는 '사용자 해시:내용 해시' 형식이라 purge_user()로 한 사용자의 항목을 모두 지울 수 있고(세션 삭제 시 호출),
+TTL이 지난 항목은 조회 시와 캐시를 열 때 삭제합니다.
+"""
+
+import hashlib
+import json
+import time
+import zlib
+from typing import Any, Dict, Optional, Tuple
+
+from utils.cache import SQLiteStore, make_cache_key
+from utils.file_processor import PARSER_VERSION
+from utils.logger import LoggerMixin
+from utils.text_normalizer import NORMALIZER_VERSION
+from config.settings import get_extraction_cache_config
+
+_HASH_CHUNK_BYTES = 1024 * 1024
+
+
+def _library_version(distribution: str) -> str:
+    """파서 라이브러리 버전 (모듈을 임포트하지 않고 설치 메타데이터만 읽음)"""
+    try:
+        from importlib.metadata import version
+        return version(distribution)
+    except Exception:
+        return "unknown"
+
+
+def hash_stream(stream) -> str:
+    """파일 스트림 전체의 SHA-256 (읽은 뒤 처음 위치로 되돌림)"""
+    digest = hashlib.sha256()
+    stream.seek(0)
+    for chunk in iter(lambda: stream.read(_HASH_CHUNK_BYTES), b""):
+        digest.update(chunk)
+    stream.seek(0)
+    return digest.hexdigest()
+
+
+class ExtractionCache(LoggerMixin):
+    """사용자별, 파일 내용 주소 기반 추출 텍스트 캐시 (SQLite)"""
+
+    def __init__(self, normalization: Dict[str, Any], config: Optional[Dict[str, Any]] = None):
+        """
+        Args:
+            normalization: 추출 결과에 영향을 주는 정규화 설정 (normalize_text, dedup_min_chars)
+        """
+        self.config = config or get_extraction_cache_config()
+        self.enabled = self.config['enabled']
+        self.store = None
+        self.hits = 0
+        self.misses = 0
+        self.extractor_version = json.dumps({
+            'parser': PARSER_VERSION,
+            'normalizer': NORMALIZER_VERSION,
+            'pypdf2': _library_version('PyPDF2'),
+            'python-docx': _library_version('python-docx'),
+            'normalization': normalization,
+        }, sort_keys=True)
+
+        if self.enabled:
+            try:
+                self.store = SQLiteStore(self.config['path'], table='extractions', max_entries=self.config['max_entries'])
+                expired = self.store.delete_older_than(self.config['ttl_seconds'])
+                self.logger.info(f"추출 텍스트 캐시 연결 완료: {self.config['path']} (만료 항목 {expired}개 삭제)")
+            except Exception as e:
+                self.logger.warning(f"추출 텍스트 캐시를 열 수 없어 매번 파싱합니다: {e}")
+
+    @staticmethod
+    def _user_prefix(user_id: str) -> str:
+        return make_cache_key('extraction-user', user_id) + ':'
+
+    def _key(self, user_id: str, content_hash: str, extension: str) -> str:
+        return self._user_prefix(user_id) + make_cache_key(content_hash, extension, self.extractor_version)
+
+    def get(self, user_id: Optional[str], content_hash: str, extension: str) -> Optional[Tuple[str, Dict[str, int]]]:
+        """
+        캐시된 추출 결과 조회
+
+        Returns:
+            Tuple[str, Dict]: (정규화된 텍스트, 정규화 보고서 dict). 없거나 만료되었으면 None
+        """
+        if self.store is None or not user_id:
+            return None
+        key = self._key(user_id, content_hash, extension)
+        try:
+            blob = self.store.get(key)
+            if blob is not None:
+                entry = json.loads(zlib.decompress(blob).decode('utf-8'))
+                if time.time() - entry['created_at'] <= self.config['ttl_seconds']:
+                    self.hits += 1
+                    return entry['text'], entry.get('normalization') or {}
+                self.store.delete(key)
+        except Exception as e:
+            self.logger.warning(f"추출 텍스트 캐시 조회 실패: {e}")
+        self.misses += 1
+        return None
+
+    def set(self, user_id: Optional[str], content_hash: str, extension: str, text: str,
+            normalization: Optional[Dict[str, int]] = None) -> None:
+        """추출 결과 저장 (JSON을 zlib으로 압축)"""
+        if self.store is None or not user_id or not text:
+            return
+        entry = {'created_at': time.time(), 'text': text, 'normalization': normalization or {}}
+        try:
+            blob = zlib.compress(json.dumps(entry, ensure_ascii=False).encode('utf-8'), 6)
+            self.store.set(self._key(user_id, content_hash, extension), blob)
+        except Exception as e:
+            self.logger.warning(f"추출 텍스트 캐시 저장 실패: {e}")
+
+    def purge_user(self, user_id: Optional[str]) -> int:
+        """사용자의 추출 결과를 모두 삭제하고 삭제한 개수를 반환합니다."""
+        if self.store is None or not user_id:
+            return 0
+        try:
+            removed = self.store.delete_prefix(self._user_prefix(user_id))
+        except Exception as e:
+            self.logger.warning(f"추출 텍스트 캐시 삭제 실패: {e}")
+            return 0
+        if removed:
+            self.logger.info(f"사용자 추출 텍스트 캐시 {removed}개 삭제")
+        return removed
+
+    def get_stats(self) -> Dict[str, Any]:
+        """캐시 통계 반환"""
+        return {
+            'enabled': self.enabled,
+            'persistent': self.store is not None,
+            'hits': self.hits,
+            'misses': self.misses
+        }
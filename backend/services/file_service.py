@@ -12,7 +12,11 @@ from utils.file_processor import (
     FileProcessingError
 )
 from utils.logger import LoggerMixin
+from utils.metrics import track_stage, record_text_normalization
+from utils.token_budget import FILE_SEPARATOR
+from utils.text_normalizer import NormalizationReport, normalize_resume_text
 from config.settings import get_file_config
+from services.extraction_cache import ExtractionCache, hash_stream
 
 logger = logging.getLogger(__name__)
 
@@ -23,14 +27,24 @@ class FileService(LoggerMixin):
     def __init__(self):
         """파일 서비스 초기화"""
         self.config = get_file_config()
+        # 같은 사용자가 같은 파일을 다시 올리면 파싱/정규화를 생략 (정규화 설정이 바뀌면 키가 달라짐)
+        self.extraction_cache = ExtractionCache({
+            'normalize_text': self.config['normalize_text'],
+            'dedup_min_chars': self.config['dedup_min_chars']
+        })
         self.logger.info("파일 서비스 초기화 완료")
     
-    def process_uploaded_files(self, files: List[FileStorage]) -> Dict:
+    def purge_user_cache(self, user_id: Optional[str]) -> int:
+        """사용자가 올린 파일의 추출 텍스트 캐시를 삭제합니다. (세션 삭제 시 원문이 디스크에 남지 않도록)"""
+        return self.extraction_cache.purge_user(user_id)
+
+    def process_uploaded_files(self, files: List[FileStorage], user_id: Optional[str] = None) -> Dict:
         """
         업로드된 파일들을 처리하고 텍스트 추출 (모든 파일 활용)
         
         Args:
             files: 업로드된 파일 목록
+            user_id: 업로드한 사용자 ID (주면 같은 사용자가 올렸던 동일 파일의 추출 결과를 재사용)
             
         Returns:
             Dict: 처리 결과 정보
@@ -56,6 +70,7 @@ class FileService(LoggerMixin):
             all_file_infos = []
             total_text_length = 0
             total_bytes_sum = 0
+            normalization = NormalizationReport(0, 0, 0, 0, pages=0)
             
             for i, file in enumerate(valid_files, 1):
                 self.logger.info(f"파일 {i}/{len(valid_files)} 처리 중: {file.filename}")
@@ -71,8 +86,28 @@ class FileService(LoggerMixin):
                 if total_bytes_sum > (50 * 1024 * 1024):
                     raise FileProcessingError("첨부파일의 용량이 50mb를 초과했습니다.")
                 
-                # 텍스트 추출
-                extracted_text = extract_text_from_file(file)
+                # 텍스트 추출 (같은 사용자가 올렸던 같은 내용의 파일이면 캐시된 결과 사용)
+                content_hash = hash_stream(file.stream) if user_id else None
+                cached = self.extraction_cache.get(user_id, content_hash, file_info['extension']) if user_id else None
+                if cached is not None:
+                    extracted_text, report_dict = cached
+                    if report_dict:
+                        normalization = normalization.merge(NormalizationReport.from_dict(report_dict))
+                    self.logger.info(f"파일 {i} 추출 캐시 적중: 파싱 생략 ({len(extracted_text)}자)")
+                else:
+                    with track_stage('file_extraction'):
+                        extracted_text = extract_text_from_file(file)
+                        # 머리글/바닥글, 중복 줄, 연속 공백을 추출 시점에 한 번만 정리합니다.
+                        report = None
+                        if self.config['normalize_text']:
+                            extracted_text, report = normalize_resume_text(extracted_text, self.config['dedup_min_chars'])
+                            normalization = normalization.merge(report)
+                            self.logger.info(f"파일 {i} {report.summary()}")
+                    if user_id:
+                        self.extraction_cache.set(
+                            user_id, content_hash, file_info['extension'], extracted_text,
+                            report.to_dict() if report else None
+                        )
                 text_length = len(extracted_text)
                 total_text_length += text_length
                 
@@ -86,9 +121,11 @@ class FileService(LoggerMixin):
                 all_file_infos.append(file_info)
             
             # 모든 텍스트를 결합
-            combined_text = "\n\n--- 파일 구분선 ---\n\n".join(all_extracted_texts)
+            combined_text = FILE_SEPARATOR.join(all_extracted_texts)
             
             self.logger.info(f"전체 텍스트 결합 완료: {total_text_length}자")
+            if normalization.pages:
+                record_text_normalization(normalization.saved_chars, normalization.saved_tokens)
             
             return {
                 'success': True,
@@ -97,6 +134,7 @@ class FileService(LoggerMixin):
                 'extracted_text': combined_text,
                 'text_length': total_text_length,
                 'file_count': len(valid_files),
+                'normalization': normalization.to_dict(),
                 'message': f'{len(valid_files)}개 파일 처리가 성공적으로 완료되었습니다.'
             }
             
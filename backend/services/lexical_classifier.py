@@ -0,0 +1,170 @@
+"""
+로컬 어휘 분류기 - 임베딩 API 호출 전에 프로세스 안에서 질문 유형을 판별하는 1차 단계
+
+1. 별칭 매칭: 정규화한 질문이 별칭("지원동기", "성장과정" 등)으로 시작하고, 그 뒤가 조사와 지시어
+   ("를 작성하시오", "에 대해 서술하시오", "(1000자 이내)")뿐이면 바로 분류합니다. ("지원 동기를 작성하시오" -> motivation)
+   "ESG 경영에 대한 포부"처럼 별칭이 질문 중간에 있거나 다른 내용이 붙으면 별칭으로 분류하지 않습니다.
+2. 문자 n-gram TF-IDF: canonical_questions.json 의 기준 질문/별칭으로 학습한 카테고리 벡터와의
+   코사인 유사도가 충분히 높고 2위와의 차이도 충분할 때만 분류합니다.
+
+확신할 수 없는 질문은 None을 반환하여 임베딩 분류로 넘깁니다.
+"""
+
+import json
+import math
+import os
+import re
+import threading
+import unicodedata
+from collections import Counter
+from typing import Dict, Any, List, Optional
+
+from utils.logger import LoggerMixin
+from config.settings import get_lexical_classifier_config
+
+CANONICAL_QUESTIONS_PATH = os.path.join(os.path.dirname(__file__), "canonical_questions.json")
+
+# 공백/문장부호를 모두 제거하여 띄어쓰기 차이("성장 과정" / "성장과정")를 흡수합니다.
+_NON_WORD_RE = re.compile(r'[\W_]+', re.UNICODE)
+_NGRAM_SIZES = (2, 3)
+
+# 별칭 뒤에 올 수 있는 꼬리 (정규화된 문자열 기준): 조사 + 작성 지시어 + 글자 수 제한
+_ALIAS_TAIL_RE = re.compile(
+    r'(?:을|를|은|는|이|가|과|와|에대해서|에대해|에대하여|에관해|에관하여)?'
+    r'(?:(?:구체적으로|자유롭게|간략히|간단히)?'
+    r'(?:(?:작성|기술|서술|설명|소개|기재)(?:하시오|하십시오|하세요|해주세요|해주십시오|해주시기바랍니다|바랍니다)'
+    r'|말해주세요|말씀해주세요|적어주세요|써주세요|쓰시오|무엇인가요|무엇입니까))?'
+    r'(?:최대)?(?:\d+자(?:이내|내외)?)?'
+)
+
+
+def normalize_question(text: Optional[str]) -> str:
+    """NFKC 정규화 + 소문자화 + 공백/문장부호 제거"""
+    if not text:
+        return ""
+    return _NON_WORD_RE.sub('', unicodedata.normalize('NFKC', text).lower())
+
+
+def _char_ngrams(normalized: str) -> Counter:
+    padded = f"^{normalized}$"
+    grams = Counter()
+    for n in _NGRAM_SIZES:
+        grams.update(padded[i:i + n] for i in range(len(padded) - n + 1))
+    return grams
+
+
+def _l2_normalize(vector: Dict[str, float]) -> Dict[str, float]:
+    norm = math.sqrt(sum(v * v for v in vector.values()))
+    if not norm:
+        return vector
+    return {k: v / norm for k, v in vector.items()}
+
+
+class LexicalClassifier(LoggerMixin):
+    """별칭 매칭 + 문자 n-gram TF-IDF 기반 로컬 질문 분류기"""
+
+    def __init__(self, canonical_questions: List[Dict[str, Any]], config: Optional[Dict[str, Any]] = None):
+        """
+        Args:
+            canonical_questions: [{'key', 'questions', 'aliases'}, ...] 형식의 기준 질문
+            config: get_lexical_classifier_config() 형식의 설정 (min_score, min_margin, max_alias_tail)
+        """
+        self.config = config or get_lexical_classifier_config()
+        self.enabled = self.config['enabled']
+
+        # 별칭: 정규화 문자열 -> 카테고리 (긴 별칭부터 검사)
+        self._aliases: Dict[str, str] = {}
+        for item in canonical_questions:
+            for alias in item.get('aliases', []):
+                normalized = normalize_question(alias)
+                if normalized:
+                    self._aliases[normalized] = item['key']
+        self._alias_order = sorted(self._aliases, key=len, reverse=True)
+
+        # TF-IDF: 기준 질문과 별칭 각각을 문서로 보고 카테고리별 중심 벡터를 만듭니다.
+        documents = [
+            (item['key'], _char_ngrams(normalize_question(text)))
+            for item in canonical_questions
+            for text in item.get('questions', []) + item.get('aliases', [])
+        ]
+        document_frequency = Counter(gram for _, grams in documents for gram in grams)
+        total = len(documents)
+        self._idf = {gram: math.log((1 + total) / (1 + df)) + 1.0 for gram, df in document_frequency.items()}
+
+        centroids: Dict[str, Counter] = {item['key']: Counter() for item in canonical_questions}
+        for key, grams in documents:
+            centroids[key].update(self._tfidf(grams))
+        self._centroids = {key: _l2_normalize(dict(vector)) for key, vector in centroids.items()}
+
+        self._lock = threading.Lock()
+        self._stats = {'requests': 0, 'alias_hits': 0, 'tfidf_hits': 0, 'fallthroughs': 0}
+
+    @classmethod
+    def from_file(cls, path: str = CANONICAL_QUESTIONS_PATH, config: Optional[Dict[str, Any]] = None) -> "LexicalClassifier":
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls(json.load(f), config=config)
+
+    def _tfidf(self, grams: Counter) -> Dict[str, float]:
+        return _l2_normalize({gram: (1 + math.log(count)) * self._idf[gram] for gram, count in grams.items() if gram in self._idf})
+
+    def match_alias(self, normalized: str) -> Optional[str]:
+        """별칭으로 시작하고 나머지가 허용된 꼬리(조사, '작성하시오', 글자 수 제한)뿐인 질문이면 해당 카테고리를 반환"""
+        if normalized in self._aliases:
+            return self._aliases[normalized]
+        for alias in self._alias_order:
+            if not normalized.startswith(alias):
+                continue
+            tail = normalized[len(alias):]
+            if len(tail) <= self.config['max_alias_tail'] and _ALIAS_TAIL_RE.fullmatch(tail):
+                return self._aliases[alias]
+        return None
+
+    def scores(self, question: str) -> Dict[str, float]:
+        """카테고리별 TF-IDF 코사인 유사도"""
+        query = self._tfidf(_char_ngrams(normalize_question(question)))
+        return {
+            key: sum(weight * centroid.get(gram, 0.0) for gram, weight in query.items())
+            for key, centroid in self._centroids.items()
+        }
+
+    def classify(self, question: str) -> Optional[Dict[str, Any]]:
+        """
+        확신할 수 있는 경우에만 분류 결과를 반환합니다.
+
+        Returns:
+            Optional[Dict]: {'category', 'method'('alias'|'tfidf'), 'score', 'margin'} 또는 None(임베딩 분류로 넘김)
+        """
+        if not self.enabled:
+            return None
+        self._increment('requests')
+        normalized = normalize_question(question)
+        if not normalized:
+            self._increment('fallthroughs')
+            return None
+
+        category = self.match_alias(normalized)
+        if category:
+            self._increment('alias_hits')
+            return {'category': category, 'method': 'alias', 'score': 1.0, 'margin': 1.0}
+
+        ranked = sorted(self.scores(question).items(), key=lambda item: item[1], reverse=True)
+        best_key, best_score = ranked[0]
+        margin = best_score - (ranked[1][1] if len(ranked) > 1 else 0.0)
+        if best_score >= self.config['min_score'] and margin >= self.config['min_margin']:
+            self._increment('tfidf_hits')
+            return {'category': best_key, 'method': 'tfidf', 'score': best_score, 'margin': margin}
+
+        self._increment('fallthroughs')
+        return None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """분류 통계 반환 (remote_calls_saved = 로컬에서 확정하여 생략한 임베딩 API 호출 수)"""
+        with self._lock:
+            stats = dict(self._stats)
+        stats['remote_calls_saved'] = stats['alias_hits'] + stats['tfidf_hits']
+        stats['local_hit_rate'] = round(stats['remote_calls_saved'] / stats['requests'], 4) if stats['requests'] else 0.0
+        return stats
+
+    def _increment(self, name: str) -> None:
+        with self._lock:
+            self._stats[name] += 1
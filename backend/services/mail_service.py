@@ -7,7 +7,6 @@ import os
 import logging
 import re
 from typing import Dict, Any, Optional
-from flask_mail import Mail, Message
 from markupsafe import escape
 from utils.logger import LoggerMixin
 
@@ -41,7 +40,8 @@ class MailService(LoggerMixin):
                 self.app.config['MAIL_USERNAME'] = os.getenv('GMAIL_USER', 'sseojum@gmail.com')
                 self.app.config['MAIL_PASSWORD'] = os.getenv('GMAIL_PASSWORD', '')
                 
-                # 메일 객체 생성
+                # 메일 객체 생성 (flask_mail은 메일 서비스가 처음 필요할 때 임포트)
+                from flask_mail import Mail
                 self.mail = Mail(self.app)
                 self.logger.info("메일 서비스 설정 완료")
                 
@@ -115,6 +115,7 @@ class MailService(LoggerMixin):
 이 메일은 써줌 서비스의 피드백 시스템을 통해 자동으로 전송되었습니다."""
             
             # 메일 메시지 생성
+            from flask_mail import Message
             msg = Message(
                 subject=safe_subject,
                 recipients=[os.getenv('GMAIL_USER', 'sseojum@gmail.com')],
@@ -159,6 +160,7 @@ class MailService(LoggerMixin):
                 }
             
             # 간단한 테스트 메일 전송
+            from flask_mail import Message
             test_msg = Message(
                 subject='[써줌] 메일 서비스 연결 테스트',
                 recipients=[os.getenv('GMAIL_USER', 'sseojum@gmail.com')],
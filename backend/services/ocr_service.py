@@ -5,29 +5,36 @@ OCR 서비스 - Google Cloud Vision AI 기반 이미지 텍스트 추출 서비
 import logging
 import io
 import base64
-import requests
 from typing import List, Optional, Tuple
-from PIL import Image, ImageEnhance, ImageFilter, ImageFile
-from google.cloud import vision
 
 
 from utils.logger import LoggerMixin
-
-# DecompressionBombWarning을 처리하기 위한 설정
-# 한계를 넉넉하게 늘려주어 경고가 발생하지 않도록 함
-Image.MAX_IMAGE_PIXELS = None
-ImageFile.LOAD_TRUNCATED_IMAGES = True # 손상된 이미지도 최대한 로드 시도
+from utils.metrics import track_stage
 
 logger = logging.getLogger(__name__)
 
 
+def _import_pil():
+    """
+    PIL은 이미지 OCR이 처음 필요할 때 임포트합니다. (앱 기동 시간 단축)
+    """
+    from PIL import Image, ImageFile
+
+    # DecompressionBombWarning을 처리하기 위한 설정
+    # 한계를 넉넉하게 늘려주어 경고가 발생하지 않도록 함
+    Image.MAX_IMAGE_PIXELS = None
+    ImageFile.LOAD_TRUNCATED_IMAGES = True # 손상된 이미지도 최대한 로드 시도
+    return Image
+
+
 class OCRService(LoggerMixin):
     """Google Cloud Vision AI 기반 OCR 처리 서비스"""
     
     def __init__(self):
         """OCR 서비스 초기화"""
         try:
-            # GCP Vision AI 클라이언트 초기화
+            # GCP Vision AI 클라이언트 초기화 (google.cloud.vision은 서비스 생성 시점에 임포트)
+            from google.cloud import vision
             self.client = vision.ImageAnnotatorClient()
             self.logger.info("GCP Vision AI 클라이언트 초기화 완료")
         except Exception as e:
@@ -39,6 +46,7 @@ class OCRService(LoggerMixin):
         이미지 바이트를 받아 리사이징하고 최적화하여 새로운 바이트를 반환합니다.
         """
         try:
+            Image = _import_pil()
             image = Image.open(io.BytesIO(content))
             
             # 이미지 포맷이 지원되는지 확인 (e.g., JPEG, PNG)
@@ -66,6 +74,18 @@ class OCRService(LoggerMixin):
             # 전처리 실패 시 원본 바이트라도 반환 시도
             return content
 
+    def _detect_text(self, content: bytes) -> str:
+        """ Vision API로 전처리된 이미지의 텍스트를 인식합니다. (실패 시 예외) """
+        from google.cloud import vision
+        image = vision.Image(content=content)
+        response = self.client.text_detection(image=image)
+
+        if response.error.message:
+            raise Exception(f"Vision API 오류: {response.error.message}")
+
+        return response.full_text_annotation.text if response.full_text_annotation else ""
+
+    @track_stage('ocr', dependency='vision')
     def extract_text_from_image_bytes(self, content: bytes) -> str:
         """이미지 바이트에서 텍스트를 추출합니다. (전처리 단계 추가)"""
         if not self.client:
@@ -85,13 +105,7 @@ class OCRService(LoggerMixin):
             
             self.logger.info(f"전처리 후 이미지 크기: {len(preprocessed_content)} bytes")
             
-            image = vision.Image(content=preprocessed_content)
-            response = self.client.text_detection(image=image)
-            
-            if response.error.message:
-                raise Exception(f"Vision API 오류: {response.error.message}")
-            
-            return response.full_text_annotation.text if response.full_text_annotation else ""
+            return self._detect_text(preprocessed_content)
 
         except Exception as e:
             self.logger.error(f"이미지 바이트 OCR 실패: {e}")
@@ -0,0 +1,173 @@
+"""
+질문 분류기 - 정규화된 기준 벡터 행렬과 단일 행렬 연산 기반의 코사인 유사도 분류
+
+기준 벡터를 로드 시점에 L2 정규화된 하나의 연속 float32 행렬로 만들어 두면,
+질문 벡터와의 코사인 유사도는 행렬-벡터 곱 한 번으로 계산됩니다.
+한 카테고리에 여러 개의 예시 벡터(exemplar)를 둘 수 있으며, 카테고리 점수는 예시 벡터 중 최댓값입니다.
+
+기준 벡터는 generate_embeddings.py가 만드는 바이너리 아티팩트(.npy 행렬 + .meta.json 사이드카)를
+메모리 맵으로 열어 사용하므로, 여러 워커가 페이지 캐시에 올라간 하나의 사본을 공유합니다.
+"""
+
+import json
+import os
+from typing import Dict, Any, List, Sequence, Tuple
+
+import numpy as np
+
+# 신뢰도 임계점 (필요시 조정)
+SIMILARITY_THRESHOLD = 0.7
+
+# 바이너리 아티팩트 포맷 버전 (사이드카 구조가 바뀌면 올립니다)
+ARTIFACT_FORMAT_VERSION = 1
+
+
+def _normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    """행 단위 L2 정규화 (영벡터는 그대로 유지)"""
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+class QuestionClassifier:
+    """기준 벡터 행렬 기반 질문 분류기"""
+
+    def __init__(
+        self, keys: Sequence[str], matrix, threshold: float = SIMILARITY_THRESHOLD,
+        prenormalized: bool = False
+    ):
+        """
+        Args:
+            keys: 행렬의 각 행이 속한 카테고리 키 (같은 키가 여러 번 나올 수 있음)
+            matrix: (행 수, 차원) 기준 벡터 행렬
+            threshold: 분류 성공으로 인정할 최소 유사도
+            prenormalized: 이미 행 단위로 정규화된 행렬이면 True
+                (카테고리별로 정렬되어 있으면 복사 없이 그대로 사용하므로 메모리 맵이 유지됩니다)
+        """
+        if not prenormalized or getattr(matrix, 'dtype', None) not in (np.float16, np.float32):
+            matrix = np.asarray(matrix, dtype=np.float32)
+        if matrix.ndim != 2 or len(keys) != matrix.shape[0]:
+            raise ValueError("기준 벡터 행렬의 형태와 키 개수가 일치하지 않습니다.")
+
+        # 같은 카테고리의 행이 연속되도록 정렬하여 카테고리별 최댓값을 reduceat 한 번으로 구합니다.
+        self.categories: List[str] = list(dict.fromkeys(keys))
+        category_index = {key: i for i, key in enumerate(self.categories)}
+        row_categories = np.array([category_index[key] for key in keys], dtype=np.int64)
+        if np.any(np.diff(row_categories) < 0):
+            order = np.argsort(row_categories, kind='stable')
+            matrix, row_categories = matrix[order], row_categories[order]
+        if not prenormalized:
+            matrix = np.ascontiguousarray(_normalize_rows(matrix), dtype=np.float32)
+
+        self.matrix = matrix
+        self._group_starts = np.searchsorted(row_categories, np.arange(len(self.categories)))
+        self.threshold = threshold
+
+    @classmethod
+    def from_records(cls, records: List[Dict[str, Any]], threshold: float = SIMILARITY_THRESHOLD) -> "QuestionClassifier":
+        """
+        canonical_embeddings.json 형식의 레코드 목록으로 분류기 생성
+        각 레코드는 'key'와 'vector'(중심 벡터) 또는 'question_vectors'(예시 벡터 목록, generate_embeddings.py --exemplars)를 가집니다.
+        """
+        keys, rows = [], []
+        for record in records:
+            vectors = record.get('question_vectors') or [record['vector']]
+            for vector in vectors:
+                keys.append(record['key'])
+                rows.append(vector)
+        return cls(keys, np.array(rows, dtype=np.float32), threshold=threshold)
+
+    @property
+    def dimension(self) -> int:
+        return self.matrix.shape[1]
+
+    def __len__(self) -> int:
+        return len(self.categories)
+
+    def scores(self, vectors) -> np.ndarray:
+        """
+        질문 벡터들의 카테고리별 코사인 유사도 계산
+
+        Args:
+            vectors: (질문 수, 차원) 또는 (차원,) 형태의 질문 벡터
+
+        Returns:
+            np.ndarray: (질문 수, 카테고리 수) 유사도 행렬
+        """
+        queries = np.atleast_2d(np.asarray(vectors, dtype=np.float32))
+        if queries.shape[1] > self.dimension:
+            # 차원 축소된 아티팩트: 질문 벡터도 앞쪽 차원만 사용한 뒤 다시 정규화합니다.
+            queries = queries[:, :self.dimension]
+        row_scores = _normalize_rows(queries) @ self.matrix.T
+        return np.maximum.reduceat(row_scores, self._group_starts, axis=1)
+
+    def classify(self, vector, top_k: int = 3) -> Dict[str, Any]:
+        """단일 질문 벡터 분류"""
+        return self.classify_batch([vector], top_k=top_k)[0]
+
+    def classify_batch(self, vectors, top_k: int = 3) -> List[Dict[str, Any]]:
+        """
+        여러 질문 벡터를 한 번의 행렬 곱으로 분류
+
+        Returns:
+            List[Dict]: 질문별 결과
+                - category: 임계점 이상인 경우 최상위 카테고리, 아니면 None
+                - best_category / score: 최상위 카테고리와 유사도
+                - margin: 1위와 2위 유사도 차이 (분류 확신도)
+                - top_k: [(카테고리, 유사도), ...] 내림차순
+        """
+        score_matrix = self.scores(vectors)
+        k = max(1, min(top_k, len(self.categories)))
+        order = np.argsort(-score_matrix, axis=1)
+
+        results = []
+        for row, ranked in zip(score_matrix, order):
+            best = int(ranked[0])
+            best_score = float(row[best])
+            second_score = float(row[ranked[1]]) if len(ranked) > 1 else 0.0
+            results.append({
+                'category': self.categories[best] if best_score >= self.threshold else None,
+                'best_category': self.categories[best],
+                'score': best_score,
+                'margin': best_score - second_score,
+                'top_k': [(self.categories[int(i)], float(row[i])) for i in ranked[:k]]
+            })
+        return results
+
+
+def load_canonical_classifier(
+    base_path: str, threshold: float = SIMILARITY_THRESHOLD
+) -> Tuple[QuestionClassifier, Dict[str, Any]]:
+    """
+    기준 임베딩을 로드하여 분류기를 생성합니다.
+
+    1. <base_path>.npy + <base_path>.meta.json 바이너리 아티팩트가 있으면 메모리 맵으로 로드
+    2. 없으면 <base_path>.json (레거시 JSON 형식)으로 대체
+
+    Returns:
+        Tuple[QuestionClassifier, Dict]: (분류기, 아티팩트 메타데이터)
+
+    Raises:
+        FileNotFoundError: 두 형식 모두 없는 경우
+        ValueError: 아티팩트 버전/형태가 맞지 않는 경우
+    """
+    npy_path = f"{base_path}.npy"
+    meta_path = f"{base_path}.meta.json"
+
+    if os.path.exists(npy_path) and os.path.exists(meta_path):
+        with open(meta_path, 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+        if meta.get('format_version') != ARTIFACT_FORMAT_VERSION:
+            raise ValueError(
+                f"지원하지 않는 임베딩 아티팩트 버전입니다: {meta.get('format_version')} "
+                f"(필요 버전: {ARTIFACT_FORMAT_VERSION})"
+            )
+        matrix = np.load(npy_path, mmap_mode='r')
+        if matrix.shape != (len(meta['keys']), meta['dimension']):
+            raise ValueError(f"임베딩 아티팩트 형태가 메타데이터와 다릅니다: {matrix.shape}")
+        meta['source'] = 'artifact'
+        return QuestionClassifier(meta['keys'], matrix, threshold=threshold, prenormalized=True), meta
+
+    with open(f"{base_path}.json", 'r', encoding='utf-8') as f:
+        records = json.load(f)
+    return QuestionClassifier.from_records(records, threshold=threshold), {'source': 'json'}
@@ -0,0 +1,201 @@
+"""
+이력서 구조화 프로필 - 세션 생성 시 한 번 추출해 두고 생성/수정 프롬프트에 원문 대신 사용
+
+문항마다 모델이 긴 이력서 원문을 다시 읽고 경험을 골라내는 대신, 세션 생성 시 경험/역할/기간/한 일/정량 성과/기술을
+JSON으로 한 번 추출해 sessions.resume_profile에 저장합니다. 이후 프롬프트의 '지원자 제출 자료'에는 이 프로필을
+간결한 텍스트로 렌더링해 넣고, 프로필이 없거나 읽을 수 없을 때만 원문(또는 검색 발췌)을 사용합니다.
+프로필은 원문과 검색 발췌를 대신하므로, 추출 입력 한도를 넘는 이력서는 잘라서 추출하지 않고 프로필을 만들지 않습니다.
+"""
+
+import json
+from typing import Any, Dict, List, Optional
+
+from utils.logger import LoggerMixin
+from utils.token_budget import estimate_tokens
+from config.settings import get_resume_profile_config
+
+# resume_profile 저장 형식 버전 (스키마가 바뀌면 올립니다. 다른 버전은 무시하고 원문 사용)
+RESUME_PROFILE_FORMAT_VERSION = 1
+
+PROFILE_EXTRACTION_PROMPT = """당신은 이력서 분석 도우미입니다. 아래 '제출 자료'에서 자기소개서 작성에 필요한 사실만 뽑아 JSON으로 정리하세요.
+
+규칙:
+- 제출 자료에 없는 내용은 절대 만들지 마세요. 확인할 수 없는 필드는 빈 문자열이나 빈 배열로 두세요.
+- 수치(기간, 인원, 비율, 금액, 건수 등)는 원문 표기 그대로 옮기세요.
+- 회사/학교 경력, 프로젝트, 대외활동, 수상 등 경험 단위마다 experiences 항목을 하나씩 만드세요.
+- 문장은 짧게, 명사형으로 끝내세요. 자기소개서에 쓸 만한 구체적인 행동과 결과를 우선하세요.
+- JSON 외의 다른 텍스트는 출력하지 마세요.
+
+출력 형식:
+{{
+  "summary": "지원자를 한 문장으로 요약",
+  "experiences": [
+    {{
+      "title": "회사/프로젝트/활동명",
+      "role": "역할 또는 직책",
+      "period": "기간",
+      "actions": ["한 일"],
+      "results": ["성과 (정량 수치 포함)"],
+      "skills": ["사용 기술/도구"]
+    }}
+  ],
+  "skills": ["보유 기술"],
+  "education": ["학력"],
+  "certifications": ["자격증/수상/어학"]
+}}
+
+--- 제출 자료 시작 ---
+{resume_text}
+--- 제출 자료 끝 ---"""
+
+PROFILE_HEADER = "[구조화 프로필] 제출 자료에서 추출한 사실 요약입니다. 이 내용만 근거로 사용하세요."
+
+
+def _strings(value: Any) -> List[str]:
+    if isinstance(value, str):
+        value = [value]
+    if not isinstance(value, list):
+        return []
+    return [str(v).strip() for v in value if isinstance(v, (str, int, float)) and str(v).strip()]
+
+
+class ResumeProfile:
+    """구조화된 이력서 프로필"""
+
+    def __init__(self, data: Dict[str, Any]):
+        self.summary = str(data.get('summary') or '').strip()
+        self.experiences: List[Dict[str, Any]] = []
+        for item in data.get('experiences') or []:
+            if not isinstance(item, dict):
+                continue
+            experience = {
+                'title': str(item.get('title') or '').strip(),
+                'role': str(item.get('role') or '').strip(),
+                'period': str(item.get('period') or '').strip(),
+                'actions': _strings(item.get('actions')),
+                'results': _strings(item.get('results')),
+                'skills': _strings(item.get('skills')),
+            }
+            if experience['title'] or experience['actions'] or experience['results']:
+                self.experiences.append(experience)
+        self.skills = _strings(data.get('skills'))
+        self.education = _strings(data.get('education'))
+        self.certifications = _strings(data.get('certifications'))
+
+    def is_empty(self) -> bool:
+        return not self.experiences and not self.skills
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'summary': self.summary,
+            'experiences': self.experiences,
+            'skills': self.skills,
+            'education': self.education,
+            'certifications': self.certifications,
+        }
+
+    def to_json(self) -> str:
+        """sessions.resume_profile 저장용 문자열"""
+        return json.dumps({'version': RESUME_PROFILE_FORMAT_VERSION, 'profile': self.to_dict()}, ensure_ascii=False)
+
+    @classmethod
+    def from_json(cls, value: str) -> "ResumeProfile":
+        data = json.loads(value)
+        if data.get('version') != RESUME_PROFILE_FORMAT_VERSION:
+            raise ValueError(f"지원하지 않는 이력서 프로필 형식입니다: {data.get('version')}")
+        return cls(data['profile'])
+
+    def render(self) -> str:
+        """프롬프트의 '지원자 제출 자료'에 넣을 간결한 텍스트"""
+        lines = [PROFILE_HEADER]
+        if self.summary:
+            lines.append(f"요약: {self.summary}")
+        if self.experiences:
+            lines.append("경험:")
+            for number, experience in enumerate(self.experiences, 1):
+                heading = " | ".join(v for v in (experience['title'], experience['role'], experience['period']) if v)
+                lines.append(f"{number}. {heading}")
+                if experience['actions']:
+                    lines.append(f"   - 한 일: {'; '.join(experience['actions'])}")
+                if experience['results']:
+                    lines.append(f"   - 성과: {'; '.join(experience['results'])}")
+                if experience['skills']:
+                    lines.append(f"   - 기술: {', '.join(experience['skills'])}")
+        if self.skills:
+            lines.append(f"보유 기술: {', '.join(self.skills)}")
+        if self.education:
+            lines.append(f"학력: {'; '.join(self.education)}")
+        if self.certifications:
+            lines.append(f"자격/수상: {'; '.join(self.certifications)}")
+        return "\n".join(lines)
+
+
+class ResumeProfileExtractor(LoggerMixin):
+    """추출 프롬프트 구성과 모델 응답 검증 (모델 호출은 AIService가 담당)"""
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None):
+        self.config = config or get_resume_profile_config()
+
+    def should_extract(self, resume_text: str) -> bool:
+        """
+        짧은 이력서는 프로필로 줄어드는 양이 적고 뉘앙스만 잃으므로 원문을 그대로 씁니다.
+        추출 입력 한도를 넘는 이력서는 잘린 뒷부분이 프로필에서 빠지므로 프로필 대신 검색 발췌를 사용합니다.
+        """
+        if not self.config['enabled'] or not resume_text:
+            return False
+        tokens = estimate_tokens(resume_text)
+        if tokens > self.config['max_input_tokens']:
+            self.logger.info(
+                f"이력서가 프로필 추출 입력 한도보다 길어 검색 발췌를 사용합니다. ({tokens:,} > {self.config['max_input_tokens']:,} 토큰)"
+            )
+            return False
+        return tokens >= self.config['min_tokens']
+
+    def build_prompt(self, resume_text: str) -> str:
+        return PROFILE_EXTRACTION_PROMPT.format(resume_text=resume_text)
+
+    def generation_config(self) -> Dict[str, Any]:
+        return {
+            'temperature': 0.0,
+            'max_output_tokens': self.config['max_output_tokens'],
+            'response_mime_type': 'application/json',
+        }
+
+    def parse(self, response_text: str, resume_text: str) -> Optional[ResumeProfile]:
+        """
+        모델 응답을 프로필로 변환합니다.
+
+        Returns:
+            ResumeProfile: JSON이 아니거나, 비어 있거나, 원문보다 짧아지지 않으면 None (원문 사용)
+        """
+        text = (response_text or "").strip()
+        start, end = text.find('{'), text.rfind('}')
+        if start < 0 or end <= start:
+            self.logger.warning("이력서 프로필 응답에서 JSON을 찾을 수 없어 원문을 사용합니다.")
+            return None
+        try:
+            profile = ResumeProfile(json.loads(text[start:end + 1]))
+        except (ValueError, TypeError, AttributeError) as e:
+            self.logger.warning(f"이력서 프로필 응답을 읽을 수 없어 원문을 사용합니다: {e}")
+            return None
+        if profile.is_empty():
+            self.logger.warning("이력서 프로필에 경험/기술이 없어 원문을 사용합니다.")
+            return None
+
+        source_tokens, profile_tokens = estimate_tokens(resume_text), estimate_tokens(profile.render())
+        if profile_tokens >= source_tokens:
+            self.logger.info(f"이력서 프로필이 원문보다 짧지 않아 원문을 사용합니다. ({profile_tokens:,} >= {source_tokens:,} 토큰)")
+            return None
+        self.logger.info(f"이력서 프로필 추출: 경험 {len(profile.experiences)}개, {source_tokens:,} -> {profile_tokens:,} 토큰")
+        return profile
+
+    def load(self, value: Optional[str]) -> Optional[ResumeProfile]:
+        """저장된 resume_profile을 읽습니다. (없거나, 비활성화되었거나, 형식이 다르면 None)"""
+        if not value or not self.config['enabled']:
+            return None
+        try:
+            profile = ResumeProfile.from_json(value)
+        except (ValueError, KeyError, TypeError) as e:
+            self.logger.warning(f"이력서 프로필을 읽을 수 없어 원문을 사용합니다: {e}")
+            return None
+        return None if profile.is_empty() else profile
@@ -0,0 +1,183 @@
+"""
+이력서 청크 검색 서비스 - 문항마다 관련 있는 이력서 구간만 프롬프트에 넣기
+
+가이드는 문항마다 '단 하나의 핵심 경험'을 고르게 하므로 전체 이력서를 매번 보낼 필요가 없습니다.
+세션 생성 시 이력서를 청크로 나눠 한 번에 임베딩하고(sessions.resume_chunks에 저장),
+문항 생성/수정 시에는 '문항 + 채용공고 앞부분'과 가장 비슷한 상위 k개 청크만 원래 순서대로 이어 붙여 사용합니다.
+업로드한 포트폴리오가 길어져도 프롬프트 크기는 top_k * 청크 크기 안에서 일정하게 유지됩니다.
+"""
+
+import base64
+import json
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from utils.logger import LoggerMixin
+from utils.metrics import track_stage
+from utils.token_budget import FILE_SEPARATOR, estimate_tokens
+from config.settings import get_resume_retrieval_config
+from services.embedding_provider import EmbeddingProvider, TASK_DOCUMENT
+
+# resume_chunks 저장 형식 버전 (구조가 바뀌면 올립니다. 다른 버전은 무시하고 전체 이력서 사용)
+RESUME_INDEX_FORMAT_VERSION = 1
+# 연속되지 않은 발췌 사이에 넣는 표시
+EXCERPT_GAP = "\n\n(...)\n\n"
+
+
+def split_resume(text: str, chunk_chars: int) -> List[str]:
+    """
+    이력서를 chunk_chars 안팎의 청크로 나눕니다.
+    빈 줄(문단)과 파일 구분선에서 먼저 끊고, 문단 안에서는 줄 단위로 채우며, 너무 긴 줄만 글자 수로 자릅니다.
+    """
+    chunks: List[str] = []
+    for document in text.split(FILE_SEPARATOR):
+        current: List[str] = []
+        size = 0
+        for paragraph in document.split("\n\n"):
+            for line in paragraph.split("\n"):
+                line = line.strip()
+                while len(line) > chunk_chars:
+                    if current:
+                        chunks.append("\n".join(current))
+                        current, size = [], 0
+                    chunks.append(line[:chunk_chars])
+                    line = line[chunk_chars:]
+                if not line:
+                    continue
+                if size + len(line) > chunk_chars and current:
+                    chunks.append("\n".join(current))
+                    current, size = [], 0
+                current.append(line)
+                size += len(line) + 1
+            # 문단이 청크의 절반을 넘게 채웠으면 문단 경계에서 끊어 청크가 여러 경험에 걸치지 않게 합니다.
+            if size >= chunk_chars // 2:
+                chunks.append("\n".join(current))
+                current, size = [], 0
+        if current:
+            chunks.append("\n".join(current))
+    return chunks
+
+
+def batch_by_tokens(chunks: Sequence[str], max_tokens: int) -> List[List[str]]:
+    """청크를 추정 토큰 합이 max_tokens를 넘지 않는 배치로 나눕니다. (한 청크가 상한보다 크면 단독 배치)"""
+    batches: List[List[str]] = []
+    current: List[str] = []
+    used = 0
+    for chunk in chunks:
+        tokens = estimate_tokens(chunk)
+        if current and used + tokens > max_tokens:
+            batches.append(current)
+            current, used = [], 0
+        current.append(chunk)
+        used += tokens
+    if current:
+        batches.append(current)
+    return batches
+
+
+class ResumeIndex:
+    """이력서 청크와 정규화된 청크 임베딩 행렬"""
+
+    def __init__(self, model: str, chunks: Sequence[str], matrix: np.ndarray):
+        self.model = model
+        self.chunks = list(chunks)
+        self.matrix = matrix
+
+    def to_json(self) -> str:
+        """sessions.resume_chunks 저장용 문자열 (벡터는 float16 base64로 크기를 줄임)"""
+        return json.dumps({
+            'version': RESUME_INDEX_FORMAT_VERSION,
+            'model': self.model,
+            'dimension': int(self.matrix.shape[1]),
+            'chunks': self.chunks,
+            'vectors': base64.b64encode(self.matrix.astype('<f2').tobytes()).decode('ascii'),
+        }, ensure_ascii=False)
+
+    @classmethod
+    def from_json(cls, value: str) -> "ResumeIndex":
+        data = json.loads(value)
+        if data.get('version') != RESUME_INDEX_FORMAT_VERSION:
+            raise ValueError(f"지원하지 않는 이력서 인덱스 형식입니다: {data.get('version')}")
+        matrix = np.frombuffer(base64.b64decode(data['vectors']), dtype='<f2').astype(np.float32)
+        matrix = matrix.reshape(len(data['chunks']), data['dimension'])
+        return cls(data['model'], data['chunks'], matrix)
+
+    def top_k(self, query_vector: Sequence[float], k: int) -> List[int]:
+        """쿼리와 코사인 유사도가 높은 청크 k개의 인덱스 (원래 순서로 정렬)"""
+        query = np.asarray(query_vector, dtype=np.float32)
+        norm = np.linalg.norm(query)
+        scores = self.matrix @ (query / norm if norm else query)
+        if k >= len(self.chunks):
+            return list(range(len(self.chunks)))
+        best = np.argpartition(-scores, k - 1)[:k]
+        return sorted(int(i) for i in best)
+
+
+class ResumeRetriever(LoggerMixin):
+    """세션 이력서 청크 인덱스 생성과 문항별 발췌"""
+
+    def __init__(self, embedding_provider: EmbeddingProvider, config: Optional[Dict[str, Any]] = None):
+        self.embedding_provider = embedding_provider
+        self.config = config or get_resume_retrieval_config()
+
+    def build_index(self, resume_text: str) -> Optional[ResumeIndex]:
+        """
+        이력서가 검색을 쓸 만큼 길면 청크로 나눠 한 번에 임베딩합니다.
+
+        Returns:
+            ResumeIndex: 짧은 이력서, 비활성화, 임베딩 실패 시 None (전체 이력서를 그대로 사용)
+        """
+        if not self.config['enabled'] or not resume_text or estimate_tokens(resume_text) < self.config['min_tokens']:
+            return None
+        chunks = split_resume(resume_text, self.config['chunk_chars'])
+        if len(chunks) <= self.config['top_k']:
+            return None
+        try:
+            # 한국어 청크는 글자 수 대비 토큰이 많아 개수 기준 배치로는 요청당 토큰 한도에 걸릴 수 있으므로
+            # 추정 토큰 합 기준으로 나누어 호출합니다.
+            vectors: List[List[float]] = []
+            with track_stage('resume_indexing'):
+                for batch in batch_by_tokens(chunks, self.config['embed_batch_tokens']):
+                    vectors.extend(self.embedding_provider.embed(batch, TASK_DOCUMENT))
+        except Exception as e:
+            self.logger.warning(f"이력서 청크 임베딩 실패, 전체 이력서를 사용합니다: {e}")
+            return None
+
+        matrix = np.asarray(vectors, dtype=np.float32)
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        self.logger.info(f"이력서 청크 인덱스 생성: {len(resume_text):,}자 -> {len(chunks)}개 청크")
+        return ResumeIndex(self.embedding_provider.model_name, chunks, matrix / norms)
+
+    def load_index(self, value: Optional[str]) -> Optional[ResumeIndex]:
+        """저장된 resume_chunks를 읽습니다. (없거나, 형식/임베딩 모델이 다르면 None)"""
+        if not value or not self.config['enabled']:
+            return None
+        try:
+            index = ResumeIndex.from_json(value)
+        except (ValueError, KeyError, TypeError) as e:
+            self.logger.warning(f"이력서 청크 인덱스를 읽을 수 없어 전체 이력서를 사용합니다: {e}")
+            return None
+        if index.model != self.embedding_provider.model_name:
+            # 다른 모델의 벡터와는 유사도를 비교할 수 없습니다.
+            self.logger.warning(
+                f"이력서 청크 인덱스의 임베딩 모델({index.model})이 현재 제공자({self.embedding_provider.model_name})와 달라 "
+                f"전체 이력서를 사용합니다."
+            )
+            return None
+        return index
+
+    def make_query(self, question: str, jd_text: str, extra: str = "") -> str:
+        """검색 쿼리: 문항 + (수정 요청) + 채용공고 앞부분"""
+        parts = [question, extra, (jd_text or "")[:self.config['query_jd_chars']]]
+        return "\n".join(p.strip() for p in parts if p and p.strip())
+
+    def select(self, index: ResumeIndex, query_vector: Sequence[float]) -> str:
+        """쿼리와 가장 비슷한 청크들을 원래 순서대로 이어 붙인 발췌문 (연속되지 않은 구간 사이에는 생략 표시)"""
+        selected = index.top_k(query_vector, self.config['top_k'])
+        excerpt = index.chunks[selected[0]]
+        for previous, current in zip(selected, selected[1:]):
+            separator = "\n" if current == previous + 1 else EXCERPT_GAP
+            excerpt += separator + index.chunks[current]
+        return excerpt
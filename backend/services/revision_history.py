@@ -0,0 +1,180 @@
+"""
+수정 히스토리 압축 - 수정 프롬프트의 '이전 버전 답변 히스토리'를 일정 크기 안에 유지
+
+수정할 때마다 이전 버전을 모두 원문으로 넣으면 열 번째 수정에는 자기소개서 열 편이 프롬프트에 실립니다.
+최근 N개 버전만 원문으로 넣고, 그보다 오래된 버전은 '다음 버전에서 무엇이 바뀌었는지'를 한 줄로 요약합니다.
+요약은 모델 호출 없이 문장 단위 diff로 만들고 questions.history_digest에 저장해 버전마다 한 번만 계산합니다.
+히스토리 구간 전체는 REVISION_HISTORY_MAX_TOKENS를 넘지 않습니다.
+"""
+
+import difflib
+import hashlib
+import json
+import re
+from typing import Any, Dict, List, Optional, Sequence
+
+from utils.logger import LoggerMixin
+from utils.token_budget import TokenEstimator, estimate_tokens, truncate_to_tokens
+from config.settings import get_revision_history_config
+
+# history_digest 저장 형식 버전 (구조나 요약 방식이 바뀌면 올립니다. 다른 버전은 다시 계산)
+HISTORY_DIGEST_FORMAT_VERSION = 1
+DIGEST_HEADER = "이전 버전 변경 요약 (오래된 순):"
+
+_SENTENCE_BOUNDARY = re.compile(r"(?<=[.!?。])\s+|\n+")
+
+
+def split_sentences(text: str) -> List[str]:
+    """문장 부호와 줄바꿈 기준으로 문장을 나눕니다."""
+    return [s.strip() for s in _SENTENCE_BOUNDARY.split(text or "") if s and s.strip()]
+
+
+def _clip(text: str, max_chars: int) -> str:
+    return text if len(text) <= max_chars else text[:max(max_chars - 1, 0)].rstrip() + "…"
+
+
+def describe_change(number: int, version: str, successor: str, max_chars: int) -> str:
+    """
+    버전 하나를 한 줄로 요약합니다. (분량, 첫 문장, 다음 버전에서 빠지고 추가된 문장)
+
+    Args:
+        number (int): 버전 번호 (1부터)
+        version (str): 요약할 버전 원문
+        successor (str): 바로 다음 버전 원문
+        max_chars (int): 요약 한 줄의 최대 글자 수
+    """
+    before, after = split_sentences(version), split_sentences(successor)
+    removed: List[str] = []
+    added: List[str] = []
+    for tag, i1, i2, j1, j2 in difflib.SequenceMatcher(None, before, after, autojunk=False).get_opcodes():
+        if tag in ('replace', 'delete'):
+            removed.extend(before[i1:i2])
+        if tag in ('replace', 'insert'):
+            added.extend(after[j1:j2])
+
+    quote_chars = max(max_chars // 4, 20)
+    line = f"버전 {number} ({len(version)}자)"
+    if before:
+        line += f" 시작: \"{_clip(before[0], quote_chars)}\""
+    if not removed and not added:
+        line += " / 다음 버전과 내용 동일"
+    else:
+        line += f" / 다음 버전에서 {len(removed)}문장 삭제, {len(added)}문장 추가"
+        if removed:
+            line += f" / 삭제: \"{_clip(removed[0], quote_chars)}\""
+        if added:
+            line += f" / 추가: \"{_clip(added[0], quote_chars)}\""
+    return _clip(line, max_chars)
+
+
+def _fingerprint(version: str, successor: str) -> str:
+    """요약 한 줄은 해당 버전과 다음 버전으로 정해지므로 두 원문으로 캐시 유효성을 판단합니다."""
+    return hashlib.sha1(f"{version}\0{successor}".encode('utf-8')).hexdigest()[:16]
+
+
+class RevisionHistoryContext:
+    """프롬프트에 넣을 히스토리 항목(오래된 순)과 questions.history_digest에 저장할 값"""
+
+    def __init__(self, entries: List[str], stored: Optional[str] = None, digested: int = 0):
+        self.entries = entries
+        # 저장된 요약이 바뀌었을 때만 값이 있습니다. (None이면 저장할 필요 없음)
+        self.stored = stored
+        self.digested = digested
+
+
+class RevisionHistoryCompactor(LoggerMixin):
+    """이전 버전 히스토리를 '요약 + 최근 원문'으로 압축하고 토큰 상한을 적용"""
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None, estimator: TokenEstimator = None):
+        self.config = config or get_revision_history_config()
+        self.estimator = estimator
+
+    def _estimate(self, text: str) -> int:
+        return self.estimator.estimate(text) if self.estimator else estimate_tokens(text)
+
+    def _load(self, stored: Optional[str]) -> Dict[str, Dict[str, str]]:
+        if not stored:
+            return {}
+        try:
+            data = json.loads(stored)
+            if data.get('version') != HISTORY_DIGEST_FORMAT_VERSION:
+                return {}
+            return dict(data.get('entries') or {})
+        except (ValueError, TypeError, AttributeError) as e:
+            self.logger.warning(f"저장된 히스토리 요약을 읽을 수 없어 다시 계산합니다: {e}")
+            return {}
+
+    def compact(self, answer_history: Sequence[str], stored: Optional[str] = None) -> RevisionHistoryContext:
+        """
+        답변 히스토리(마지막 항목이 수정 대상인 현재 버전)에서 이전 버전들을 압축합니다.
+
+        Args:
+            answer_history: 질문의 answer_history (현재 버전까지)
+            stored: questions.history_digest에 저장된 요약 (없으면 새로 계산)
+
+        Returns:
+            RevisionHistoryContext: 프롬프트 항목과 갱신된 저장 값
+        """
+        history = [v or "" for v in (answer_history or [])]
+        previous = history[:-1]
+        keep = max(self.config['verbatim_versions'], 0)
+        digested = max(len(previous) - keep, 0)
+
+        cached = self._load(stored)
+        entries: Dict[str, Dict[str, str]] = {}
+        lines: List[str] = []
+        computed = 0
+        for index in range(digested):
+            number = index + 1
+            fingerprint = _fingerprint(history[index], history[index + 1])
+            entry = cached.get(str(number))
+            if not entry or entry.get('fp') != fingerprint:
+                entry = {
+                    'fp': fingerprint,
+                    'line': describe_change(number, history[index], history[index + 1],
+                                            self.config['digest_line_chars'])
+                }
+                computed += 1
+            entries[str(number)] = entry
+            lines.append(entry['line'])
+
+        new_stored = None
+        if computed or set(entries) != set(cached):
+            new_stored = json.dumps({'version': HISTORY_DIGEST_FORMAT_VERSION, 'entries': entries}, ensure_ascii=False)
+        if computed:
+            self.logger.debug(f"히스토리 요약 계산: {computed}개 버전 (저장된 요약 {digested - computed}개 재사용)")
+
+        recent = [f"버전 {number}: {text}" for number, text in enumerate(previous[digested:], digested + 1)]
+        return RevisionHistoryContext(self._cap(lines, recent), new_stored, digested)
+
+    def _cap(self, lines: List[str], recent: List[str]) -> List[str]:
+        """최신 원문 버전부터 상한 안에 채우고, 남은 예산으로 요약 줄을 최신 것부터 채웁니다."""
+        remaining = self.config['max_tokens']
+        kept_recent: List[str] = []
+        for entry in reversed(recent):
+            tokens = self._estimate(entry)
+            if tokens > remaining:
+                # 가장 최근 버전이 상한보다 길면 앞부분만 남깁니다. 그보다 오래된 원문은 넣지 않습니다.
+                truncated = truncate_to_tokens(entry, remaining, self.estimator)
+                if truncated and not kept_recent:
+                    kept_recent.append(truncated)
+                    remaining -= self._estimate(truncated)
+                break
+            kept_recent.append(entry)
+            remaining -= tokens
+        kept_recent.reverse()
+
+        kept_lines: List[str] = []
+        remaining -= self._estimate(DIGEST_HEADER)
+        for line in reversed(lines):
+            tokens = self._estimate(line) + 1
+            if tokens > remaining:
+                break
+            kept_lines.append(line)
+            remaining -= tokens
+        kept_lines.reverse()
+
+        if not kept_lines:
+            return kept_recent
+        digest = DIGEST_HEADER + "\n" + "\n".join(f"- {line}" for line in kept_lines)
+        return [digest] + kept_recent
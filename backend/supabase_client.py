@@ -3,12 +3,21 @@ Supabase 클라이언트 설정
 """
 
 import os
+import threading
+import time
 from dotenv import load_dotenv
-from supabase import create_client, Client
-from typing import Optional, Dict, Any, List
+from typing import TYPE_CHECKING, Optional, Dict, Any, List
 import json
 from pathlib import Path  # pathlib 임포트
 
+from utils.logger import get_logger
+from utils.metrics import track_stage
+
+logger = get_logger('supabase')
+
+if TYPE_CHECKING:
+    from supabase import Client
+
 # --- [수정된 부분 1: 명시적인 .env 경로 설정] ---
 # 이 파일(supabase_client.py)이 있는 폴더를 기준으로 .env 파일을 찾습니다.
 # 이렇게 하면 어디서 실행하든 항상 .env 파일을 올바르게 로드할 수 있습니다.
@@ -19,33 +28,44 @@ load_dotenv(dotenv_path=env_path)
 SUPABASE_URL = os.getenv("SUPABASE_URL")
 SUPABASE_KEY = os.getenv("SUPABASE_SERVICE_ROLE_KEY")
 
-def test_connection(client: Client) -> bool:
+# 세션 목록 조회 시 가져올 컬럼 (목록 응답에 이력서 청크 벡터(resume_chunks)와 구조화 프로필(resume_profile)이 실리지 않도록 명시)
+SESSION_LIST_COLUMNS = (
+    "id, user_id, created_at, company_name, job_title, main_responsibilities, requirements, "
+    "preferred_qualifications, resume_text, company_info"
+)
+
+def test_connection(client: "Client") -> bool:
     """Supabase 연결 상태를 테스트합니다."""
     try:
         # 간단한 쿼리로 연결 상태 확인
         client.table("sessions").select("id").limit(1).execute()
         return True
     except Exception as e:
-        print(f"연결 테스트 실패: {str(e)}")
+        logger.warning("연결 테스트 실패: %s", e)
         return False
 
-def reconnect_supabase() -> Client:
+def reconnect_supabase() -> "Client":
     """Supabase 클라이언트를 재연결합니다."""
+    from supabase import create_client
+
     try:
-        print("🔄 Supabase 재연결 시도 중...")
+        logger.info("Supabase 재연결 시도 중...")
         new_client = create_client(SUPABASE_URL, SUPABASE_KEY)
         if test_connection(new_client):
-            print("✅ Supabase 재연결 성공")
+            logger.info("Supabase 재연결 성공")
             return new_client
         else:
             raise Exception("재연결 후 연결 테스트 실패")
     except Exception as e:
-        print(f"❌ Supabase 재연결 실패: {str(e)}")
+        logger.error("Supabase 재연결 실패: %s", e)
         raise
 
 # --- [수정된 부분 2: 클라이언트 초기화 로직 단순화] ---
-def init_supabase() -> Client:
+def init_supabase() -> "Client":
     """Supabase 클라이언트를 초기화하고 반환합니다."""
+    # supabase 패키지는 클라이언트가 처음 필요할 때 임포트합니다. (앱 기동 시간 단축)
+    from supabase import create_client
+
     if not SUPABASE_URL:
         raise ValueError("SUPABASE_URL 환경 변수를 찾을 수 없습니다. .env 파일 위치와 내용을 확인하세요.")
     if not SUPABASE_KEY:
@@ -55,19 +75,28 @@ def init_supabase() -> Client:
         client = create_client(SUPABASE_URL, SUPABASE_KEY)
         # 간단한 연결 테스트
         client.table("sessions").select("id").limit(1).execute()
-        print("✅ Supabase 클라이언트 초기화 및 연결 성공")
+        logger.info("Supabase 클라이언트 초기화 및 연결 성공")
         return client
     except Exception as e:
-        print(f"❌ Supabase 클라이언트 초기화 실패: {str(e)}")
+        logger.error("Supabase 클라이언트 초기화 실패: %s", e)
         raise
 
-# 모듈이 로드될 때 단 한 번만 클라이언트를 초기화합니다.
-supabase: Client = init_supabase()
+# 클라이언트는 모듈 임포트 시점이 아니라 처음 사용할 때 단 한 번만 초기화합니다.
+_supabase: Optional["Client"] = None
+_supabase_lock = threading.Lock()
+
+def get_supabase() -> "Client":
+    """초기화된 Supabase 클라이언트를 반환합니다. (최초 호출 시 초기화)"""
+    global _supabase
+    if _supabase is None:
+        with _supabase_lock:
+            if _supabase is None:
+                _supabase = init_supabase()
+    return _supabase
 
-def get_supabase() -> Client:
-    """초기화된 Supabase 클라이언트를 반환합니다."""
-    # 이제 supabase는 None일 수 없으므로, 복잡한 확인 없이 바로 반환합니다.
-    return supabase
+# 읽기/쓰기 호출 지연 시간과 진행 중인 Supabase 호출 수를 메트릭으로 기록합니다.
+_supabase_read = track_stage('supabase_read', dependency='supabase')
+_supabase_write = track_stage('supabase_write', dependency='supabase')
 
 # --- [기존 SupabaseService 클래스는 그대로 유지] ---
 class SupabaseService:
@@ -78,6 +107,7 @@ class SupabaseService:
         self.client = get_supabase()
 
     # ... (create_session, get_user_sessions 등 나머지 모든 메서드는 수정할 필요 없음) ...
+    @_supabase_write
     def create_session(self, user_id: str, session_data: Dict[str, Any]) -> Dict[str, Any]:
         """새 세션 생성"""
         try:
@@ -91,6 +121,11 @@ class SupabaseService:
                 "resume_text": session_data.get("resume_text"),
                 "company_info": session_data.get("company_info")
             }
+            # 이력서 청크 인덱스는 긴 이력서에만 만들어지므로 있을 때만 저장합니다.
+            if session_data.get("resume_chunks"):
+                data["resume_chunks"] = session_data["resume_chunks"]
+            if session_data.get("resume_profile"):
+                data["resume_profile"] = session_data["resume_profile"]
             
             result = self.client.table("sessions").insert(data).execute()
             return result.data[0] if result.data else None
@@ -98,6 +133,7 @@ class SupabaseService:
         except Exception as e:
             raise Exception(f"세션 생성 실패: {str(e)}")
     
+    @_supabase_read
     def get_session(self, session_id: str, user_id: str) -> Optional[Dict[str, Any]]:
         """세션 조회"""
         max_retries = 3
@@ -110,10 +146,10 @@ class SupabaseService:
                 if attempt == max_retries - 1:
                     raise Exception(f"세션 조회 실패: {str(e)}")
                 else:
-                    print(f"세션 조회 재시도 {attempt + 1}/{max_retries}: {str(e)}")
-                    import time
+                    logger.warning("세션 조회 재시도 %d/%d: %s", attempt + 1, max_retries, e)
                     time.sleep(1)  # 1초 대기 후 재시도
     
+    @_supabase_read
     def get_user_sessions(self, user_id: str) -> List[Dict[str, Any]]:
         """사용자의 모든 세션 조회 (질문이 없는 세션은 자동 정리)"""
         max_retries = 3
@@ -121,15 +157,15 @@ class SupabaseService:
             try:
                 # 연결 상태 확인 및 재연결 시도
                 if not test_connection(self.client):
-                    print(f"🔌 연결이 끊어짐, 재연결 시도... (시도 {attempt + 1}/{max_retries})")
+                    logger.warning("연결이 끊어짐, 재연결 시도... (시도 %d/%d)", attempt + 1, max_retries)
                     self.client = reconnect_supabase()
                 
-                print(f"🔍 사용자 세션 조회 시도 {attempt + 1}/{max_retries} - 사용자 ID: {user_id}")
+                logger.debug("사용자 세션 조회 시도 %d/%d - 사용자 ID: %s", attempt + 1, max_retries, user_id)
                 
                 # 1. 사용자의 모든 세션 조회
-                result = self.client.table("sessions").select("*").eq("user_id", user_id).order("created_at", desc=True).execute()
+                result = self.client.table("sessions").select(SESSION_LIST_COLUMNS).eq("user_id", user_id).order("created_at", desc=True).execute()
                 sessions = result.data if result.data else []
-                print(f"📊 세션 조회 성공: {len(sessions)}개 세션 발견")
+                logger.debug("세션 조회 성공: %d개 세션 발견", len(sessions))
                 
                 # 2. 각 세션에 대해 질문이 있는지 확인하고, 질문이 없는 세션은 삭제
                 valid_sessions = []
@@ -143,21 +179,21 @@ class SupabaseService:
                     if question_count > 0:
                         # 질문이 있는 세션은 유지
                         valid_sessions.append(session)
-                        print(f"✅ 세션 {session_id} 유지 (질문 {question_count}개)")
+                        logger.debug("세션 %s 유지 (질문 %d개)", session_id, question_count, extra={'sample': True})
                     else:
                         # 질문이 없는 세션은 자동 삭제
                         try:
                             self.client.table("sessions").delete().eq("id", session_id).execute()
-                            print(f"🗑️ 자동 정리: 질문이 없는 세션 삭제됨 - {session_id}")
+                            logger.info("자동 정리: 질문이 없는 세션 삭제됨 - %s", session_id)
                         except Exception as e:
-                            print(f"⚠️ 자동 정리 실패: 세션 삭제 중 오류 - {session_id}, {str(e)}")
+                            logger.warning("자동 정리 실패: 세션 삭제 중 오류 - %s, %s", session_id, e)
                 
-                print(f"🎯 최종 유효 세션: {len(valid_sessions)}개")
+                logger.debug("최종 유효 세션: %d개", len(valid_sessions))
                 return valid_sessions
                 
             except Exception as e:
                 error_msg = str(e)
-                print(f"❌ 사용자 세션 조회 시도 {attempt + 1}/{max_retries} 실패: {error_msg}")
+                logger.warning("사용자 세션 조회 시도 %d/%d 실패: %s", attempt + 1, max_retries, error_msg)
                 
                 if attempt == max_retries - 1:
                     # 마지막 시도에서 실패한 경우 상세한 에러 정보 제공
@@ -168,14 +204,15 @@ class SupabaseService:
                     else:
                         raise Exception(f"사용자 세션 조회 실패: {error_msg}")
                 else:
-                    print(f"🔄 재시도 대기 중... ({attempt + 1}/{max_retries})")
+                    logger.info("재시도 대기 중... (%d/%d)", attempt + 1, max_retries)
                     # 연결 재시도
                     try:
                         self.client = reconnect_supabase()
                     except Exception as reconnect_error:
-                        print(f"⚠️ 재연결 실패: {str(reconnect_error)}")
+                        logger.warning("재연결 실패: %s", reconnect_error)
                     time.sleep(2)  # 2초 대기 후 재시도
     
+    @_supabase_write
     def update_session(self, session_id: str, user_id: str, update_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """세션 업데이트"""
         try:
@@ -185,6 +222,7 @@ class SupabaseService:
         except Exception as e:
             raise Exception(f"세션 업데이트 실패: {str(e)}")
     
+    @_supabase_write
     def delete_session(self, session_id: str, user_id: str) -> bool:
         """세션 삭제"""
         try:
@@ -194,6 +232,7 @@ class SupabaseService:
         except Exception as e:
             raise Exception(f"세션 삭제 실패: {str(e)}")
     
+    @_supabase_write
     def create_question(self, session_id: str, question_data: Dict[str, Any]) -> Dict[str, Any]:
         """질문 생성"""
         try:
@@ -211,6 +250,7 @@ class SupabaseService:
         except Exception as e:
             raise Exception(f"질문 생성 실패: {str(e)}")
     
+    @_supabase_read
     def get_session_questions(self, session_id: str) -> List[Dict[str, Any]]:
         """세션의 모든 질문 조회"""
         max_retries = 3
@@ -245,10 +285,10 @@ class SupabaseService:
                 if attempt == max_retries - 1:
                     raise Exception(f"세션 질문 조회 실패: {str(e)}")
                 else:
-                    print(f"세션 질문 조회 재시도 {attempt + 1}/{max_retries}: {str(e)}")
-                    import time
+                    logger.warning("세션 질문 조회 재시도 %d/%d: %s", attempt + 1, max_retries, e)
                     time.sleep(1)  # 1초 대기 후 재시도
     
+    @_supabase_write
     def update_question(self, question_id: int, update_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """질문 업데이트"""
         try:
@@ -282,6 +322,7 @@ class SupabaseService:
         except Exception as e:
             raise Exception(f"질문 업데이트 실패: {str(e)}")
     
+    @_supabase_write
     def delete_question(self, question_id: int) -> bool:
         """질문 삭제 (질문이 없는 세션이 되면 세션도 함께 삭제)"""
         try:
@@ -305,15 +346,16 @@ class SupabaseService:
             if remaining_count == 0:
                 try:
                     self.client.table("sessions").delete().eq("id", session_id).execute()
-                    print(f"자동 정리: 마지막 질문 삭제로 인한 세션 삭제 - {session_id}")
+                    logger.info("자동 정리: 마지막 질문 삭제로 인한 세션 삭제 - %s", session_id)
                 except Exception as e:
-                    print(f"자동 정리 실패: 세션 삭제 중 오류 - {session_id}, {str(e)}")
+                    logger.warning("자동 정리 실패: 세션 삭제 중 오류 - %s, %s", session_id, e)
             
             return True
             
         except Exception as e:
             raise Exception(f"질문 삭제 실패: {str(e)}")
     
+    @_supabase_read
     def get_user_by_email(self, email: str) -> Optional[Dict[str, Any]]:
         """이메일로 사용자 조회"""
         try:
@@ -330,6 +372,7 @@ class SupabaseService:
         except Exception as e:
             raise Exception(f"사용자 조회 실패: {str(e)}")
     
+    @_supabase_write
     def create_user(self, email: str, password: str) -> Dict[str, Any]:
         """새 사용자 생성"""
         try:
@@ -349,6 +392,7 @@ class SupabaseService:
             raise Exception(f"사용자 생성 실패: {str(e)}")
     
     # 피드백 관련 메서드들
+    @_supabase_write
     def create_feedback(self, feedback_data: Dict[str, Any]) -> Dict[str, Any]:
         """새 피드백 생성"""
         try:
@@ -365,6 +409,7 @@ class SupabaseService:
         except Exception as e:
             raise Exception(f"피드백 생성 실패: {str(e)}")
     
+    @_supabase_read
     def get_feedback(self, feedback_id: str) -> Optional[Dict[str, Any]]:
         """피드백 조회"""
         try:
@@ -374,6 +419,7 @@ class SupabaseService:
         except Exception as e:
             raise Exception(f"피드백 조회 실패: {str(e)}")
     
+    @_supabase_write
     def update_feedback(self, feedback_id: str, update_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """피드백 업데이트"""
         try:
@@ -383,6 +429,7 @@ class SupabaseService:
         except Exception as e:
             raise Exception(f"피드백 업데이트 실패: {str(e)}")
     
+    @_supabase_read
     def get_user_feedbacks(self, user_id: str) -> List[Dict[str, Any]]:
         """사용자의 피드백 목록 조회"""
         try:
@@ -16,7 +16,9 @@ CREATE TABLE sessions (
     
     -- 기타 필드
     resume_text TEXT,
-    company_info TEXT
+    company_info TEXT,
+    resume_chunks TEXT, -- 이력서 청크와 임베딩(JSON, 벡터는 float16 base64). 긴 이력서만 저장
+    resume_profile TEXT -- 이력서 구조화 프로필(JSON: 경험/역할/기술/정량 성과). 세션 생성 시 한 번 추출
 );
 
 -- 질문 테이블 생성
@@ -27,6 +29,7 @@ CREATE TABLE questions (
     question TEXT NOT NULL,
     answer_history TEXT, -- JSON 형태의 문자열로 답변 리스트 저장
     current_version_index INTEGER DEFAULT 0 NOT NULL,
+    history_digest TEXT, -- 수정 프롬프트용 이전 버전 변경 요약(JSON). 버전마다 한 번만 계산
     
     -- 세션 내 질문 번호는 유니크해야 함
     UNIQUE(session_id, question_number)
@@ -91,4 +94,13 @@ CREATE POLICY "Users can delete own questions" ON questions
             WHERE sessions.id = questions.session_id 
             AND sessions.user_id = auth.uid()
         )
-    ); 
\ No newline at end of file
+    );
+
+-- 기존 데이터베이스 업그레이드: 문항별 이력서 검색용 청크 인덱스 컬럼
+ALTER TABLE sessions ADD COLUMN IF NOT EXISTS resume_chunks TEXT;
+
+-- 기존 데이터베이스 업그레이드: 수정 히스토리 요약 캐시 컬럼
+ALTER TABLE questions ADD COLUMN IF NOT EXISTS history_digest TEXT;
+
+-- 기존 데이터베이스 업그레이드: 이력서 구조화 프로필 컬럼
+ALTER TABLE sessions ADD COLUMN IF NOT EXISTS resume_profile TEXT;
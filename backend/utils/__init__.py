@@ -3,7 +3,10 @@ Utility functions package for iloveresume backend
 """
 
 from .file_processor import parse_pdf, parse_docx, validate_file_type, extract_text_from_file, get_file_info, FileProcessingError
-from .logger import setup_logger, get_logger, setup_flask_logger
+from .logger import setup_logger, get_logger, setup_flask_logger, lazy
+from .cache import LRUCache, SQLiteStore, make_cache_key, normalize_text
+from .metrics import track_stage, record_token_usage
+from .tracing import span, get_trace_id
 from .validators import (
     validate_session_data, validate_question_data, validate_revision_request,
     validate_session_id, validate_question_index, ValidationError
@@ -12,7 +15,9 @@ from .validators import (
 
 __all__ = [
     'parse_pdf', 'parse_docx', 'validate_file_type', 'extract_text_from_file', 'get_file_info', 'FileProcessingError',
-    'setup_logger', 'get_logger', 'setup_flask_logger',
+    'setup_logger', 'get_logger', 'setup_flask_logger', 'lazy',
+    'LRUCache', 'SQLiteStore', 'make_cache_key', 'normalize_text',
+    'track_stage', 'record_token_usage', 'span', 'get_trace_id',
     'validate_session_data', 'validate_question_data', 'validate_revision_request',
     'validate_session_id', 'validate_question_index', 'ValidationError'
 ] 
\ No newline at end of file
@@ -0,0 +1,223 @@
+"""
+캐시 유틸리티
+TTL 만료와 LRU 퇴출을 지원하는 스레드 안전 인메모리 캐시, SQLite 영속 저장소 및 캐시 키 생성 함수 제공
+"""
+
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional
+
+_WHITESPACE_RE = re.compile(r'\s+')
+
+
+def normalize_text(text: Optional[str]) -> str:
+    """
+    캐시 키 생성을 위한 텍스트 정규화 (앞뒤 공백 제거 및 연속 공백 축약)
+
+    Args:
+        text (str): 정규화할 텍스트
+
+    Returns:
+        str: 정규화된 텍스트
+    """
+    if not text:
+        return ""
+    return _WHITESPACE_RE.sub(' ', text).strip()
+
+
+def make_cache_key(*parts: Any) -> str:
+    """
+    여러 입력값을 정규화한 뒤 SHA-256 해시 키로 변환
+
+    Args:
+        *parts: 키를 구성할 값들 (문자열은 정규화, 리스트/딕셔너리는 JSON 직렬화)
+
+    Returns:
+        str: 16진수 해시 문자열
+    """
+    normalized = [normalize_text(p) if isinstance(p, str) else p for p in parts]
+    payload = json.dumps(normalized, ensure_ascii=False, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class LRUCache:
+    """
+    TTL 만료 + LRU 퇴출을 지원하는 스레드 안전 캐시
+
+    Usage:
+        cache = LRUCache(max_entries=256, ttl_seconds=3600)
+        value = cache.get(key)
+        if value is None:
+            value = compute()
+            cache.set(key, value)
+    """
+
+    def __init__(self, max_entries: int = 256, ttl_seconds: Optional[float] = None):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """캐시 조회 (만료된 항목은 삭제 후 miss 처리)"""
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                self.misses += 1
+                return default
+            value, expires_at = item
+            if expires_at is not None and expires_at <= time.time():
+                del self._data[key]
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any, ttl_seconds: Optional[float] = None) -> None:
+        """캐시 저장 (용량 초과 시 가장 오래 사용되지 않은 항목부터 퇴출)"""
+        ttl = ttl_seconds if ttl_seconds is not None else self.ttl_seconds
+        expires_at = time.time() + ttl if ttl else None
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, key: Hashable) -> bool:
+        """캐시 항목 삭제"""
+        with self._lock:
+            return self._data.pop(key, None) is not None
+
+    def clear(self) -> None:
+        """캐시 전체 비우기"""
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """적중/미스 통계 반환"""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'entries': len(self._data),
+                'max_entries': self.max_entries,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': round(self.hits / total, 4) if total else 0.0
+            }
+
+
+class SQLiteStore:
+    """
+    재시작 후에도 유지되는 SQLite 기반 키-값 저장소 (같은 호스트의 워커 간 공유 가능)
+
+    값은 bytes로 저장하며, 최대 항목 수를 넘으면 가장 오래 조회되지 않은 항목부터 정리합니다.
+    """
+
+    # 조회 시각(accessed_at) 갱신 최소 간격 (초)
+    ACCESS_TOUCH_INTERVAL = 60
+
+    def __init__(self, path: str, table: str = 'kv', max_entries: Optional[int] = None):
+        directory = os.path.dirname(path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory, exist_ok=True)
+
+        self.path = path
+        self.table = table
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._writes_since_prune = 0
+        self._conn = sqlite3.connect(path, timeout=5, check_same_thread=False)
+        # WAL 모드: 여러 워커 프로세스가 동시에 읽고 쓸 수 있도록 설정
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute(
+            f'CREATE TABLE IF NOT EXISTS {table} ('
+            'key TEXT PRIMARY KEY, value BLOB NOT NULL, '
+            'created_at REAL NOT NULL, accessed_at REAL NOT NULL)'
+        )
+        self._conn.execute(f'CREATE INDEX IF NOT EXISTS idx_{table}_accessed_at ON {table}(accessed_at)')
+        self._conn.commit()
+
+    def get(self, key: str) -> Optional[bytes]:
+        """값 조회 (없으면 None)"""
+        with self._lock:
+            row = self._conn.execute(
+                f'SELECT value, accessed_at FROM {self.table} WHERE key = ?', (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            # 조회할 때마다 쓰기가 일어나지 않도록, 마지막 조회 시각이 일정 시간 이상 지난 경우에만 갱신합니다.
+            # (정리 순서에만 쓰이므로 이 정도 오차는 문제되지 않음)
+            now = time.time()
+            if now - row[1] >= self.ACCESS_TOUCH_INTERVAL:
+                self._conn.execute(f'UPDATE {self.table} SET accessed_at = ? WHERE key = ?', (now, key))
+                self._conn.commit()
+            return row[0]
+
+    def set(self, key: str, value: bytes) -> None:
+        """값 저장 (동일 키는 덮어쓰기)"""
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                f'INSERT OR REPLACE INTO {self.table} (key, value, created_at, accessed_at) VALUES (?, ?, ?, ?)',
+                (key, value, now, now)
+            )
+            self._conn.commit()
+            self._writes_since_prune += 1
+            if self.max_entries and self._writes_since_prune >= 100:
+                self._prune()
+
+    def delete(self, key: str) -> bool:
+        """값 삭제"""
+        with self._lock:
+            cursor = self._conn.execute(f'DELETE FROM {self.table} WHERE key = ?', (key,))
+            self._conn.commit()
+            return cursor.rowcount > 0
+
+    def delete_prefix(self, prefix: str) -> int:
+        """prefix로 시작하는 키를 모두 삭제하고 삭제한 개수를 반환합니다."""
+        if not prefix:
+            raise ValueError("prefix가 비어 있으면 전체 삭제가 되므로 허용하지 않습니다.")
+        with self._lock:
+            # 범위 조건이라 key 기본 키 인덱스를 그대로 사용합니다. (LIKE의 와일드카드 문자 처리 불필요)
+            cursor = self._conn.execute(
+                f'DELETE FROM {self.table} WHERE key >= ? AND key < ?', (prefix, prefix + '\U0010ffff')
+            )
+            self._conn.commit()
+            return cursor.rowcount
+
+    def delete_older_than(self, max_age_seconds: float) -> int:
+        """저장한 지 max_age_seconds가 지난 항목을 삭제하고 삭제한 개수를 반환합니다."""
+        with self._lock:
+            cursor = self._conn.execute(
+                f'DELETE FROM {self.table} WHERE created_at < ?', (time.time() - max_age_seconds,)
+            )
+            self._conn.commit()
+            return cursor.rowcount
+
+    def _prune(self) -> None:
+        """최대 항목 수 초과분을 오래 조회되지 않은 순서로 삭제 (self._lock 보유 상태에서 호출)"""
+        self._writes_since_prune = 0
+        count = self._conn.execute(f'SELECT COUNT(*) FROM {self.table}').fetchone()[0]
+        overflow = count - self.max_entries
+        if overflow > 0:
+            self._conn.execute(
+                f'DELETE FROM {self.table} WHERE key IN '
+                f'(SELECT key FROM {self.table} ORDER BY accessed_at ASC LIMIT ?)',
+                (overflow,)
+            )
+            self._conn.commit()
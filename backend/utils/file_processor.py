@@ -5,9 +5,14 @@ PDF, DOCX 파일 파싱 및 검증 기능 제공
 
 import io
 import os
-from PyPDF2 import PdfReader
-from docx import Document
 from config.settings import ALLOWED_EXTENSIONS, MAX_FILE_SIZE
+from utils.logger import get_logger
+from utils.text_normalizer import PAGE_BREAK
+
+# 추출 결과가 달라지는 변경(파싱 방식, 쪽 구분 등)을 하면 올립니다. 추출 텍스트 캐시 키에 포함됩니다.
+PARSER_VERSION = 1
+
+logger = get_logger(__name__)
 
 
 class FileProcessingError(Exception):
@@ -69,7 +74,7 @@ def parse_pdf(file_stream):
         file_stream: PDF 파일 스트림
         
     Returns:
-        str: 추출된 텍스트
+        str: 추출된 텍스트 (쪽 사이는 PAGE_BREAK로 구분하며, 머리글/바닥글 검출 후 normalize_resume_text에서 제거됨)
         
     Raises:
         FileProcessingError: PDF 파싱 실패 시
@@ -78,23 +83,25 @@ def parse_pdf(file_stream):
         # 파일 크기 검증
         validate_file_size(file_stream)
         
-        # PDF 파싱
+        # PDF 파싱 (PyPDF2는 첫 PDF 처리 시점에 임포트하여 앱 기동 시간을 줄입니다)
+        from PyPDF2 import PdfReader
         stream = io.BytesIO(file_stream.read())
         reader = PdfReader(stream)
         
         if len(reader.pages) == 0:
             raise FileProcessingError("PDF 파일에 페이지가 없습니다.")
         
-        text = ""
+        page_texts = []
         for page_num, page in enumerate(reader.pages):
             try:
                 page_text = page.extract_text()
                 if page_text:
-                    text += page_text + "\n"
+                    page_texts.append(page_text)
             except Exception as e:
                 # 개별 페이지 오류는 로깅만 하고 계속 진행
-                print(f"페이지 {page_num + 1} 처리 중 오류: {str(e)}")
+                logger.warning(f"페이지 {page_num + 1} 처리 중 오류: {str(e)}")
         
+        text = PAGE_BREAK.join(page_texts)
         if not text.strip():
             raise FileProcessingError("PDF에서 텍스트를 추출할 수 없습니다.")
         
@@ -123,7 +130,8 @@ def parse_docx(file_stream):
         # 파일 크기 검증
         validate_file_size(file_stream)
         
-        # DOCX 파싱
+        # DOCX 파싱 (python-docx는 첫 DOCX 처리 시점에 임포트)
+        from docx import Document
         stream = io.BytesIO(file_stream.read())
         doc = Document(stream)
         
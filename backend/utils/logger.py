@@ -2,16 +2,188 @@
 로깅 설정 통합 관리
 """
 
-import os
+import atexit
+import json
 import logging
-from logging.handlers import RotatingFileHandler
-from config.settings import LOG_LEVEL, LOG_FILE_MAX_BYTES, LOG_BACKUP_COUNT, LOGS_DIR
+import os
+import queue
+import threading
+import time
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from config.settings import LOG_LEVEL, LOG_FILE_MAX_BYTES, LOG_BACKUP_COUNT, LOGS_DIR, get_logging_config
+from utils.tracing import TraceContextFilter
+
+TEXT_FORMAT = '[%(asctime)s] %(levelname)s [%(trace_id)s] in %(module)s.%(funcName)s:%(lineno)d - %(message)s'
+CONSOLE_FORMAT = '%(levelname)s [%(trace_id)s]: %(message)s'
+DATE_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+# 로그 파일별 큐 리스너 (같은 파일을 쓰는 로거들은 하나의 파일 핸들러를 공유)
+_listeners = {}
+_listeners_lock = threading.Lock()
+
+
+class JsonFormatter(logging.Formatter):
+    """로그 레코드를 한 줄짜리 JSON으로 출력합니다. (로그 수집기 적재용)"""
+
+    def format(self, record):
+        payload = {
+            'ts': self.formatTime(record, DATE_FORMAT),
+            'level': record.levelname,
+            'logger': record.name,
+            'module': record.module,
+            'func': record.funcName,
+            'line': record.lineno,
+            'trace_id': getattr(record, 'trace_id', '-'),
+            'message': record.getMessage()
+        }
+        suppressed = getattr(record, 'suppressed', 0)
+        if suppressed:
+            payload['suppressed'] = suppressed
+        if record.exc_info:
+            payload['exc_info'] = self.formatException(record.exc_info)
+        return json.dumps(payload, ensure_ascii=False)
+
+
+class SamplingFilter(logging.Filter):
+    """
+    반복되는 상세 로그를 호출 위치(로거, 파일, 줄)별로 제한합니다.
+
+    max_level 이하 레벨의 레코드와 extra={'sample': True}로 표시한 레코드는
+    window_seconds 동안 호출 위치별로 burst건까지만 통과시키고, 나머지는 버립니다.
+    버린 건수는 다음에 통과하는 레코드 메시지 뒤에 붙입니다.
+    """
+
+    def __init__(self, max_level=logging.DEBUG, burst=20, window_seconds=10.0):
+        super().__init__()
+        self.max_level = max_level
+        self.burst = burst
+        self.window_seconds = window_seconds
+        self._windows = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record):
+        if record.levelno > self.max_level and not getattr(record, 'sample', False):
+            return True
+        key = (record.name, record.pathname, record.lineno)
+        now = time.monotonic()
+        with self._lock:
+            window = self._windows.get(key)
+            if window is None or now - window[0] >= self.window_seconds:
+                suppressed = window[2] if window else 0
+                self._windows[key] = [now, 1, 0]
+            elif window[1] < self.burst:
+                window[1] += 1
+                suppressed, window[2] = window[2], 0
+            else:
+                window[2] += 1
+                return False
+        if suppressed:
+            record.suppressed = suppressed
+            record.msg = f"{record.msg} (같은 위치의 로그 {suppressed}건 생략)"
+        return True
+
+
+class LazyLogArg:
+    """
+    로그 레벨이 비활성화되어 있으면 계산하지 않는 지연 로그 인자
+
+    Usage:
+        logger.debug("필드 크기: %s", lazy(lambda: len(data.encode('utf-8'))))
+    """
+
+    __slots__ = ('func',)
+
+    def __init__(self, func):
+        self.func = func
+
+    def __str__(self):
+        return str(self.func())
+
+    __repr__ = __str__
+
+
+def lazy(func):
+    """LazyLogArg 생성 헬퍼 (% 형식 로그 인자로 전달)"""
+    return LazyLogArg(func)
+
+
+def _build_formatters(config):
+    if config['format'] == 'json':
+        json_formatter = JsonFormatter()
+        return json_formatter, json_formatter
+    return logging.Formatter(TEXT_FORMAT, datefmt=DATE_FORMAT), logging.Formatter(CONSOLE_FORMAT)
+
+
+def _get_listener_queue(log_file):
+    """
+    로그 파일별 큐를 반환합니다. (최초 호출 시 파일/콘솔 핸들러와 큐 리스너 스레드 생성)
+    요청 스레드는 큐에 레코드를 넣기만 하고, 파일 쓰기와 회전은 리스너 스레드가 처리합니다.
+    """
+    with _listeners_lock:
+        if log_file in _listeners:
+            return _listeners[log_file][0]
+
+        config = get_logging_config()
+        # 로그 디렉토리 생성
+        if not os.path.exists(LOGS_DIR):
+            os.makedirs(LOGS_DIR, exist_ok=True)
+
+        file_formatter, console_formatter = _build_formatters(config)
+
+        # 파일 핸들러 설정
+        file_handler = RotatingFileHandler(
+            os.path.join(LOGS_DIR, log_file),
+            maxBytes=LOG_FILE_MAX_BYTES,
+            backupCount=LOG_BACKUP_COUNT,
+            encoding='utf-8'
+        )
+        file_handler.setFormatter(file_formatter)
+
+        # 콘솔 핸들러 설정 (개발 환경용)
+        console_handler = logging.StreamHandler()
+        console_handler.setFormatter(console_formatter)
+
+        log_queue = queue.Queue(maxsize=config['queue_size']) if config['queue_size'] > 0 else queue.Queue()
+        listener = QueueListener(log_queue, file_handler, console_handler, respect_handler_level=True)
+        listener.start()
+        _listeners[log_file] = (log_queue, listener)
+        return log_queue
+
+
+def _stop_listeners():
+    """종료 시 큐에 남은 레코드를 모두 기록하고 리스너 스레드를 정리합니다."""
+    with _listeners_lock:
+        listeners = list(_listeners.values())
+        _listeners.clear()
+    for _, listener in listeners:
+        try:
+            listener.stop()
+        except Exception:
+            pass
+
+
+atexit.register(_stop_listeners)
+
+
+class _NonBlockingQueueHandler(QueueHandler):
+    """큐가 가득 차면 요청 스레드를 막지 않고 레코드를 버립니다."""
+
+    dropped = 0
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            _NonBlockingQueueHandler.dropped += 1
 
 
 def setup_logger(name=None, log_file='app.log'):
     """
     로거 설정 및 반환
     
+    로거에는 큐 핸들러만 붙이고, 실제 파일/콘솔 출력은 로그 파일별 큐 리스너 스레드가 담당합니다.
+    trace id 부착과 샘플링은 큐에 넣기 전(요청 스레드)에 처리합니다.
+
     Args:
         name (str): 로거 이름 (None이면 root logger)
         log_file (str): 로그 파일명
@@ -19,10 +191,8 @@ def setup_logger(name=None, log_file='app.log'):
     Returns:
         logging.Logger: 설정된 로거 객체
     """
-    # 로그 디렉토리 생성
-    if not os.path.exists(LOGS_DIR):
-        os.makedirs(LOGS_DIR)
-    
+    config = get_logging_config()
+
     # 로거 생성
     logger = logging.getLogger(name)
     logger.setLevel(getattr(logging, LOG_LEVEL.upper(), logging.INFO))
@@ -31,32 +201,16 @@ def setup_logger(name=None, log_file='app.log'):
     if logger.handlers:
         logger.handlers.clear()
     
-    # 파일 핸들러 설정
-    log_path = os.path.join(LOGS_DIR, log_file)
-    file_handler = RotatingFileHandler(
-        log_path, 
-        maxBytes=LOG_FILE_MAX_BYTES, 
-        backupCount=LOG_BACKUP_COUNT,
-        encoding='utf-8'
-    )
-    
-    # 포매터 설정
-    formatter = logging.Formatter(
-        '[%(asctime)s] %(levelname)s in %(module)s.%(funcName)s:%(lineno)d - %(message)s',
-        datefmt='%Y-%m-%d %H:%M:%S'
-    )
-    file_handler.setFormatter(formatter)
-    
-    # 콘솔 핸들러 설정 (개발 환경용)
-    console_handler = logging.StreamHandler()
-    console_formatter = logging.Formatter(
-        '%(levelname)s: %(message)s'
-    )
-    console_handler.setFormatter(console_formatter)
-    
-    # 핸들러 추가
-    logger.addHandler(file_handler)
-    logger.addHandler(console_handler)
+    queue_handler = _NonBlockingQueueHandler(_get_listener_queue(log_file))
+    # 현재 요청의 trace id는 컨텍스트 변수이므로 요청 스레드에서 붙여야 합니다.
+    queue_handler.addFilter(TraceContextFilter())
+    if config['sampling_enabled']:
+        queue_handler.addFilter(SamplingFilter(
+            max_level=getattr(logging, config['sampling_level'], logging.DEBUG),
+            burst=config['sampling_burst'],
+            window_seconds=config['sampling_window_seconds']
+        ))
+    logger.addHandler(queue_handler)
     
     # 상위 로거로의 전파 방지 (중복 로깅 방지)
     logger.propagate = False
@@ -124,11 +278,11 @@ def log_function_call(func):
     """
     def wrapper(*args, **kwargs):
         logger = get_logger(func.__module__)
-        logger.debug(f"함수 호출: {func.__name__}({args}, {kwargs})")
+        logger.debug("함수 호출: %s(%s, %s)", func.__name__, args, kwargs)
         
         try:
             result = func(*args, **kwargs)
-            logger.debug(f"함수 완료: {func.__name__} -> {type(result)}")
+            logger.debug("함수 완료: %s -> %s", func.__name__, type(result))
             return result
         except Exception as e:
             logger.error(f"함수 오류: {func.__name__} -> {str(e)}")
@@ -152,7 +306,7 @@ def log_api_request(func):
         
         logger = get_logger('api')
         logger.info(f"API 요청: {request.method} {request.path}")
-        logger.debug(f"요청 데이터: {request.get_json() if request.is_json else 'Non-JSON'}")
+        logger.debug("요청 데이터: %s", lazy(lambda: request.get_json() if request.is_json else 'Non-JSON'))
         
         try:
             result = func(*args, **kwargs)
@@ -0,0 +1,323 @@
+"""
+프로세스 내 메트릭 레지스트리 (Prometheus 텍스트 형식으로 노출)
+
+- Counter: 누적 값 (토큰 수, 요청 수)
+- Gauge: 현재 값 (동시 처리 중인 요청/외부 호출 수, 캐시 적중률)
+- Histogram: 지연 시간 분포 (라우트별 응답 시간, 단계별 처리 시간)
+
+외부 라이브러리 없이 동작하며, 값은 워커 프로세스별로 집계됩니다.
+(gunicorn 워커가 여러 개면 스크레이퍼가 워커별 값을 합산해야 합니다)
+
+사용법:
+    with track_stage('supabase_read', dependency='supabase'):
+        result = client.table(...).execute()
+
+    @track_stage('auth')
+    def get_user(...): ...
+"""
+
+import functools
+import math
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from utils.tracing import span
+
+# 지연 시간 히스토그램 기본 버킷 (초). 생성 호출은 수~수십 초가 걸리므로 상단을 넓게 잡습니다.
+DEFAULT_LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 40.0, 80.0)
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+def _label_key(labels: Dict[str, Any]) -> LabelKey:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _escape_label_value(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(key: LabelKey, extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = list(key) + ([extra] if extra else [])
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape_label_value(v)}"' for k, v in pairs) + "}"
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class _Metric:
+    metric_type = "untyped"
+
+    def __init__(self, name: str, description: str):
+        self.name = name
+        self.description = description
+        self._lock = threading.Lock()
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.description}", f"# TYPE {self.name} {self.metric_type}"]
+        lines.extend(self._render_samples())
+        return lines
+
+    def _render_samples(self) -> List[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    """단조 증가 카운터"""
+    metric_type = "counter"
+
+    def __init__(self, name: str, description: str):
+        super().__init__(name, description)
+        self._values: Dict[LabelKey, float] = {}
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        if amount < 0:
+            raise ValueError("Counter는 감소할 수 없습니다.")
+        key = _label_key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels) -> float:
+        with self._lock:
+            return self._values.get(_label_key(labels), 0)
+
+    def _render_samples(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [f"{self.name}{_format_labels(key)} {_format_value(value)}" for key, value in items]
+
+
+class Gauge(_Metric):
+    """증감 가능한 현재 값"""
+    metric_type = "gauge"
+
+    def __init__(self, name: str, description: str):
+        super().__init__(name, description)
+        self._values: Dict[LabelKey, float] = {}
+
+    def set(self, value: float, **labels) -> None:
+        with self._lock:
+            self._values[_label_key(labels)] = value
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        key = _label_key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount: float = 1, **labels) -> None:
+        self.inc(-amount, **labels)
+
+    def value(self, **labels) -> float:
+        with self._lock:
+            return self._values.get(_label_key(labels), 0)
+
+    def _render_samples(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [f"{self.name}{_format_labels(key)} {_format_value(value)}" for key, value in items]
+
+
+class Histogram(_Metric):
+    """누적 버킷 히스토그램 (Prometheus histogram 형식)"""
+    metric_type = "histogram"
+
+    def __init__(self, name: str, description: str, buckets: Iterable[float] = DEFAULT_LATENCY_BUCKETS):
+        super().__init__(name, description)
+        self.buckets = tuple(sorted(buckets))
+        # 라벨 -> [버킷별 개수..., 합계, 전체 개수]
+        self._values: Dict[LabelKey, List[float]] = {}
+
+    def observe(self, value: float, **labels) -> None:
+        key = _label_key(labels)
+        with self._lock:
+            data = self._values.get(key)
+            if data is None:
+                data = self._values[key] = [0] * len(self.buckets) + [0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    data[i] += 1
+            data[-2] += value
+            data[-1] += 1
+
+    def snapshot(self, **labels) -> Dict[str, Any]:
+        """라벨 조합 하나의 {'count', 'sum', 'buckets'} (집계 확인용)"""
+        with self._lock:
+            data = list(self._values.get(_label_key(labels), [0] * len(self.buckets) + [0.0, 0]))
+        return {'count': data[-1], 'sum': data[-2], 'buckets': dict(zip(self.buckets, data[:-2]))}
+
+    def _render_samples(self) -> List[str]:
+        with self._lock:
+            items = sorted((key, list(data)) for key, data in self._values.items())
+        lines = []
+        for key, data in items:
+            for bound, count in zip(self.buckets, data[:-2]):
+                lines.append(f"{self.name}_bucket{_format_labels(key, ('le', _format_value(bound)))} {count}")
+            lines.append(f"{self.name}_bucket{_format_labels(key, ('le', '+Inf'))} {data[-1]}")
+            lines.append(f"{self.name}_sum{_format_labels(key)} {_format_value(data[-2])}")
+            lines.append(f"{self.name}_count{_format_labels(key)} {data[-1]}")
+        return lines
+
+
+class MetricsRegistry:
+    """메트릭 등록 및 텍스트 노출"""
+
+    def __init__(self, namespace: str = "sseojum"):
+        self.namespace = namespace
+        self._metrics: Dict[str, _Metric] = {}
+        self._collectors: Dict[str, Callable[[], None]] = {}
+        self._lock = threading.Lock()
+
+    def _get_or_create(self, cls, name: str, description: str, **kwargs) -> Any:
+        full_name = f"{self.namespace}_{name}" if self.namespace else name
+        with self._lock:
+            metric = self._metrics.get(full_name)
+            if metric is None:
+                metric = self._metrics[full_name] = cls(full_name, description, **kwargs)
+            elif not isinstance(metric, cls):
+                raise ValueError(f"메트릭 '{full_name}'이(가) 다른 형식으로 이미 등록되어 있습니다.")
+            return metric
+
+    def counter(self, name: str, description: str) -> Counter:
+        return self._get_or_create(Counter, name, description)
+
+    def gauge(self, name: str, description: str) -> Gauge:
+        return self._get_or_create(Gauge, name, description)
+
+    def histogram(self, name: str, description: str, buckets: Iterable[float] = DEFAULT_LATENCY_BUCKETS) -> Histogram:
+        return self._get_or_create(Histogram, name, description, buckets=buckets)
+
+    def register_collector(self, name: str, collector: Callable[[], None]) -> None:
+        """
+        스크레이프 직전에 호출할 수집 함수를 등록합니다. (같은 이름으로 다시 등록하면 교체)
+        캐시 적중률처럼 다른 서비스의 get_stats()에서 읽어 오는 값을 Gauge에 반영할 때 사용합니다.
+        """
+        with self._lock:
+            self._collectors[name] = collector
+
+    def render(self) -> str:
+        """Prometheus 텍스트 노출 형식(0.0.4)으로 모든 메트릭을 출력합니다."""
+        with self._lock:
+            collectors = list(self._collectors.items())
+        for name, collector in collectors:
+            try:
+                collector()
+            except Exception:
+                # 수집 함수 하나의 실패가 스크레이프 전체를 막지 않도록 합니다.
+                COLLECTOR_ERRORS.inc(collector=name)
+        with self._lock:
+            metrics = [self._metrics[name] for name in sorted(self._metrics)]
+        lines: List[str] = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+# --- 공통 메트릭 ---
+HTTP_REQUEST_DURATION = registry.histogram(
+    "http_request_duration_seconds", "라우트별 HTTP 요청 처리 시간(초)"
+)
+HTTP_REQUESTS_IN_FLIGHT = registry.gauge(
+    "http_requests_in_flight", "처리 중인 HTTP 요청 수"
+)
+STAGE_DURATION = registry.histogram(
+    "stage_duration_seconds", "처리 단계별 소요 시간(초) (auth, supabase_read/write, file_extraction, ocr, classification, generation 등)"
+)
+DEPENDENCY_IN_FLIGHT = registry.gauge(
+    "dependency_in_flight", "외부 의존성(vertex, supabase 등)에 대해 진행 중인 호출 수"
+)
+LLM_TOKENS = registry.counter(
+    "llm_tokens_total", "작업별 생성 모델 토큰 사용량 (kind: prompt, output, cached)"
+)
+PROMPT_TRIMMED_TOKENS = registry.counter(
+    "prompt_budget_trimmed_tokens_total", "토큰 예산 때문에 프롬프트에서 줄인 추정 토큰 수 (section: resume, jd, appendix, history)"
+)
+TEXT_NORMALIZATION_SAVED = registry.counter(
+    "text_normalization_saved_total", "추출 텍스트 정규화로 줄인 양 (unit: chars, tokens(추정))"
+)
+TOKEN_ESTIMATOR_CORRECTION = registry.gauge(
+    "token_estimator_correction", "원격 count_tokens 검증으로 학습한 로컬 토큰 추정기 보정 배율"
+)
+CACHE_HIT_RATIO = registry.gauge(
+    "cache_hit_ratio", "캐시별 적중률 (0~1)"
+)
+CACHE_EVENTS = registry.gauge(
+    "cache_events", "캐시별 누적 적중/미스 수 (result: hit, miss)"
+)
+COLLECTOR_ERRORS = registry.counter(
+    "metrics_collector_errors_total", "스크레이프 시 실패한 수집 함수 호출 수"
+)
+
+
+class track_stage:
+    """
+    처리 단계의 소요 시간을 STAGE_DURATION에 기록하는 컨텍스트 매니저 겸 데코레이터
+
+    dependency를 지정하면 블록이 실행되는 동안 DEPENDENCY_IN_FLIGHT를 1 올립니다.
+    진행 중인 요청 trace가 있으면 같은 이름의 span도 기록합니다.
+    예외가 발생하면 status="error"로 기록하고 예외는 그대로 전파합니다.
+    """
+
+    def __init__(self, stage: str, dependency: Optional[str] = None):
+        self.stage = stage
+        self.dependency = dependency
+        self._span = span(stage, dependency=dependency) if dependency else span(stage)
+        self._local = threading.local()
+
+    def __enter__(self) -> "track_stage":
+        starts = getattr(self._local, 'starts', None)
+        if starts is None:
+            starts = self._local.starts = []
+        starts.append(time.perf_counter())
+        if self.dependency:
+            DEPENDENCY_IN_FLIGHT.inc(dependency=self.dependency)
+        self._span.__enter__()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        self._span.__exit__(exc_type, exc, tb)
+        elapsed = time.perf_counter() - self._local.starts.pop()
+        if self.dependency:
+            DEPENDENCY_IN_FLIGHT.dec(dependency=self.dependency)
+        STAGE_DURATION.observe(elapsed, stage=self.stage, status="error" if exc_type else "ok")
+        return False
+
+    def __call__(self, func: Callable) -> Callable:
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with self:
+                return func(*args, **kwargs)
+        return wrapper
+
+
+def record_token_usage(operation: str, prompt_tokens: int = 0, output_tokens: int = 0, cached_tokens: int = 0) -> None:
+    """생성 모델 응답의 토큰 사용량을 작업별로 누적합니다."""
+    LLM_TOKENS.inc(prompt_tokens or 0, operation=operation, kind="prompt")
+    LLM_TOKENS.inc(output_tokens or 0, operation=operation, kind="output")
+    LLM_TOKENS.inc(cached_tokens or 0, operation=operation, kind="cached")
+
+
+def record_prompt_trim(operation: str, section: str, tokens: int) -> None:
+    """토큰 예산에 맞추느라 줄인 구간별 추정 토큰 수를 누적합니다."""
+    PROMPT_TRIMMED_TOKENS.inc(tokens or 0, operation=operation, section=section)
+
+
+def record_text_normalization(saved_chars: int, saved_tokens: int) -> None:
+    """추출 텍스트 정규화로 줄인 글자 수와 추정 토큰 수를 누적합니다."""
+    TEXT_NORMALIZATION_SAVED.inc(max(saved_chars, 0), unit="chars")
+    TEXT_NORMALIZATION_SAVED.inc(max(saved_tokens, 0), unit="tokens")
+
+
+def record_cache_stats(cache: str, hits: int, misses: int) -> None:
+    """다른 모듈의 get_stats() 값을 캐시 적중 지표로 반영합니다. (수집 함수에서 호출)"""
+    total = hits + misses
+    CACHE_EVENTS.set(hits, cache=cache, result="hit")
+    CACHE_EVENTS.set(misses, cache=cache, result="miss")
+    CACHE_HIT_RATIO.set(round(hits / total, 4) if total else 0.0, cache=cache)
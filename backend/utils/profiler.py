@@ -0,0 +1,153 @@
+"""
+요청 단위 온디맨드 프로파일러
+
+- StackSampler: 요청을 처리하는 스레드의 호출 스택을 일정 간격으로 샘플링합니다. (통계적 프로파일)
+  결과는 flamegraph.pl / speedscope / inferno가 읽는 folded 형식("a;b;c 샘플수")으로 만듭니다.
+- ProfileStore: 프로파일을 디스크에 JSON으로 저장하고, 최대 개수를 넘으면 오래된 것부터 지우는 링 저장소
+
+관리자 헤더가 붙은 요청 또는 PROFILE_SAMPLE_RATE 비율로 뽑힌 요청만 프로파일링하므로
+평소 요청에는 비용이 없습니다. (app.register_profiling 참고)
+"""
+
+import json
+import os
+import re
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from typing import Any, Dict, List, Optional
+
+from utils.logger import LoggerMixin
+
+_PROFILE_ID_RE = re.compile(r'^[0-9a-zA-Z_-]{1,64}$')
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    filename = os.path.basename(code.co_filename)
+    # folded 형식에서 ';'는 스택 구분자이므로 치환합니다. (샘플 수는 마지막 공백 뒤에 옵니다)
+    return f"{code.co_name} ({filename}:{code.co_firstlineno})".replace(';', ':')
+
+
+class StackSampler:
+    """대상 스레드의 호출 스택을 interval_ms 간격으로 샘플링합니다."""
+
+    def __init__(self, thread_id: int, interval_ms: float = 5.0, max_depth: int = 128):
+        self.thread_id = thread_id
+        self.interval = max(interval_ms, 0.5) / 1000
+        self.max_depth = max_depth
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.started: Optional[float] = None
+        self.stopped: Optional[float] = None
+
+    def start(self) -> "StackSampler":
+        self.started = time.perf_counter()
+        self._thread = threading.Thread(target=self._run, name="request-profiler", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> "StackSampler":
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+        self.stopped = time.perf_counter()
+        return self
+
+    @property
+    def duration_ms(self) -> float:
+        if self.started is None:
+            return 0.0
+        return ((self.stopped or time.perf_counter()) - self.started) * 1000
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            labels: List[str] = []
+            while frame is not None and len(labels) < self.max_depth:
+                labels.append(_frame_label(frame))
+                frame = frame.f_back
+            # 바깥 호출(루트)이 앞에 오도록 뒤집습니다.
+            self.stacks[';'.join(reversed(labels))] += 1
+            self.samples += 1
+
+    def folded(self) -> str:
+        """folded 형식 (한 줄에 '스택 샘플수')"""
+        return "\n".join(f"{stack} {count}" for stack, count in self.stacks.most_common()) + "\n"
+
+
+class ProfileStore(LoggerMixin):
+    """디스크 기반 프로파일 링 저장소 (max_entries개를 넘으면 가장 오래된 프로파일부터 삭제)"""
+
+    def __init__(self, directory: str, max_entries: int = 50):
+        self.directory = directory
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def save(self, sampler: StackSampler, metadata: Dict[str, Any]) -> str:
+        """프로파일을 저장하고 ID를 반환합니다."""
+        profile_id = f"{int(time.time() * 1000)}-{uuid.uuid4().hex[:8]}"
+        record = dict(metadata)
+        record.update({
+            'id': profile_id,
+            'created_at': time.time(),
+            'duration_ms': round(sampler.duration_ms, 2),
+            'interval_ms': round(sampler.interval * 1000, 2),
+            'samples': sampler.samples,
+            'stacks': dict(sampler.stacks)
+        })
+        path = self._path(profile_id)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(record, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+        self._prune()
+        return profile_id
+
+    def list_profiles(self) -> List[Dict[str, Any]]:
+        """저장된 프로파일 요약 목록 (최신순, 스택 제외)"""
+        summaries = []
+        for name in sorted(os.listdir(self.directory), reverse=True):
+            if not name.endswith('.json'):
+                continue
+            record = self.load(name[:-5])
+            if record:
+                record.pop('stacks', None)
+                summaries.append(record)
+        return summaries
+
+    def load(self, profile_id: str) -> Optional[Dict[str, Any]]:
+        if not _PROFILE_ID_RE.match(profile_id or ''):
+            return None
+        try:
+            with open(self._path(profile_id), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def folded(self, profile_id: str) -> Optional[str]:
+        """flamegraph 도구가 읽는 folded 형식으로 반환합니다."""
+        record = self.load(profile_id)
+        if record is None:
+            return None
+        stacks = sorted(record['stacks'].items(), key=lambda item: item[1], reverse=True)
+        return "\n".join(f"{stack} {count}" for stack, count in stacks) + "\n"
+
+    def _path(self, profile_id: str) -> str:
+        return os.path.join(self.directory, f"{profile_id}.json")
+
+    def _prune(self) -> None:
+        with self._lock:
+            names = sorted(name for name in os.listdir(self.directory) if name.endswith('.json'))
+            for name in names[:max(len(names) - self.max_entries, 0)]:
+                try:
+                    os.remove(os.path.join(self.directory, name))
+                except OSError as e:
+                    self.logger.warning(f"오래된 프로파일 삭제 실패 ({name}): {e}")
@@ -0,0 +1,210 @@
+"""
+이력서 텍스트 정규화 유틸리티
+
+파일에서 추출한 텍스트를 프롬프트에 넣기 전에 한 번만 정리합니다. (services/file_service.py가 추출 직후 호출)
+- 컴파일된 정규식 하나로 상용구 문장, 영문 하이픈 줄바꿈, 연속 공백, 보이지 않는 문자를 한 번에 처리
+- 여러 쪽의 같은 위치에 반복되는 머리글/바닥글과 쪽 번호 줄 제거 (parse_pdf는 쪽 사이에 PAGE_BREAK를 넣어 반환)
+- 같은 줄이 다시 나오면 제거 (바로 연속되지 않으면 한 줄짜리 문장만), 연속 빈 줄은 하나로
+결과와 함께 줄어든 글자 수/추정 토큰 수를 NormalizationReport로 반환합니다.
+
+사용법:
+    text, report = normalize_resume_text(extracted_text)
+    logger.info(report.summary())
+"""
+
+import re
+from collections import Counter
+from typing import Dict, List, Optional, Set, Tuple
+
+from utils.token_budget import estimate_tokens
+
+# 정규화 결과가 달라지는 변경을 하면 올립니다. 추출 텍스트 캐시 키에 포함됩니다.
+NORMALIZER_VERSION = 2
+
+# parse_pdf가 쪽 사이에 넣는 구분 문자 (정규화 후에는 남지 않음)
+PAGE_BREAK = "\f"
+
+# AI 챗봇이 생성했을 법한 상용구 (긴 문구가 먼저 일치하도록 길이 역순으로 정렬)
+BOILERPLATE_PHRASES = (
+    "좋습니다. 요청하신 대로", "요청하신 대로", "자소서를 수정해 드리겠습니다.",
+    "AI가 생성한 답변입니다.", "다음은 ...에 대한 답변입니다.", "생성된 자기소개서입니다.",
+    "도움이 되셨기를 바랍니다.", "...에 대한 답변입니다.", "답변:", "답변 :"
+)
+
+# 머리글/바닥글 후보로 볼 쪽 앞뒤 줄 수
+EDGE_LINES = 2
+# 같은 쪽 위치(위/아래)에 같은 줄이 이 쪽 수 이상, 또는 전체 쪽의 이 비율을 넘게 나오면 머리글/바닥글로 봅니다.
+REPEATED_EDGE_MIN_PAGES = 3
+REPEATED_EDGE_RATIO = 0.5
+# 머리글/바닥글로 볼 최대 줄 길이
+EDGE_MAX_CHARS = 80
+# 이보다 짧은 줄은 바로 앞 줄과 같을 때만 중복으로 제거합니다. (날짜, '- Python' 같은 항목은 여러 번 나올 수 있음)
+DUPLICATE_MIN_CHARS = 15
+
+_BOILERPLATE = "|".join(re.escape(p) for p in sorted(BOILERPLATE_PHRASES, key=len, reverse=True))
+_BOILERPLATE_PATTERN = re.compile(_BOILERPLATE)
+_NORMALIZE_PATTERN = re.compile(
+    rf"(?P<boilerplate>{_BOILERPLATE})"
+    r"|(?P<invisible>[\u200b-\u200d\ufeff\u00ad])"
+    r"|(?P<hyphen>(?<=[A-Za-z])-[ \t]*\n[ \t]*(?=[a-z]))"
+    r"|(?P<space>[ \t\u00a0\u2000-\u200a\u3000]+)"
+)
+_REPLACEMENTS = {'boilerplate': "", 'invisible': "", 'hyphen': "", 'space': " "}
+
+# 쪽 번호만 있는 줄: "3", "- 3 -", "3 / 10", "Page 3 of 10", "3 페이지", "3쪽" (연도와 헷갈리지 않게 세 자리까지만)
+_PAGE_NUMBER_LINE = re.compile(
+    r"^(?:[-–—]\s*)?(?:page\s*)?\d{1,3}(?:\s*(?:/|of)\s*\d{1,3})?(?:\s*(?:페이지|쪽|p))?(?:\s*[-–—])?$",
+    re.IGNORECASE
+)
+_DIGITS = re.compile(r"\d+")
+_SENTENCE_END = re.compile(r"[.!?。]$")
+
+
+def _substitute(match: "re.Match") -> str:
+    return _REPLACEMENTS[match.lastgroup]
+
+
+def strip_boilerplate(text: str) -> str:
+    """상용구 문장만 제거합니다. (프롬프트 조립 시 사용자 입력 텍스트에 적용, 줄바꿈/들여쓰기는 유지)"""
+    return _BOILERPLATE_PATTERN.sub("", text or "")
+
+
+class NormalizationReport:
+    """정규화 전후 크기와 제거한 줄 수"""
+
+    def __init__(self, chars_before: int, chars_after: int, tokens_before: int, tokens_after: int,
+                 header_footer_lines: int = 0, duplicate_lines: int = 0, pages: int = 1):
+        self.chars_before = chars_before
+        self.chars_after = chars_after
+        self.tokens_before = tokens_before
+        self.tokens_after = tokens_after
+        self.header_footer_lines = header_footer_lines
+        self.duplicate_lines = duplicate_lines
+        self.pages = pages
+
+    @property
+    def saved_chars(self) -> int:
+        return self.chars_before - self.chars_after
+
+    @property
+    def saved_tokens(self) -> int:
+        return self.tokens_before - self.tokens_after
+
+    def merge(self, other: "NormalizationReport") -> "NormalizationReport":
+        return NormalizationReport(
+            self.chars_before + other.chars_before, self.chars_after + other.chars_after,
+            self.tokens_before + other.tokens_before, self.tokens_after + other.tokens_after,
+            self.header_footer_lines + other.header_footer_lines, self.duplicate_lines + other.duplicate_lines,
+            self.pages + other.pages
+        )
+
+    def to_dict(self) -> Dict[str, int]:
+        return {
+            'chars_before': self.chars_before,
+            'chars_after': self.chars_after,
+            'saved_chars': self.saved_chars,
+            'tokens_before': self.tokens_before,
+            'tokens_after': self.tokens_after,
+            'saved_tokens': self.saved_tokens,
+            'header_footer_lines': self.header_footer_lines,
+            'duplicate_lines': self.duplicate_lines,
+            'pages': self.pages,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, int]) -> "NormalizationReport":
+        return cls(
+            data.get('chars_before', 0), data.get('chars_after', 0),
+            data.get('tokens_before', 0), data.get('tokens_after', 0),
+            data.get('header_footer_lines', 0), data.get('duplicate_lines', 0), data.get('pages', 0)
+        )
+
+    def summary(self) -> str:
+        return (f"텍스트 정규화: {self.chars_before:,} -> {self.chars_after:,}자 (-{self.saved_chars:,}), "
+                f"추정 토큰 {self.tokens_before:,} -> {self.tokens_after:,} (-{self.saved_tokens:,}), "
+                f"머리글/바닥글 {self.header_footer_lines}줄, 중복 {self.duplicate_lines}줄 제거")
+
+
+def _edge_key(line: str, page_number: int, page_count: int) -> str:
+    """
+    쪽 번호만 다른 머리글/바닥글('이력서 - 3 -', '3 / 10')을 같은 것으로 보기 위한 키
+
+    쪽 번호나 전체 쪽 수와 같은 숫자만 '#'로 바꾸고 나머지 숫자는 그대로 둡니다.
+    (쪽 경계에 걸린 '2019.03 ~ 2020.02' 같은 기간 줄이 서로 같은 줄로 묶여 지워지지 않게)
+    """
+    numbers = (str(page_number), str(page_count))
+    return _DIGITS.sub(lambda match: "#" if match.group() in numbers else match.group(), line)
+
+
+def _edge_lines(lines: List[str]) -> Tuple[List[int], List[int]]:
+    """쪽의 위/아래 EDGE_LINES줄 (빈 줄 제외) 인덱스"""
+    content = [i for i, line in enumerate(lines) if line]
+    return content[:EDGE_LINES], content[-EDGE_LINES:]
+
+
+def _repeated_edges(pages: List[List[str]]) -> Set[Tuple[str, str]]:
+    """여러 쪽의 같은 위치(위/아래) EDGE_LINES줄 안에 반복해서 나오는 ('top'|'bottom', 키)를 찾습니다."""
+    if len(pages) < 2:
+        return set()
+    counts: Counter = Counter()
+    for page_number, lines in enumerate(pages, 1):
+        top, bottom = _edge_lines(lines)
+        keys = set()
+        for side, indexes in (('top', top), ('bottom', bottom)):
+            keys.update((side, _edge_key(lines[i], page_number, len(pages)))
+                        for i in indexes if len(lines[i]) <= EDGE_MAX_CHARS)
+        counts.update(keys)
+    threshold = min(REPEATED_EDGE_MIN_PAGES, int(len(pages) * REPEATED_EDGE_RATIO) + 1)
+    return {key for key, count in counts.items() if count >= threshold}
+
+
+def normalize_resume_text(text: str, dedup_min_chars: int = DUPLICATE_MIN_CHARS) -> Tuple[str, NormalizationReport]:
+    """
+    추출한 이력서 텍스트를 정규화합니다.
+
+    Args:
+        text (str): 추출한 텍스트 (쪽 사이에 PAGE_BREAK가 있으면 머리글/바닥글 검출에 사용)
+        dedup_min_chars (int): 떨어져 있어도 중복으로 제거할 최소 줄 길이 (한 줄이 온전한 문장일 때만)
+
+    Returns:
+        Tuple[str, NormalizationReport]: 정규화된 텍스트와 보고서
+    """
+    text = text or ""
+    cleaned = _NORMALIZE_PATTERN.sub(_substitute, text)
+    pages = [[line.strip() for line in page.split("\n")] for page in cleaned.split(PAGE_BREAK)]
+    repeated = _repeated_edges(pages)
+
+    output: List[str] = []
+    seen: Set[str] = set()
+    header_footer = duplicates = 0
+    previous: Optional[str] = None
+    for page_number, lines in enumerate(pages, 1):
+        top, bottom = _edge_lines(lines)
+        sides = {i: {'top'} for i in top}
+        for i in bottom:
+            sides.setdefault(i, set()).add('bottom')
+        for index, line in enumerate(lines):
+            if not line:
+                if output and output[-1]:
+                    output.append("")
+                continue
+            if index in sides and (_PAGE_NUMBER_LINE.match(line) or any(
+                    (side, _edge_key(line, page_number, len(pages))) in repeated for side in sides[index])):
+                header_footer += 1
+                continue
+            # PDF는 긴 문장을 여러 줄로 나누므로, 떨어진 중복은 문장 하나가 온전히 한 줄인 경우에만 제거합니다.
+            # (앞 줄이 문장 끝에서 끝났고 이 줄도 문장 끝으로 끝나야 함. 줄바꿈된 문장 조각이 우연히 같아도 유지)
+            whole = _SENTENCE_END.search(line) and (not output or not output[-1] or _SENTENCE_END.search(output[-1]))
+            if line == previous or (whole and len(line) >= dedup_min_chars and line in seen):
+                duplicates += 1
+                continue
+            output.append(line)
+            seen.add(line)
+            previous = line
+
+    result = "\n".join(output).strip()
+    report = NormalizationReport(
+        len(text), len(result), estimate_tokens(text), estimate_tokens(result),
+        header_footer, duplicates, len(pages)
+    )
+    return result, report
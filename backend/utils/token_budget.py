@@ -0,0 +1,376 @@
+"""
+프롬프트 토큰 예산 유틸리티
+
+- TokenEstimator: 한국어 비중이 높은 텍스트용 로컬 토큰 추정기 (원격 count_tokens로 선택적 보정)
+- PromptBudgeter: 작업별 입력 토큰 예산에 맞춰 이력서/채용공고/부록/답변 히스토리를 줄이고 그 내역을 보고
+
+사용법:
+    budgeter = PromptBudgeter(remote_counter=lambda text: model.count_tokens(text).total_tokens)
+    blocks, report = budgeter.fit('generate', {'resume': resume, 'jd': jd, 'appendix': appendix}, render)
+    # render(**parts)는 (전역 블록, 세션 블록, 요청 블록)을 반환하는 함수
+"""
+
+import math
+import random
+import threading
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from utils.logger import LoggerMixin
+from utils.metrics import record_prompt_trim
+from config.settings import get_prompt_budget_config
+
+# 파일 여러 개를 합친 이력서의 구분선 (services/file_service.py가 결합할 때 사용)
+FILE_SEPARATOR = "\n\n--- 파일 구분선 ---\n\n"
+TRUNCATION_MARKER = "\n...(이하 생략)"
+
+# 문자 종류별 토큰 계수 (초기값은 근사치이며, verify()로 원격 토큰 수와 비교해 보정 배율을 학습합니다)
+# 한글 음절 등 멀티바이트 문자는 글자당 1토큰 미만, 영문/숫자는 3~4글자당 1토큰, 공백은 대부분 앞뒤 토큰에 흡수됩니다.
+MULTIBYTE_TOKENS_PER_CHAR = 0.65
+ASCII_TOKENS_PER_CHAR = 0.28
+WHITESPACE_TOKENS_PER_CHAR = 0.1
+# 보정 배율 학습률과 허용 범위
+CALIBRATION_ALPHA = 0.2
+CALIBRATION_RANGE = (0.5, 2.0)
+
+
+class TokenEstimator:
+    """
+    문자 종류별 계수로 토큰 수를 추정합니다.
+
+    문자를 하나씩 보지 않고 UTF-8 바이트 수와 문자 수의 차이로 멀티바이트 문자(한글은 3바이트) 수를 구하므로
+    수 MB 텍스트도 C 수준 연산 몇 번으로 추정합니다.
+    """
+
+    name = "ko-estimate"
+
+    def __init__(self):
+        self.correction = 1.0
+        self._lock = threading.Lock()
+        self._stats = {'verifications': 0, 'verify_failures': 0, 'abs_error_sum': 0.0}
+
+    def _raw_estimate(self, text: str) -> float:
+        if not text:
+            return 0.0
+        chars = len(text)
+        multibyte = (len(text.encode('utf-8')) - chars) // 2
+        whitespace = text.count(' ') + text.count('\n') + text.count('\t')
+        ascii_chars = max(chars - multibyte - whitespace, 0)
+        return (multibyte * MULTIBYTE_TOKENS_PER_CHAR + ascii_chars * ASCII_TOKENS_PER_CHAR
+                + whitespace * WHITESPACE_TOKENS_PER_CHAR)
+
+    def estimate(self, text: str) -> int:
+        """보정 배율을 적용한 추정 토큰 수"""
+        return int(math.ceil(self._raw_estimate(text) * self.correction))
+
+    # benchmarks/prompt_regression.py 토큰 카운터 인터페이스
+    count = estimate
+
+    def verify(self, text: str, remote_counter: Callable[[str], int]) -> Optional[Dict[str, Any]]:
+        """
+        원격 토큰 수와 비교해 보정 배율을 갱신합니다.
+
+        Returns:
+            dict: {'estimated', 'actual', 'error'} (원격 호출 실패 시 None)
+        """
+        raw = self._raw_estimate(text)
+        if raw <= 0:
+            return None
+        estimated = self.estimate(text)
+        try:
+            actual = int(remote_counter(text))
+        except Exception:
+            with self._lock:
+                self._stats['verify_failures'] += 1
+            return None
+
+        low, high = CALIBRATION_RANGE
+        with self._lock:
+            ratio = actual / raw
+            self.correction = min(max((1 - CALIBRATION_ALPHA) * self.correction + CALIBRATION_ALPHA * ratio, low), high)
+            error = (estimated - actual) / actual if actual else 0.0
+            self._stats['verifications'] += 1
+            self._stats['abs_error_sum'] += abs(error)
+        return {'estimated': estimated, 'actual': actual, 'error': round(error, 4)}
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            verifications = self._stats['verifications']
+            return {
+                'correction': round(self.correction, 4),
+                'verifications': verifications,
+                'verify_failures': self._stats['verify_failures'],
+                'mean_abs_error': round(self._stats['abs_error_sum'] / verifications, 4) if verifications else None
+            }
+
+
+# 프로세스 공용 추정기 (원격 검증으로 학습한 보정 배율을 컨텍스트 캐시와 프롬프트 예산이 공유)
+_default_estimator = TokenEstimator()
+
+
+def estimate_tokens(text: str) -> int:
+    """공용 추정기로 토큰 수를 추정합니다."""
+    return _default_estimator.estimate(text)
+
+
+# ---------------------------------------------------------------------- #
+# 구간 축소 함수
+# ---------------------------------------------------------------------- #
+def truncate_to_tokens(text: str, max_tokens: int, estimator: TokenEstimator = None) -> str:
+    """
+    앞부분을 남기고 max_tokens 이하가 되도록 자릅니다. (가능하면 줄 경계에서 자르고 생략 표시를 붙임)
+
+    Args:
+        text (str): 자를 텍스트
+        max_tokens (int): 허용 토큰 수 (0 이하이면 빈 문자열)
+
+    Returns:
+        str: 잘린 텍스트
+    """
+    estimator = estimator or _default_estimator
+    if max_tokens <= 0 or not text:
+        return ""
+    tokens = estimator.estimate(text)
+    if tokens <= max_tokens:
+        return text
+
+    limit = max_tokens - estimator.estimate(TRUNCATION_MARKER)
+    if limit <= 0:
+        return ""
+
+    def head_at(cut: int) -> str:
+        head = text[:cut]
+        newline = head.rfind("\n")
+        if newline >= cut * 0.8:
+            head = head[:newline]
+        return head.rstrip()
+
+    # limit 안에 들어가는 가장 긴 앞부분을 이분 탐색으로 찾습니다. (비율로 줄여 나가면 예산보다 크게 모자라게 잘림)
+    low, high, best = 0, len(text), ""
+    while low <= high:
+        cut = (low + high) // 2
+        head = head_at(cut)
+        if estimator.estimate(head) <= limit:
+            best = head
+            low = cut + 1
+        else:
+            high = cut - 1
+    return best + TRUNCATION_MARKER if best else ""
+
+
+def truncate_files(text: str, max_tokens: int, estimator: TokenEstimator = None,
+                   separator: str = FILE_SEPARATOR) -> str:
+    """
+    구분선으로 합친 여러 파일을 max_tokens 안에 맞춥니다.
+    작은 파일은 그대로 두고 남은 예산을 큰 파일들에 고르게 나눠, 한 파일이 다른 파일을 밀어내지 않게 합니다.
+    """
+    estimator = estimator or _default_estimator
+    files = text.split(separator)
+    if len(files) == 1:
+        return truncate_to_tokens(text, max_tokens, estimator)
+
+    remaining = max_tokens - estimator.estimate(separator) * (len(files) - 1)
+    sizes = [estimator.estimate(f) for f in files]
+    allowances = [0] * len(files)
+    order = sorted(range(len(files)), key=lambda i: sizes[i])
+    for position, index in enumerate(order):
+        share = max(remaining // (len(files) - position), 0)
+        allowances[index] = min(sizes[index], share)
+        remaining -= allowances[index]
+    trimmed = [truncate_to_tokens(f, allowance, estimator) for f, allowance in zip(files, allowances)]
+    return separator.join(f for f in trimmed if f)
+
+
+def keep_recent(versions: Sequence[str], max_tokens: int, estimator: TokenEstimator = None) -> List[str]:
+    """최신 버전부터 max_tokens 안에 들어가는 만큼만 남깁니다. (순서 유지, 오래된 버전부터 제외)"""
+    estimator = estimator or _default_estimator
+    kept: List[str] = []
+    used = 0
+    for version in reversed(versions):
+        tokens = estimator.estimate(version)
+        if used + tokens > max_tokens:
+            break
+        kept.append(version)
+        used += tokens
+    kept.reverse()
+    return kept
+
+
+def drop_section(text: str, max_tokens: int, estimator: TokenEstimator = None) -> str:
+    """나눌 수 없는 구간(문항 유형 부록): 예산이 모자라면 통째로 제외합니다."""
+    estimator = estimator or _default_estimator
+    return text if estimator.estimate(text) <= max_tokens else ""
+
+
+class SectionPolicy:
+    """줄일 수 있는 프롬프트 구간 (줄이는 순서, 최소 보존 토큰 수, 축소 함수)"""
+
+    def __init__(self, name: str, trim: Callable[..., Any], min_tokens: int = 0, divisible: bool = True):
+        self.name = name
+        self.trim = trim
+        self.min_tokens = min_tokens
+        self.divisible = divisible
+
+
+class BudgetReport:
+    """예산 적용 결과 (줄인 구간 목록 포함)"""
+
+    def __init__(self, operation: str, budget: Optional[int], tokens_before: int):
+        self.operation = operation
+        self.budget = budget
+        self.tokens_before = tokens_before
+        self.tokens_after = tokens_before
+        self.actions: List[Dict[str, Any]] = []
+
+    @property
+    def trimmed(self) -> bool:
+        return bool(self.actions)
+
+    @property
+    def within_budget(self) -> bool:
+        return not self.budget or self.tokens_after <= self.budget
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'operation': self.operation,
+            'budget': self.budget,
+            'tokens_before': self.tokens_before,
+            'tokens_after': self.tokens_after,
+            'within_budget': self.within_budget,
+            'actions': self.actions,
+        }
+
+    def summary(self) -> str:
+        details = ", ".join(
+            f"{a['section']} {a['action']} {a['tokens_before']:,}->{a['tokens_after']:,}" for a in self.actions
+        )
+        return (f"{self.operation} 프롬프트 {self.tokens_before:,} -> {self.tokens_after:,} 토큰 "
+                f"(예산 {self.budget:,}){': ' + details if details else ''}")
+
+
+class PromptBudgeter(LoggerMixin):
+    """작업별 입력 토큰 예산에 맞춰 프롬프트 구간을 줄이는 관리자"""
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None, estimator: Optional[TokenEstimator] = None,
+                 remote_counter: Optional[Callable[[str], int]] = None):
+        self.config = config or get_prompt_budget_config()
+        self.estimator = estimator or _default_estimator
+        self.remote_counter = remote_counter
+        min_tokens = self.config.get('min_tokens', {})
+        # 세션 구간(컨텍스트 캐시 접두부): 요청 내용과 무관하게 고정된 세션 예산에 맞춰 이력서를 최소 보존량까지 먼저 줄이고,
+        # 그래도 넘을 때만 채용공고를 줄입니다. (채용공고는 짧고 문항 답변의 기준이 되므로 마지막까지 보존)
+        # 같은 세션의 모든 요청이 같은 결과를 얻으므로 접두부가 요청마다 달라지지 않습니다.
+        self.session_policies = [
+            SectionPolicy('resume', truncate_files, min_tokens.get('resume', 0)),
+            SectionPolicy('jd', truncate_to_tokens, min_tokens.get('jd', 0)),
+        ]
+        # 요청 구간: 전체 예산의 나머지를 두고 오래된 히스토리 → 문항 유형 부록 순으로 줄입니다.
+        self.request_policies = [
+            SectionPolicy('history', keep_recent),
+            SectionPolicy('appendix', drop_section, divisible=False),
+        ]
+        self._lock = threading.Lock()
+        self._stats = {'prompts': 0, 'trimmed': 0, 'over_budget': 0}
+
+    def _section_tokens(self, value: Any) -> int:
+        if isinstance(value, (list, tuple)):
+            return sum(self.estimator.estimate(v) for v in value)
+        return self.estimator.estimate(value or "")
+
+    def _estimate_blocks(self, blocks: Sequence[str]) -> int:
+        return self.estimator.estimate("\n".join(blocks))
+
+    def _trim(self, operation: str, policies: List[SectionPolicy], parts: Dict[str, Any], fitted: Dict[str, Any],
+              excess: int, report: BudgetReport) -> None:
+        """policies 순서대로 구간을 줄여 excess 토큰만큼 덜어냅니다. (결과는 fitted에 기록)"""
+        for policy in policies:
+            value = parts.get(policy.name)
+            if excess <= 0 or not value:
+                continue
+            tokens = self._section_tokens(value)
+            if policy.divisible:
+                cut = min(max(tokens - policy.min_tokens, 0), excess)
+            else:
+                cut = tokens
+            if cut <= 0:
+                continue
+            fitted[policy.name] = policy.trim(value, tokens - cut, self.estimator)
+            tokens_after = self._section_tokens(fitted[policy.name])
+            report.actions.append({
+                'section': policy.name,
+                'action': 'dropped' if not fitted[policy.name] else 'trimmed',
+                'tokens_before': tokens,
+                'tokens_after': tokens_after,
+            })
+            excess -= tokens - tokens_after
+            record_prompt_trim(operation, policy.name, tokens - tokens_after)
+
+    def fit(self, operation: str, parts: Dict[str, Any],
+            render: Callable[..., Tuple[str, ...]]) -> Tuple[Tuple[str, ...], BudgetReport]:
+        """
+        parts로 프롬프트를 조립하고, 예산을 넘으면 구간을 줄여 다시 조립합니다.
+
+        이력서/채용공고는 요청 내용과 관계없이 세션 예산(session_tokens)에 맞춰 줄이고,
+        전체 예산을 넘는 나머지는 히스토리/부록 같은 요청 구간이 흡수합니다.
+
+        Args:
+            operation (str): 'generate' 또는 'revise' (작업별 예산 키)
+            parts (dict): 줄일 수 있는 구간 값 (resume, jd, appendix: 문자열 / history: 문자열 목록)
+            render (callable): render(**parts) -> 프롬프트 블록 튜플
+
+        Returns:
+            tuple: (프롬프트 블록 튜플, BudgetReport)
+        """
+        budget = self.config['budgets'].get(operation) if self.config['enabled'] else None
+        session_budget = self.config.get('session_tokens') if self.config['enabled'] else None
+        fitted = dict(parts)
+        blocks = render(**parts)
+        report = BudgetReport(operation, budget, self._estimate_blocks(blocks))
+        with self._lock:
+            self._stats['prompts'] += 1
+
+        session_tokens = sum(self._section_tokens(parts.get(p.name)) for p in self.session_policies)
+        if session_budget and session_tokens > session_budget:
+            self._trim(operation, self.session_policies, parts, fitted, session_tokens - session_budget, report)
+            blocks = render(**fitted)
+        if budget and self._estimate_blocks(blocks) > budget:
+            self._trim(operation, self.request_policies, parts, fitted,
+                       self._estimate_blocks(blocks) - budget, report)
+            blocks = render(**fitted)
+
+        if report.trimmed:
+            report.tokens_after = self._estimate_blocks(blocks)
+            with self._lock:
+                self._stats['trimmed'] += 1
+                if not report.within_budget:
+                    self._stats['over_budget'] += 1
+            if report.within_budget:
+                self.logger.info(f"토큰 예산 적용: {report.summary()}")
+            else:
+                self.logger.warning(f"줄일 수 있는 구간을 모두 줄였지만 예산을 넘습니다: {report.summary()}")
+        elif not report.within_budget:
+            with self._lock:
+                self._stats['over_budget'] += 1
+            self.logger.warning(f"줄일 수 있는 구간이 없어 예산을 넘습니다: {report.summary()}")
+
+        self._maybe_verify("\n".join(blocks))
+        return blocks, report
+
+    def _maybe_verify(self, prompt: str):
+        """샘플링된 프롬프트의 추정치를 원격 토큰 수로 검증합니다. (요청 지연이 늘지 않도록 백그라운드 스레드)"""
+        rate = self.config.get('verify_sample_rate', 0)
+        if not self.remote_counter or rate <= 0 or random.random() >= rate:
+            return
+
+        def verify():
+            result = self.estimator.verify(prompt, self.remote_counter)
+            if result:
+                self.logger.debug(f"토큰 추정 검증: 추정 {result['estimated']:,} / 실제 {result['actual']:,} "
+                                  f"(오차 {result['error']:+.1%}, 보정 배율 {self.estimator.correction:.3f})")
+
+        threading.Thread(target=verify, name="token-verify", daemon=True).start()
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self._stats)
+        stats['estimator'] = self.estimator.get_stats()
+        return stats
@@ -0,0 +1,300 @@
+"""
+경량 요청 추적(tracing) - 컨텍스트별 trace id와 중첩된 시간 측정 구간(span)
+
+- 요청마다 start_trace()로 trace를 시작하고, 서비스 코드에서는 span()으로 구간을 감쌉니다.
+  (metrics.track_stage로 감싼 단계는 같은 이름의 span도 자동으로 기록됩니다)
+- 진행 중인 trace가 없으면(백그라운드 스레드, 배치 스크립트 등) span()은 아무 것도 하지 않습니다.
+- 끝난 trace는 등록된 내보내기(exporter)로 전달됩니다. (log, jsonl 또는 register_exporter로 추가)
+- server_timing_header()는 같은 이름의 구간을 합산하여 Server-Timing 응답 헤더 값을 만듭니다.
+
+사용법:
+    with span('upload.create_session', session_fields=6):
+        session_model.create_session(...)
+
+    @span('file_service.process')
+    def process(...): ...
+"""
+
+import functools
+import json
+import logging
+import os
+import re
+import threading
+import time
+import uuid
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, List, Optional
+
+_TRACE_ID_RE = re.compile(r'^[0-9a-fA-F-]{8,64}$')
+_SERVER_TIMING_NAME_RE = re.compile(r'[^A-Za-z0-9_.-]+')
+
+logger = logging.getLogger(__name__)
+
+
+class Span:
+    """시간 측정 구간 한 건"""
+
+    __slots__ = ('name', 'span_id', 'parent_id', 'start', 'end', 'attributes', 'status')
+
+    def __init__(self, name: str, parent_id: Optional[str], attributes: Dict[str, Any]):
+        self.name = name
+        self.span_id = uuid.uuid4().hex[:16]
+        self.parent_id = parent_id
+        self.start = time.perf_counter()
+        self.end: Optional[float] = None
+        self.attributes = attributes
+        self.status = 'ok'
+
+    @property
+    def duration_ms(self) -> float:
+        return ((self.end or time.perf_counter()) - self.start) * 1000
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+
+class Trace:
+    """요청 하나에 속한 구간 목록"""
+
+    def __init__(self, name: str, trace_id: Optional[str] = None):
+        self.name = name
+        self.trace_id = trace_id or uuid.uuid4().hex
+        self.started_at = time.time()
+        self.start = time.perf_counter()
+        self.end: Optional[float] = None
+        self.attributes: Dict[str, Any] = {}
+        self.spans: List[Span] = []
+        self._lock = threading.Lock()
+
+    @property
+    def duration_ms(self) -> float:
+        return ((self.end or time.perf_counter()) - self.start) * 1000
+
+    def add_span(self, span: Span) -> None:
+        with self._lock:
+            self.spans.append(span)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """내보내기용 표현 (구간 시작 시각은 trace 시작 기준 ms)"""
+        with self._lock:
+            spans = list(self.spans)
+        return {
+            'trace_id': self.trace_id,
+            'name': self.name,
+            'started_at': self.started_at,
+            'duration_ms': round(self.duration_ms, 2),
+            'attributes': self.attributes,
+            'spans': [
+                {
+                    'name': s.name,
+                    'span_id': s.span_id,
+                    'parent_id': s.parent_id,
+                    'offset_ms': round((s.start - self.start) * 1000, 2),
+                    'duration_ms': round(s.duration_ms, 2),
+                    'status': s.status,
+                    'attributes': s.attributes
+                }
+                for s in spans
+            ]
+        }
+
+
+_current_trace: ContextVar[Optional[Trace]] = ContextVar('current_trace', default=None)
+_current_span: ContextVar[Optional[Span]] = ContextVar('current_span', default=None)
+
+_exporters: List[Callable[[Dict[str, Any]], None]] = []
+_exporters_lock = threading.Lock()
+
+
+def normalize_trace_id(value: Optional[str]) -> Optional[str]:
+    """
+    요청 헤더의 추적 ID를 검증합니다.
+    X-Request-ID 값이나 W3C traceparent("00-<trace-id>-<span-id>-<flags>")의 trace-id를 사용합니다.
+    """
+    if not value:
+        return None
+    value = value.strip()
+    parts = value.split('-')
+    if len(parts) == 4 and len(parts[1]) == 32:
+        value = parts[1]
+    return value if _TRACE_ID_RE.match(value) else None
+
+
+def start_trace(name: str, trace_id: Optional[str] = None) -> Trace:
+    """현재 컨텍스트에서 새 trace를 시작합니다. (finish_trace로 종료)"""
+    trace = Trace(name, trace_id)
+    _current_trace.set(trace)
+    _current_span.set(None)
+    return trace
+
+
+def finish_trace(trace: Optional[Trace] = None) -> Optional[Trace]:
+    """현재 trace를 종료하고 등록된 내보내기로 전달합니다."""
+    trace = trace or _current_trace.get()
+    _current_trace.set(None)
+    _current_span.set(None)
+    if trace is None:
+        return None
+    trace.end = time.perf_counter()
+    with _exporters_lock:
+        exporters = list(_exporters)
+    if exporters:
+        payload = trace.to_dict()
+        for exporter in exporters:
+            try:
+                exporter(payload)
+            except Exception as e:
+                logger.warning(f"trace 내보내기 실패 ({getattr(exporter, '__name__', type(exporter).__name__)}): {e}")
+    return trace
+
+
+def get_current_trace() -> Optional[Trace]:
+    return _current_trace.get()
+
+
+def get_trace_id() -> Optional[str]:
+    """현재 컨텍스트의 trace id (없으면 None)"""
+    trace = _current_trace.get()
+    return trace.trace_id if trace else None
+
+
+class span:
+    """
+    중첩 가능한 시간 측정 구간 (컨텍스트 매니저 겸 데코레이터)
+
+    진행 중인 trace가 없으면 아무 것도 기록하지 않습니다.
+    예외가 발생하면 status='error'로 기록하고 예외는 그대로 전파합니다.
+    """
+
+    def __init__(self, name: str, **attributes):
+        self.name = name
+        self.attributes = attributes
+        self._local = threading.local()
+
+    def __enter__(self) -> Optional[Span]:
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+        trace = _current_trace.get()
+        if trace is None:
+            stack.append(None)
+            return None
+        parent = _current_span.get()
+        current = Span(self.name, parent.span_id if parent else None, dict(self.attributes))
+        stack.append((current, _current_span.set(current)))
+        return current
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        entry = self._local.stack.pop()
+        if entry is None:
+            return False
+        current, token = entry
+        current.end = time.perf_counter()
+        if exc_type:
+            current.status = 'error'
+            current.attributes['error'] = exc_type.__name__
+        _current_span.reset(token)
+        trace = _current_trace.get()
+        if trace is not None:
+            trace.add_span(current)
+        return False
+
+    def __call__(self, func: Callable) -> Callable:
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with self:
+                return func(*args, **kwargs)
+        return wrapper
+
+
+def server_timing_header(trace: Optional[Trace] = None, max_entries: int = 20) -> str:
+    """
+    Server-Timing 헤더 값을 만듭니다.
+    같은 이름의 구간은 합산하고(desc에 횟수 표시), 소요 시간이 긴 순서로 max_entries개까지 포함합니다.
+    """
+    trace = trace or _current_trace.get()
+    if trace is None:
+        return ""
+    totals: Dict[str, List[float]] = {}
+    with trace._lock:
+        spans = list(trace.spans)
+    for s in spans:
+        name = _SERVER_TIMING_NAME_RE.sub('_', s.name) or 'span'
+        entry = totals.setdefault(name, [0.0, 0])
+        entry[0] += s.duration_ms
+        entry[1] += 1
+    ranked = sorted(totals.items(), key=lambda item: item[1][0], reverse=True)[:max_entries]
+    parts = [
+        f'{name};dur={duration:.1f}' + (f';desc="x{count}"' if count > 1 else '')
+        for name, (duration, count) in ranked
+    ]
+    parts.append(f'total;dur={trace.duration_ms:.1f}')
+    return ', '.join(parts)
+
+
+# ---------------------------------------------------------------------- #
+# 내보내기 (exporter)
+# ---------------------------------------------------------------------- #
+def register_exporter(exporter: Callable[[Dict[str, Any]], None]) -> None:
+    """종료된 trace(to_dict 형식)를 받을 함수를 등록합니다."""
+    with _exporters_lock:
+        _exporters.append(exporter)
+
+
+def clear_exporters() -> None:
+    with _exporters_lock:
+        _exporters.clear()
+
+
+class LogTraceExporter:
+    """min_duration_ms 이상 걸린 trace의 구간 요약을 로그로 남깁니다."""
+
+    def __init__(self, min_duration_ms: float = 0):
+        # utils.logger가 이 모듈을 임포트하므로 순환 임포트를 피해 여기서 가져옵니다.
+        from utils.logger import get_logger
+        self.min_duration_ms = min_duration_ms
+        self.logger = get_logger('tracing')
+
+    def __call__(self, trace: Dict[str, Any]) -> None:
+        if trace['duration_ms'] < self.min_duration_ms:
+            return
+        summary = ', '.join(f"{s['name']}={s['duration_ms']:.0f}ms" for s in trace['spans'])
+        self.logger.info(f"trace {trace['trace_id']} {trace['name']} {trace['duration_ms']:.0f}ms: {summary}")
+
+
+class JsonLinesTraceExporter:
+    """trace를 JSON Lines 파일에 한 줄씩 추가합니다. (외부 수집기로 전달하거나 오프라인 분석용)"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def __call__(self, trace: Dict[str, Any]) -> None:
+        line = json.dumps(trace, ensure_ascii=False, default=str)
+        with self._lock:
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(line + '\n')
+
+
+def configure_exporters(config: Dict[str, Any]) -> None:
+    """get_tracing_config() 설정에 따라 기본 내보내기를 등록합니다. (기존 등록은 교체)"""
+    clear_exporters()
+    for name in config['exporters']:
+        if name == 'log':
+            register_exporter(LogTraceExporter(config['log_min_duration_ms']))
+        elif name == 'jsonl':
+            register_exporter(JsonLinesTraceExporter(config['export_path']))
+        elif name not in ('', 'none'):
+            logger.warning(f"알 수 없는 trace 내보내기: {name}")
+
+
+class TraceContextFilter(logging.Filter):
+    """로그 레코드에 현재 trace id를 붙입니다. (없으면 '-')"""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.trace_id = get_trace_id() or '-'
+        return True
@@ -1,16 +1,30 @@
 """
 Vertex AI 클라이언트 설정 (리팩토링 버전)
+
+vertexai 패키지 임포트와 초기화는 앱 기동 시간을 크게 늘리므로,
+생성 모델이 처음 필요할 때 get_generation_model()에서 한 번만 수행합니다.
 """
 
-import vertexai
-from vertexai.generative_models import GenerativeModel
+import threading
 from config.settings import get_vertex_ai_config
 
-# Vertex AI 설정 가져오기
-config = get_vertex_ai_config()
+_model = None
+_lock = threading.Lock()
+
+
+def get_generation_model():
+    """애플리케이션 전체에서 공유될 Gemini 모델 인스턴스를 반환합니다. (최초 호출 시 Vertex AI 초기화)"""
+    global _model
+    if _model is None:
+        with _lock:
+            if _model is None:
+                import vertexai
+                from vertexai.generative_models import GenerativeModel
 
-# Vertex AI 초기화
-vertexai.init(project=config['project_id'], location=config['location'])
+                # Vertex AI 설정 가져오기
+                config = get_vertex_ai_config()
 
-# 애플리케이션 전체에서 공유될 Gemini 모델 인스턴스
-model = GenerativeModel(config['model_name']) 
\ No newline at end of file
+                # Vertex AI 초기화
+                vertexai.init(project=config['project_id'], location=config['location'])
+                _model = GenerativeModel(config['model_name'])
+    return _model